@@ -0,0 +1,132 @@
+"""
+Benchmark for restoring the client cache from a snapshot.
+
+    python benchmarks/bench_cache_snapshot.py [--guilds 100] [--members 200000] [--channels 20] [--roles 10]
+
+"payloads" fills a fresh client's cache from gateway payloads, like GUILD_CREATE plus member chunks do after a cold
+start (without the network time of receiving them, which is most of it). "snapshot" restores the same cache with
+`load_snapshot`. Each runs in a fresh process, RSS is how much that process grew while filling the cache.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interactions.client.client import Client
+
+
+def rss_mib() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def make_guilds(guilds: int, members: int, channels: int, roles: int) -> Iterator[dict]:
+    """GUILD_CREATE payloads with all members, one at a time like the gateway delivers them."""
+    per_guild = members // guilds
+    for g in range(guilds):
+        guild_id = str((g + 1) << 22)
+        role_ids = [str(((g * roles + r) + 1) << 23) for r in range(roles)]
+        yield (
+            {
+                "id": guild_id,
+                "name": f"guild {g}",
+                "owner_id": "1",
+                "roles": [
+                    {"id": role_id, "name": f"role {r}", "color": 0, "hoist": False, "position": r, "permissions": "0"}
+                    for r, role_id in enumerate(role_ids)
+                ],
+                "channels": [
+                    {"id": str(((g * channels + c) + 1) << 24), "type": 0, "name": f"channel-{c}", "position": c}
+                    for c in range(channels)
+                ],
+                "members": [
+                    {
+                        "user": {
+                            "id": str(((g * per_guild + m) + 1) << 25),
+                            "username": f"user{g}_{m}",
+                            "discriminator": "0",
+                            "global_name": None,
+                            "avatar": None,
+                        },
+                        "roles": role_ids[: m % 3],
+                        "joined_at": "2024-01-01T00:00:00+00:00",
+                        "deaf": False,
+                        "mute": False,
+                    }
+                    for m in range(per_guild)
+                ],
+                "emojis": [],
+                "features": [],
+                "member_count": per_guild,
+                "preferred_locale": "en-US",
+            }
+        )
+
+
+def fill(client: Client, payloads: Iterator[dict]) -> None:
+    for guild in payloads:
+        client.cache.place_guild_data(guild)
+
+
+def child(args: argparse.Namespace) -> None:
+    client = Client()
+    rss = rss_mib()
+    started = time.perf_counter()
+    if args.child == "payloads":
+        fill(client, make_guilds(args.guilds, args.members, args.channels, args.roles))
+    else:
+        client.cache.load_snapshot(args.path)
+    elapsed = time.perf_counter() - started
+    rss = rss_mib() - rss
+    print(f"{elapsed:.3f} {rss:.1f} {len(client.cache.member_cache)}")
+
+
+def measure(args: argparse.Namespace, mode: str, path: str) -> tuple:
+    command = [sys.executable, __file__, "--child", mode, "--path", path]
+    command += ["--guilds", str(args.guilds), "--members", str(args.members)]
+    command += ["--channels", str(args.channels), "--roles", str(args.roles)]
+    elapsed, rss, members = subprocess.check_output(command, text=True).split()
+    return float(elapsed), float(rss), int(members)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--guilds", type=int, default=100)
+    parser.add_argument("--members", type=int, default=200_000)
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--roles", type=int, default=10)
+    parser.add_argument("--child", choices=("payloads", "snapshot"), help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.bin")
+        client = Client()
+        fill(client, make_guilds(args.guilds, args.members, args.channels, args.roles))
+        started = time.perf_counter()
+        entries = asyncio.run(client.cache.save_snapshot(path))
+        saved = time.perf_counter() - started
+        size = os.path.getsize(path) / 1024**2
+
+        print(f"{args.guilds} guilds, {args.members} members, {entries} cache entries")
+        print(f"save:     {saved:7.2f}s  {size:7.1f} MiB on disk")
+        for mode in ("payloads", "snapshot"):
+            elapsed, rss, members = measure(args, mode, path)
+            assert members == args.members // args.guilds * args.guilds
+            print(f"{mode + ':':9} {elapsed:7.2f}s  {rss:7.1f} MiB RSS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+r"""
+Benchmark for routing component custom_ids to regex component callbacks.
+
+    python benchmarks/bench_component_routing.py [--patterns 300] [--presses 20000] [--unprefixed 10]
+
+"linear" is how the client used to find the callback: `match` every registered pattern in order until one
+matches. "indexed" is RegexRoutes, which only tries the patterns whose literal prefix the custom_id starts with.
+Patterns without a literal prefix (--unprefixed percent, e.g. `(\d+)-vote`) are tried for every custom_id.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interactions.client.utils import RegexRoutes
+
+
+def kind(i: int, unprefixed: int) -> str:
+    if i % 100 < unprefixed:
+        return "vote"
+    return ("poll", "ticket", "role_menu")[i % 3]
+
+
+def make_patterns(count: int, unprefixed: int) -> list:
+    patterns = {
+        "vote": r"(\d+)-vote{i}$",
+        "poll": r"^poll{i}\|(\d+)\|(yes|no)$",
+        "ticket": r"ticket:{i}:\w+",
+        "role_menu": r"role_menu_{i}/[a-z]+",
+    }
+    return [re.compile(patterns[kind(i, unprefixed)].format(i=i)) for i in range(count)]
+
+
+def make_custom_ids(count: int, pattern_count: int, unprefixed: int) -> list:
+    custom_ids = {
+        "vote": "{n}-vote{i}",
+        "poll": "poll{i}|{n}|yes",
+        "ticket": "ticket:{i}:open",
+        "role_menu": "role_menu_{i}/pick",
+    }
+    ids = []
+    for _ in range(count):
+        i = random.randrange(pattern_count)
+        ids.append(custom_ids[kind(i, unprefixed)].format(i=i, n=random.randrange(10**6)))
+    return ids
+
+
+def linear(routes: dict, custom_id: str) -> Any:
+    for regex, callback in routes.items():
+        if regex.match(custom_id):
+            return callback
+    return None
+
+
+def main(pattern_count: int, presses: int, unprefixed: int):
+    patterns = make_patterns(pattern_count, unprefixed)
+    custom_ids = make_custom_ids(presses, pattern_count, unprefixed)
+    routes = RegexRoutes((pattern, i) for i, pattern in enumerate(patterns))
+
+    started = time.perf_counter()
+    expected = [linear(routes, custom_id) for custom_id in custom_ids]
+    linear_rate = presses / (time.perf_counter() - started)
+
+    routes.match("")  # build the index outside the timing, it is built once after registering
+    started = time.perf_counter()
+    indexed = [routes.match(custom_id) for custom_id in custom_ids]
+    indexed_rate = presses / (time.perf_counter() - started)
+
+    assert indexed == expected
+    print(f"{presses} custom_ids routed against {pattern_count} patterns ({unprefixed}% without a literal prefix):")
+    print(f"  linear  {linear_rate:>10.0f} /s")
+    print(f"  indexed {indexed_rate:>10.0f} /s ({indexed_rate / linear_rate:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--patterns", type=int, default=300)
+    parser.add_argument("--presses", type=int, default=20000)
+    parser.add_argument("--unprefixed", type=int, default=10, help="percentage of patterns without a literal prefix")
+    args = parser.parse_args()
+    main(args.patterns, args.presses, args.unprefixed)
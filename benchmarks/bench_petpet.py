@@ -0,0 +1,91 @@
+"""
+Benchmark for the petpet GIF pipeline: renders/sec and how long the event loop stalls meanwhile.
+
+    python benchmarks/bench_petpet.py [--renders 40] [--workers 2]
+
+"inline" renders on the event loop the way /petpet used to, "pool" uses PetPetRenderer.
+The stall is the worst lateness of a 5 ms ticker running next to the renders, i.e. how long
+any other command would have waited. The pool only removes the stall if there is a spare CPU
+core for the workers, on a single core they compete with the event loop for it.
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from utils.image_utils import PetPetRenderer, decode_hand_frames, load_hand_frames, render_petpet
+
+TICK = 0.005
+
+
+def make_avatars(count: int, size: int = 256) -> list:
+    """Random noise avatars: worst case for GIF encoding, and no two are alike (no cache hits)."""
+    avatars = []
+    for _ in range(count):
+        image = Image.frombytes("RGB", (size, size), random.randbytes(size * size * 3))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        avatars.append(buffer.getvalue())
+    return avatars
+
+
+async def measure(render_all) -> tuple:
+    worst_stall = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal worst_stall
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            worst_stall = max(worst_stall, time.perf_counter() - started - TICK)
+
+    ticker_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await render_all()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticker_task
+    return elapsed, worst_stall
+
+
+async def main(renders: int, workers: int):
+    avatars = make_avatars(renders)
+    hand_images = decode_hand_frames(load_hand_frames())
+
+    async def inline():
+        for avatar in avatars:
+            render_petpet(avatar, hand_images)
+            await asyncio.sleep(0)  # A command handler yields between requests
+
+    renderer = PetPetRenderer(workers=workers)
+    renderer.start()
+    await renderer.render(make_avatars(1)[0])  # Wait for the workers to be up
+
+    async def pool():
+        await asyncio.gather(*(renderer.render(avatar) for avatar in avatars))
+
+    async def cached():
+        await asyncio.gather(*(renderer.render(avatar) for avatar in avatars))
+
+    print(f"{renders} renders of 256px avatars, {workers} worker process(es)")
+    for name, render_all in (("inline", inline), ("pool", pool), ("pool, cached", cached)):
+        elapsed, stall = await measure(render_all)
+        print(f"{name:>13}: {renders / elapsed:8.1f} renders/s, worst event loop stall {stall * 1000:7.1f} ms")
+    renderer.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--renders", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.renders, args.workers))
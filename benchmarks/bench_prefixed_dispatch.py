@@ -0,0 +1,99 @@
+"""
+Benchmark for prefixed command dispatch in a busy channel: matching MessageCreate waits and prefixes.
+
+    python benchmarks/bench_prefixed_dispatch.py [--rate 1000] [--messages 5000] [--prefixes 20]
+
+For every uncached message PrefixedManager waits up to 2 seconds for its MessageCreate, so a channel
+with --rate messages/sec keeps about 2 * rate waits pending. "checks" is how those waits used to be
+matched (every pending check runs for every event), "keyed" indexes them by message id.
+The prefix part compares trying every prefix with startswith against PrefixTrie.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interactions.api.events import MessageCreate
+from interactions.client.client import Client
+from interactions.ext.prefixed_commands import PrefixTrie
+
+WAIT_TIMEOUT = 2
+
+
+def _event(message_id: int) -> MessageCreate:
+    return MessageCreate(message=SimpleNamespace(id=message_id, _channel_id=1, _author_id=2))
+
+
+async def bench_waits(messages: int, pending: int, keyed: bool) -> float:
+    """Messages/sec the wait matching keeps up with, with `pending` waits outstanding."""
+    bot = Client()
+    waits = []
+
+    def register(message_id: int):
+        if keyed:
+            waits.append(asyncio.ensure_future(bot.wait_for(MessageCreate, timeout=60, key=("message_id", message_id))))
+        else:
+            waits.append(
+                asyncio.ensure_future(
+                    bot.wait_for(MessageCreate, checks=lambda e, _id=message_id: int(e.message.id) == _id, timeout=60)
+                )
+            )
+
+    for message_id in range(pending):  # the backlog of the last WAIT_TIMEOUT seconds
+        register(message_id)
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    for message_id in range(pending, pending + messages):
+        register(message_id)
+        await bot._process_waits(_event(message_id - pending))
+    elapsed = time.perf_counter() - started
+
+    for wait in waits:
+        wait.cancel()
+    await asyncio.gather(*waits, return_exceptions=True)
+    return messages / elapsed
+
+
+def bench_prefixes(messages: int, prefix_count: int) -> tuple:
+    prefixes = ["<@123456789012345678> ", "<@!123456789012345678> "] + [f"p{i}!" for i in range(prefix_count)]
+    contents = [f"p{i % (prefix_count * 2)}!help me please" for i in range(messages)]  # half of them match
+
+    started = time.perf_counter()
+    linear = [next((prefix for prefix in prefixes if content.startswith(prefix)), None) for content in contents]
+    linear_rate = messages / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    trie = [PrefixTrie.for_prefixes(tuple(prefixes)).match(content) for content in contents]
+    trie_rate = messages / (time.perf_counter() - started)
+
+    assert linear == trie
+    return linear_rate, trie_rate
+
+
+async def main(rate: int, messages: int, prefix_count: int):
+    pending = rate * WAIT_TIMEOUT
+    print(f"{messages} messages with {pending} pending waits ({rate} msg/s channel):")
+    for keyed in (False, True):
+        throughput = await bench_waits(messages, pending, keyed)
+        verdict = "keeps up" if throughput >= rate else "falls behind"
+        print(f"  {'keyed' if keyed else 'checks':<7} {throughput:>10.0f} msg/s ({verdict})")
+
+    linear_rate, trie_rate = bench_prefixes(messages * 10, prefix_count)
+    print(f"{messages * 10} prefix matches against {prefix_count + 2} prefixes:")
+    print(f"  startswith {linear_rate:>10.0f} msg/s")
+    print(f"  trie       {trie_rate:>10.0f} msg/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rate", type=int, default=1000, help="messages/sec in the channel")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--prefixes", type=int, default=20, help="custom prefixes next to the two mention prefixes")
+    args = parser.parse_args()
+    asyncio.run(main(args.rate, args.messages, args.prefixes))
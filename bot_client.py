@@ -1,6 +1,8 @@
 import os
 import sys
 from interactions import Client
+from interactions.api.gateway import GatewaySessionStore
+from utils.log_sink import server_log
 from dotenv import load_dotenv
 
 load_dotenv() # Ensure .env is loaded before accessing BOT_TOKEN
@@ -11,4 +13,25 @@ if not BOT_TOKEN:
     print("Error: BOT_TOKEN not found in .env file. Please make sure it is set.", file=sys.stderr)
     sys.exit(1)
 
-bot = Client(token=BOT_TOKEN, sync_interactions=False)
\ No newline at end of file
+bot = Client(token=BOT_TOKEN, sync_interactions=False)
+
+# Per command latency histograms for /manage stats, costs a few microseconds per interaction. INTERACTION_METRICS=0 turns them off.
+bot.interaction_metrics.enabled = os.getenv("INTERACTION_METRICS", "1") != "0"
+# Port for the Prometheus text endpoint (/metrics on METRICS_HOST, localhost by default), unset or 0 = no endpoint
+METRICS_PORT = int(os.getenv("METRICS_PORT") or 0)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+# The gateway session is saved here on shutdown and resumed on the next start, so a restart replays the missed events
+# instead of identifying again. GATEWAY_SESSION_FILE= (empty) turns it off.
+GATEWAY_SESSION_FILE = os.getenv("GATEWAY_SESSION_FILE", "gateway_session.json")
+if GATEWAY_SESSION_FILE:
+    bot.session_store = GatewaySessionStore(GATEWAY_SESSION_FILE)
+# The cache (guilds, channels, roles, members) is saved here on shutdown and restored on the next start, so commands
+# don't wait for it to be refetched. Restored entries are refetched the first time they are fetched.
+# CACHE_SNAPSHOT_FILE= (empty) turns it off.
+CACHE_SNAPSHOT_FILE = os.getenv("CACHE_SNAPSHOT_FILE", "cache_snapshot.bin")
+if CACHE_SNAPSHOT_FILE:
+    bot.cache_snapshot = CACHE_SNAPSHOT_FILE
+    bot.cache_snapshot_max_age = 24 * 60 * 60
+# LOG_WEBHOOKS=1 delivers the server activity log through a webhook the bot creates in each log channel (needs Manage
+# Webhooks), so the log has its own rate limits instead of sharing the bot's with its other messages in the channel.
+server_log.use_webhooks = os.getenv("LOG_WEBHOOKS", "0") == "1"
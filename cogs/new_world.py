@@ -1,8 +1,6 @@
 import json
 import logging
 import re
-import requests
-from bs4 import BeautifulSoup
 from interactions import slash_command, slash_option, OptionType, Embed, Permissions
 
 from bot_client import bot
@@ -3,6 +3,7 @@ import os
 import asyncio
 import subprocess
 import sys
+from datetime import datetime
 
 from interactions import (
     Extension,
@@ -12,12 +13,17 @@ from interactions import (
     SlashContext,
     Permissions,
     Client,
+    Embed,
 )
 
 from settings_manager import is_bot_manager, add_bot_manager, remove_bot_manager, set_dev_mode_setting, get_dev_mode_setting
+from db_utils import get_perk_refresh_status, request_perk_refresh
+from interactions.client.metrics import PHASES
 
 logger = logging.getLogger(__name__)
 
+MAX_STATS_ROWS = 15 # Slowest commands shown by /manage stats, more would not fit the embed
+
 class AdminCommands(Extension):
     def __init__(self, bot: Client):
         self.bot = bot
@@ -80,5 +86,67 @@ class AdminCommands(Extension):
         logger.info(f"Restart initiated by {ctx.author.user}. Shutting down.")
         await self.bot.stop()
 
+    @manage_group.subcommand(sub_cmd_name="perkrefresh", sub_cmd_description="Show or start the background perk data update.")
+    @slash_option("action", "Show the status or start an update now", opt_type=OptionType.STRING, required=False, choices=[{"name": "Status", "value": "status"}, {"name": "Start", "value": "start"}])
+    async def manage_perkrefresh(self, ctx: SlashContext, action: str = "status"):
+        if not ctx.author.has_permission(Permissions.ADMINISTRATOR) and not is_bot_manager(int(ctx.author.id)):
+            await ctx.send("You do not have permission to use this command.", ephemeral=True)
+            return
+        if action == "start":
+            # An explicit request skips the cooldown, but never runs two updates at once
+            started = request_perk_refresh(f"/manage perkrefresh by {ctx.author.user}", force=True)
+            await ctx.send("Perk data update started in the background." if started else "A perk data update is already running.", ephemeral=True)
+            return
+
+        status = get_perk_refresh_status()
+        embed = Embed(title="Perk Data Update", color=0x1ABC9C)
+        embed.add_field(name="State", value="Running" if status["running"] else "Idle", inline=True)
+        embed.add_field(name="Runs", value=str(status["runs"]), inline=True)
+        embed.add_field(name="Cached Misses", value=str(status["cached_misses"]), inline=True)
+        if status["started_at"]:
+            embed.add_field(name="Last Started", value=f"<t:{int(status['started_at'])}:R> ({status['trigger']})", inline=False)
+        if status["finished_at"]:
+            result = "OK" if status["returncode"] == 0 else f"Failed (exit code {status['returncode']})"
+            embed.add_field(name="Last Finished", value=f"<t:{int(status['finished_at'])}:R> - {result}", inline=False)
+        if status["cooldown_remaining"]:
+            embed.add_field(name="Cooldown", value=f"{int(status['cooldown_remaining'] // 60)} min", inline=True)
+        await ctx.send(embeds=embed, ephemeral=True)
+
+    @manage_group.subcommand(sub_cmd_name="stats", sub_cmd_description="Show command latency statistics.")
+    @slash_option("phase", "Which part of handling a command to show (default: total)", opt_type=OptionType.STRING, required=False, choices=[{"name": phase.replace("_", " ").title(), "value": phase} for phase in PHASES])
+    @slash_option("reset", "Clear the statistics after showing them", opt_type=OptionType.BOOLEAN, required=False)
+    async def manage_stats(self, ctx: SlashContext, phase: str = "total", reset: bool = False):
+        if not ctx.author.has_permission(Permissions.ADMINISTRATOR) and not is_bot_manager(int(ctx.author.id)):
+            await ctx.send("You do not have permission to use this command.", ephemeral=True)
+            return
+        metrics = self.bot.interaction_metrics
+        if not metrics.enabled:
+            await ctx.send("Latency statistics are disabled (INTERACTION_METRICS=0).", ephemeral=True)
+            return
+
+        rows = metrics.summary(phase)[:MAX_STATS_ROWS]
+        embed = Embed(title=f"Command Latency: {phase.replace('_', ' ')}", color=0x1ABC9C)
+        if rows:
+            lines = [f"{'command':<24} {'n':>6} {'p50':>7} {'p99':>7} {'max':>7}"]
+            for row in rows:
+                name = row["name"] if row["kind"] == "command" else f"{row['name']} (ac)"
+                lines.append(f"{name[:24]:<24} {row['count']:>6} {_ms(row['p50']):>7} {_ms(row['p99']):>7} {_ms(row['max']):>7}")
+            embed.description = "```\n" + "\n".join(lines) + "\n```"
+        else:
+            embed.description = "Nothing recorded yet."
+        http_stats = self.bot.http.ratelimit_stats
+        embed.add_field(name="Discord API", value=f"{http_stats['requests']} requests, {http_stats['paced']} paced, {http_stats['429']} rate limited", inline=False)
+        autocomplete_cache = self.bot.autocomplete_cache
+        embed.add_field(name="Autocomplete Cache", value=f"{autocomplete_cache.hit_rate:.0%} answered from cache ({autocomplete_cache.stats['hits']} hits, {autocomplete_cache.stats['derived']} from shorter input, {autocomplete_cache.stats['misses']} misses), {len(autocomplete_cache)} entries", inline=False)
+        channel_stats = self.bot.context_channel_stats
+        embed.add_field(name="Interaction Channels", value=f"{channel_stats['payload'] + channel_stats['cached']} without a fetch ({channel_stats['payload']} from the interaction, {channel_stats['cached']} cached), {channel_stats['fetched']} fetched, {channel_stats['failed']} failed", inline=False)
+        embed.set_footer(text=f"Since {datetime.fromtimestamp(metrics.since):%Y-%m-%d %H:%M}. (ac) = autocomplete, times in ms.")
+        if reset:
+            metrics.reset()
+        await ctx.send(embeds=embed, ephemeral=True)
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}"
+
 def setup(bot: Client):
     AdminCommands(bot)
\ No newline at end of file
@@ -1,6 +1,5 @@
 import logging
 import time
-import math
 from typing import Optional
 
 from interactions import (
@@ -12,8 +11,9 @@ from config import (
     BOT_START_TIME,
     OWNER_ID
 )
-from common_utils import format_uptime
+from common_utils import evaluate_expression, format_uptime
 from utils.image_utils import generate_petpet_gif
+from utils.offload import OffloadLimitExceeded, OffloadQueueFull, offload_pool
 
 logger = logging.getLogger(__name__)
 
@@ -88,8 +88,15 @@ class GeneralCommands(Extension):
     @slash_option("user", "The user to pet (Aeternum style)", opt_type=OptionType.USER, required=True)
     async def petpet(self, ctx: SlashContext, user: User):
         await ctx.defer()
-        avatar_url = user.avatar.url if user.avatar else user.default_avatar.url
-        gif_buffer = await generate_petpet_gif(str(avatar_url))
+        avatar = user.avatar or user.default_avatar
+        try:
+            # 256px is plenty for a 112px GIF; goes through the bot's CDN cache
+            avatar_bytes = await avatar.fetch(extension=".png", size=256)
+        except Exception as e:
+            logger.error(f"Failed to fetch avatar of {user.id} for petpet: {e}")
+            avatar_bytes = None
+        cache_key = f"{avatar.hash}:256" if avatar.hash else None
+        gif_buffer = await generate_petpet_gif(avatar_bytes, cache_key=cache_key) if avatar_bytes else None
         if gif_buffer:
             await ctx.send(files=[File(file=gif_buffer, file_name="petpet.gif")])
         else:
@@ -98,12 +105,20 @@ class GeneralCommands(Extension):
     @slash_command("calculate", description="Perform a calculation with New World magic!")
     @slash_option("expression", "The mathematical expression to calculate", opt_type=OptionType.STRING, required=True)
     async def calculate(self, ctx: SlashContext, expression: str):
+        # Waiting for a free worker can take longer than Discord's 3 seconds. The deferred reply is ephemeral so
+        # errors stay private, a result is posted publicly as a followup.
+        await ctx.defer(ephemeral=True)
         try:
-            allowed_names = {k: v for k, v in math.__dict__.items() if not k.startswith("_")}
-            result = eval(expression, {"__builtins__": {}}, allowed_names)
-            await ctx.send(f"🔮 The result of `{expression}` is `{result}`.")
+            result = await offload_pool.run(evaluate_expression, expression, timeout=5)
+        except OffloadLimitExceeded:
+            await ctx.send("That calculation is beyond even Aeternum's arcane arts.")
+        except OffloadQueueFull:
+            await ctx.send("Too many calculations are brewing right now, try again in a moment.")
         except Exception as e:
-            await ctx.send(f"The arcane calculation failed: {e}", ephemeral=True)
+            await ctx.send(f"The arcane calculation failed: {e}")
+        else:
+            await ctx.send("🔮 The arcane energies have spoken.")
+            await ctx.send(f"🔮 The result of `{expression}` is `{result}`.")
 
     @slash_command(name="uptime", description="Shows how long Ina has been online.")
     async def uptime_command(self, ctx: SlashContext):
@@ -7,14 +7,19 @@ from interactions import ( # Added Member to imports
     Extension, slash_command, slash_option, OptionType, SlashContext, AutocompleteContext, Embed, Permissions, Client, Member
 )
 
+from interactions.ext.paginators import Paginator, PaginatorRouter
 from settings_manager import is_bot_manager
 from config import BUILDS_FILE, OWNER_ID # Added OWNER_ID to imports
 
 logger = logging.getLogger(__name__)
 
+BUILDS_PER_PAGE = 10 # Embeds hold at most 25 fields
+
 class NewWorldBuilds(Extension):
     def __init__(self, bot: Client):
         self.bot = bot
+        # /build list pages are recreated from BUILDS_FILE on every button press, nothing is kept per message
+        PaginatorRouter.for_client(bot).register_source("builds", self._build_list_paginator)
 
     @slash_command(name="build", description="Manage saved New World builds.")
     async def build_group(self, ctx: SlashContext):
@@ -42,8 +47,8 @@ class NewWorldBuilds(Extension):
             
         await ctx.send(f"Build '{name}' added!", ephemeral=True)
 
-    @build_group.subcommand(sub_cmd_name="list", sub_cmd_description="Show a list of saved builds.")
-    async def build_list(self, ctx: SlashContext):
+    async def _build_list_paginator(self, _argument: str = "") -> Optional[Paginator]:
+        """The saved builds as a stateless paginator, None if there are none."""
         try:
             with open(BUILDS_FILE, 'r', encoding='utf-8') as f:
                 builds = json.load(f)
@@ -51,15 +56,28 @@ class NewWorldBuilds(Extension):
             builds = []
 
         if not builds:
+            return None
+
+        pages = []
+        for start in range(0, len(builds), BUILDS_PER_PAGE):
+            embed = Embed(title="Saved Builds", color=0x3498db)
+            for build in builds[start:start + BUILDS_PER_PAGE]:
+                submitter = f"<@{build.get('submitted_by', 'Unknown')}>"
+                embed.add_field(name=build['name'], value=f"[Link]({build['link']}) by {submitter}", inline=False)
+            pages.append(embed)
+        return Paginator.create_from_embeds(self.bot, *pages, stateless=True, content_key="builds:")
+
+    @build_group.subcommand(sub_cmd_name="list", sub_cmd_description="Show a list of saved builds.")
+    async def build_list(self, ctx: SlashContext):
+        paginator = await self._build_list_paginator()
+        if not paginator:
             await ctx.send("No builds saved yet.", ephemeral=True)
             return
 
-        embed = Embed(title="Saved Builds", color=0x3498db)
-        for build in builds:
-            submitter = f"<@{build.get('submitted_by', 'Unknown')}>"
-            embed.add_field(name=build['name'], value=f"[Link]({build['link']}) by {submitter}", inline=False)
-        
-        await ctx.send(embeds=embed)
+        if len(paginator.pages) == 1:
+            await ctx.send(embeds=paginator.pages[0])
+        else:
+            await paginator.send(ctx)
 
     @build_group.subcommand(sub_cmd_name="remove", sub_cmd_description="Remove a saved build.")
     @slash_option("name", "The name of the build to remove", opt_type=OptionType.STRING, required=True, autocomplete=True)
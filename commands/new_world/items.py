@@ -12,21 +12,23 @@ from interactions import (
     SlashContext,
 )
 
-from db_utils import find_item_in_db, find_perk_in_db, find_all_item_names_in_db
+from db_utils import find_item_in_db, find_perk_in_db, find_all_item_names_in_db, game_data_check, game_data_autocomplete
 from common_utils import scale_value_with_gs
 from recipes import get_recipe
 
 from commands.new_world.utils import get_any, items_data_cache # Import the in-memory cache
+from config import AUTOCOMPLETE_CACHE_TTL
 logger = logging.getLogger(__name__)
 
 class NewWorldItemCommands(Extension):
     def __init__(self, bot):
         self.bot = bot
+        self.add_ext_check(game_data_check)
 
     @slash_command(name="nwdb", description="Look up items from New World Database.", dm_permission=False)
     @slash_option("item_name", "The name of the item to look up", opt_type=OptionType.STRING, required=True, autocomplete=True)
     async def nwdb(self, ctx: SlashContext, item_name: str):
-        await ctx.defer()
+        await ctx.defer(suppress_error=True) # game_data_check may have deferred already
 
         item = None
         # 1. First, try the fast in-memory cache
@@ -95,7 +97,8 @@ class NewWorldItemCommands(Extension):
         # 3. If item is not found, send not found message.
         await ctx.send(f"Item '{item_name}' not found in the database.", ephemeral=True)
 
-    @nwdb.autocomplete("item_name")
+    @nwdb.autocomplete("item_name", cache_ttl=AUTOCOMPLETE_CACHE_TTL)
+    @game_data_autocomplete
     async def nwdb_autocomplete(self, ctx: AutocompleteContext):
         search_term = ctx.input_text.lower().strip() if ctx.input_text else ""
         if not search_term:
@@ -108,7 +111,8 @@ class NewWorldItemCommands(Extension):
                 choices.append({"name": str(name), "value": str(name)})
 
         logging.info(f"Autocomplete: Search term '{search_term}' returned {len(choices)} choices.")
-        await ctx.send(choices=choices)
+        # Judged by the rows: a full LIMIT 25 query is truncated, even when some of its names were dropped
+        await ctx.send(choices=choices, complete=len(matches) < 25)
 
 def setup(bot):
     NewWorldItemCommands(bot)
\ No newline at end of file
@@ -1,31 +1,36 @@
 import logging
-import re
 from typing import Optional
 
 from interactions import (
     Extension, slash_command, slash_option, OptionType, SlashContext, AutocompleteContext, Embed, Client
 )
 
-from db_utils import find_perk_in_db
-from common_utils import scale_value_with_gs
+from db_utils import find_perk_in_db, get_perk_refresh_status, get_perk_scaling, game_data_check, game_data_autocomplete
+from utils.perk_scaler import compile_perk_template, DEFAULT_GEAR_SCORE, SCALING_BREAKPOINTS
 from commands.new_world.utils import get_any, PERK_PRETTY # Import get_any and PERK_PRETTY
+from config import AUTOCOMPLETE_CACHE_TTL
 
 logger = logging.getLogger(__name__)
 
+MAX_SCALING_TABLE_COLUMNS = 4 # Values per row that still fit an embed field
+
 class NewWorldPerks(Extension):
     def __init__(self, bot: Client):
         self.bot = bot
+        self.add_ext_check(game_data_check)
 
     @slash_command(name="perk", description="Look up information about a specific New World perk.")
     @slash_option("perk_name", "The name of the perk to look up", opt_type=OptionType.STRING, required=True, autocomplete=True)
-    async def perk(self, ctx: SlashContext, perk_name: str):
+    @slash_option("gear_score", "Gear Score to scale the values to (default 725)", opt_type=OptionType.INTEGER, required=False, min_value=100, max_value=800)
+    async def perk(self, ctx: SlashContext, perk_name: str, gear_score: Optional[int] = None):
         """Lookup perk from the New World perk database."""
-        await ctx.defer()
-        perk_results = await find_perk_in_db(perk_name, exact_match=True)
+        await ctx.defer(suppress_error=True) # game_data_check may have deferred already
+        perk_results = await find_perk_in_db(perk_name, exact_match=True, refresh_on_miss=False)
         if not perk_results:
             perk_results = await find_perk_in_db(perk_name, exact_match=False)
             if not perk_results:
-                await ctx.send(f"Perk '{perk_name}' not found in the database.", ephemeral=True)
+                refresh_note = " The perk data is being updated in the background, please try again in a few minutes." if get_perk_refresh_status()["running"] else ""
+                await ctx.send(f"Perk '{perk_name}' not found in the database.{refresh_note}", ephemeral=True)
                 return
         
         perk_info = perk_results[0]
@@ -54,7 +59,10 @@ class NewWorldPerks(Extension):
         if icon_url:
             embed.set_thumbnail(url=str(icon_url).strip())
 
-        scaled_description = scale_value_with_gs(str(description_raw))
+        description_template = compile_perk_template(str(description_raw))
+        # Values create_db.py evaluated ahead of time, anything else is evaluated from the compiled template
+        precomputed_scaling = await get_perk_scaling(str(perk_id).strip()) if perk_id and description_template.has_scaling else {}
+        scaled_description = description_template.render(gear_score or DEFAULT_GEAR_SCORE, precomputed=precomputed_scaling)
         perk_type_display = str(perk_type_raw).strip() if perk_type_raw and str(perk_type_raw).strip() else "Unknown Type"
 
         embed.add_field(name="Description", value=scaled_description, inline=False)
@@ -63,8 +71,13 @@ class NewWorldPerks(Extension):
         if is_craft_mod and craft_mod_item_name and str(craft_mod_item_name).strip():
             embed.add_field(name="Crafted With / Source", value=str(craft_mod_item_name), inline=True)
         
-        if re.search(r'\{\[.*?\]\}', str(description_raw)):
-            embed.add_field(name="Scaling", value="Values scale with Gear Score (shown at 725 GS)", inline=True)
+        if description_template.has_scaling:
+            if gear_score:
+                gear_scores = sorted(set(SCALING_BREAKPOINTS) | {gear_score})
+                scaling_table = self._format_scaling_table(description_template, gear_scores, precomputed_scaling)
+                embed.add_field(name=f"Scaling (shown at {gear_score} GS)", value=scaling_table, inline=False)
+            else:
+                embed.add_field(name="Scaling", value=f"Values scale with Gear Score (shown at {DEFAULT_GEAR_SCORE} GS)", inline=True)
 
         embed.add_field(name="Condition", value=str(condition).strip() if condition else "-", inline=False)
         embed.add_field(name="Compatible With", value=", ".join([item.strip() for item in str(compatible_with_raw).split(',') if item.strip()]) if compatible_with_raw else "-", inline=False)
@@ -78,19 +91,29 @@ class NewWorldPerks(Extension):
         embed.set_footer(text="Perk information from local data. Values may scale with Gear Score in-game.")
         await ctx.send(embeds=embed)
 
-    @perk.autocomplete("perk_name")
+    @staticmethod
+    def _format_scaling_table(template, gear_scores, precomputed=None) -> str:
+        rows = [row[:MAX_SCALING_TABLE_COLUMNS + 1] for row in template.scaling_table(gear_scores, precomputed)]
+        header = ["GS"] + [f"#{i}" for i in range(1, len(rows[0]))]
+        widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+        lines = ["  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in [header] + rows]
+        return "```\n" + "\n".join(lines) + "\n```"
+
+    @perk.autocomplete("perk_name", cache_ttl=AUTOCOMPLETE_CACHE_TTL)
+    @game_data_autocomplete
     async def perk_autocomplete(self, ctx: AutocompleteContext):
         """Autocomplete for perk names."""
         search_term = ctx.input_text.lower().strip() if ctx.input_text else ""
         if not search_term:
             return await ctx.send(choices=[])
-        matches = await find_perk_in_db(search_term, exact_match=False)
+        matches = await find_perk_in_db(search_term, exact_match=False, refresh_on_miss=False)
         choices = []
         for row in matches[:25]: # Limit to 25 results for Discord autocomplete
             name = get_any(row, ['Name', 'name', 'PerkName'], None)
             if name is not None and str(name).strip(): # Ensure name is not None or an empty string
                 choices.append({"name": str(name), "value": str(name)})
-        await ctx.send(choices=choices)
+        # Judged by the rows: a full LIMIT 25 query is truncated, even when some of its names were dropped
+        await ctx.send(choices=choices, complete=len(matches) < 25)
 
 def setup(bot: Client):
     NewWorldPerks(bot)
\ No newline at end of file
@@ -0,0 +1,49 @@
+import logging
+
+from interactions import (
+    Extension, slash_command, slash_option, OptionType, SlashContext, Embed, Client
+)
+
+from db_utils import search_game_data, game_data_check
+
+logger = logging.getLogger(__name__)
+
+MAX_SEARCH_RESULTS = 10
+RESULT_TYPE_LABELS = {"item": "Item", "perk": "Perk"}
+
+class NewWorldSearch(Extension):
+    def __init__(self, bot: Client):
+        self.bot = bot
+        self.add_ext_check(game_data_check)
+
+    @slash_command(name="search", description="Search item and perk names and descriptions, e.g. 'empower' or 'keen'.")
+    @slash_option("query", "Words to search for", opt_type=OptionType.STRING, required=True)
+    @slash_option(
+        name="category",
+        description="Limit the search to items or perks.",
+        opt_type=OptionType.STRING,
+        required=False,
+        choices=[
+            {"name": "Everything", "value": "all"},
+            {"name": "Items", "value": "item"},
+            {"name": "Perks", "value": "perk"},
+        ]
+    )
+    async def search(self, ctx: SlashContext, query: str, category: str = "all"):
+        """Ranked full-text search over the local New World data."""
+        await ctx.defer(suppress_error=True) # game_data_check may have deferred already, the results are public
+        results = await search_game_data(query, category=category, limit=MAX_SEARCH_RESULTS)
+        if not results:
+            await ctx.send(f"Nothing found for '{query}'.")
+            return
+
+        embed = Embed(title=f"Search: {query}", color=0x1ABC9C)
+        for result in results:
+            label = RESULT_TYPE_LABELS.get(result['result_type'], result['result_type'])
+            snippet = str(result.get('snippet') or '-') # Perk values are scaled to the default gear score in the index
+            embed.add_field(name=f"{result['result_name']} ({label})", value=snippet[:1024], inline=False)
+        embed.set_footer(text="Use /nwdb or /perk with a name for the full details.")
+        await ctx.send(embeds=embed)
+
+def setup(bot: Client):
+    NewWorldSearch(bot)
@@ -1,8 +1,13 @@
+import asyncio
 import logging
 import json
 import os
+import sqlite3
 from typing import Dict, Any, List, Optional
 
+from config import DB_NAME
+from db_utils import add_data_version_listener
+
 logger = logging.getLogger(__name__)
 
 # Global constants (moved to top)
@@ -77,12 +82,44 @@ GENERIC_MATERIAL_MAPPING.update({
 
 GENERIC_MATERIAL_MAPPING["obsidian sandpaper"] = "Obsidian Sandpaper"
 
-# Global cache for items_updated.json
+# Global cache for items_updated.json and the database's items table
 items_data_cache: Dict[str, Dict[str, Any]] = {}
 
-# Load items_updated.json once when this module is imported
-def _load_items_data_cache(): # Renamed from _load_items_data_cache to _load_all_items_data
-    global items_data_cache
+def _add_item(cache: Dict[str, Dict[str, Any]], item: Dict[str, Any], name: Optional[str], item_id: Optional[str]):
+    """Adds an item by Name (canonical display name), and by Item ID (internal ID) if it differs from the name."""
+    if name:
+        cache[name.lower()] = item
+    if item_id and item_id.lower() != (name or "").lower():
+        cache[item_id.lower()] = item
+
+def _overlay_db_items(cache: Dict[str, Dict[str, Any]]):
+    """
+    Adds the rows of the database's items table to the cache. Their sanitized columns (Item_ID) take precedence over
+    the JSON keys (Item ID) in get_any, so refreshed values win while fields only the JSON has are kept.
+    """
+    if not os.path.exists(DB_NAME):
+        return
+    try:
+        conn = sqlite3.connect(f"file:{DB_NAME}?mode=ro", uri=True)
+        try:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM items").fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not read the items table of {DB_NAME} for the item cache: {e}")
+        return
+    for row in rows:
+        row = dict(row)
+        name, item_id = row.get("Name"), row.get("Item_ID")
+        known = cache.get((name or item_id or "").lower())
+        _add_item(cache, {**known, **row} if known else row, name, item_id)
+    logger.info(f"Overlaid {len(rows)} items from the database onto the item cache.")
+
+# Load the item data once when this module is imported
+def _build_items_data_cache() -> Dict[str, Dict[str, Any]]:
+    """Reads items_updated.json, the database's items table and the alias files into a fresh lookup dict."""
+    items_data_cache: Dict[str, Dict[str, Any]] = {}
     # Adjust path to point to items_updated.json in the project root
     items_updated_path = os.path.join(os.path.dirname(__file__), "..", "..", "items_updated.json")
     nwdb_aliases_path = os.path.join(os.path.dirname(__file__), "..", "..", "nwdb_items_cache.json") # Path to aliases
@@ -90,26 +127,24 @@ def _load_items_data_cache(): # Renamed from _load_items_data_cache to _load_all
     # 1. Load main items data from items_updated.json
     if not os.path.exists(items_updated_path):
         logger.error(f"items_updated.json not found at: {items_updated_path}")
-        return # Exit if main data file is missing
-    try:
-        with open(items_updated_path, "r", encoding="utf-8") as f:
-            raw_items = json.load(f)
-            if isinstance(raw_items, list):
-                for item in raw_items:
-                    if not isinstance(item, dict):
-                        continue
-                    # Add by Name (canonical display name)
-                    if item.get("Name"):
-                        items_data_cache[item["Name"].lower()] = item
-                    # Add by Item ID (internal ID) if different from Name and exists
-                    if item.get("Item ID") and item["Item ID"].lower() != item.get("Name", "").lower():
-                        items_data_cache[item["Item ID"].lower()] = item
-            else:
-                logger.error(f"items_updated.json content is not a list: {type(raw_items)}")
-        logger.info(f"Loaded {len(items_data_cache)} items from items_updated.json into cache (initial pass with Name and Item ID).")
-    except Exception as e:
-        logger.error(f"Failed to load items_updated.json for crafting cache: {e}", exc_info=True)
-        return # Exit if main data load fails
+    else:
+        try:
+            with open(items_updated_path, "r", encoding="utf-8") as f:
+                raw_items = json.load(f)
+                if isinstance(raw_items, list):
+                    for item in raw_items:
+                        if isinstance(item, dict):
+                            _add_item(items_data_cache, item, item.get("Name"), item.get("Item ID"))
+                else:
+                    logger.error(f"items_updated.json content is not a list: {type(raw_items)}")
+            logger.info(f"Loaded {len(items_data_cache)} items from items_updated.json into cache (initial pass with Name and Item ID).")
+        except Exception as e:
+            logger.error(f"Failed to load items_updated.json for crafting cache: {e}", exc_info=True)
+
+    # 1b. Overlay the items table: create_db's refresh updates it, items_updated.json only changes when the scraper runs
+    _overlay_db_items(items_data_cache)
+    if not items_data_cache:
+        return items_data_cache # Neither source had any items
 
     # 2. Load and apply aliases from nwdb_items_cache.json
     if os.path.exists(nwdb_aliases_path):
@@ -149,8 +184,23 @@ def _load_items_data_cache(): # Renamed from _load_items_data_cache to _load_all
 
     # Log total items in cache after loading both sources
     logger.info(f"Total {len(items_data_cache)} items (including aliases) in cache for crafting calculations.")
+    return items_data_cache
+
+def _load_items_data_cache():
+    # Swap the contents in place: other modules hold a reference to this dict.
+    # Nothing awaits between clear() and update(), so no command ever sees it empty.
+    new_cache = _build_items_data_cache()
+    items_data_cache.clear()
+    items_data_cache.update(new_cache)
+
+async def reload_items_data_cache(_data_version: Optional[int] = None):
+    """Rebuilds the item cache off the event loop after the game data was refreshed."""
+    new_cache = await asyncio.to_thread(_build_items_data_cache)
+    items_data_cache.clear()
+    items_data_cache.update(new_cache)
 
 _load_items_data_cache() # Call on import
+add_data_version_listener(reload_items_data_cache)
 
 # Helper function to safely get values from item dictionary
 def get_any(item_dict: Dict[str, Any], keys: List[str], default: Any) -> Any:
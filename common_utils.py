@@ -1,9 +1,12 @@
-import re
+import ast
 import math
+import operator
 import logging
 import shutil
 import os
-from typing import Optional, Tuple, List
+from typing import Tuple, List
+
+from utils import perk_scaler
 
 def format_uptime(seconds: float) -> str:
     """Formats a duration in seconds into a human-readable string (Xd Yh Zm Ws)."""
@@ -26,64 +29,35 @@ def format_uptime(seconds: float) -> str:
     
     return " ".join(parts) if parts else "0s"
 
-# TODO: Review the logic of _eval_perk_expression and scale_value_with_gs for correctness and safety.
-def _eval_perk_expression(expr_str: str, gs_multiplier_val: float) -> str:
-    """
-    Safely evaluates a perk expression string after substituting perkMultiplier.
-    Example: expr_str = "0.024 * perkMultiplier", gs_multiplier_val = 1.45 (for GS 725 from base 500)
-    """
-    try:
-        original_expr_for_check = expr_str.strip()
-
-        eval_str = expr_str.replace("{perkMultiplier}", str(gs_multiplier_val))
-        eval_str = eval_str.replace("perkMultiplier", str(gs_multiplier_val))
+CALC_MAX_POWER_BITS = 100_000 # Largest integer power /calculate computes, anything bigger is refused up front
 
-        result = None
+class CalculationError(ValueError):
+    """The expression uses something other than numbers, math constants and functions, and + - * / // % **."""
 
-        if "perkMultiplier" not in original_expr_for_check:
-            try:
-                numeric_value = float(original_expr_for_check)
-                result = numeric_value * gs_multiplier_val
-            except ValueError:
-                pass
+def _power(base: float, exponent: float) -> float:
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        if max(abs(base).bit_length(), 1) * exponent > CALC_MAX_POWER_BITS:
+            raise CalculationError(f"{base} ** {exponent} is too large")
+    return operator.pow(base, exponent)
 
-        if result is None:
-            # Ensure eval is as safe as possible
-            allowed_globals = {"__builtins__": {}}
-            # Consider adding math functions if necessary:
-            # allowed_locals = {"math": math, "abs": abs, "min": min, "max": max, "round": round}
-            allowed_locals = {"abs": abs, "min": min, "max": max, "round": round}
-            result = eval(eval_str, allowed_globals, allowed_locals)
+# perk_scaler's arithmetic with a capped ** and the math module's constants and functions
+_CALC_WHITELIST = perk_scaler.ArithmeticWhitelist(
+    constants={k: v for k, v in math.__dict__.items() if not k.startswith("_") and isinstance(v, float)},
+    functions={k: v for k, v in math.__dict__.items() if not k.startswith("_") and callable(v)},
+    binary_operators={**perk_scaler.BINARY_OPERATORS, ast.Pow: _power},
+    error=CalculationError,
+)
 
-        if isinstance(result, float):
-            # Format floats nicely, remove trailing zeros for whole numbers
-            if result.is_integer():
-                return str(int(result)) 
-            num_decimals = 3 if abs(result) < 1 and abs(result) > 0 else 2
-            formatted_result = f"{result:.{num_decimals}f}".rstrip('0').rstrip('.')
-            return formatted_result if formatted_result != "0" else "0"
-        return str(result)
-    except Exception as e:
-        logging.warning(f"Could not evaluate perk expression '{expr_str}' with multiplier {gs_multiplier_val}: {e}")
-        return f"[EVAL_ERROR: {expr_str}]"
-
-def scale_value_with_gs(base_value: Optional[str], gear_score: int = 725) -> str:
+def evaluate_expression(expression: str) -> str:
     """
-    Scales numeric values within a perk description string based on Gear Score.
-    Replaces placeholders like {[expression * perkMultiplier]} or {[value]} with their calculated/literal values.
+    Evaluates a /calculate expression with the math module's constants and functions, returns the result as text.
+    Raises CalculationError for anything outside the arithmetic whitelist.
+    Runs in the offload pool: an expression like factorial(10**7) can still take any amount of CPU time and memory.
     """
-    if not base_value:
-        return base_value
-
-    base_gs = 500
-    gs_multiplier = gear_score / base_gs
-
-    def replace_match(match):
-        expression_inside_braces = match.group(1)
-        return _eval_perk_expression(expression_inside_braces, gs_multiplier)
+    return str(perk_scaler.compile_arithmetic(expression, _CALC_WHITELIST)(0.0))
 
-    # Regex to find expressions within {[...]}
-    return re.sub(r'\{\[(.*?)\]\}', replace_match, base_value)
+# Perk descriptions are scaled by the compiled, cached templates in utils/perk_scaler.py
+scale_value_with_gs = perk_scaler.scale_value_with_gs
 
 
 async def _cleanup_cache_files_recursive(root_dir: str) -> Tuple[int, int, List[str]]:
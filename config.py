@@ -23,8 +23,12 @@ BOT_MANAGERS_FILE = 'bot_managers.json'
 VERSION_FILE_PATH = 'VERSION' # For local VERSION file, if needed for consistency
 DB_NAME = "new_world_data.db"
 MASTER_SETTINGS_FILE = 'bot_settings.json'
+LOG_WEBHOOKS_FILE = 'log_webhooks.json' # Webhook tokens of the log channels, kept out of git unlike bot_settings.json
 TRACKED_RECIPES_FILE = 'tracked_recipes.json'
 
+# --- Autocomplete ---
+AUTOCOMPLETE_CACHE_TTL = 10 * 60 # Seconds an item/perk/recipe name suggestion is reused, cleared when the game data changes
+
 # --- Update Checker Configuration ---
 GITHUB_REPO_OWNER = "involvex"
 GITHUB_REPO_NAME = "ina-discord-bot" # Removed trailing hyphen
@@ -1,20 +1,102 @@
 # create_db.py
-import pandas as pd
 import sqlite3
 import os
-import requests
 import time # Import time for sleep
-from io import StringIO
+import tempfile
+import hashlib
+import sys
 import csv
 import json # For serializing/deserializing ingredients
 import re # For cleaning up ingredient names
 import logging # Import logging module
+from typing import Dict, Iterable, Iterator, List, Optional
 from config import DB_NAME, ITEMS_CSV_URL, PERKS_SCRAPED_CSV_URL, CRAFTING_RECIPES_CSV_URL, LEGACY_CRAFTING_RECIPES_CSV_URL
 from scrape_items import scrape_nwdb_items, OUTPUT_CSV_FILE as SCRAPED_ITEMS_CSV
+from utils.perk_scaler import PerkTemplate, SCALING_BREAKPOINTS, scale_value_with_gs
+
+try:
+    import resource # Not available on Windows, peak RSS is simply not reported there
+except ImportError:
+    resource = None
 
 ITEMS_CSV_PATH = "items.csv" #https://raw.githubusercontent.com/involvex/ina-discord-bot/refs/heads/beta/items.csv
+PERKS_BUDDY_CSV_PATH = "perks_buddy.csv"
+INSERT_BATCH_SIZE = 1000 # Rows per executemany call
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+PERKS_TABLE_COLUMNS = ['id', 'name', 'description', 'PerkType', 'icon_url', 'ConditionText', 'CompatibleEquipment', 'ExclusiveLabels', 'ExclusiveLabel', 'CraftModItem', 'GeneratedLabel']
+# perks table column -> perks_buddy.csv column. nw-buddy data wins over the scraped data where both have a value.
+BUDDY_OVERRIDE_COLS = {'id': 'Perk ID', 'name': 'Name', 'description': 'Description', 'PerkType': 'Type', 'ConditionText': 'Condition Event', 'CompatibleEquipment': 'Item Class', 'ExclusiveLabels': 'Exclusive Labels', 'ExclusiveLabel': 'Exclusive Labels', 'CraftModItem': 'Craft Mod', 'GeneratedLabel': 'Category', 'icon_url': 'Icon Path'}
+BUDDY_ICON_BASE_URL = "https://cdn.nw-buddy.de/nw-data/live/"
+RECIPES_TABLE_COLUMNS = ['output_item_name', 'station', 'skill', 'skill_level', 'tier', 'ingredients', 'raw_recipe_data']
+PARSED_RECIPES_TABLE_COLUMNS = ['Name', 'Ingredients']
+
+# Bookkeeping for incremental refreshes: a hash per source row (mapped to the rowid it was written to)
+# and a data version that running bots poll to notice new data.
+ROW_HASHES_TABLE = 'source_row_hashes'
+DATA_META_TABLE = 'data_meta'
+# Columns identifying a source row. Repeated keys (e.g. several recipes for one item) get an occurrence suffix.
+TABLE_KEY_COLUMNS = {
+    'items': ('Item_ID', 'Name'),
+    'perks': ('id',),
+    'recipes': ('output_item_name',),
+    'parsed_recipes': ('Name',),
+}
+TABLE_INDEXES = {
+    'items': "CREATE INDEX IF NOT EXISTS idx_items_name_lower ON items (lower(Name))",
+    'perks': "CREATE INDEX IF NOT EXISTS idx_perks_name_lower ON perks (lower(name))",
+    'recipes': "CREATE INDEX IF NOT EXISTS idx_recipes_output_item_name_lower ON recipes (lower(output_item_name))",
+    'parsed_recipes': "CREATE INDEX IF NOT EXISTS idx_parsed_recipes_name_lower ON parsed_recipes (lower(Name))",
+}
+
+# Full-text search (FTS5) over the text columns players actually search in, most important column first.
+# The indexes are external-content tables over the base table's rowid, so the text is not stored twice.
+FTS_COLUMNS = {
+    'items': ('Name', 'Description'),
+    'perks': ('name', 'description', 'ConditionText'),
+}
+
+# Every scaling perk evaluated at SCALING_BREAKPOINTS, so /perk can show exact values without evaluating
+# the description's formulas. One row per perk and gear score holding a JSON array of placeholder values.
+PERK_SCALING_TABLE = 'perk_scaling'
+
+
+class BuildReport:
+    """Collects per-phase timings and row counts of a database build."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[tuple] = []
+
+    def add(self, phase: str, rows: int, started: float):
+        elapsed = time.perf_counter() - started
+        self.phases.append((phase, rows, elapsed))
+        logging.info(f"{phase}: {rows} rows in {elapsed:.2f}s")
+
+    def summary(self) -> str:
+        total = time.perf_counter() - self.started
+        phases = ", ".join(f"{phase} {rows} rows/{elapsed:.2f}s" for phase, rows, elapsed in self.phases)
+        rss = peak_rss_mb()
+        rss_text = f", peak RSS {rss:.1f} MB" if rss is not None else ""
+        return f"Database build took {total:.2f}s ({phases}){rss_text}"
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None where the platform can't tell us."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return max_rss / (1024 * 1024) if os.uname().sysname == "Darwin" else max_rss / 1024
+
+
+def sanitize_column_name(col: str) -> str:
+    return col.replace(' ', '_').replace('(', '').replace(')', '').replace('%', 'percent')
+
 
 def fetch_csv_data(url, retries=3, retry_delay=5, post_fetch_delay=1, save_path=None):
+    import requests # Only needed when downloading, keeps `import create_db` light
+
     logging.info(f"Fetching CSV from {url}...")
     for i in range(retries):
         try:
@@ -37,87 +119,490 @@ def fetch_csv_data(url, retries=3, retry_delay=5, post_fetch_delay=1, save_path=
                 return None
     return None # Should not be reached, but for clarity
 
-def fetch_and_parse_crafting_recipes(url: str, retries=3, retry_delay=0.5, post_fetch_delay=1):
-    logging.info(f"Fetching crafting recipes from {url}...")
-    csv_data = fetch_csv_data(url, retries=retries, retry_delay=retry_delay, post_fetch_delay=post_fetch_delay)
-    if not csv_data:
-        logging.error("Failed to fetch crafting recipe CSV data.")
-        return []
-
-    recipes_for_db = []
-    reader = csv.DictReader(StringIO(csv_data))
-    for row in reader:
-        output_item_name = row.get("Name")
-        if not output_item_name:
-            continue
+def download_csv(url: str, dest_path: str, retries=3, retry_delay=5, post_fetch_delay=1) -> bool:
+    """
+    Streams a CSV from url to dest_path in chunks so the file never has to sit in memory.
+    Returns True on success.
+    """
+    import requests # Only needed when downloading, keeps `import create_db` light
 
-        ingredients = []
-        for i in range(1, 8):
-            ing_name = row.get(f"Ingredient{i}")
-            ing_qty_str = row.get(f"Qty{i}")
-            if ing_name and ing_qty_str:
-                try:
-                    ing_qty = int(ing_qty_str)
-                    if ing_qty > 0:
-                        ingredients.append({"item": ing_name, "quantity": ing_qty})
-                except (ValueError, TypeError):
-                    continue
-
-        recipes_for_db.append({
-            'output_item_name': output_item_name,
-            'station': row.get('CraftingStation'),
-            'skill': row.get('Tradeskill'),
-            'skill_level': row.get('Level'),
-            'tier': row.get('Tier'),
-            'ingredients': json.dumps(ingredients),
-            'raw_recipe_data': json.dumps(row) # Store the whole row for full context
-        })
-    return recipes_for_db
-
-def populate_parsed_recipes_table(conn):
-    """
-    Populates the 'parsed_recipes' table from a legacy CSV URL.
-    This function is designed to handle CSVs with 'Name', 'IngredientX', and 'QtyX' columns.
-    """
-    logging.info(f"Populating 'parsed_recipes' table from {LEGACY_CRAFTING_RECIPES_CSV_URL}...")
-    legacy_recipes_csv_data = fetch_csv_data(LEGACY_CRAFTING_RECIPES_CSV_URL, post_fetch_delay=1)
-    if not legacy_recipes_csv_data:
-        logging.warning("Failed to fetch legacy crafting recipe CSV data. 'parsed_recipes' table will not be created or populated.")
-        return
+    logging.info(f"Downloading CSV from {url} to {dest_path}...")
+    for i in range(retries):
+        try:
+            with requests.get(url, timeout=15, stream=True) as response:
+                response.raise_for_status()  # Raise an exception for HTTP errors
+                with open(dest_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            if post_fetch_delay > 0:
+                time.sleep(post_fetch_delay) # Delay after successful fetch
+            return True
+        except (requests.RequestException, OSError) as e:
+            logging.error(f"Error downloading CSV from {url}: {e}")
+            if i < retries - 1:
+                logging.warning(f"Retrying in {retry_delay} seconds... (Attempt {i + 2}/{retries})")
+                time.sleep(retry_delay)
+            else:
+                logging.error(f"Failed to download CSV from {url} after {retries} attempts.")
+    return False
+
+def iter_csv_rows(path: str, sanitize_columns: bool = False) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Yields the rows of a CSV file one at a time. Empty cells become None (NULL in SQLite).
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        columns = unique_columns([sanitize_column_name(col) for col in header] if sanitize_columns else header)
+        for values in reader:
+            if not values:
+                continue
+            yield {col: (value if value != '' else None) for col, value in zip(columns, values)}
 
-    parsed_recipes_for_db = []
-    reader = csv.DictReader(StringIO(legacy_recipes_csv_data))
-    for row in reader:
-        output_item_name = row.get("Name")
-        if not output_item_name:
+def read_csv_header(path: str, sanitize_columns: bool = False) -> List[str]:
+    with open(path, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f), [])
+    return unique_columns([sanitize_column_name(col) for col in header] if sanitize_columns else header)
+
+def unique_columns(columns: List[str]) -> List[str]:
+    """SQLite refuses duplicate column names, so repeated headers get a numeric suffix."""
+    seen = {}
+    result = []
+    for col in columns:
+        if col.lower() in seen:
+            seen[col.lower()] += 1
+            col = f"{col}_{seen[col.lower()]}"
+        seen.setdefault(col.lower(), 0)
+        result.append(col)
+    return result
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+def create_table(conn: sqlite3.Connection, table: str, columns: List[str]):
+    conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+    conn.execute(f"CREATE TABLE {_quote(table)} ({', '.join(f'{_quote(col)} TEXT' for col in columns)})")
+
+def fts_table_name(table: str) -> str:
+    return f"{table}_fts"
+
+def build_fts_index(conn: sqlite3.Connection, table: str) -> bool:
+    """
+    (Re)creates the FTS5 index of a table from its current contents.
+    The index keeps its own copy of the text with perk placeholders scaled to the default gear score, so
+    snippets show values rather than formulas the highlight markers could land in.
+    Returns False if this SQLite build has no FTS5, the bot then falls back to LIKE searches.
+    """
+    existing_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+    fts_columns = [col for col in FTS_COLUMNS[table] if col in existing_columns]
+    fts_table = fts_table_name(table)
+    conn.execute(f"DROP TABLE IF EXISTS {_quote(fts_table)}")
+    if not fts_columns:
+        logging.warning(f"Table '{table}' has none of the full-text search columns {FTS_COLUMNS[table]}. No search index built.")
+        return False
+    try:
+        conn.execute(
+            f"CREATE VIRTUAL TABLE {_quote(fts_table)} USING fts5("
+            f"{', '.join(_quote(col) for col in fts_columns)}, tokenize='unicode61 remove_diacritics 2')"
+        )
+    except sqlite3.OperationalError as e:
+        logging.warning(f"Could not create full-text search index for '{table}' (FTS5 unavailable?): {e}")
+        return False
+    conn.create_function("scale_value_with_gs", 1, scale_value_with_gs, deterministic=True)
+    conn.execute(
+        f"INSERT INTO {_quote(fts_table)} (rowid, {', '.join(_quote(col) for col in fts_columns)}) "
+        f"SELECT rowid, {', '.join(f'scale_value_with_gs({_quote(col)})' for col in fts_columns)} FROM {_quote(table)}"
+    )
+    return True
+
+def build_perk_scaling_table(conn: sqlite3.Connection) -> int:
+    """
+    (Re)creates the precomputed perk scaling table from the current perks table.
+    Returns the number of perks that scale with gear score.
+    """
+    conn.execute(f"DROP TABLE IF EXISTS {PERK_SCALING_TABLE}")
+    conn.execute(
+        f"CREATE TABLE {PERK_SCALING_TABLE} (perk_id TEXT NOT NULL, gear_score INTEGER NOT NULL, "
+        "scaled_values TEXT NOT NULL, PRIMARY KEY (perk_id, gear_score)) WITHOUT ROWID"
+    )
+    sql = f"INSERT OR REPLACE INTO {PERK_SCALING_TABLE} (perk_id, gear_score, scaled_values) VALUES (?, ?, ?)"
+    templates: Dict[str, PerkTemplate] = {} # Many perks share a description (e.g. per tier), compile each once
+    batch = []
+    count = 0
+    for perk_id, description in conn.execute("SELECT id, description FROM perks WHERE id IS NOT NULL AND description IS NOT NULL"):
+        template = templates.get(description)
+        if template is None:
+            template = templates[description] = PerkTemplate(description)
+        if not template.has_scaling:
             continue
+        count += 1
+        batch.extend((perk_id, gear_score, json.dumps(template.evaluate(gear_score))) for gear_score in SCALING_BREAKPOINTS)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            conn.executemany(sql, batch)
+            batch.clear()
+    conn.executemany(sql, batch)
+    return count
 
-        ingredients = []
-        # Assuming the legacy CSV has IngredientX and QtyX columns, similar to CRAFTING_RECIPES_CSV_URL
-        for i in range(1, 8): # Assuming up to 7 ingredients
-            ing_name = row.get(f"Ingredient{i}")
-            ing_qty_str = row.get(f"Qty{i}")
-            if ing_name and ing_qty_str:
-                try:
-                    ing_qty = int(ing_qty_str)
-                    if ing_qty > 0:
-                        ingredients.append({"item": ing_name, "quantity": ing_qty}) # Use 'quantity' for consistency
-                except (ValueError, TypeError):
-                    continue
-
-        parsed_recipes_for_db.append({
-            'Name': output_item_name, # Use 'Name' as expected by recipes.py fallback
-            'Ingredients': json.dumps(ingredients) # Store ingredients as JSON string
-        })
-
-    if parsed_recipes_for_db:
-        parsed_recipes_df = pd.DataFrame(parsed_recipes_for_db)
-        parsed_recipes_df.to_sql('parsed_recipes', conn, if_exists="replace", index=False)
-        cursor = conn.cursor() # Get cursor to create index
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_parsed_recipes_name_lower ON parsed_recipes (lower(Name))")
-        logging.info(f"Successfully loaded {len(parsed_recipes_df)} recipes into 'parsed_recipes' table.")
+def hash_row(row: Dict, columns: List[str]) -> str:
+    return hashlib.blake2b(json.dumps([row.get(col) for col in columns]).encode('utf-8'), digest_size=16).hexdigest()
+
+def iter_keyed_rows(rows: Iterable[Dict], key_columns: Iterable[str]) -> Iterator[tuple]:
+    """Yields (source_key, row) pairs. The key is the first non-empty key column plus an occurrence counter."""
+    occurrences: Dict[str, int] = {}
+    for row in rows:
+        base_key = next((str(row[col]) for col in key_columns if row.get(col) is not None), '')
+        occurrence = occurrences.get(base_key, 0)
+        occurrences[base_key] = occurrence + 1
+        yield f"{base_key}#{occurrence}", row
+
+def create_meta_tables(conn: sqlite3.Connection):
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {ROW_HASHES_TABLE} (tbl TEXT NOT NULL, row_key TEXT NOT NULL, row_hash TEXT NOT NULL, row_id INTEGER NOT NULL, PRIMARY KEY (tbl, row_key))")
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {DATA_META_TABLE} (key TEXT PRIMARY KEY, value TEXT)")
+
+def get_data_version(conn: sqlite3.Connection) -> int:
+    try:
+        row = conn.execute(f"SELECT value FROM {DATA_META_TABLE} WHERE key = 'data_version'").fetchone()
+    except sqlite3.OperationalError: # Databases built before versioning existed
+        return 0
+    return int(row[0]) if row else 0
+
+def set_data_version(conn: sqlite3.Connection, version: int):
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {DATA_META_TABLE} (key, value) VALUES (?, ?)",
+        [('data_version', str(version)), ('updated_at', str(int(time.time())))]
+    )
+
+def read_data_version(db_path: str) -> int:
+    """Data version of an existing database file, 0 if there is none."""
+    if not os.path.exists(db_path):
+        return 0
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            return get_data_version(conn)
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return 0
+
+def insert_rows(conn: sqlite3.Connection, table: str, columns: List[str], rows: Iterable[Dict], batch_size: int = INSERT_BATCH_SIZE, key_columns: Optional[Iterable[str]] = None) -> int:
+    """
+    Inserts rows with executemany in fixed-size batches, so only one batch is ever held in memory.
+    With key_columns, each row's hash is recorded in the row hashes table for later incremental refreshes.
+    Returns the number of rows inserted.
+    """
+    sql = f"INSERT INTO {_quote(table)} ({', '.join(_quote(col) for col in columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    hash_sql = f"INSERT OR REPLACE INTO {ROW_HASHES_TABLE} (tbl, row_key, row_hash, row_id) VALUES (?, ?, ?, ?)"
+    # Appending to a table without an INTEGER PRIMARY KEY hands out rowids max(rowid)+1, +2, ...
+    next_row_id = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {_quote(table)}").fetchone()[0] + 1
+    keyed_rows = iter_keyed_rows(rows, key_columns) if key_columns else ((None, row) for row in rows)
+    batch = []
+    hash_batch = []
+    count = 0
+    for row_key, row in keyed_rows:
+        batch.append(tuple(row.get(col) for col in columns))
+        if row_key is not None:
+            hash_batch.append((table, row_key, hash_row(row, columns), next_row_id + count + len(batch) - 1))
+        if len(batch) >= batch_size:
+            conn.executemany(sql, batch)
+            conn.executemany(hash_sql, hash_batch)
+            count += len(batch)
+            batch.clear()
+            hash_batch.clear()
+    if batch:
+        conn.executemany(sql, batch)
+        conn.executemany(hash_sql, hash_batch)
+        count += len(batch)
+    return count
+
+def sync_table(conn: sqlite3.Connection, table: str, columns: List[str], rows: Iterable[Dict], key_columns: Iterable[str]) -> Dict[str, int]:
+    """
+    Brings an existing table in line with its source rows: new rows are inserted, rows whose hash
+    changed are updated in place, rows no longer in the source are deleted, everything else is left alone.
+    Returns counts of inserted/updated/deleted/unchanged rows.
+    """
+    stats = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    table_exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    if not table_exists:
+        create_table(conn, table, columns)
+        stats['inserted'] = insert_rows(conn, table, columns, rows, key_columns=key_columns)
+        return stats
+
+    existing_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+    for col in columns:
+        if col not in existing_columns: # The source gained a column
+            conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(col)} TEXT")
+
+    known = {row_key: (row_hash, row_id) for row_key, row_hash, row_id in conn.execute(
+        f"SELECT row_key, row_hash, row_id FROM {ROW_HASHES_TABLE} WHERE tbl = ?", (table,)
+    )}
+    if not known:
+        # Built before row hashes existed, so we can't diff. Replace the contents; readers keep
+        # seeing the old rows until the surrounding transaction commits.
+        stats['deleted'] = conn.execute(f"DELETE FROM {_quote(table)}").rowcount
+        stats['inserted'] = insert_rows(conn, table, columns, rows, key_columns=key_columns)
+        return stats
+
+    insert_sql = f"INSERT INTO {_quote(table)} ({', '.join(_quote(col) for col in columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    update_sql = f"UPDATE {_quote(table)} SET {', '.join(f'{_quote(col)} = ?' for col in columns)} WHERE rowid = ?"
+    hash_sql = f"INSERT OR REPLACE INTO {ROW_HASHES_TABLE} (tbl, row_key, row_hash, row_id) VALUES (?, ?, ?, ?)"
+    seen = set()
+    for row_key, row in iter_keyed_rows(rows, key_columns):
+        seen.add(row_key)
+        row_hash = hash_row(row, columns)
+        values = tuple(row.get(col) for col in columns)
+        previous = known.get(row_key)
+        if previous is None:
+            row_id = conn.execute(insert_sql, values).lastrowid
+            conn.execute(hash_sql, (table, row_key, row_hash, row_id))
+            stats['inserted'] += 1
+        elif previous[0] != row_hash:
+            conn.execute(update_sql, (*values, previous[1]))
+            conn.execute(hash_sql, (table, row_key, row_hash, previous[1]))
+            stats['updated'] += 1
+        else:
+            stats['unchanged'] += 1
+
+    removed = [(row_key, row_id) for row_key, (_, row_id) in known.items() if row_key not in seen]
+    conn.executemany(f"DELETE FROM {_quote(table)} WHERE rowid = ?", [(row_id,) for _, row_id in removed])
+    conn.executemany(f"DELETE FROM {ROW_HASHES_TABLE} WHERE tbl = ? AND row_key = ?", [(table, row_key) for row_key, _ in removed])
+    stats['deleted'] = len(removed)
+    return stats
+
+def _parse_ingredients(row: Dict[str, Optional[str]]) -> List[Dict]:
+    ingredients = []
+    for i in range(1, 8): # Assuming up to 7 ingredients
+        ing_name = row.get(f"Ingredient{i}")
+        ing_qty_str = row.get(f"Qty{i}")
+        if ing_name and ing_qty_str:
+            try:
+                ing_qty = int(ing_qty_str)
+                if ing_qty > 0:
+                    ingredients.append({"item": ing_name, "quantity": ing_qty}) # Use 'quantity' for consistency
+            except (ValueError, TypeError):
+                continue
+    return ingredients
+
+def iter_crafting_recipes(path: str) -> Iterator[Dict]:
+    """Normalizes the crafting recipes CSV into rows of the 'recipes' table."""
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            output_item_name = row.get("Name")
+            if not output_item_name:
+                continue
+            yield {
+                'output_item_name': output_item_name,
+                'station': row.get('CraftingStation') or None,
+                'skill': row.get('Tradeskill') or None,
+                'skill_level': row.get('Level') or None,
+                'tier': row.get('Tier') or None,
+                'ingredients': json.dumps(_parse_ingredients(row)),
+                'raw_recipe_data': json.dumps(row) # Store the whole row for full context
+            }
+
+def iter_parsed_recipes(path: str) -> Iterator[Dict]:
+    """
+    Normalizes a legacy recipes CSV into rows of the 'parsed_recipes' table.
+    This handles CSVs with 'Name', 'IngredientX', and 'QtyX' columns.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            output_item_name = row.get("Name")
+            if not output_item_name:
+                continue
+            yield {
+                'Name': output_item_name, # Use 'Name' as expected by recipes.py fallback
+                'Ingredients': json.dumps(_parse_ingredients(row)) # Store ingredients as JSON string
+            }
+
+def _buddy_perk_row(buddy_row: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    perk = {db_col: buddy_row.get(buddy_col) for db_col, buddy_col in BUDDY_OVERRIDE_COLS.items() if buddy_col in buddy_row}
+    icon_path = perk.get('icon_url')
+    if icon_path and not icon_path.startswith('http'):
+        perk['icon_url'] = BUDDY_ICON_BASE_URL + icon_path
+    return perk
+
+def perks_table_columns(scraped_perks_csv: Optional[str]) -> List[str]:
+    columns = list(PERKS_TABLE_COLUMNS)
+    if scraped_perks_csv:
+        columns += [col for col in read_csv_header(scraped_perks_csv, sanitize_columns=True) if col not in columns]
+    return columns
+
+def iter_merged_perks(scraped_perks_csv: Optional[str], perks_buddy_csv: Optional[str]) -> Iterator[Dict]:
+    """
+    Merges the scraped perks CSV and perks_buddy.csv by perk id.
+    nw-buddy values take precedence, scraped values fill the gaps, perks only present in one source are kept.
+    Only the (small) scraped perks file is indexed in memory; perks_buddy.csv is streamed.
+    """
+    scraped_by_id: Dict[str, Dict] = {}
+    if scraped_perks_csv:
+        for row in iter_csv_rows(scraped_perks_csv, sanitize_columns=True):
+            if row.get('id') is not None:
+                scraped_by_id.setdefault(row['id'], row)
+
+    seen_ids = set()
+    if perks_buddy_csv:
+        for buddy_row in iter_csv_rows(perks_buddy_csv):
+            perk = _buddy_perk_row(buddy_row)
+            perk_id = perk.get('id')
+            if perk_id is None or perk_id in seen_ids:
+                continue
+            seen_ids.add(perk_id)
+            scraped = scraped_by_id.get(perk_id, {})
+            merged = dict(scraped)
+            merged.update({col: value for col, value in perk.items() if value is not None})
+            yield merged
+
+    for perk_id, scraped in scraped_by_id.items():
+        if perk_id not in seen_ids:
+            yield scraped
+
+def table_sources(
+    items_csv: Optional[str] = None,
+    scraped_perks_csv: Optional[str] = None,
+    perks_buddy_csv: Optional[str] = None,
+    recipes_csv: Optional[str] = None,
+    legacy_recipes_csv: Optional[str] = None,
+) -> List[tuple]:
+    """
+    (table, columns, rows) for every game data table. columns/rows are None when the table has no source.
+    Rows are lazy iterators, nothing is read until the table is written.
+    """
+    sources = []
+    if items_csv:
+        sources.append(('items', read_csv_header(items_csv, sanitize_columns=True), iter_csv_rows(items_csv, sanitize_columns=True)))
+    else:
+        sources.append(('items', None, None))
+    if scraped_perks_csv or perks_buddy_csv:
+        sources.append(('perks', perks_table_columns(scraped_perks_csv), iter_merged_perks(scraped_perks_csv, perks_buddy_csv)))
     else:
-        logging.warning("No recipes found in legacy CSV for 'parsed_recipes' table.")
+        sources.append(('perks', None, None))
+    sources.append(('recipes', RECIPES_TABLE_COLUMNS, iter_crafting_recipes(recipes_csv)) if recipes_csv else ('recipes', None, None))
+    sources.append(('parsed_recipes', PARSED_RECIPES_TABLE_COLUMNS, iter_parsed_recipes(legacy_recipes_csv)) if legacy_recipes_csv else ('parsed_recipes', None, None))
+    return sources
+
+def build_database(
+    db_path: str,
+    items_csv: Optional[str] = None,
+    scraped_perks_csv: Optional[str] = None,
+    perks_buddy_csv: Optional[str] = None,
+    recipes_csv: Optional[str] = None,
+    legacy_recipes_csv: Optional[str] = None,
+    report: Optional[BuildReport] = None,
+    data_version: int = 1,
+):
+    """
+    Builds all tables into db_path from local CSV files in a single transaction.
+    Sources that are None are skipped (their table is not created).
+    Journaling and fsync are switched off, as a failed build is simply thrown away.
+    """
+    report = report or BuildReport()
+    conn = sqlite3.connect(db_path, isolation_level=None) # We manage the transaction ourselves
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("BEGIN")
+        create_meta_tables(conn)
+
+        for table, columns, rows in table_sources(items_csv, scraped_perks_csv, perks_buddy_csv, recipes_csv, legacy_recipes_csv):
+            if columns is None:
+                logging.error(f"No source data available for '{table}'. The table will not be created.")
+                continue
+            started = time.perf_counter()
+            create_table(conn, table, columns)
+            count = insert_rows(conn, table, columns, rows, key_columns=TABLE_KEY_COLUMNS[table])
+            conn.execute(TABLE_INDEXES[table])
+            if table in FTS_COLUMNS:
+                build_fts_index(conn, table)
+            if table == 'perks':
+                logging.info(f"Precomputed scaling values of {build_perk_scaling_table(conn)} perks.")
+            report.add(table, count, started)
+
+        set_data_version(conn, data_version)
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return report
+
+def refresh_database(
+    db_path: str,
+    items_csv: Optional[str] = None,
+    scraped_perks_csv: Optional[str] = None,
+    perks_buddy_csv: Optional[str] = None,
+    recipes_csv: Optional[str] = None,
+    legacy_recipes_csv: Optional[str] = None,
+    report: Optional[BuildReport] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Differentially refreshes an existing database in place.
+    All changes happen in one transaction on a WAL database, so the bot keeps reading the previous
+    data until the commit and never sees a partially refreshed or empty table.
+    Tables without a source this time are left untouched. The data version is bumped if anything changed.
+    Returns per-table inserted/updated/deleted/unchanged counts.
+    """
+    report = report or BuildReport()
+    results = {}
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL") # Readers are never blocked by the writer
+        conn.execute("BEGIN IMMEDIATE")
+        create_meta_tables(conn)
+
+        for table, columns, rows in table_sources(items_csv, scraped_perks_csv, perks_buddy_csv, recipes_csv, legacy_recipes_csv):
+            if columns is None:
+                logging.warning(f"No source data available for '{table}'. Keeping the current table as is.")
+                continue
+            started = time.perf_counter()
+            stats = sync_table(conn, table, columns, rows, TABLE_KEY_COLUMNS[table])
+            conn.execute(TABLE_INDEXES[table])
+            # Rebuilding the external-content index after the sync is cheap and keeps it exact without per-row triggers
+            changed = stats['inserted'] or stats['updated'] or stats['deleted']
+            if table in FTS_COLUMNS and (changed or not _table_exists(conn, fts_table_name(table))):
+                build_fts_index(conn, table)
+            if table == 'perks' and (changed or not _table_exists(conn, PERK_SCALING_TABLE)):
+                logging.info(f"Precomputed scaling values of {build_perk_scaling_table(conn)} perks.")
+            results[table] = stats
+            report.add(f"{table} (+{stats['inserted']} ~{stats['updated']} -{stats['deleted']})", sum(stats.values()), started)
+
+        if any(stats['inserted'] or stats['updated'] or stats['deleted'] for stats in results.values()):
+            new_version = get_data_version(conn) + 1
+            set_data_version(conn, new_version)
+            logging.info(f"Game data changed, data version is now {new_version}.")
+        else:
+            logging.info("Game data unchanged, data version kept.")
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return results
+
+def download_sources(download_dir: str, report: BuildReport) -> Dict[str, Optional[str]]:
+    """Downloads every remote CSV source. Keys match the build_database/refresh_database arguments."""
+    started = time.perf_counter()
+    # items.csv is kept next to the DB for debugging, cleanup_items_csv() removes it
+    sources = {'items_csv': ITEMS_CSV_PATH if download_csv(ITEMS_CSV_URL, ITEMS_CSV_PATH) else None}
+    for name, url, retry_delay in (
+        ('scraped_perks_csv', PERKS_SCRAPED_CSV_URL, 5),
+        ('recipes_csv', CRAFTING_RECIPES_CSV_URL, 0.5),
+        ('legacy_recipes_csv', LEGACY_CRAFTING_RECIPES_CSV_URL, 5),
+    ):
+        path = os.path.join(download_dir, f"{name}.csv")
+        sources[name] = path if download_csv(url, path, retry_delay=retry_delay) else None
+    sources['perks_buddy_csv'] = PERKS_BUDDY_CSV_PATH if os.path.exists(PERKS_BUDDY_CSV_PATH) else None
+    report.add("download", sum(1 for path in sources.values() if path), started)
+    return sources
 
 def cleanup_items_csv():
     if os.path.exists(ITEMS_CSV_PATH):
@@ -132,108 +617,83 @@ def populate_db():
     This prevents a corrupted/empty database from being used by the bot.
     """
     temp_db_name = f"{DB_NAME}.tmp"
-    conn = None
+    report = BuildReport()
 
     # Clean up old temp file if it exists from a previous failed run
     if os.path.exists(temp_db_name):
         os.remove(temp_db_name)
 
     try:
-        conn = sqlite3.connect(temp_db_name)
-        logging.info(f"Connecting to and populating temporary database: {temp_db_name}")
-        cursor = conn.cursor()
-
-        # --- Populate items table from GitHub CSV ---
-        logging.info(f"Fetching comprehensive item data from {ITEMS_CSV_URL}...") # Added post_fetch_delay
-        items_csv_data = fetch_csv_data(ITEMS_CSV_URL, save_path=ITEMS_CSV_PATH, post_fetch_delay=1)
-        if items_csv_data:
-            try:
-                # Use the locally saved file from fetch_csv_data
-                items_df = pd.read_csv(ITEMS_CSV_PATH, low_memory=False, encoding='utf-8')
-                items_df.columns = [col.replace(' ', '_').replace('(', '').replace(')', '').replace('%', 'percent') for col in items_df.columns]
-                items_df.to_sql('items', conn, if_exists="replace", index=False)
-                logging.info("Successfully loaded data into 'items' table.")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_name_lower ON items (lower(Name))")
-            except Exception as e:
-                logging.error(f"Error processing or loading items data from {ITEMS_CSV_PATH}: {e}", exc_info=True)
-        else:
-            logging.error(f"Failed to fetch item data from the URL. 'items' table will be empty.")
-
-        # --- Populate perks table ---
-        df_perks_final = pd.DataFrame()  # This will be the final DataFrame for the 'perks' table # Added post_fetch_delay
-        scraped_perks_data = fetch_csv_data(PERKS_SCRAPED_CSV_URL, post_fetch_delay=1)
-        if scraped_perks_data:
-            try:
-                df_scraped_perks = pd.read_csv(StringIO(scraped_perks_data), low_memory=False)
-                df_scraped_perks.columns = [col.replace(' ', '_').replace('(', '').replace(')', '').replace('%', 'percent') for col in df_scraped_perks.columns]
-                df_perks_final = df_scraped_perks.copy()
-            except Exception as e:
-                logging.error(f"Error processing scraped perks data from {PERKS_SCRAPED_CSV_URL}: {e}", exc_info=True)
-
-        perks_buddy_csv_path = "perks_buddy.csv"
-        if os.path.exists(perks_buddy_csv_path):
-            try:
-                df_perks_buddy = pd.read_csv(perks_buddy_csv_path, low_memory=False)
-                if 'Icon Path' in df_perks_buddy.columns:
-                    df_perks_buddy['icon_url_from_buddy'] = "https://cdn.nw-buddy.de/nw-data/live/" + df_perks_buddy['Icon Path'].astype(str)
-                else:
-                    df_perks_buddy['icon_url_from_buddy'] = ''
-                buddy_override_cols = {'id': 'Perk ID', 'name': 'Name', 'description': 'Description', 'PerkType': 'Type', 'ConditionText': 'Condition Event', 'CompatibleEquipment': 'Item Class', 'ExclusiveLabels': 'Exclusive Labels', 'ExclusiveLabel': 'Exclusive Labels', 'CraftModItem': 'Craft Mod', 'GeneratedLabel': 'Category', 'icon_url': 'icon_url_from_buddy'}
-                df_buddy_processed = pd.DataFrame()
-                for db_col, buddy_col in buddy_override_cols.items():
-                    if buddy_col in df_perks_buddy.columns:
-                        df_buddy_processed[db_col] = df_perks_buddy[buddy_col]
-                if df_perks_final.empty and not df_buddy_processed.empty:
-                    df_perks_final = df_buddy_processed.copy()
-                elif not df_perks_final.empty and not df_buddy_processed.empty:
-                    df_perks_final = df_buddy_processed.set_index('id').combine_first(df_perks_final.set_index('id')).reset_index()
-            except Exception as e:
-                logging.error(f"Error processing {perks_buddy_csv_path} for table 'perks': {e}", exc_info=True)
-
-        target_db_cols = ['id', 'name', 'description', 'PerkType', 'icon_url', 'ConditionText', 'CompatibleEquipment', 'ExclusiveLabels', 'ExclusiveLabel', 'CraftModItem', 'GeneratedLabel']
-        for col in target_db_cols:
-            if col not in df_perks_final.columns:
-                df_perks_final[col] = None
-        if not df_perks_final.empty:
-            df_perks_final.to_sql("perks", conn, if_exists="replace", index=False)
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_perks_name_lower ON perks (lower(name))")
-            logging.info(f"Successfully loaded combined data into 'perks' table.")
-
-        # --- Populate recipes table from GitHub CSV ---
-        recipes_data_for_db = fetch_and_parse_crafting_recipes(CRAFTING_RECIPES_CSV_URL, post_fetch_delay=1)
-        if recipes_data_for_db:
-            recipes_df = pd.DataFrame(recipes_data_for_db)
-            recipes_df.to_sql('recipes', conn, if_exists='replace', index=False)
-            logging.info(f"Successfully added {len(recipes_df)} recipes to the 'recipes' table from GitHub CSV.")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_recipes_output_item_name_lower ON recipes (lower(output_item_name))")
-        else:
-            logging.warning("No recipes loaded from GitHub CSV. 'recipes' table might be empty.")
-
-        # --- Populate parsed_recipes table from legacy CSV ---
-        populate_parsed_recipes_table(conn)
-
+        with tempfile.TemporaryDirectory(prefix="nw_db_build_") as download_dir:
+            sources = download_sources(download_dir, report)
+            logging.info(f"Connecting to and populating temporary database: {temp_db_name}")
+            build_database(temp_db_name, report=report, data_version=read_data_version(DB_NAME) + 1, **sources)
         logging.info("All tables created and indexed in temporary database.")
-
     except Exception as e:
         logging.error(f"A critical error occurred during database population: {e}", exc_info=True)
-        if conn:
-            conn.close()
         if os.path.exists(temp_db_name):
             os.remove(temp_db_name)
             logging.info(f"Removed failed temporary database: {temp_db_name}")
         raise  # Re-raise the exception so the caller in main.py knows it failed.
     else:
-        # This block runs only if the try block completes without exceptions
-        if conn:
-            conn.close()
-        # Atomically replace the old DB with the new one
-        if os.path.exists(DB_NAME):
-            os.remove(DB_NAME)
-        os.rename(temp_db_name, DB_NAME)
+        _leave_wal_mode(DB_NAME)
+        # Atomically replace the old DB with the new one; readers see either the old or the new file
+        os.replace(temp_db_name, DB_NAME)
+        _remove_wal_files(DB_NAME)
         logging.info(f"Successfully replaced '{DB_NAME}' with newly populated database.")
+        logging.info(report.summary())
     finally:
         logging.info("Database population process finished.")
 
+def _leave_wal_mode(db_path: str):
+    """
+    A refreshed database runs in WAL mode. Its -wal file must be folded back in before the
+    file is swapped out, or the new database would be opened together with the old log.
+    """
+    if not os.path.exists(db_path):
+        return
+    try:
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        logging.warning(f"Could not switch '{db_path}' out of WAL mode before replacing it: {e}")
+
+def _remove_wal_files(db_path: str):
+    """
+    Removes the -wal/-shm files of the replaced database. With connections still open the switch out of
+    WAL mode fails, and the new database must not be opened together with the old log.
+    """
+    for suffix in ("-wal", "-shm"):
+        try:
+            os.remove(db_path + suffix)
+            logging.info(f"Removed leftover '{db_path}{suffix}' of the replaced database.")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Could not remove leftover '{db_path}{suffix}': {e}")
+
+def refresh_db():
+    """
+    Refreshes the live database in place with only the rows that changed upstream.
+    Falls back to a full build if there is no database yet.
+    """
+    if not os.path.exists(DB_NAME):
+        logging.info(f"Database '{DB_NAME}' not found, doing a full build instead of a refresh.")
+        return populate_db()
+
+    report = BuildReport()
+    with tempfile.TemporaryDirectory(prefix="nw_db_refresh_") as download_dir:
+        sources = download_sources(download_dir, report)
+        refresh_database(DB_NAME, report=report, **sources)
+    logging.info(report.summary())
+
 if __name__ == "__main__":
-    populate_db()
-    cleanup_items_csv()
\ No newline at end of file
+    if "--refresh" in sys.argv:
+        refresh_db()
+    else:
+        populate_db()
+    cleanup_items_csv()
@@ -4,10 +4,118 @@ import logging
 import random
 import time
 import platform
+import re
 import asyncio
+import inspect
+import functools
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import aiosqlite # Use the async library
 from config import DB_NAME # Import DB_NAME
 
+DATA_VERSION_POLL_INTERVAL = 60 # Seconds between checks for a refreshed database
+
+# create_db.py bumps data_meta.data_version whenever a build or refresh changes the game data.
+_data_version: Optional[int] = None
+_data_version_listeners: List[Callable] = []
+
+def add_data_version_listener(callback: Callable):
+    """
+    Registers callback(new_version) to run when the game data changes underneath the running bot,
+    e.g. to drop in-memory caches. The callback may be a plain function or a coroutine function.
+    """
+    _data_version_listeners.append(callback)
+
+async def get_data_version() -> int:
+    """Returns the data version of the database, 0 if it is missing or predates versioning."""
+    if not os.path.exists(DB_NAME):
+        return 0
+    try:
+        async with aiosqlite.connect(DB_NAME) as conn:
+            async with conn.execute("SELECT value FROM data_meta WHERE key = 'data_version'") as cursor:
+                row = await cursor.fetchone()
+        return int(row[0]) if row else 0
+    except aiosqlite.Error:
+        return 0
+
+async def check_data_version() -> bool:
+    """
+    Compares the database's data version with the last one seen and notifies the listeners if it moved.
+    Returns True if the data changed.
+    """
+    global _data_version
+    version = await get_data_version()
+    if _data_version is None or version == _data_version:
+        _data_version = version
+        return False
+
+    logging.info(f"Game data version changed from {_data_version} to {version}. Notifying {len(_data_version_listeners)} listener(s).")
+    _data_version = version
+    await notify_data_version_listeners(version)
+    return True
+
+async def notify_data_version_listeners(version: int):
+    """Runs the data version listeners, e.g. after the database was built while the bot was already running."""
+    for callback in list(_data_version_listeners):
+        try:
+            result = callback(version)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logging.error(f"Data version listener {callback} failed: {e}", exc_info=True)
+
+async def watch_data_version(interval: float = DATA_VERSION_POLL_INTERVAL):
+    """Background task: picks up refreshed game data without a bot restart."""
+    while True:
+        try:
+            await check_data_version()
+        except asyncio.CancelledError:
+            logging.info("watch_data_version task cancelled during shutdown.")
+            break
+        except Exception as e:
+            logging.warning(f"Failed to check the game data version: {e}")
+        await asyncio.sleep(interval)
+
+# main.py verifies (or builds) the database in a worker thread while the bot connects. Commands that read
+# game data wait for it with game_data_check, autocompletes decorated with game_data_autocomplete skip answering
+# until is_game_data_ready().
+GAME_DATA_WAIT_TIMEOUT = 14 * 60 # Deferred interactions can be answered for 15 minutes
+_game_data_ready = asyncio.Event()
+
+def set_game_data_ready():
+    _game_data_ready.set()
+
+def is_game_data_ready() -> bool:
+    return _game_data_ready.is_set()
+
+async def game_data_check(ctx) -> bool:
+    """
+    Extension check for commands that read game data. Used before the database is ready, the command is
+    deferred and held until it is, instead of failing on a missing or half built database.
+    """
+    if _game_data_ready.is_set():
+        return True
+    if not ctx.deferred and not ctx.responded:
+        await ctx.defer()
+    logging.info(f"Holding /{ctx.invoke_target} until the game data is ready.")
+    try:
+        await asyncio.wait_for(_game_data_ready.wait(), GAME_DATA_WAIT_TIMEOUT)
+    except asyncio.TimeoutError:
+        logging.warning(f"Game data still not ready, running /{ctx.invoke_target} anyway.")
+    return True
+
+def game_data_autocomplete(callback):
+    """
+    Decorator for autocompletes that read game data. Before the database is ready they don't answer at all,
+    rather than with an empty response the autocomplete cache would keep.
+    """
+    @functools.wraps(callback)
+    async def wrapper(*args, **kwargs):
+        if not _game_data_ready.is_set():
+            return None
+        return await callback(*args, **kwargs)
+    return wrapper
+
 async def find_item_in_db(item_name_query: str, exact_match: bool = False):
     retries = 3
     if not os.path.exists(DB_NAME): # Use imported DB_NAME
@@ -81,17 +189,134 @@ async def find_all_item_names_in_db(item_name_query: str):
         return []
     return results
 
-async def find_perk_in_db(perk_name_query: str, exact_match: bool = False, _attempted_update: bool = False):
-    if not os.path.exists(DB_NAME): # Use imported DB_NAME
-        logging.error(f"find_perk_in_db: Database {DB_NAME} not found.")
+# --- Background perk data refresh ---
+# A perk the local data does not know usually means the game added it since the last update.
+# A miss schedules update_perks.sh in the background instead of making the user wait for the scrape.
+PERK_REFRESH_COOLDOWN = 30 * 60 # Seconds between two refreshes triggered by misses
+PERK_MISS_CACHE_TTL = 10 * 60 # Seconds a missed query is answered from the negative cache
+PERK_MISS_CACHE_MAX = 1000 # Autocomplete keystrokes miss a lot, keep the cache bounded
+
+_perk_refresh_task: Optional[asyncio.Task] = None
+_perk_refresh_status: Dict[str, Any] = {
+    "running": False, "trigger": None, "started_at": None, "finished_at": None, "returncode": None, "runs": 0,
+}
+_recent_perk_misses: Dict[Tuple[str, bool], float] = {} # (query, exact_match) key -> monotonic time of the miss
+
+def _perk_update_command() -> Optional[List[str]]:
+    current_os = platform.system().lower()
+    script_dir = os.path.dirname(os.path.abspath(__file__)) # Assumes db_utils.py is in the root
+    if "windows" in current_os:
+        script_to_run = os.path.join(script_dir, "update_perks.ps1")
+        run_command = ["powershell.exe", "-ExecutionPolicy", "Bypass", "-File", script_to_run]
+    elif "linux" in current_os:
+        script_to_run = os.path.join(script_dir, "update_perks.sh")
+        run_command = ["/bin/bash", script_to_run]
+    else:
+        logging.warning(f"Unsupported OS ({current_os}) for running update_perks script. Manual intervention needed")
+        return None
+    if not os.path.exists(script_to_run):
+        logging.error(f"Update script not found: {script_to_run}")
+        return None
+    return run_command
 
+async def _run_perk_refresh(run_command: List[str]):
+    try:
+        logging.info(f"Executing update script in the background: {run_command}")
+        process = await asyncio.create_subprocess_exec(
+            *run_command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if stdout:
+            logging.info(f"Update script stdout:\n{stdout.decode(errors='ignore')}")
+        if stderr:
+            logging.warning(f"Update script stderr:\n{stderr.decode(errors='ignore')}")
+        _perk_refresh_status["returncode"] = process.returncode
+        if process.returncode != 0:
+            logging.error(f"Update script failed with exit code {process.returncode}.")
+        else:
+            logging.info("Update script executed successfully.")
+            _recent_perk_misses.clear()
+            await check_data_version() # Let caches reload now instead of on the next poll
+    except asyncio.CancelledError:
+        logging.info("Background perk refresh cancelled during shutdown.")
+        raise
+    except Exception as e:
+        logging.error(f"Error running update script {run_command}: {e}", exc_info=True)
+    finally:
+        _perk_refresh_status["running"] = False
+        _perk_refresh_status["finished_at"] = time.time()
 
+def request_perk_refresh(trigger: str, force: bool = False) -> bool:
+    """
+    Starts a background perk data refresh unless one is already running (single-flight)
+    or the last one finished less than PERK_REFRESH_COOLDOWN seconds ago (skipped with force=True).
+    Returns True if a refresh was started.
+    """
+    global _perk_refresh_task
+    if _perk_refresh_status["running"]:
+        return False
+    finished_at = _perk_refresh_status["finished_at"]
+    if not force and finished_at is not None and time.time() - finished_at < PERK_REFRESH_COOLDOWN:
+        logging.info(f"Perk refresh for '{trigger}' skipped, the last one finished {time.time() - finished_at:.0f}s ago.")
+        return False
+    run_command = _perk_update_command()
+    if not run_command:
+        return False
 
+    _perk_refresh_status.update(running=True, trigger=trigger, started_at=time.time(), returncode=None)
+    _perk_refresh_status["runs"] += 1
+    _perk_refresh_task = asyncio.create_task(_run_perk_refresh(run_command)) # Module reference keeps the task alive
+    return True
 
+def get_perk_refresh_status() -> Dict[str, Any]:
+    """Snapshot of the background refresher: running, trigger, started_at/finished_at (epoch), returncode, runs, cached_misses."""
+    status = dict(_perk_refresh_status)
+    status["cached_misses"] = len(_recent_perk_misses)
+    if status["finished_at"] is not None:
+        status["cooldown_remaining"] = max(0, PERK_REFRESH_COOLDOWN - (time.time() - status["finished_at"]))
+    else:
+        status["cooldown_remaining"] = 0
+    return status
 
+def _remember_perk_miss(miss_key: tuple):
+    now = time.monotonic()
+    _recent_perk_misses[miss_key] = now
+    if len(_recent_perk_misses) > PERK_MISS_CACHE_MAX:
+        for key, missed_at in list(_recent_perk_misses.items()):
+            if now - missed_at >= PERK_MISS_CACHE_TTL:
+                del _recent_perk_misses[key]
+        while len(_recent_perk_misses) > PERK_MISS_CACHE_MAX: # Still full of fresh misses: drop the oldest
+            del _recent_perk_misses[next(iter(_recent_perk_misses))]
 
+def _clear_perk_misses(_data_version: Optional[int] = None):
+    _recent_perk_misses.clear()
 
+add_data_version_listener(_clear_perk_misses) # New data may contain what was missing
+
+def _refresh_after_miss(perk_name_query: str):
+    if request_perk_refresh(perk_name_query):
+        logging.info(f"No perk '{perk_name_query}' found in database, started a background perk data update.")
+
+async def find_perk_in_db(perk_name_query: str, exact_match: bool = False, refresh_on_miss: bool = True):
+    """
+    Looks up perks by name. A miss returns [] immediately; with refresh_on_miss it also schedules a
+    background refresh of the perk data (see request_perk_refresh) so a later lookup can find it.
+    """
+    if not os.path.exists(DB_NAME): # Use imported DB_NAME
+        logging.error(f"find_perk_in_db: Database {DB_NAME} not found.")
         return []
+
+    miss_key = (perk_name_query.lower(), exact_match)
+    missed_at = _recent_perk_misses.get(miss_key)
+    if missed_at is not None:
+        if time.monotonic() - missed_at < PERK_MISS_CACHE_TTL:
+            if refresh_on_miss: # The miss may have been cached by autocomplete, which doesn't refresh
+                _refresh_after_miss(perk_name_query)
+            return []
+        del _recent_perk_misses[miss_key]
+
     results = []
     try:
         async with aiosqlite.connect(DB_NAME) as conn:
@@ -108,49 +333,85 @@ async def find_perk_in_db(perk_name_query: str, exact_match: bool = False, _atte
         logging.error(f"SQLite error in find_perk_in_db: {e}", exc_info=True)
         return []
 
-    if not results and not _attempted_update: # Only attempt update if not found AND not already attempted
-        logging.info(f"No perk '{perk_name_query}' found in database, attempting to auto-run perk data update.")
-        current_os = platform.system().lower()
-        script_dir = os.path.dirname(os.path.abspath(__file__)) # Assumes db_utils.py is in the root
-        
-        script_to_run = None
-        run_command = []
-
-        if "windows" in current_os:
-            script_to_run = os.path.join(script_dir, "update_perks.ps1")
-            run_command = ["powershell.exe", "-ExecutionPolicy", "Bypass", "-File", script_to_run]
-        elif "linux" in current_os:
-            script_to_run = os.path.join(script_dir, "update_perks.sh")
-            run_command = ["/bin/bash", script_to_run]
-        else:
-            logging.warning(f"Unsupported OS ({current_os}) for running update_perks script. Manual intervention needed")
-            return results
+    if not results:
+        _remember_perk_miss(miss_key)
+        if refresh_on_miss:
+            _refresh_after_miss(perk_name_query)
+    return results
 
-        if script_to_run and os.path.exists(script_to_run):
-            try:
-                logging.info(f"Executing update script: {run_command}")
-                process = await asyncio.create_subprocess_exec(
-                    *run_command,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
+async def get_perk_scaling(perk_id: str) -> Dict[int, List]:
+    """
+    The placeholder values of a perk's description precomputed by create_db.py, by gear score.
+    Empty if the perk doesn't scale or the database predates the perk_scaling table.
+    """
+    if not perk_id or not os.path.exists(DB_NAME):
+        return {}
+    try:
+        async with aiosqlite.connect(DB_NAME) as conn:
+            async with conn.execute("SELECT gear_score, scaled_values FROM perk_scaling WHERE perk_id = ?", (perk_id,)) as cursor:
+                return {gear_score: json.loads(scaled_values) for gear_score, scaled_values in await cursor.fetchall()}
+    except aiosqlite.OperationalError as e: # Table missing, /perk evaluates the formulas itself then
+        logging.debug(f"No precomputed perk scaling available: {e}")
+    except (aiosqlite.Error, ValueError) as e:
+        logging.error(f"Error reading precomputed scaling of perk '{perk_id}': {e}", exc_info=True)
+    return {}
+
+# --- Full-text search (FTS5 indexes built by create_db.py) ---
+# BM25 column weights, in FTS_COLUMNS order: a hit in the name counts far more than one in the description.
+SEARCH_TABLES = {
+    'item': ('items', 'items_fts', (10.0, 1.0), 'Name'),
+    'perk': ('perks', 'perks_fts', (10.0, 2.0, 1.0), 'name'),
+}
+SEARCH_SNIPPET_TOKENS = 12
+
+def build_fts_query(text: str) -> str:
+    """
+    Turns free user input into a safe FTS5 MATCH expression: every word must match as a prefix.
+    Quoting each token keeps FTS5 operators (AND, NEAR, *, :) in user input from being interpreted.
+    """
+    tokens = re.findall(r"\w+", text.lower())
+    return " ".join(f'"{token}"*' for token in tokens)
+
+async def search_game_data(query: str, category: str = "all", limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Ranked full-text search over item names/descriptions and perk names/descriptions/conditions.
+    category is "item", "perk" or "all". Each result is the full table row plus
+    'result_type', 'result_name', 'snippet' (matches in **bold**) and 'rank' (lower is better).
+    Returns [] if the database has no search index yet.
+    """
+    match = build_fts_query(query)
+    if not match or not os.path.exists(DB_NAME):
+        return []
+
+    kinds = list(SEARCH_TABLES) if category == "all" else [category]
+    results = []
+    start_time = time.perf_counter()
+    try:
+        async with aiosqlite.connect(DB_NAME) as conn:
+            conn.row_factory = aiosqlite.Row
+            for kind in kinds:
+                table, fts_table, weights, name_column = SEARCH_TABLES[kind]
+                sql = (
+                    f"SELECT t.*, bm25({fts_table}, {', '.join(map(str, weights))}) AS rank, "
+                    f"snippet({fts_table}, -1, '**', '**', '…', {SEARCH_SNIPPET_TOKENS}) AS snippet "
+                    f"FROM {fts_table} JOIN {table} AS t ON t.rowid = {fts_table}.rowid "
+                    f"WHERE {fts_table} MATCH ? ORDER BY rank LIMIT ?"
                 )
-                stdout, stderr = await process.communicate()
-
-                if stdout:
-                    logging.info(f"Update script stdout:\n{stdout.decode(errors='ignore')}")
-                if stderr:
-                    logging.warning(f"Update script stderr:\n{stderr.decode(errors='ignore')}")
-                
-                if process.returncode != 0:
-                    logging.error(f"Update script failed with exit code {process.returncode}.")
-                else:
-                    logging.info("Update script executed successfully.")
-            except Exception as e:
-                logging.error(f"Error running update script {script_to_run}: {e}", exc_info=True)
-        else:
-            logging.error(f"Update script not found or not specified: {script_to_run}")
+                try:
+                    async with conn.execute(sql, (match, limit)) as cursor:
+                        rows = await cursor.fetchall()
+                except aiosqlite.OperationalError as e: # Index missing (old database) or no FTS5 support
+                    logging.warning(f"Full-text search on {fts_table} unavailable: {e}")
+                    continue
+                for row in rows:
+                    result = dict(row)
+                    result['result_type'] = kind
+                    result['result_name'] = result.get(name_column)
+                    results.append(result)
+    except aiosqlite.Error as e:
+        logging.error(f"SQLite error in search_game_data: {e}", exc_info=True)
+        return []
 
-        results = await find_perk_in_db(perk_name_query, exact_match=exact_match, _attempted_update=True) # Recursive call with flag
-        if results:
-            logging.info(f"Automatic perk update succeeded. '{perk_name_query}' found in updated data.")
-    return results
\ No newline at end of file
+    results.sort(key=lambda result: result['rank'])
+    logging.info(f"search_game_data('{query}', {category}) returned {len(results[:limit])} results in {time.perf_counter() - start_time:.4f} seconds")
+    return results[:limit]
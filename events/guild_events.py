@@ -1,40 +1,15 @@
 import logging
 import random
 import datetime
-from typing import Optional
 
 from interactions import Extension, Member, Embed, User, Role, listen
 from interactions.models.discord.channel import GuildText
 from config import NEW_WORLD_WELCOME_MESSAGES
-from settings_manager import get_welcome_setting, get_logging_setting
+from settings_manager import get_welcome_setting
+from utils.log_sink import server_log
 
 logger = logging.getLogger(__name__)
 
-# Helper function for logging server activity.
-# This function is duplicated in message_events.py for now.
-# For a larger project, consider moving it to a shared utility module (e.g., common_utils.py)
-# or a dedicated logging extension if it's used across multiple event types.
-async def _log_server_activity(guild_id: str, embed: Embed, text_message: Optional[str] = None):
-    """Helper function to send log messages to the configured log channel."""
-    if not guild_id:
-        return
-
-    log_settings = get_logging_setting(str(guild_id))
-    if log_settings and log_settings.get("enabled") and log_settings.get("channel_id"):
-        log_channel_id = log_settings["channel_id"]
-        try:
-            # Use embed._client to get bot instance, as embed objects created by interactions.py
-            # typically have a reference to the client.
-            log_channel = await embed._client.fetch_channel(int(log_channel_id))
-            if log_channel and isinstance(log_channel, GuildText):
-                if not embed.timestamp:
-                    embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-                await log_channel.send(content=text_message, embeds=embed)
-            else:
-                logger.warning(f"Log channel {log_channel_id} in guild {guild_id} is not a valid text channel or not found.")
-        except Exception as e:
-            logger.error(f"Failed to send log message to channel {log_channel_id} in guild {guild_id}: {e}", exc_info=True)
-
 class GuildEvents(Extension):
     def __init__(self, bot):
         self.bot = bot
@@ -86,7 +61,7 @@ class GuildEvents(Extension):
         if getattr(member, 'avatar', None):
           embed.set_thumbnail(url=member.avatar.url)
 
-        await _log_server_activity(str(member.guild.id), embed)
+        server_log.log(self.bot, str(member.guild.id), embed)
 
     @listen()
     async def on_guild_ban(self, guild_id: str, user: User):
@@ -105,7 +80,7 @@ class GuildEvents(Extension):
         )
         if getattr(user, 'avatar', None):
             embed.set_thumbnail(url=user.avatar.url)
-        await _log_server_activity(str(guild.id), embed)
+        server_log.log(self.bot, str(guild.id), embed)
 
     @listen()
     async def on_guild_unban(self, guild_id: str, user: User):
@@ -124,7 +99,7 @@ class GuildEvents(Extension):
         )
         if getattr(user, 'avatar', None):
             embed.set_thumbnail(url=user.avatar.url)
-        await _log_server_activity(str(guild.id), embed)
+        server_log.log(self.bot, str(guild.id), embed)
 
     @listen()
     async def on_guild_role_create(self, role: Role):
@@ -138,7 +113,7 @@ class GuildEvents(Extension):
             color=0x00FF00, # Green
         )
         if hasattr(role, 'guild') and role.guild:
-            await _log_server_activity(str(role.guild.id), embed)
+            server_log.log(self.bot, str(role.guild.id), embed)
 
     @listen()
     async def on_guild_role_delete(self, role: Role):
@@ -152,7 +127,7 @@ class GuildEvents(Extension):
             color=0xFF4500, # OrangeRed
         )
         if hasattr(role, 'guild') and role.guild:
-            await _log_server_activity(str(role.guild.id), embed)
+            server_log.log(self.bot, str(role.guild.id), embed)
 
 def setup(bot):
     GuildEvents(bot)
\ No newline at end of file
@@ -7,35 +7,10 @@ from interactions import Extension, Message, Embed, listen
 from interactions.models.discord.channel import GuildText
 from interactions.api.events.discord import MessageCreate
 from config import SILLY_MENTION_RESPONSES
-from settings_manager import get_logging_setting
+from utils.log_sink import server_log
 
 logger = logging.getLogger(__name__)
 
-# Helper function for logging server activity.
-# This function is duplicated in guild_events.py for now.
-# For a larger project, consider moving it to a shared utility module (e.g., common_utils.py)
-# or a dedicated logging extension if it's used across multiple event types.
-async def _log_server_activity(guild_id: str, embed: Embed, text_message: Optional[str] = None):
-    """Helper function to send log messages to the configured log channel."""
-    if not guild_id:
-        return
-
-    log_settings = get_logging_setting(str(guild_id))
-    if log_settings and log_settings.get("enabled") and log_settings.get("channel_id"):
-        log_channel_id = log_settings["channel_id"]
-        try:
-            # Use embed._client to get bot instance, as embed objects created by interactions.py
-            # typically have a reference to the client.
-            log_channel = await embed._client.fetch_channel(int(log_channel_id))
-            if log_channel and isinstance(log_channel, GuildText):
-                if not embed.timestamp:
-                    embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-                await log_channel.send(content=text_message, embeds=embed)
-            else:
-                logger.warning(f"Log channel {log_channel_id} in guild {guild_id} is not a valid text channel or not found.")
-        except Exception as e:
-            logger.error(f"Failed to send log message to channel {log_channel_id} in guild {guild_id}: {e}", exc_info=True)
-
 class MessageEvents(Extension):
     def __init__(self, bot):
         self.bot = bot
@@ -95,7 +70,7 @@ class MessageEvents(Extension):
             embed.add_field(name="Attachments", value=f"{len(message.attachments)} attachment(s)", inline=True)
         embed.set_footer(text=f"Message ID: {message.id}")
 
-        await _log_server_activity(str(message.guild.id), embed)
+        server_log.log(self.bot, str(message.guild.id), embed)
 
     @listen()
     async def on_message_update(self, before: Optional[Message] = None, after: Optional[Message] = None):
@@ -131,7 +106,7 @@ class MessageEvents(Extension):
         embed.add_field(name="After", value=f"```{new_content}```", inline=False)
         embed.set_footer(text=f"Message ID: {after.id}")
 
-        await _log_server_activity(str(after.guild.id), embed)
+        server_log.log(self.bot, str(after.guild.id), embed)
 
 def setup(bot):
     MessageEvents(bot)
\ No newline at end of file
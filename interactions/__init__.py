@@ -1,372 +1,380 @@
 import sys
-from .client import (
-    __api_version__,
-    __py_version__,
-    __repo_url__,
-    __version__,
-    Absent,
-    ACTION_ROW_MAX_ITEMS,
-    AutoShardedClient,
-    Client,
-    CONTEXT_MENU_NAME_LENGTH,
-    DISCORD_EPOCH,
-    EMBED_FIELD_VALUE_LENGTH,
-    EMBED_MAX_DESC_LENGTH,
-    EMBED_MAX_FIELDS,
-    EMBED_MAX_NAME_LENGTH,
-    EMBED_TOTAL_MAX,
-    errors,
-    get_logger,
-    GLOBAL_SCOPE,
-    GlobalScope,
-    kwarg_spam,
-    logger_name,
-    MENTION_PREFIX,
-    MentionPrefix,
-    Missing,
-    MISSING,
-    POLL_MAX_ANSWERS,
-    POLL_MAX_DURATION_HOURS,
-    PREMIUM_GUILD_LIMITS,
-    SELECT_MAX_NAME_LENGTH,
-    SELECTS_MAX_OPTIONS,
-    Sentinel,
-    Singleton,
-    SLASH_CMD_MAX_DESC_LENGTH,
-    SLASH_CMD_MAX_OPTIONS,
-    SLASH_CMD_NAME_LENGTH,
-    SLASH_OPTION_NAME_LENGTH,
-    smart_cache,
-    T,
-    T_co,
-    ClientT,
-    utils,
-)
-from .client import const
-from .models import (
-    ActionRow,
-    ActiveVoiceState,
-    Activity,
-    ActivityAssets,
-    ActivityFlag,
-    ActivityParty,
-    ActivitySecrets,
-    ActivityTimestamps,
-    ActivityType,
-    AllowedMentions,
-    Application,
-    application_commands_to_dict,
-    ApplicationCommandPermission,
-    ApplicationFlags,
-    Asset,
-    AsyncIterator,
-    Attachment,
-    AuditLog,
-    AuditLogChange,
-    AuditLogEntry,
-    AuditLogEventType,
-    AuditLogHistory,
-    auto_defer,
-    AutoArchiveDuration,
-    AutocompleteContext,
-    AutoDefer,
-    AutoModerationAction,
-    AutoModRule,
-    BaseChannel,
-    BaseChannelConverter,
-    BaseCommand,
-    BaseComponent,
-    BaseContext,
-    BaseGuild,
-    BaseInteractionContext,
-    BaseMessage,
-    BaseSelectMenu,
-    BaseTrigger,
-    BaseUser,
-    BrandColors,
-    BrandColours,
-    Buckets,
-    BulkBanResponse,
-    Button,
-    ButtonStyle,
-    CallbackObject,
-    CallbackType,
-    ChannelConverter,
-    ChannelFlags,
-    ChannelHistory,
-    ChannelMention,
-    ChannelSelectMenu,
-    ChannelType,
-    check,
-    ClientUser,
-    Color,
-    COLOR_TYPES,
-    Colour,
-    CommandType,
-    component_callback,
-    ComponentCommand,
-    ComponentContext,
-    ComponentType,
-    ConsumeRest,
-    contexts,
-    context_menu,
-    ContextMenu,
-    ContextMenuContext,
-    ContextType,
-    Converter,
-    cooldown,
-    Cooldown,
-    CooldownSystem,
-    CronTrigger,
-    CustomEmoji,
-    CustomEmojiConverter,
-    DateTrigger,
-    DefaultNotificationLevel,
-    DefaultReaction,
-    DM,
-    dm_only,
-    DMChannel,
-    DMChannelConverter,
-    DMConverter,
-    DMGroup,
-    DMGroupConverter,
-    Embed,
-    EmbedAttachment,
-    EmbedAuthor,
-    EmbedField,
-    EmbedFooter,
-    EmbedProvider,
-    Entitlement,
-    ExplicitContentFilterLevel,
-    Extension,
-    File,
-    FlatUIColors,
-    FlatUIColours,
-    ForumLayoutType,
-    get_components_ids,
-    global_autocomplete,
-    GlobalAutoComplete,
-    Greedy,
-    Guild,
-    guild_only,
-    GuildBan,
-    GuildCategory,
-    GuildCategoryConverter,
-    GuildChannel,
-    GuildChannelConverter,
-    GuildConverter,
-    GuildForum,
-    GuildForumPost,
-    GuildIntegration,
-    GuildMedia,
-    GuildNews,
-    GuildNewsConverter,
-    GuildNewsThread,
-    GuildNewsThreadConverter,
-    GuildPreview,
-    GuildPrivateThread,
-    GuildPrivateThreadConverter,
-    GuildPublicThread,
-    GuildPublicThreadConverter,
-    GuildStageVoice,
-    GuildStageVoiceConverter,
-    GuildTemplate,
-    GuildText,
-    GuildTextConverter,
-    GuildVoice,
-    GuildVoiceConverter,
-    GuildWelcome,
-    GuildWelcomeChannel,
-    GuildWidget,
-    GuildWidgetSettings,
-    has_any_role,
-    has_id,
-    has_role,
-    IDConverter,
-    InputText,
-    IntegrationExpireBehaviour,
-    IntegrationType,
-    integration_types,
-    Intents,
-    InteractionCommand,
-    InteractionContext,
-    InteractionPermissionTypes,
-    InteractionType,
-    InteractiveComponent,
-    IntervalTrigger,
-    InvitableMixin,
-    Invite,
-    InviteTargetType,
-    is_owner,
-    listen,
-    Listener,
-    LocalisedDesc,
-    LocalisedName,
-    LocalizedDesc,
-    LocalizedName,
-    MaterialColors,
-    MaterialColours,
-    max_concurrency,
-    MaxConcurrency,
-    Member,
-    MemberConverter,
-    MemberFlags,
-    MentionableSelectMenu,
-    MentionType,
-    Message,
-    message_context_menu,
-    MessageableChannelConverter,
-    MessageableMixin,
-    MessageActivity,
-    MessageActivityType,
-    MessageConverter,
-    MessageFlags,
-    MessageInteraction,
-    MessageInteractionMetadata,
-    MessageReference,
-    MessageType,
-    MFALevel,
-    Modal,
-    modal_callback,
-    ModalCommand,
-    ModalContext,
-    MODEL_TO_CONVERTER,
-    NoArgumentConverter,
-    NSFWLevel,
-    open_file,
-    Onboarding,
-    OnboardingMode,
-    OnboardingPrompt,
-    OnboardingPromptOption,
-    OnboardingPromptType,
-    OptionType,
-    OrTrigger,
-    OverwriteType,
-    ParagraphText,
-    PartialEmoji,
-    PartialEmojiConverter,
-    PermissionOverwrite,
-    Permissions,
-    Poll,
-    PollAnswer,
-    PollAnswerCount,
-    PollLayoutType,
-    PollMedia,
-    PollResults,
-    PremiumTier,
-    PremiumType,
-    process_allowed_mentions,
-    process_color,
-    process_colour,
-    process_components,
-    process_default_reaction,
-    process_embeds,
-    process_emoji,
-    process_emoji_req_format,
-    process_message_payload,
-    process_message_reference,
-    process_permission_overwrites,
-    process_thread_tag,
-    Reaction,
-    ReactionUsers,
-    Resolved,
-    Role,
-    RoleColors,
-    RoleColours,
-    RoleConverter,
-    RoleSelectMenu,
-    ScheduledEvent,
-    ScheduledEventPrivacyLevel,
-    ScheduledEventStatus,
-    ScheduledEventType,
-    ShortText,
-    slash_attachment_option,
-    slash_bool_option,
-    slash_channel_option,
-    slash_command,
-    slash_default_member_permission,
-    slash_float_option,
-    slash_int_option,
-    slash_mentionable_option,
-    slash_option,
-    slash_role_option,
-    slash_str_option,
-    slash_user_option,
-    SlashCommand,
-    SlashCommandChoice,
-    SlashCommandOption,
-    SlashCommandParameter,
-    SlashContext,
-    Snowflake,
-    Snowflake_Type,
-    SnowflakeConverter,
-    SnowflakeObject,
-    spread_to_rows,
-    StageInstance,
-    StagePrivacyLevel,
-    Status,
-    Sticker,
-    StickerFormatType,
-    StickerItem,
-    StickerPack,
-    StickerTypes,
-    StringSelectMenu,
-    StringSelectOption,
-    subcommand,
-    sync_needed,
-    SystemChannelFlags,
-    Task,
-    Team,
-    TeamMember,
-    TeamMembershipState,
-    TextStyles,
-    ThreadableMixin,
-    ThreadChannel,
-    ThreadChannelConverter,
-    ThreadList,
-    ThreadMember,
-    ThreadTag,
-    Timestamp,
-    TimestampStyles,
-    TimeTrigger,
-    to_optional_snowflake,
-    to_snowflake,
-    to_snowflake_list,
-    TYPE_ALL_ACTION,
-    TYPE_ALL_CHANNEL,
-    TYPE_ALL_TRIGGER,
-    TYPE_CHANNEL_MAPPING,
-    TYPE_COMPONENT_MAPPING,
-    TYPE_DM_CHANNEL,
-    TYPE_GUILD_CHANNEL,
-    TYPE_MESSAGEABLE_CHANNEL,
-    TYPE_THREAD_CHANNEL,
-    TYPE_VOICE_CHANNEL,
-    Typing,
-    UPLOADABLE_TYPE,
-    User,
-    user_context_menu,
-    UserConverter,
-    UserFlags,
-    UserSelectMenu,
-    VerificationLevel,
-    VideoQualityMode,
-    VoiceChannelConverter,
-    VoiceRegion,
-    VoiceState,
-    Wait,
-    Webhook,
-    WebhookMixin,
-    WebhookTypes,
-    WebSocketOPCode,
-    SlidingWindowSystem,
-    ExponentialBackoffSystem,
-    LeakyBucketSystem,
-    TokenBucketSystem,
-    ForumSortOrder,
-)
-from .api import events
-from . import ext
+from typing import TYPE_CHECKING
+
+from interactions._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .client import (
+        __api_version__,
+        __py_version__,
+        __repo_url__,
+        __version__,
+        Absent,
+        ACTION_ROW_MAX_ITEMS,
+        AutoShardedClient,
+        Client,
+        Cluster,
+        CONTEXT_MENU_NAME_LENGTH,
+        DISCORD_EPOCH,
+        EMBED_FIELD_VALUE_LENGTH,
+        EMBED_MAX_DESC_LENGTH,
+        EMBED_MAX_FIELDS,
+        EMBED_MAX_NAME_LENGTH,
+        EMBED_TOTAL_MAX,
+        errors,
+        get_logger,
+        GLOBAL_SCOPE,
+        GlobalScope,
+        kwarg_spam,
+        logger_name,
+        MENTION_PREFIX,
+        MentionPrefix,
+        Missing,
+        MISSING,
+        POLL_MAX_ANSWERS,
+        POLL_MAX_DURATION_HOURS,
+        PREMIUM_GUILD_LIMITS,
+        SELECT_MAX_NAME_LENGTH,
+        SELECTS_MAX_OPTIONS,
+        Sentinel,
+        Singleton,
+        SLASH_CMD_MAX_DESC_LENGTH,
+        SLASH_CMD_MAX_OPTIONS,
+        SLASH_CMD_NAME_LENGTH,
+        SLASH_OPTION_NAME_LENGTH,
+        smart_cache,
+        T,
+        T_co,
+        ClientT,
+        utils,
+    )
+    from .client import const
+    from .models import (
+        ActionRow,
+        ActiveVoiceState,
+        Activity,
+        ActivityAssets,
+        ActivityFlag,
+        ActivityParty,
+        ActivitySecrets,
+        ActivityTimestamps,
+        ActivityType,
+        AllowedMentions,
+        Application,
+        application_commands_to_dict,
+        ApplicationCommandPermission,
+        ApplicationFlags,
+        Asset,
+        AsyncIterator,
+        Attachment,
+        AuditLog,
+        AuditLogChange,
+        AuditLogEntry,
+        AuditLogEventType,
+        AuditLogHistory,
+        auto_defer,
+        AutoArchiveDuration,
+        AutocompleteContext,
+        AutoDefer,
+        AutoModerationAction,
+        AutoModRule,
+        BaseChannel,
+        BaseChannelConverter,
+        BaseCommand,
+        BaseComponent,
+        BaseContext,
+        BaseGuild,
+        BaseInteractionContext,
+        BaseMessage,
+        BaseSelectMenu,
+        BaseTrigger,
+        BaseUser,
+        BrandColors,
+        BrandColours,
+        Buckets,
+        BulkBanResponse,
+        Button,
+        ButtonStyle,
+        CallbackObject,
+        CallbackType,
+        ChannelConverter,
+        ChannelFlags,
+        ChannelHistory,
+        ChannelMention,
+        ChannelSelectMenu,
+        ChannelType,
+        check,
+        ClientUser,
+        Color,
+        COLOR_TYPES,
+        Colour,
+        CommandType,
+        component_callback,
+        ComponentCommand,
+        ComponentContext,
+        ComponentType,
+        ConsumeRest,
+        contexts,
+        context_menu,
+        ContextMenu,
+        ContextMenuContext,
+        ContextType,
+        Converter,
+        cooldown,
+        Cooldown,
+        CooldownSystem,
+        CronTrigger,
+        CustomEmoji,
+        CustomEmojiConverter,
+        DateTrigger,
+        DefaultNotificationLevel,
+        DefaultReaction,
+        DM,
+        dm_only,
+        DMChannel,
+        DMChannelConverter,
+        DMConverter,
+        DMGroup,
+        DMGroupConverter,
+        Embed,
+        EmbedAttachment,
+        EmbedAuthor,
+        EmbedField,
+        EmbedFooter,
+        EmbedProvider,
+        Entitlement,
+        ExplicitContentFilterLevel,
+        Extension,
+        File,
+        FlatUIColors,
+        FlatUIColours,
+        ForumLayoutType,
+        get_components_ids,
+        global_autocomplete,
+        GlobalAutoComplete,
+        Greedy,
+        Guild,
+        guild_only,
+        GuildBan,
+        GuildCategory,
+        GuildCategoryConverter,
+        GuildChannel,
+        GuildChannelConverter,
+        GuildConverter,
+        GuildForum,
+        GuildForumPost,
+        GuildIntegration,
+        GuildMedia,
+        GuildNews,
+        GuildNewsConverter,
+        GuildNewsThread,
+        GuildNewsThreadConverter,
+        GuildPreview,
+        GuildPrivateThread,
+        GuildPrivateThreadConverter,
+        GuildPublicThread,
+        GuildPublicThreadConverter,
+        GuildStageVoice,
+        GuildStageVoiceConverter,
+        GuildTemplate,
+        GuildText,
+        GuildTextConverter,
+        GuildVoice,
+        GuildVoiceConverter,
+        GuildWelcome,
+        GuildWelcomeChannel,
+        GuildWidget,
+        GuildWidgetSettings,
+        has_any_role,
+        has_id,
+        has_role,
+        IDConverter,
+        InputText,
+        IntegrationExpireBehaviour,
+        IntegrationType,
+        integration_types,
+        Intents,
+        InteractionCommand,
+        InteractionContext,
+        InteractionPermissionTypes,
+        InteractionType,
+        InteractiveComponent,
+        IntervalTrigger,
+        InvitableMixin,
+        Invite,
+        InviteTargetType,
+        is_owner,
+        listen,
+        Listener,
+        LocalisedDesc,
+        LocalisedName,
+        LocalizedDesc,
+        LocalizedName,
+        MaterialColors,
+        MaterialColours,
+        max_concurrency,
+        MaxConcurrency,
+        Member,
+        MemberConverter,
+        MemberFlags,
+        MentionableSelectMenu,
+        MentionType,
+        Message,
+        message_context_menu,
+        MessageableChannelConverter,
+        MessageableMixin,
+        MessageActivity,
+        MessageActivityType,
+        MessageConverter,
+        MessageFlags,
+        MessageInteraction,
+        MessageInteractionMetadata,
+        MessageReference,
+        MessageType,
+        MFALevel,
+        Modal,
+        modal_callback,
+        ModalCommand,
+        ModalContext,
+        MODEL_TO_CONVERTER,
+        NoArgumentConverter,
+        NSFWLevel,
+        open_file,
+        Onboarding,
+        OnboardingMode,
+        OnboardingPrompt,
+        OnboardingPromptOption,
+        OnboardingPromptType,
+        OptionType,
+        OrTrigger,
+        OverwriteType,
+        ParagraphText,
+        PartialEmoji,
+        PartialEmojiConverter,
+        PermissionOverwrite,
+        Permissions,
+        Poll,
+        PollAnswer,
+        PollAnswerCount,
+        PollLayoutType,
+        PollMedia,
+        PollResults,
+        PremiumTier,
+        PremiumType,
+        process_allowed_mentions,
+        process_color,
+        process_colour,
+        process_components,
+        process_default_reaction,
+        process_embeds,
+        process_emoji,
+        process_emoji_req_format,
+        process_message_payload,
+        process_message_reference,
+        process_permission_overwrites,
+        process_thread_tag,
+        Reaction,
+        ReactionUsers,
+        Resolved,
+        Role,
+        RoleColors,
+        RoleColours,
+        RoleConverter,
+        RoleSelectMenu,
+        ScheduledEvent,
+        ScheduledEventPrivacyLevel,
+        ScheduledEventStatus,
+        ScheduledEventType,
+        ShortText,
+        slash_attachment_option,
+        slash_bool_option,
+        slash_channel_option,
+        slash_command,
+        slash_default_member_permission,
+        slash_float_option,
+        slash_int_option,
+        slash_mentionable_option,
+        slash_option,
+        slash_role_option,
+        slash_str_option,
+        slash_user_option,
+        SlashCommand,
+        SlashCommandChoice,
+        SlashCommandOption,
+        SlashCommandParameter,
+        SlashContext,
+        Snowflake,
+        Snowflake_Type,
+        SnowflakeConverter,
+        SnowflakeObject,
+        spread_to_rows,
+        StageInstance,
+        StagePrivacyLevel,
+        Status,
+        Sticker,
+        StickerFormatType,
+        StickerItem,
+        StickerPack,
+        StickerTypes,
+        StringSelectMenu,
+        StringSelectOption,
+        subcommand,
+        sync_needed,
+        SystemChannelFlags,
+        Task,
+        Team,
+        TeamMember,
+        TeamMembershipState,
+        TextStyles,
+        ThreadableMixin,
+        ThreadChannel,
+        ThreadChannelConverter,
+        ThreadList,
+        ThreadMember,
+        ThreadTag,
+        Timestamp,
+        TimestampStyles,
+        TimeTrigger,
+        to_optional_snowflake,
+        to_snowflake,
+        to_snowflake_list,
+        TYPE_ALL_ACTION,
+        TYPE_ALL_CHANNEL,
+        TYPE_ALL_TRIGGER,
+        TYPE_CHANNEL_MAPPING,
+        TYPE_COMPONENT_MAPPING,
+        TYPE_DM_CHANNEL,
+        TYPE_GUILD_CHANNEL,
+        TYPE_MESSAGEABLE_CHANNEL,
+        TYPE_THREAD_CHANNEL,
+        TYPE_VOICE_CHANNEL,
+        Typing,
+        UPLOADABLE_TYPE,
+        User,
+        user_context_menu,
+        UserConverter,
+        UserFlags,
+        UserSelectMenu,
+        VerificationLevel,
+        VideoQualityMode,
+        VoiceChannelConverter,
+        VoiceRegion,
+        VoiceState,
+        Wait,
+        Webhook,
+        WebhookMixin,
+        WebhookTypes,
+        WebSocketOPCode,
+        SlidingWindowSystem,
+        ExponentialBackoffSystem,
+        LeakyBucketSystem,
+        TokenBucketSystem,
+        ForumSortOrder,
+    )
+    from .api import events
+    from . import ext
+
+__getattr__, __dir__ = lazy_exports(__name__)
 
 __all__ = (
     "__api_version__",
@@ -433,6 +441,7 @@ __all__ = (
     "Client",
     "ClientT",
     "ClientUser",
+    "Cluster",
     "Color",
     "COLOR_TYPES",
     "Colour",
@@ -736,6 +745,8 @@ __all__ = (
 )
 
 if "discord" in sys.modules:
+    from .client.const import get_logger
+
     get_logger().error(
         "`import discord` import detected.  Interactions.py is a completely separate library, and is not compatible with d.py models.  Please see https://interactions-py.github.io/interactions.py/Guides/100%20Migration%20From%20D.py/ for how to fix your code."
     )
@@ -0,0 +1,87 @@
+"""
+Lazy public namespaces for the library's packages (PEP 562).
+
+A package lists its exports as usual, as `from .module import Name` statements, but inside an `if TYPE_CHECKING:` block,
+so type checkers and IDEs still see them. At runtime `lazy_exports` reads those statements and imports a module the
+first time one of its names is used, so `import interactions` (or any submodule) doesn't import the whole library.
+"""
+
+import ast
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Any, Callable
+
+__all__ = ("lazy_exports",)
+
+
+class _LazyPackage(ModuleType):
+    _lazy_exports: dict
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # importing a submodule sets it on its package, which mustn't hide an export of the same name
+        # (e.g. the auto_defer decorator of interactions.models.internal, next to its auto_defer module)
+        if isinstance(value, ModuleType) and self._lazy_exports.get(name, (".", name)) != (".", name):
+            return
+        super().__setattr__(name, value)
+
+
+def _type_checking_imports(path: str) -> dict[str, tuple[str, str]]:
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    exports = {}
+    for node in tree.body:
+        if isinstance(node, ast.If) and isinstance(node.test, ast.Name) and node.test.id == "TYPE_CHECKING":
+            for statement in node.body:
+                if isinstance(statement, ast.ImportFrom):
+                    module = "." * statement.level + (statement.module or "")
+                    for alias in statement.names:
+                        exports[alias.asname or alias.name] = (module, alias.name)
+    return exports
+
+
+def lazy_exports(package: str) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Make the imports in a package's `if TYPE_CHECKING:` block lazy.
+
+    Use as `__getattr__, __dir__ = lazy_exports(__name__)` in the package's `__init__.py`, after the block.
+
+    Args:
+        package: The package's name
+
+    Returns:
+        The package's module `__getattr__` and `__dir__`
+
+    """
+    module = sys.modules[package]
+    namespace = module.__dict__
+    exports = _type_checking_imports(namespace["__file__"])
+    module._lazy_exports = exports
+    module.__class__ = _LazyPackage
+
+    def __getattr__(name: str) -> Any:
+        if name in exports:
+            source_name, attribute = exports[name]
+            if source_name == ".":  # from . import submodule
+                value = importlib.import_module(f"{package}.{attribute}")
+            else:
+                source = importlib.import_module(source_name, package)
+                try:
+                    value = getattr(source, attribute)
+                except AttributeError:  # from .package import submodule, not imported by the package yet
+                    value = importlib.import_module(f"{source.__name__}.{attribute}")
+        elif importlib.util.find_spec(f"{package}.{name}") is not None:
+            # e.g. `interactions.api.http`, imported as a side effect before the namespace was lazy
+            value = importlib.import_module(f"{package}.{name}")
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
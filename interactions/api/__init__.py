@@ -1,3 +1,10 @@
-from . import events
+from typing import TYPE_CHECKING
+
+from interactions._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from . import events
+
+__getattr__, __dir__ = lazy_exports(__name__)
 
 __all__ = ("events",)
@@ -1,4 +1,6 @@
 from . import gateway
+from . import session_store
 from . import state
+from .session_store import GatewaySessionStore
 
-__all__ = ("gateway", "state")
+__all__ = ("gateway", "session_store", "state", "GatewaySessionStore")
@@ -84,6 +84,14 @@ class GatewayClient(WebsocketClient):
 
         self._ready = asyncio.Event()
         self._close_gateway = asyncio.Event()
+        self._close_code = 1000  # closing with 1000 ends the session, any other code keeps it resumable
+
+        # a session saved by a previous process (see GatewaySessionStore), resumed instead of identifying
+        self._resuming_stored: dict | None = state.resume_session
+        if self._resuming_stored:
+            self.session_id = self._resuming_stored["session_id"]
+            self.sequence = self._resuming_stored["sequence"]
+            self.ws_resume_url = self._resuming_stored["resume_gateway_url"] or MISSING
 
         # Sanity check, it is extremely important that an instance isn't reused.
         self._entered = False
@@ -95,7 +103,10 @@ class GatewayClient(WebsocketClient):
         self._entered = True
         self._zlib = zlib.decompressobj()
 
-        self.ws = await self.state.client.http.websocket_connect(self.state.gateway_url)
+        if self._resuming_stored and self.ws_resume_url:
+            self.ws = await self.state.client.http.websocket_connect(self.ws_resume_url)
+        else:
+            self.ws = await self.state.client.http.websocket_connect(self.state.gateway_url)
 
         hello = await self.receive(force=True)
         self.heartbeat_interval = hello["d"]["heartbeat_interval"] / 1000
@@ -103,7 +114,11 @@ class GatewayClient(WebsocketClient):
 
         self._keep_alive = asyncio.create_task(self.run_bee_gees())
 
-        await self._identify()
+        if self._resuming_stored:
+            self.state.wrapped_logger(logging.INFO, f"Resuming the session saved at sequence {self.sequence}")
+            await self._resume_connection()
+        else:
+            await self._identify()
 
         return self
 
@@ -130,7 +145,7 @@ class GatewayClient(WebsocketClient):
                 # We could be cancelled here, it is extremely important that we close the
                 # WebSocket either way, hence the try/except.
                 try:
-                    await self.ws.close(code=1000)
+                    await self.ws.close(code=self._close_code)
                 finally:
                     self.ws = None
 
@@ -195,6 +210,7 @@ class GatewayClient(WebsocketClient):
 
             case OPCODE.INVALIDATE_SESSION:
                 self.state.wrapped_logger(logging.WARNING, "Gateway invalidated session. Reconnecting...")
+                self._resuming_stored = None  # identifying instead, READY follows as usual
                 return await self.reconnect()
 
             case _:
@@ -219,6 +235,17 @@ class GatewayClient(WebsocketClient):
                 self.state.wrapped_logger(
                     logging.INFO, f"Successfully resumed connection! Session_ID: {self.session_id}"
                 )
+                if stored := self._resuming_stored:
+                    # this process never saw READY, discord doesn't send it (nor the guilds) on RESUME
+                    self._resuming_stored = None
+                    self._ready.set()
+                    ready = {
+                        "guilds": [{"id": guild_id} for guild_id in stored["guild_ids"]],
+                        "shard": list(self.shard),
+                        "session_id": self.session_id,
+                        "resumed": True,
+                    }
+                    self.state.client.dispatch(events.WebsocketReady(ready))
                 self.state.client.dispatch(events.Resume())
                 return None
 
@@ -243,8 +270,16 @@ class GatewayClient(WebsocketClient):
         self.state.client.dispatch(events.RawGatewayEvent(data.copy(), override_name="raw_gateway_event"))
         self.state.client.dispatch(events.RawGatewayEvent(data.copy(), override_name=f"raw_{event.lower()}"))
 
-    def close(self) -> None:
-        """Shutdown the websocket connection."""
+    def close(self, resumable: bool = False) -> None:
+        """
+        Shutdown the websocket connection.
+
+        Args:
+            resumable: Whether to keep the session resumable, e.g. to resume it after a restart
+
+        """
+        if resumable:
+            self._close_code = 4000
         self._close_gateway.set()
 
     async def _identify(self) -> None:
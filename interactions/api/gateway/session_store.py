@@ -0,0 +1,100 @@
+"""Keeps gateway sessions across process restarts, so shards can RESUME instead of IDENTIFY."""
+
+import json
+import os
+import time
+from logging import Logger
+from typing import TYPE_CHECKING, Optional
+
+from interactions.client.const import get_logger
+
+if TYPE_CHECKING:
+    from .gateway import GatewayClient
+
+__all__ = ("GatewaySessionStore",)
+
+
+class GatewaySessionStore:
+    """
+    A small JSON file of the sessions of a client's shards.
+
+    A client with a `session_store` saves each shard's session on `stop()` (closing the connection in a way that keeps
+    the session resumable), and a shard starting later takes its saved session to RESUME it. Discord replays the events
+    missed in between, and the identify budget isn't spent. A session discord no longer knows is answered with an
+    invalid session, after which the shard identifies as usual.
+
+    Args:
+        path: The file to keep the sessions in
+        max_age: Seconds after which a saved session is not worth resuming any more
+
+    """
+
+    def __init__(self, path: str, max_age: float = 180) -> None:
+        self.path = path
+        self.max_age = max_age
+        self.logger: Logger = get_logger()
+
+    @staticmethod
+    def _key(shard_id: int, total_shards: int) -> str:
+        return f"{shard_id}/{total_shards}"
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable gateway session file {self.path}: {e}")
+            return {}
+
+    def _write(self, sessions: dict) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(sessions, f)
+        os.replace(temp_path, self.path)
+
+    def save(self, gateway: "GatewayClient", guild_ids: list[int]) -> None:
+        """
+        Save the session of a gateway connection that has been closed resumably.
+
+        Args:
+            gateway: The closed gateway connection
+            guild_ids: The IDs of the shard's guilds, discord doesn't send them again on RESUME
+
+        """
+        if not gateway.session_id or gateway.sequence is None:
+            return
+        shard_id, total_shards = gateway.shard
+        sessions = self._read()
+        sessions[self._key(shard_id, total_shards)] = {
+            "session_id": gateway.session_id,
+            "sequence": gateway.sequence,
+            "resume_gateway_url": gateway.ws_resume_url or None,
+            "guild_ids": [str(guild_id) for guild_id in guild_ids],
+            "saved_at": time.time(),
+        }
+        self._write(sessions)
+        self.logger.debug(f"Saved the gateway session of shard {shard_id} at sequence {gateway.sequence}")
+
+    def take(self, shard_id: int, total_shards: int) -> Optional[dict]:
+        """
+        Take the saved session of a shard, a session can only be resumed once.
+
+        Args:
+            shard_id: The shard's ID
+            total_shards: The total number of shards, sessions of a different shard count can't be resumed
+
+        Returns:
+            The session (`session_id`, `sequence`, `resume_gateway_url`, `guild_ids`), None if there is none to resume
+
+        """
+        sessions = self._read()
+        session = sessions.pop(self._key(shard_id, total_shards), None)
+        if session is None:
+            return None
+        self._write(sessions)
+        if time.time() - session["saved_at"] > self.max_age:
+            self.logger.info(f"The saved gateway session of shard {shard_id} is too old to resume")
+            return None
+        return session
@@ -46,6 +46,9 @@ class ConnectionState:
 
     _shard_task: asyncio.Task | None = None
 
+    resume_session: Optional[dict] = None
+    """A session saved by a previous process to resume on start, see `GatewaySessionStore`"""
+
     logger: Logger = attrs.field(repr=False, init=False, factory=get_logger)
 
     def __attrs_post_init__(self, *args, **kwargs) -> None:
@@ -72,6 +75,8 @@ class ConnectionState:
     async def start(self) -> None:
         """Connect to the Discord Gateway."""
         self.gateway_url = await self.client.http.get_gateway()
+        if self.resume_session is None and (store := self.client.session_store) is not None:
+            self.resume_session = store.take(self.shard_id, self.client.total_shards)
 
         self.wrapped_logger(logging.INFO, "Starting Shard")
         self.start_time = datetime.now()
@@ -86,16 +91,32 @@ class ConnectionState:
     async def stop(self) -> None:
         """Disconnect from the Discord Gateway."""
         self.wrapped_logger(logging.INFO, "Stopping Shard")
-        if self.gateway is not None:
-            self.gateway.close()
+        store = self.client.session_store
+        gateway = self.gateway
+        if gateway is not None:
+            gateway.close(resumable=store is not None)
             self.gateway = None
 
         if self._shard_task is not None:
             await self._shard_task
             self._shard_task = None
 
+        if store is not None and gateway:
+            store.save(gateway, self._guild_ids())
+        self.resume_session = None
         self.gateway_started.clear()
 
+    def _guild_ids(self) -> list["Snowflake_Type"]:
+        if not self.client.user:
+            return []
+        total_shards = self.client.total_shards
+        # noinspection PyProtectedMember
+        return [
+            guild_id
+            for guild_id in self.client.user._guild_ids
+            if (int(guild_id) >> 22) % total_shards == self.shard_id
+        ]
+
     def clear_ready(self) -> None:
         """Clear the ready event."""
         self._shard_ready.clear()
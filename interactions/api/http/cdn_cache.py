@@ -0,0 +1,186 @@
+"""A cache for assets downloaded from the discord CDN."""
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+import interactions.client.const as constants
+from interactions.client.utils.single_flight import SingleFlight
+
+__all__ = ("CDNCache",)
+
+
+class CDNCache:
+    """
+    Caches CDN downloads in memory (LRU, bounded by a byte budget) and optionally on disk.
+
+    CDN urls contain the asset's hash, so an entry never goes stale: the key is the url's path plus the
+    requested size. Concurrent requests for the same asset share a single download.
+
+    Attributes:
+        max_bytes int: The memory budget. Items larger than a quarter of it are not kept in memory
+        disk_path str | None: The directory of the on-disk tier, None to disable it
+        disk_max_bytes int: The disk budget. The least recently written files are removed first
+        stats dict[str, int]: Hit/miss counters
+
+    """
+
+    def __init__(
+        self, max_bytes: int = 32 * 1024 * 1024, disk_path: str | None = None, disk_max_bytes: int = 256 * 1024 * 1024
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.disk_max_bytes = disk_max_bytes
+        self.stats: dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "bytes_downloaded": 0,
+        }
+
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._in_flight = SingleFlight()
+        self._disk_bytes: int | None = None  # unknown until the disk tier is first written to
+        self._disk_lock = threading.Lock()  # writes run in threads, and pruning must not remove a file being written
+
+        self.logger = constants.get_logger()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @property
+    def memory_bytes(self) -> int:
+        """The bytes currently held in memory."""
+        return self._memory_bytes
+
+    @staticmethod
+    def key_for_url(url: str) -> str:
+        """
+        Get the cache key for a CDN url.
+
+        Args:
+            url: The url of the asset
+
+        Returns:
+            The asset's path and size, other query parameters don't change the content
+
+        """
+        parts = urlsplit(url)
+        size = dict(parse_qsl(parts.query)).get("size", "")
+        return f"{parts.netloc}{parts.path}?size={size}"
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Get an asset from the cache, downloading it with `fetch` on a miss.
+
+        Args:
+            key: The cache key, see `key_for_url`
+            fetch: Downloads the asset. Errors are passed on to every waiting caller and not cached. If the
+                downloading caller is cancelled, a waiting caller downloads it again
+
+        Returns:
+            The asset's bytes
+
+        """
+        if (data := self._memory.get(key)) is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return data
+
+        if key in self._in_flight:
+            self.stats["coalesced"] += 1
+
+        async def load() -> bytes:
+            data = await self._read_disk(key)
+            if data is not None:
+                self.stats["disk_hits"] += 1
+            else:
+                self.stats["misses"] += 1
+                data = await fetch()
+                self.stats["bytes_downloaded"] += len(data)
+                await self._write_disk(key, data)
+            self._remember(key, data)
+            return data
+
+        return await self._in_flight.run(key, load)
+
+    def clear(self) -> None:
+        """Empty the memory tier."""
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes // 4:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats["evictions"] += 1
+
+    def _disk_file(self, key: str) -> str:
+        return os.path.join(self.disk_path, hashlib.sha256(key.encode()).hexdigest())
+
+    async def _read_disk(self, key: str) -> bytes | None:
+        if not self.disk_path:
+            return None
+
+        def _read() -> bytes | None:
+            try:
+                with open(self._disk_file(key), "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                return None
+
+        try:
+            return await asyncio.to_thread(_read)
+        except OSError as e:
+            self.logger.warning(f"Could not read {key} from the CDN disk cache: {e}")
+            return None
+
+    async def _write_disk(self, key: str, data: bytes) -> None:
+        if not self.disk_path:
+            return
+
+        def _write() -> None:
+            with self._disk_lock:
+                os.makedirs(self.disk_path, exist_ok=True)
+                if self._disk_bytes is None:
+                    self._disk_bytes = sum(entry.stat().st_size for entry in self._disk_entries())
+                path = self._disk_file(key)
+                with open(f"{path}.tmp", "wb") as f:
+                    f.write(data)
+                os.replace(f"{path}.tmp", path)
+                self._disk_bytes += len(data)
+                if self._disk_bytes > self.disk_max_bytes:
+                    self._prune_disk()
+
+        try:
+            await asyncio.to_thread(_write)
+        except OSError as e:
+            self.logger.warning(f"Could not write {key} to the CDN disk cache: {e}")
+
+    def _disk_entries(self) -> list[os.DirEntry]:
+        """The cached files, without the `.tmp` files of writes left over from a crash."""
+        return [entry for entry in os.scandir(self.disk_path) if entry.is_file() and not entry.name.endswith(".tmp")]
+
+    def _prune_disk(self) -> None:
+        """Remove the least recently written files down to 90% of the budget. Called with the disk lock held."""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.disk_max_bytes * 0.9:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+        self._disk_bytes = total
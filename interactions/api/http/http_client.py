@@ -4,10 +4,10 @@ import asyncio
 import inspect
 import os
 import time
+from collections import deque
 from logging import Logger
 from typing import Any, cast, Callable
 from urllib.parse import quote as _uriquote
-from weakref import WeakValueDictionary
 
 import aiohttp
 import discord_typings
@@ -15,6 +15,7 @@ from aiohttp import BaseConnector, ClientSession, ClientWebSocketResponse, FormD
 from multidict import CIMultiDictProxy
 
 import interactions.client.const as constants
+from interactions.client.metrics import current_interaction_timer
 from interactions import models
 from interactions.api.http.http_requests import (
     BotRequests,
@@ -51,6 +52,7 @@ from interactions.client.mixins.serialization import DictSerializationMixin
 from interactions.client.utils.input_utils import response_decode, FastJson
 from interactions.client.utils.serializer import dict_filter, get_file_mimetype
 from interactions.models.discord.file import UPLOADABLE_TYPE
+from .cdn_cache import CDNCache
 from .route import Route
 
 __all__ = ("HTTPClient",)
@@ -98,25 +100,36 @@ class GlobalLock:
 
 
 class BucketLock:
-    """Manages the rate limit for each bucket."""
+    """
+    Manages the rate limit for each bucket.
+
+    Until the first response has revealed the bucket's limits, only one request at a time is let through.
+    Afterwards up to `limit` requests run concurrently, and requests are paced proactively: once the known
+    `remaining` calls are used up, further requests wait for the bucket to reset instead of provoking a 429.
+    """
 
     DEFAULT_LIMIT = 1
     DEFAULT_REMAINING = 1
     DEFAULT_DELTA = 0.0
 
-    def __init__(self, header: CIMultiDictProxy | None = None) -> None:
-        self._semaphore: asyncio.Semaphore | None = None
-        if header is None:
-            self.bucket_hash: str | None = None
-            self.limit: int = self.DEFAULT_LIMIT
-            self.remaining: int = self.DEFAULT_REMAINING
-            self.delta: float = self.DEFAULT_DELTA
-        else:
-            self.ingest_ratelimit_header(header)
+    def __init__(self, header: CIMultiDictProxy | None = None, stats: dict[str, int] | None = None) -> None:
+        self.bucket_hash: str | None = None
+        self.limit: int = self.DEFAULT_LIMIT
+        self.remaining: int = self.DEFAULT_REMAINING
+        self.delta: float = self.DEFAULT_DELTA
+        self.reset_at: float = 0.0
+        self.unlimited: bool = False
+        self.stats = stats if stats is not None else {}
+
+        self._in_flight: int = 0  # slots taken, including requests still waiting for the reset
+        self._sent: int = 0  # requests past the pacing that discord may not have counted yet
+        self._waiters: deque[asyncio.Future] = deque()
 
         self.logger = constants.get_logger()
 
         self._lock: asyncio.Lock = asyncio.Lock()
+        if header is not None:
+            self.ingest_ratelimit_header(header)
 
     def __repr__(self) -> str:
         return f"<BucketLock: {self.bucket_hash or 'Generic'}, limit: {self.limit}, remaining: {self.remaining}, delta: {self.delta}>"
@@ -126,7 +139,19 @@ class BucketLock:
         """Returns whether the bucket is locked."""
         if self._lock.locked():
             return True
-        return self._semaphore is not None and self._semaphore.locked()
+        if self.remaining <= 0 and self.reset_at > time.perf_counter():
+            return True
+        return not self.unlimited and self._in_flight >= self.limit
+
+    @property
+    def idle(self) -> bool:
+        """Whether nothing uses the bucket and its window has expired, i.e. it can be forgotten safely."""
+        return (
+            not self._in_flight
+            and not self._waiters
+            and not self._lock.locked()
+            and self.reset_at <= time.perf_counter()
+        )
 
     def ingest_ratelimit_header(self, header: CIMultiDictProxy) -> None:
         """
@@ -139,38 +164,84 @@ class BucketLock:
 
         """
         self.bucket_hash = header.get("x-ratelimit-bucket")
+        # no bucket means the endpoint isn't rate limited (beyond the global limit)
+        self.unlimited = self.bucket_hash is None
         self.limit = int(header.get("x-ratelimit-limit", self.DEFAULT_LIMIT))
-        self.remaining = int(header.get("x-ratelimit-remaining", self.DEFAULT_REMAINING))
         self.delta = float(header.get("x-ratelimit-reset-after", self.DEFAULT_DELTA))
+        # requests still in flight (other than the one this response belongs to) are not counted by discord yet
+        remaining = int(header.get("x-ratelimit-remaining", self.DEFAULT_REMAINING))
+        self.remaining = max(0, remaining - max(0, self._sent - 1))
+        self.reset_at = time.perf_counter() + self.delta
 
         if self.delta < 0.005 and self.remaining == 0:  # the delta value is so small that we can assume it's 0
             self.delta = self.DEFAULT_DELTA
             self.remaining = self.DEFAULT_REMAINING  # we can assume that we can make another request right away
+            self.reset_at = 0.0
 
-        if self._semaphore is None or self._semaphore._value != self.limit:
-            self._semaphore = asyncio.Semaphore(self.limit)
+        self._wake_waiters()
 
-    async def acquire(self) -> None:
-        """Acquires the semaphore."""
-        if self._semaphore is None:
-            return
+    def _has_free_slot(self) -> bool:
+        return self.unlimited or self._in_flight < self.limit
 
+    def _wake_waiters(self) -> None:
+        free = len(self._waiters) if self.unlimited else self.limit - self._in_flight
+        while self._waiters and free > 0:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def acquire(self) -> None:
+        """Waits for a free slot in the bucket, and for the bucket to reset if its calls are used up."""
         if self._lock.locked():
             self.logger.debug(f"Waiting for bucket {self.bucket_hash} to unlock.")
             async with self._lock:
                 pass
 
-        await self._semaphore.acquire()
+        while not self._has_free_slot():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_waiters()  # pass the slot we were given on to the next waiter
+                raise
+        self._in_flight += 1
+
+        if self.unlimited:
+            self._sent += 1
+            return
+        try:
+            while self.remaining <= 0 and (wait := self.reset_at - time.perf_counter()) > 0:
+                self.stats["paced"] = self.stats.get("paced", 0) + 1
+                self.logger.debug(
+                    f"Bucket {self.bucket_hash} has no calls remaining, waiting {wait:.3f}s for it to reset"
+                )
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._release_slot()
+            raise
+        now = time.perf_counter()
+        if self.reset_at <= now:
+            # the window has reset: start a new one, the next response corrects our estimate
+            self.remaining = self.limit - self._sent
+            self.reset_at = now + self.delta
+        self.remaining -= 1
+        self._sent += 1
 
     def release(self) -> None:
         """
-        Releases the semaphore.
+        Releases the slot taken by acquire.
 
         Note: If the bucket has been locked with lock_for_duration, this will not release the lock.
         """
-        if self._semaphore is None:
-            return
-        self._semaphore.release()
+        self._sent -= 1
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+        self._wake_waiters()
 
     async def lock_for_duration(self, duration: float, block: bool = False) -> None:
         """
@@ -236,9 +307,17 @@ class HTTPClient(
         self.global_lock: GlobalLock = GlobalLock()
         self._max_attempts: int = 3
 
-        self.ratelimit_locks: WeakValueDictionary[str, BucketLock] = WeakValueDictionary()
+        # bucket hash + major parameters -> lock. Idle locks are pruned once there are more than RATELIMIT_REGISTRY_SIZE
+        self.ratelimit_locks: dict[str, BucketLock] = {}
+        # route.rl_bucket -> lock shared by requests to a route whose bucket hash isn't known yet
+        self._provisional_locks: dict[str, BucketLock] = {}
+        self.ratelimit_stats: dict[str, int] = {"requests": 0, "paced": 0, "429": 0, "429_global": 0, "429_shared": 0}
+        # called with (bucket key, lock) when a bucket's calls are used up, a cluster worker shares these with the other processes
+        self.ratelimit_listener: Callable[[str, BucketLock], None] | None = None
         self.show_ratelimit_traceback: bool = show_ratelimit_tracebacks
         self._endpoints = {}
+        # replace with a CDNCache(disk_path=...) to keep downloaded assets across restarts
+        self.cdn_cache: CDNCache = CDNCache()
 
         self.user_agent: str = (
             f"DiscordBot ({__repo_url__} {__version__} Python/{__py_version__}) aiohttp/{aiohttp.__version__}"
@@ -250,6 +329,13 @@ class HTTPClient(
             logger = constants.get_logger()
         self.logger = logger
 
+    RATELIMIT_REGISTRY_SIZE = 1024
+
+    @staticmethod
+    def _bucket_key(route: Route, bucket_hash: str) -> str:
+        """Discord shares a bucket between routes with the same hash *and* the same major parameters."""
+        return f"{bucket_hash}:{route.webhook_id}{route.webhook_token}:{route.channel_id}:{route.guild_id}"
+
     def get_ratelimit(self, route: Route) -> BucketLock:
         """
         Get a route's rate limit bucket.
@@ -262,12 +348,14 @@ class HTTPClient(
 
         """
         if bucket_hash := self._endpoints.get(route.rl_bucket):
-            if lock := self.ratelimit_locks.get(bucket_hash):
-                # if we have an active lock on this route, it'll still be in the cache
-                # return that lock
+            if lock := self.ratelimit_locks.get(self._bucket_key(route, bucket_hash)):
                 return lock
-        # if no cached lock exists, return a new lock
-        return BucketLock()
+        # the bucket isn't known (yet), all requests to this route share one provisional lock so a burst
+        # of first requests doesn't fire at once, the first response tells us the actual limits
+        lock = self._provisional_locks.get(route.rl_bucket)
+        if lock is None:
+            lock = self._provisional_locks[route.rl_bucket] = BucketLock(stats=self.ratelimit_stats)
+        return lock
 
     def ingest_ratelimit(self, route: Route, header: CIMultiDictProxy, bucket_lock: BucketLock) -> None:
         """
@@ -281,11 +369,72 @@ class HTTPClient(
         """
         bucket_lock.ingest_ratelimit_header(header)
 
+        if self._provisional_locks.get(route.rl_bucket) is bucket_lock:
+            # requests still queued on the provisional lock move over to the registered one (see _acquire_ratelimit)
+            del self._provisional_locks[route.rl_bucket]
+
         if bucket_lock.bucket_hash:
             # We only ever try and cache the bucket if the bucket hash has been set (ignores unlimited endpoints)
-            self.logger.debug(f"Caching ingested rate limit data for: {bucket_lock.bucket_hash}")
+            key = self._bucket_key(route, bucket_lock.bucket_hash)
             self._endpoints[route.rl_bucket] = bucket_lock.bucket_hash
-            self.ratelimit_locks[bucket_lock.bucket_hash] = bucket_lock
+            registered = self.ratelimit_locks.get(key)
+            if registered is None:
+                self.logger.debug(f"Caching ingested rate limit data for: {bucket_lock.bucket_hash}")
+                if len(self.ratelimit_locks) >= self.RATELIMIT_REGISTRY_SIZE:
+                    self._prune_ratelimit_locks()
+                self.ratelimit_locks[key] = bucket_lock
+            elif registered is not bucket_lock:
+                # another route already uses this bucket: keep that lock, and let it know the latest state
+                self.logger.debug(
+                    f"Merging rate limit data for {route.rl_bucket} into bucket {bucket_lock.bucket_hash}"
+                )
+                registered.limit = bucket_lock.limit
+                registered.remaining = min(registered.remaining, bucket_lock.remaining)
+                registered.reset_at = max(registered.reset_at, bucket_lock.reset_at)
+                registered.delta = bucket_lock.delta
+                bucket_lock = registered
+
+            if (
+                self.ratelimit_listener is not None
+                and bucket_lock.remaining <= 0
+                and bucket_lock.reset_at > time.perf_counter()
+            ):
+                self.ratelimit_listener(key, bucket_lock)
+
+    def apply_shared_ratelimit(self, key: str, reset_after: float) -> None:
+        """
+        Marks a bucket as used up until it resets, because another process sharing the token used its calls.
+
+        Args:
+            key: The bucket key, see `_bucket_key`
+            reset_after: Seconds until the bucket resets
+
+        """
+        if lock := self.ratelimit_locks.get(key):
+            lock.remaining = 0
+            lock.reset_at = max(lock.reset_at, time.perf_counter() + reset_after)
+
+    def _prune_ratelimit_locks(self) -> None:
+        """Forgets buckets that are idle and whose window has expired, they start over as provisional locks."""
+        for key, lock in list(self.ratelimit_locks.items()):
+            if lock.idle:
+                del self.ratelimit_locks[key]
+
+    async def _acquire_ratelimit(self, route: Route) -> BucketLock:
+        """
+        Acquires the rate limit bucket for a route.
+
+        If the route's bucket was discovered (and merged into an existing one) while we waited on a
+        provisional lock, we queue again on the registered lock. Returns the lock that is held.
+        """
+        lock = self.get_ratelimit(route)
+        while True:
+            await lock.acquire()
+            current = self.get_ratelimit(route)
+            if current is lock or lock.unlimited:
+                return lock
+            lock.release()
+            lock = current
 
     @staticmethod
     def _process_payload(
@@ -357,7 +506,7 @@ class HTTPClient(
         form_data.add_field("payload_json", FastJson.dumps(payload))
         return form_data
 
-    async def request(  # noqa: C901
+    async def request(
         self,
         route: Route,
         payload: list | dict | None = None,
@@ -377,6 +526,24 @@ class HTTPClient(
             params: Query string parameters
 
         """
+        # requests made by an interaction's callback count towards its "http" phase, see Client.interaction_metrics
+        if (timer := current_interaction_timer.get()) is not None and timer.count_http:
+            started = time.perf_counter()
+            try:
+                return await self._request(route, payload, files, reason, params, **kwargs)
+            finally:
+                timer.add_http(time.perf_counter() - started)
+        return await self._request(route, payload, files, reason, params, **kwargs)
+
+    async def _request(  # noqa: C901
+        self,
+        route: Route,
+        payload: list | dict | None = None,
+        files: list[UPLOADABLE_TYPE] | None = None,
+        reason: str | None = None,
+        params: dict | None = None,
+        **kwargs: dict,
+    ) -> str | dict[str, Any] | None:
         # Assemble headers
         kwargs["headers"] = {"User-Agent": self.user_agent}
         if self.token:
@@ -389,92 +556,88 @@ class HTTPClient(
         if isinstance(params, dict):
             kwargs["params"] = dict_filter(params)
 
-        lock = self.get_ratelimit(route)
-        # this gets a BucketLock for this route.
-        # If this endpoint has been used before, it will get an existing ratelimit for the respective buckethash
-        # otherwise a brand-new bucket lock will be returned
-
         for attempt in range(self._max_attempts):
-            async with lock:
-                try:
-                    if self.__session.closed:
-                        await self.login(cast(str, self.token))
-
-                    processed_data = self._process_payload(payload, files)
-                    if isinstance(processed_data, FormData):
-                        kwargs["data"] = processed_data  # pyright: ignore
-                    else:
-                        kwargs["json"] = processed_data  # pyright: ignore
-                    await self.global_lock.wait()
-
-                    if self.proxy:
-                        kwargs["proxy"] = self.proxy[0]
-                        kwargs["proxy_auth"] = self.proxy[1]
-
-                    async with self.__session.request(route.method, route.url, **kwargs) as response:
-                        result = await response_decode(response)
-                        self.ingest_ratelimit(route, response.headers, lock)
-
-                        if response.status == 429:
-                            # ratelimit exceeded
-                            result = cast(dict[str, str], result)
-                            if result.get("global", False):
-                                # global ratelimit is reached
-                                # if we get a global, that's pretty bad, this would usually happen if the user is hitting the api from 2 clients sharing a token
-                                self.log_ratelimit(
-                                    self.logger.warning,
-                                    f"Bot has exceeded global ratelimit, locking REST API for {result['retry_after']} seconds",
-                                )
-                                self.global_lock.set_reset_time(float(result["retry_after"]))
-                            elif result.get("message") == "The resource is being rate limited.":
-                                # resource ratelimit is reached
-                                self.log_ratelimit(
-                                    self.logger.warning,
-                                    f"{route.resolved_endpoint} The resource is being rate limited! "
-                                    f"Reset in {result.get('retry_after')} seconds",
-                                )
-                                # lock this resource and wait for unlock
-                                await lock.lock_for_duration(float(result["retry_after"]), block=True)
-                            else:
-                                # endpoint ratelimit is reached
-                                # 429's are unfortunately unavoidable, but we can attempt to avoid them
-                                # so long as these are infrequent we're doing well
-                                self.log_ratelimit(
-                                    self.logger.warning,
-                                    f"{route.resolved_endpoint} Has exceeded its ratelimit ({lock.limit})! Reset in {lock.delta} seconds",
-                                )
-                                await lock.lock_for_duration(lock.delta, block=True)
-                            continue
-                        if lock.remaining == 0:
-                            # Last call available in the bucket, lock until reset
+            # this gets (and acquires) the BucketLock for this route.
+            # If this endpoint has been used before, it will get the existing ratelimit for the respective buckethash
+            # otherwise the route's provisional lock, until the first response reveals the bucket
+            lock = await self._acquire_ratelimit(route)
+            try:
+                if self.__session.closed:
+                    await self.login(cast(str, self.token))
+
+                processed_data = self._process_payload(payload, files)
+                if isinstance(processed_data, FormData):
+                    kwargs["data"] = processed_data  # pyright: ignore
+                else:
+                    kwargs["json"] = processed_data  # pyright: ignore
+                await self.global_lock.wait()
+
+                if self.proxy:
+                    kwargs["proxy"] = self.proxy[0]
+                    kwargs["proxy_auth"] = self.proxy[1]
+
+                self.ratelimit_stats["requests"] += 1
+                async with self.__session.request(route.method, route.url, **kwargs) as response:
+                    result = await response_decode(response)
+                    self.ingest_ratelimit(route, response.headers, lock)
+
+                    if response.status == 429:
+                        # ratelimit exceeded
+                        self.ratelimit_stats["429"] += 1
+                        result = cast(dict[str, str], result)
+                        if result.get("global", False):
+                            self.ratelimit_stats["429_global"] += 1
+                            # global ratelimit is reached
+                            # if we get a global, that's pretty bad, this would usually happen if the user is hitting the api from 2 clients sharing a token
                             self.log_ratelimit(
-                                self.logger.debug,
-                                f"{route.resolved_endpoint} Has exhausted its ratelimit ({lock.limit})! Locking route for {lock.delta} seconds",
+                                self.logger.warning,
+                                f"Bot has exceeded global ratelimit, locking REST API for {result['retry_after']} seconds",
                             )
-                            await lock.lock_for_duration(
-                                lock.delta
-                            )  # lock this route, but continue processing the current response
-
-                        elif response.status in {500, 502, 504}:
-                            # Server issues, retry
-                            self.logger.warning(
-                                f"{route.resolved_endpoint} Received {response.status}... retrying in {1 + attempt * 2} seconds"
+                            self.global_lock.set_reset_time(float(result["retry_after"]))
+                        elif result.get("message") == "The resource is being rate limited.":
+                            self.ratelimit_stats["429_shared"] += 1
+                            # resource ratelimit is reached
+                            self.log_ratelimit(
+                                self.logger.warning,
+                                f"{route.resolved_endpoint} The resource is being rate limited! "
+                                f"Reset in {result.get('retry_after')} seconds",
                             )
-                            await asyncio.sleep(1 + attempt * 2)
-                            continue
-
-                        if not 300 > response.status >= 200:
-                            await self._raise_exception(response, route, result)
+                            # lock this resource and wait for unlock
+                            await lock.lock_for_duration(float(result["retry_after"]), block=True)
+                        else:
+                            # endpoint ratelimit is reached
+                            # 429's are unfortunately unavoidable, but we can attempt to avoid them
+                            # so long as these are infrequent we're doing well
+                            self.log_ratelimit(
+                                self.logger.warning,
+                                f"{route.resolved_endpoint} Has exceeded its ratelimit ({lock.limit})! Reset in {lock.delta} seconds",
+                            )
+                            await lock.lock_for_duration(lock.delta, block=True)
+                        continue
+                    # an exhausted bucket (remaining == 0) needs no locking here: the next acquire waits for the reset
 
-                        self.logger.debug(
-                            f"{route.resolved_endpoint} Received {response.status} :: [{lock.remaining}/{lock.limit} calls remaining]"
+                    if response.status in {500, 502, 504}:
+                        # Server issues, retry
+                        self.logger.warning(
+                            f"{route.resolved_endpoint} Received {response.status}... retrying in {1 + attempt * 2} seconds"
                         )
-                        return result
-                except OSError as e:
-                    if attempt < self._max_attempts - 1 and e.errno in (54, 10054):
                         await asyncio.sleep(1 + attempt * 2)
                         continue
-                    raise
+
+                    if not 300 > response.status >= 200:
+                        await self._raise_exception(response, route, result)
+
+                    self.logger.debug(
+                        f"{route.resolved_endpoint} Received {response.status} :: [{lock.remaining}/{lock.limit} calls remaining]"
+                    )
+                    return result
+            except OSError as e:
+                if attempt < self._max_attempts - 1 and e.errno in (54, 10054):
+                    await asyncio.sleep(1 + attempt * 2)
+                    continue
+                raise
+            finally:
+                lock.release()
 
     async def _raise_exception(self, response, route, result) -> None:
         self.logger.error(f"{route.method}::{route.url}: {response.status}")
@@ -512,6 +675,20 @@ class HTTPClient(
         log_func(message)
 
     async def request_cdn(self, url, asset) -> bytes:  # pyright: ignore [reportGeneralTypeIssues]
+        """
+        Get an asset from the CDN, through `cdn_cache`.
+
+        Args:
+            url: The url of the asset
+            asset: The asset being requested, used for logging and errors
+
+        Returns:
+            The asset's bytes
+
+        """
+        return await self.cdn_cache.get(CDNCache.key_for_url(url), lambda: self._download_cdn(url, asset))
+
+    async def _download_cdn(self, url, asset) -> bytes:  # pyright: ignore [reportGeneralTypeIssues]
         self.logger.debug(f"{asset} requests {url} from CDN")
         async with self.__session.get(url) as response:
             if response.status == 200:
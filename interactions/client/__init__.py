@@ -1,46 +1,55 @@
-from .const import (
-    __version__,
-    __repo_url__,
-    __py_version__,
-    __api_version__,
-    get_logger,
-    logger_name,
-    kwarg_spam,
-    DISCORD_EPOCH,
-    ACTION_ROW_MAX_ITEMS,
-    SELECTS_MAX_OPTIONS,
-    SELECT_MAX_NAME_LENGTH,
-    CONTEXT_MENU_NAME_LENGTH,
-    SLASH_CMD_NAME_LENGTH,
-    SLASH_CMD_MAX_DESC_LENGTH,
-    SLASH_CMD_MAX_OPTIONS,
-    SLASH_OPTION_NAME_LENGTH,
-    EMBED_MAX_NAME_LENGTH,
-    EMBED_MAX_DESC_LENGTH,
-    EMBED_MAX_FIELDS,
-    EMBED_TOTAL_MAX,
-    EMBED_FIELD_VALUE_LENGTH,
-    Singleton,
-    Sentinel,
-    GlobalScope,
-    Missing,
-    MentionPrefix,
-    GLOBAL_SCOPE,
-    MISSING,
-    MENTION_PREFIX,
-    PREMIUM_GUILD_LIMITS,
-    POLL_MAX_ANSWERS,
-    POLL_MAX_DURATION_HOURS,
-    Absent,
-    T,
-    T_co,
-    ClientT,
-)
-from .client import Client
-from .auto_shard_client import AutoShardedClient
-from . import smart_cache
-from . import errors
-from . import utils
+from typing import TYPE_CHECKING
+
+from interactions._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .const import (
+        __version__,
+        __repo_url__,
+        __py_version__,
+        __api_version__,
+        get_logger,
+        logger_name,
+        kwarg_spam,
+        DISCORD_EPOCH,
+        ACTION_ROW_MAX_ITEMS,
+        SELECTS_MAX_OPTIONS,
+        SELECT_MAX_NAME_LENGTH,
+        CONTEXT_MENU_NAME_LENGTH,
+        SLASH_CMD_NAME_LENGTH,
+        SLASH_CMD_MAX_DESC_LENGTH,
+        SLASH_CMD_MAX_OPTIONS,
+        SLASH_OPTION_NAME_LENGTH,
+        EMBED_MAX_NAME_LENGTH,
+        EMBED_MAX_DESC_LENGTH,
+        EMBED_MAX_FIELDS,
+        EMBED_TOTAL_MAX,
+        EMBED_FIELD_VALUE_LENGTH,
+        Singleton,
+        Sentinel,
+        GlobalScope,
+        Missing,
+        MentionPrefix,
+        GLOBAL_SCOPE,
+        MISSING,
+        MENTION_PREFIX,
+        PREMIUM_GUILD_LIMITS,
+        POLL_MAX_ANSWERS,
+        POLL_MAX_DURATION_HOURS,
+        Absent,
+        T,
+        T_co,
+        ClientT,
+    )
+    from .client import Client
+    from .auto_shard_client import AutoShardedClient
+    from .cluster import Cluster
+    from . import smart_cache
+    from . import metrics
+    from . import errors
+    from . import utils
+
+__getattr__, __dir__ = lazy_exports(__name__)
 
 __all__ = (
     "__version__",
@@ -81,7 +90,9 @@ __all__ = (
     "ClientT",
     "Client",
     "AutoShardedClient",
+    "Cluster",
     "smart_cache",
+    "metrics",
     "errors",
     "utils",
 )
@@ -1,14 +1,13 @@
 import asyncio
 import time
 from datetime import datetime
-from collections import defaultdict
-from typing import TYPE_CHECKING, Optional, List
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, List
 
 import interactions.api.events as events
 from interactions.api.events import ShardConnect
 from interactions.api.gateway.state import ConnectionState
 from interactions.client.client import Client
-from interactions.client.const import MISSING
+from interactions.client.const import MISSING, get_logger
 from interactions.models import (
     Guild,
     to_snowflake,
@@ -19,11 +18,69 @@ from interactions.models.internal.listener import Listener
 if TYPE_CHECKING:
     from interactions.models import Snowflake_Type
 
-__all__ = ("AutoShardedClient",)
+__all__ = ("AutoShardedClient", "IdentifyScheduler")
 
 from ..api.gateway.gateway import GatewayClient
 
 
+IDENTIFY_INTERVAL = 5.1
+"""Seconds between two identifies of one rate limit key, discord allows one every 5 seconds"""
+
+
+class IdentifyScheduler:
+    """
+    Paces identifies the way discord allows them.
+
+    Shards are grouped into `max_concurrency` rate limit keys (`shard_id % max_concurrency`), each allowing one
+    identify every `interval` seconds, and every identify counts towards the session start limit, which is waited
+    out if it is used up.
+    """
+
+    def __init__(self, max_concurrency: int = 1, interval: float = IDENTIFY_INTERVAL) -> None:
+        self.max_concurrency = max_concurrency
+        self.interval = interval
+        self.total: Optional[int] = None
+        self.remaining: Optional[int] = None  # None: unknown, not limited
+        self.reset_at: float = 0.0
+
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._next_identify: dict[int, float] = {}
+        self.logger = get_logger()
+
+    def configure(self, session_start_limit: dict) -> None:
+        """
+        Apply the `session_start_limit` of `get_gateway_bot`.
+
+        Args:
+            session_start_limit: The session start limit
+
+        """
+        self.max_concurrency = max(1, session_start_limit["max_concurrency"])
+        self.total = session_start_limit["total"]
+        self.remaining = session_start_limit["remaining"]
+        self.reset_at = time.perf_counter() + session_start_limit["reset_after"] / 1000
+
+    async def wait(self, shard_id: int) -> None:
+        """Waits until a shard may identify."""
+        key = shard_id % self.max_concurrency
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if (wait := self._next_identify.get(key, 0.0) - time.perf_counter()) > 0:
+                await asyncio.sleep(wait)
+            await self._take_session_start()
+            self._next_identify[key] = time.perf_counter() + self.interval
+
+    async def _take_session_start(self) -> None:
+        if self.remaining is None:
+            return
+        if self.remaining <= 0:
+            if (wait := self.reset_at - time.perf_counter()) > 0:
+                self.logger.warning(f"The session start limit is used up, waiting {wait:.1f}s for it to reset")
+                await asyncio.sleep(wait)
+            self.remaining = self.total
+            self.reset_at = time.perf_counter() + 24 * 60 * 60
+        self.remaining -= 1
+
+
 class AutoShardedClient(Client):
     """
     A client to automatically shard the bot.
@@ -42,6 +99,13 @@ class AutoShardedClient(Client):
         self._connection_states: list[ConnectionState] = []
 
         self.max_start_concurrency: int = 1
+        self.session_start_limit: Optional[dict] = None  # as discord sent it on login
+        self.cold_start_times: dict[int, float] = {}  # shard ID -> seconds from login until the shard was ready
+
+        self.identify_scheduler = IdentifyScheduler()
+        # awaited with a shard ID before that shard connects and identifies. A cluster worker replaces it, to let
+        # the cluster coordinator pace the identifies of all processes (see interactions.client.cluster)
+        self.identify_gate: Callable[[int], Awaitable[None]] = self.identify_scheduler.wait
 
     @property
     def gateway_started(self) -> bool:
@@ -85,9 +149,13 @@ class AutoShardedClient(Client):
     async def stop(self) -> None:
         """Shutdown the bot."""
         self.logger.debug("Stopping the bot.")
+        was_ready = self.is_ready
         self._ready.clear()
-        await self.http.close()
+        # the gateways first, they connect through the http session (and their sessions may be saved to resume)
         await asyncio.gather(*(state.stop() for state in self._connection_states))
+        if self.cache_snapshot and was_ready:
+            await self._save_cache_snapshot()
+        await self.http.close()
 
     def get_guild_websocket(self, guild_id: "Snowflake_Type") -> GatewayClient:
         """
@@ -143,17 +211,26 @@ class AutoShardedClient(Client):
         shard_id, total_shards = connection_data["shard"]
         connection_state = next((state for state in self._connection_states if state.shard_id == shard_id), None)
 
-        if expected_guilds:
+        if connection_data.get("resumed"):
+            # a session resumed after a restart: discord doesn't send the guilds again
+            self._user._add_guilds(expected_guilds)
+        elif expected_guilds:
+            # shards start in parallel and share _guild_event, so it is never cleared (another shard might miss a set):
+            # it is replaced once set. An event replaced after we took it has been set, so a guild can't be missed
             while True:
-                try:
-                    await asyncio.wait_for(self._guild_event.wait(), self.guild_event_timeout)
-                except asyncio.TimeoutError:
-                    self.logger.warning("Timeout waiting for guilds cache: Not all guilds will be in cache")
-                    break
-                self._guild_event.clear()
+                guild_event = self._guild_event
                 if all(self.cache.get_guild(g_id) is not None for g_id in expected_guilds):
                     # all guilds cached
                     break
+                try:
+                    await asyncio.wait_for(guild_event.wait(), self.guild_event_timeout)
+                except asyncio.TimeoutError:
+                    self.logger.warning(
+                        f"Shard {shard_id} timed out waiting for guilds cache: Not all guilds will be in cache"
+                    )
+                    break
+                if self._guild_event is guild_event:
+                    self._guild_event = asyncio.Event()
 
             if self.fetch_members:
                 self.logger.info(f"Shard {shard_id} is waiting for members to be chunked")
@@ -204,35 +281,39 @@ class AutoShardedClient(Client):
         self.logger.debug("Starting http client...")
         await self.login(token)
 
-        tasks = []
-
-        # Sort shards into their respective ratelimit buckets
-        shard_buckets = defaultdict(list)
-        for shard in self._connection_states:
-            bucket = str(shard.shard_id % self.max_start_concurrency)
-            shard_buckets[bucket].append(shard)
-
-        for bucket in shard_buckets.values():
-            for shard in bucket:
-                self.logger.debug(f"Starting {shard.shard_id}")
-                start = time.perf_counter()
-                tasks.append(asyncio.create_task(shard.start()))
-
-                if self.max_start_concurrency == 1:
-                    # connection ratelimiting when discord has asked for one connection concurrently
-                    # noinspection PyProtectedMember
-                    await shard._shard_ready.wait()
-                    await asyncio.sleep(5.1 - (time.perf_counter() - start))
-
-            # wait for shards to finish starting
-            # noinspection PyProtectedMember
-            await asyncio.gather(*[shard._shard_ready.wait() for shard in self._connection_states])
-
+        # every shard is started at once, identify_gate lets each through when its rate limit key allows an identify.
+        # Shards of different keys identify in parallel, and a shard waiting for READY doesn't hold up the next identify
+        started = time.perf_counter()
+        self.cold_start_times = {}
+        tasks = [asyncio.create_task(self._start_shard(shard, started)) for shard in self._connection_states]
         try:
             await asyncio.gather(*tasks)
         finally:
             await self.stop()
 
+    async def _start_shard(self, shard: ConnectionState, started: float) -> None:
+        if self.session_store is not None:
+            shard.resume_session = self.session_store.take(shard.shard_id, self.total_shards)
+        if shard.resume_session is None:
+            # resuming doesn't identify
+            await self.identify_gate(shard.shard_id)
+        self.logger.debug(f"Starting {shard.shard_id}")
+        connection = asyncio.create_task(shard.start())
+        # noinspection PyProtectedMember
+        ready = asyncio.create_task(shard._shard_ready.wait())
+        await asyncio.wait({connection, ready}, return_when=asyncio.FIRST_COMPLETED)
+        if ready.done():
+            self.cold_start_times[shard.shard_id] = time.perf_counter() - started
+            self.logger.info(
+                f"Shard {shard.shard_id} is ready {self.cold_start_times[shard.shard_id]:.1f}s after login"
+            )
+            if len(self.cold_start_times) == len(self._connection_states):
+                slowest = max(self.cold_start_times.values())
+                self.logger.info(f"All {len(self.cold_start_times)} shards are ready after {slowest:.1f}s")
+        else:
+            ready.cancel()
+        await connection
+
     async def login(self, token: str | None = None) -> None:
         """
         Login to discord via http.
@@ -247,7 +328,9 @@ class AutoShardedClient(Client):
         await super().login(token)
         data = await self.http.get_gateway_bot()
 
-        self.max_start_concurrency = data["session_start_limit"]["max_concurrency"]
+        self.session_start_limit = data["session_start_limit"]
+        self.max_start_concurrency = self.session_start_limit["max_concurrency"]
+        self.identify_scheduler.configure(self.session_start_limit)
         if self.auto_sharding:
             self.total_shards = data["shards"]
         elif data["shards"] != self.total_shards:
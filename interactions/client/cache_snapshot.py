@@ -0,0 +1,198 @@
+"""
+Binary snapshots of the client's cache, so a restarted client starts with its guilds, channels and members.
+
+A snapshot is a header followed by length-prefixed frames, each a pickled batch of `(key, object)` pairs of one cache.
+The cached objects are pickled as they are, with the client they reference written as a placeholder that is swapped
+for the restoring client on load. Only load snapshots written by your own client, loading a
+pickle runs whatever it was told to.
+"""
+
+import asyncio
+import functools
+import hashlib
+import importlib
+import io
+import os
+import pickle
+import struct
+import time
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterator, Optional
+
+import attrs
+
+from interactions.client.const import Sentinel, __version__
+
+if TYPE_CHECKING:
+    from interactions.client.client import Client
+    from interactions.client.smart_cache import GlobalCache
+
+__all__ = ("SNAPSHOT_CACHES", "read_snapshot", "write_snapshot")
+
+MAGIC = b"IPYCACHE"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8sHd16p16s")  # magic, format version, saved at, library version, fingerprint
+FRAME = struct.Struct("<I")  # length of the pickled batch that follows
+
+SNAPSHOT_CACHES = (
+    "guild_cache",
+    "role_cache",
+    "channel_cache",
+    "user_cache",
+    "member_cache",
+    "emoji_cache",
+    "user_guilds",
+)
+"""The caches a snapshot holds, guilds first. Messages, voice states and DM channels are not worth keeping."""
+
+SNAPSHOT_MODULES = tuple(
+    f"interactions.models.discord.{name}"
+    for name in (
+        "activity",
+        "app_perms",
+        "asset",
+        "base",
+        "channel",
+        "color",
+        "emoji",
+        "guild",
+        "role",
+        "thread",
+        "user",
+    )
+)
+"""The modules of the cached objects and the objects they hold, whose classes the fingerprint covers."""
+
+
+@functools.cache
+def class_fingerprint() -> bytes:
+    """
+    Get a digest of the fields of every class a snapshot may hold.
+
+    The library can change without its version changing, and unpickling objects of an older class layout would
+    silently leave new fields missing.
+
+    Returns:
+        16 bytes that change whenever a field of one of these classes is added, removed or renamed
+
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for module_name in SNAPSHOT_MODULES:
+        module = importlib.import_module(module_name)
+        classes = (obj for obj in vars(module).values() if isinstance(obj, type) and obj.__module__ == module_name)
+        for cls in sorted((cls for cls in classes if attrs.has(cls)), key=lambda cls: cls.__qualname__):
+            digest.update(f"{module_name}.{cls.__qualname__}:{','.join(f.name for f in attrs.fields(cls))};".encode())
+    return digest.digest()
+
+
+def _restoring_client() -> None:
+    """Stands in for the client in a snapshot, the unpickler returns the restoring client for it."""
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def __init__(self, file: BinaryIO, client: "Client") -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.client = client
+
+    def reducer_override(self, obj: Any) -> Any:
+        # unlike persistent_id, this isn't called for the ints, strings and containers that make up most of a cache
+        if obj is self.client:
+            return _restoring_client, ()
+        if isinstance(obj, Sentinel):
+            return type(obj), ()  # sentinels are singletons
+        return NotImplemented
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file: BinaryIO, client: "Client") -> None:
+        super().__init__(file)
+        self.client = client
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module == __name__ and name == _restoring_client.__name__:
+            client = self.client  # not self, the unpickler's memo keeps this
+            return lambda: client
+        return super().find_class(module, name)
+
+
+def _dump(client: "Client", batch: tuple) -> bytes:
+    buffer = io.BytesIO()
+    buffer.write(FRAME.pack(0))
+    _SnapshotPickler(buffer, client).dump(batch)
+    frame = buffer.getbuffer()
+    FRAME.pack_into(frame, 0, len(frame) - FRAME.size)
+    return bytes(frame)
+
+
+def _batches(cache: "GlobalCache", batch_size: int) -> Iterator[tuple]:
+    for name in SNAPSHOT_CACHES:
+        entries = getattr(cache, name)
+        if not entries:
+            continue
+        items = list(entries.items())
+        for i in range(0, len(items), batch_size):
+            yield name, items[i : i + batch_size]
+
+
+async def write_snapshot(cache: "GlobalCache", path: str, batch_size: int = 2000) -> int:
+    """
+    Write a snapshot of a cache, one batch at a time so the event loop keeps running in between.
+
+    Batches are pickled on the event loop (the objects may change under a thread) and written to the file from a
+    thread. The snapshot replaces `path` once complete.
+
+    Args:
+        cache: The cache to snapshot
+        path: The file to write
+        batch_size: Entries per frame
+
+    Returns:
+        The number of entries written
+
+    """
+    temp_path = f"{path}.tmp"
+    written = 0
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, time.time(), __version__.encode(), class_fingerprint()))
+        for batch in _batches(cache, batch_size):
+            frame = _dump(cache._client, batch)
+            await asyncio.to_thread(f.write, frame)
+            written += len(batch[1])
+    os.replace(temp_path, path)
+    return written
+
+
+def read_snapshot(client: "Client", path: str, max_age: Optional[float] = None) -> Iterator[tuple]:
+    """
+    Read the batches of a snapshot.
+
+    Args:
+        client: The client the restored objects belong to
+        path: The snapshot file
+        max_age: Seconds after which the snapshot is ignored, None to accept any age
+
+    Returns:
+        An iterator of `(cache name, [(key, object), ...])`, empty if the snapshot is too old, of another version
+        or was written with different cached classes
+
+    Raises:
+        ValueError: If the file is not a snapshot
+
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not a cache snapshot")
+        magic, format_version, saved_at, library_version, fingerprint = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a cache snapshot")
+        if format_version != FORMAT_VERSION or library_version.decode() != __version__:
+            # the cached classes may have changed since
+            return
+        if fingerprint != class_fingerprint():
+            return
+        if max_age is not None and time.time() - saved_at > max_age:
+            return
+
+        while length := f.read(FRAME.size):
+            (length,) = FRAME.unpack(length)
+            yield _SnapshotUnpickler(io.BytesIO(f.read(length)), client).load()
@@ -38,6 +38,7 @@ import interactions.client.const as constants
 from interactions.api.events import BaseEvent, RawGatewayEvent, processors
 from interactions.api.events.internal import CallbackAdded
 from interactions.api.gateway.gateway import GatewayClient
+from interactions.api.gateway.session_store import GatewaySessionStore
 from interactions.api.gateway.state import ConnectionState
 from interactions.api.http.http_client import HTTPClient
 from interactions.client import errors
@@ -59,8 +60,9 @@ from interactions.client.errors import (
     HTTPException,
     NotFound,
 )
+from interactions.client.metrics import InteractionMetrics, InteractionTimer, current_interaction_timer
 from interactions.client.smart_cache import GlobalCache
-from interactions.client.utils import NullCache, FastJson
+from interactions.client.utils import NullCache, FastJson, RegexRoutes
 from interactions.client.utils.misc_utils import get_event_name, wrap_partial
 from interactions.client.utils.serializer import to_image_data
 from interactions.models import (
@@ -88,6 +90,8 @@ from interactions.models import (
     VoiceRegion,
 )
 from interactions.models import Wait
+from interactions.models.internal.wait import WAIT_KEYS
+from interactions.models.internal.autocomplete_cache import AutocompleteCache
 from interactions.models.discord.color import BrandColors
 from interactions.models.discord.components import get_components_ids, BaseComponent
 from interactions.models.discord.embed import Embed
@@ -396,6 +400,12 @@ class Client(
         # Sharding
         self.total_shards = total_shards
         self._connection_state: ConnectionState = ConnectionState(self, intents, shard_id=shard_id)
+        self.session_store: Optional[GatewaySessionStore] = None
+        """Saves the gateway sessions on `stop()` so the next start can RESUME them, see `GatewaySessionStore`"""
+        self.cache_snapshot: Optional[str] = None
+        """A file to save the cache to on `stop()` and restore it from on login, see `GlobalCache.save_snapshot`"""
+        self.cache_snapshot_max_age: Optional[float] = None
+        """Seconds after which the cache snapshot is too old to restore, None to restore any age"""
 
         self.enforce_interaction_perms = enforce_interaction_perms
 
@@ -426,9 +436,9 @@ class Client(
         )
         """A dictionary of registered application commands in a tree"""
         self._component_callbacks: Dict[str, Callable[..., Coroutine]] = {}
-        self._regex_component_callbacks: Dict[re.Pattern, Callable[..., Coroutine]] = {}
+        self._regex_component_callbacks: RegexRoutes[re.Pattern, Callable[..., Coroutine]] = RegexRoutes()
         self._modal_callbacks: Dict[str, Callable[..., Coroutine]] = {}
-        self._regex_modal_callbacks: Dict[re.Pattern, Callable[..., Coroutine]] = {}
+        self._regex_modal_callbacks: RegexRoutes[re.Pattern, Callable[..., Coroutine]] = RegexRoutes()
         self._global_autocompletes: Dict[str, GlobalAutoComplete] = {}
         self.processors: Dict[str, Callable[..., Coroutine]] = {}
         self.__modules = {}
@@ -436,6 +446,14 @@ class Client(
         """A dictionary of mounted ext"""
         self.listeners: Dict[str, list[Listener]] = {}
         self.waits: Dict[str, List] = {}
+        self.interaction_metrics: InteractionMetrics = InteractionMetrics()
+        """Per command latency histograms of interaction handling. Disabled until `interaction_metrics.enabled` is set"""
+        self.context_channel_stats: dict[str, int] = {"payload": 0, "cached": 0, "fetched": 0, "failed": 0}
+        """How interaction contexts got their channel: from the interaction payload, the cache, or a REST fetch"""
+        self.autocomplete_cache: AutocompleteCache = AutocompleteCache()
+        """Responses of autocompletes registered with a `cache_ttl`"""
+        self.keyed_waits: Dict[str, Dict[str, Dict[Snowflake, List[Wait]]]] = {}
+        """Waits by event name, `WAIT_KEYS` name and id. An event only runs the checks of the waits for its ids"""
         self.owner_ids: set[Snowflake_Type] = set(owner_ids)
 
         self.async_startup_tasks: list[tuple[Callable[..., Coroutine], Iterable[Any], dict[str, Any]]] = []
@@ -877,7 +895,8 @@ class Client(
         self._user._add_guilds(expected_guilds)
 
         if not self._startup:
-            while len(self.guilds) != len(expected_guilds):
+            # a session resumed after a restart: discord doesn't send the guilds again
+            while not data.get("resumed") and len(self.guilds) != len(expected_guilds):
                 try:  # wait to let guilds cache
                     await asyncio.wait_for(self._guild_event.wait(), self.guild_event_timeout)
                 except asyncio.TimeoutError:
@@ -888,7 +907,7 @@ class Client(
                     break
                 self._guild_event.clear()
 
-            if self.fetch_members:
+            if self.fetch_members and not data.get("resumed"):
                 # ensure all guilds have completed chunking
                 for guild in self.guilds:
                     if guild and not guild.chunked.is_set():
@@ -957,6 +976,8 @@ class Client(
         self.cache.place_user_data(me)
         self._app = Application.from_dict(await self.http.get_current_bot_information(), self)
         self._mention_reg = re.compile(rf"^(<@!?{self.user.id}*>\s)")
+        if self.cache_snapshot:
+            self.cache.load_snapshot(self.cache_snapshot, max_age=self.cache_snapshot_max_age)
 
         if self.app.owner:
             self.owner_ids.add(self.app.owner.id)
@@ -1027,11 +1048,30 @@ class Client(
     async def stop(self) -> None:
         """Shutdown the bot."""
         self.logger.debug("Stopping the bot.")
+        was_ready = self.is_ready
         self._ready.clear()
-        await self.http.close()
+        # the gateway first, it connects through the http session (and its session may be saved to resume)
         await self._connection_state.stop()
+        if self.cache_snapshot and was_ready:
+            await self._save_cache_snapshot()
+        await self.http.close()
+
+    async def _save_cache_snapshot(self) -> None:
+        try:
+            await self.cache.save_snapshot(self.cache_snapshot)
+        except Exception as e:
+            self.logger.error(f"Could not save the cache snapshot: {e!r}")
 
     async def _process_waits(self, event: events.BaseEvent) -> None:
+        if keyed_waits := self.keyed_waits.get(event.resolved_name):
+            for key_name, waits_by_id in list(keyed_waits.items()):
+                key_value = WAIT_KEYS[key_name](event)
+                if key_value is None or not (_waits := waits_by_id.get(key_value)):
+                    continue
+                for _wait in list(_waits):
+                    if not _wait.future.done() and await _wait(event):
+                        self._discard_keyed_wait(event.resolved_name, key_name, key_value, _wait)
+
         if _waits := self.waits.get(event.resolved_name, []):
             index_to_remove = []
             for i, _wait in enumerate(_waits):
@@ -1042,6 +1082,18 @@ class Client(
             for idx in sorted(index_to_remove, reverse=True):
                 _waits.pop(idx)
 
+    def _discard_keyed_wait(self, event_name: str, key_name: str, key_value: Snowflake, wait: Wait) -> None:
+        waits_by_id = self.keyed_waits.get(event_name, {}).get(key_name, {})
+        _waits = waits_by_id.get(key_value, [])
+        with contextlib.suppress(ValueError):
+            _waits.remove(wait)
+        if not _waits and key_value in waits_by_id:
+            del waits_by_id[key_value]
+            if not waits_by_id:
+                del self.keyed_waits[event_name][key_name]
+                if not self.keyed_waits[event_name]:
+                    del self.keyed_waits[event_name]
+
     def dispatch(self, event: events.BaseEvent, *args, **kwargs) -> None:
         """
         Dispatch an event.
@@ -1083,6 +1135,8 @@ class Client(
         event: type[EventT],
         checks: Absent[Callable[[EventT], bool] | Callable[[EventT], Awaitable[bool]]] = MISSING,
         timeout: Optional[float] = None,
+        *,
+        key: Optional[tuple[str, "Snowflake_Type"]] = None,
     ) -> "Awaitable[EventT]": ...
 
     @overload
@@ -1091,6 +1145,8 @@ class Client(
         event: str,
         checks: Callable[[EventT], bool] | Callable[[EventT], Awaitable[bool]],
         timeout: Optional[float] = None,
+        *,
+        key: Optional[tuple[str, "Snowflake_Type"]] = None,
     ) -> "Awaitable[EventT]": ...
 
     @overload
@@ -1099,6 +1155,8 @@ class Client(
         event: str,
         checks: Missing = MISSING,
         timeout: Optional[float] = None,
+        *,
+        key: Optional[tuple[str, "Snowflake_Type"]] = None,
     ) -> Awaitable[Any]: ...
 
     def wait_for(
@@ -1106,6 +1164,8 @@ class Client(
         event: Union[str, "type[BaseEvent]"],
         checks: Absent[Callable[[BaseEvent], bool] | Callable[[BaseEvent], Awaitable[bool]]] = MISSING,
         timeout: Optional[float] = None,
+        *,
+        key: Optional[tuple[str, "Snowflake_Type"]] = None,
     ) -> Awaitable[Any]:
         """
         Waits for a WebSocket event to be dispatched.
@@ -1114,17 +1174,30 @@ class Client(
             event: The name of event to wait.
             checks: A predicate to check what to wait for.
             timeout: The number of seconds to wait before timing out.
+            key: Only consider events about this id, e.g. `("message_id", message.id)`. See `WAIT_KEYS` for the supported names. \
+                Keyed waits are looked up by id, so any number of them costs other events nothing. `checks` still applies.
 
         Returns:
             The event object.
 
         """
         event = get_event_name(event)
+        future = asyncio.Future()
+
+        if key is not None:
+            key_name, key_value = key
+            if key_name not in WAIT_KEYS:
+                raise ValueError(f"Unknown wait key {key_name!r}, expected one of {', '.join(WAIT_KEYS)}")
+            key_value = to_snowflake(key_value)
+            wait = Wait(event, checks, future)
+            self.keyed_waits.setdefault(event, {}).setdefault(key_name, {}).setdefault(key_value, []).append(wait)
+            # Timed out or cancelled waits would otherwise linger until an event with their id shows up
+            future.add_done_callback(lambda _: self._discard_keyed_wait(event, key_name, key_value, wait))
+            return asyncio.wait_for(future, timeout)
 
         if event not in self.waits:
             self.waits[event] = []
 
-        future = asyncio.Future()
         self.waits[event].append(Wait(event, checks, future))
 
         return asyncio.wait_for(future, timeout)
@@ -1459,7 +1532,7 @@ class Client(
 
         for listener in command.listeners:
             if isinstance(listener, re.Pattern):
-                if listener in self._regex_component_callbacks.keys():
+                if listener in self._regex_modal_callbacks.keys():
                     raise ValueError(f"Duplicate Component! Multiple modal callbacks for `{listener}`")
                 self._regex_modal_callbacks[listener] = command
             else:
@@ -1853,16 +1926,26 @@ class Client(
             case _:
                 self.logger.warning(f"Unknown interaction type [{data['type']}] - please update or report this.")
                 cls = self.interaction_context.from_dict(self, data)
-        if not cls.channel:
-            # fallback channel if not provided
-            try:
-                if cls.guild_id:
-                    channel = await self.cache.fetch_channel(data["channel_id"])
-                else:
-                    channel = await self.cache.fetch_dm_channel(cls.author_id)
-                cls.channel_id = channel.id
-            except Forbidden:
-                self.logger.debug(f"Failed to fetch channel data for {data['channel_id']}")
+        if cls.channel:
+            # the partial channel discord sends along is cached by `from_dict`, use `ctx.fetch_channel` for the full one
+            self.context_channel_stats["payload" if "channel" in data else "cached"] += 1
+            return cls
+
+        if timer := current_interaction_timer.get():
+            timer.mark("context")
+        # fallback channel if not provided
+        try:
+            if cls.guild_id:
+                channel = await self.cache.fetch_channel(data["channel_id"])
+            else:
+                channel = await self.cache.fetch_dm_channel(cls.author_id)
+            cls.channel_id = channel.id
+            self.context_channel_stats["fetched"] += 1
+        except Forbidden:
+            self.logger.debug(f"Failed to fetch channel data for {data['channel_id']}")
+            self.context_channel_stats["failed"] += 1
+        if timer:
+            timer.mark("channel_fetch")
         return cls
 
     async def handle_pre_ready_response(self, data: dict) -> None:
@@ -1896,7 +1979,7 @@ class Client(
         return await command(ctx, **ctx.kwargs)
 
     @processors.Processor.define("raw_interaction_create")
-    async def _dispatch_interaction(self, event: RawGatewayEvent) -> None:  # noqa: C901
+    async def _dispatch_interaction(self, event: RawGatewayEvent) -> None:
         """
         Identify and dispatch interaction of slash commands or components.
 
@@ -1916,49 +1999,15 @@ class Client(
             InteractionType.APPLICATION_COMMAND,
             InteractionType.AUTOCOMPLETE,
         ):
-            interaction_id = interaction_data["data"]["id"]
-            name = interaction_data["data"]["name"]
-
-            ctx = await self.get_context(interaction_data)
-            if ctx.command:
-                self.logger.debug(f"{ctx.command_id}::{ctx.command.name} should be called")
-
-                if ctx.command.auto_defer:
-                    auto_defer = ctx.command.auto_defer
-                elif ctx.command.extension and ctx.command.extension.auto_defer:
-                    auto_defer = ctx.command.extension.auto_defer
-                else:
-                    auto_defer = self.auto_defer
-
-                if auto_opt := getattr(ctx, "focussed_option", None):
-                    if autocomplete := ctx.command.autocomplete_callbacks.get(str(auto_opt.name)):
-                        if ctx.command.has_binding:
-                            callback = functools.partial(ctx.command.call_with_binding, autocomplete)
-                        else:
-                            callback = autocomplete
-                    elif autocomplete := self._global_autocompletes.get(str(auto_opt.name)):
-                        callback = autocomplete
-                    else:
-                        raise ValueError(f"Autocomplete callback for {auto_opt.name!s} not found")
-
-                    await self.__dispatch_interaction(
-                        ctx=ctx,
-                        callback=callback(ctx),
-                        callback_kwargs=ctx.kwargs,
-                        error_callback=events.AutocompleteError,
-                        completion_callback=events.AutocompleteCompletion,
-                    )
-                else:
-                    await auto_defer(ctx)
-                    await self.__dispatch_interaction(
-                        ctx=ctx,
-                        callback=self._run_slash_command(ctx.command, ctx),
-                        callback_kwargs=ctx.kwargs,
-                        error_callback=events.CommandError,
-                        completion_callback=events.CommandCompletion,
-                    )
+            if timer := self.interaction_metrics.start():
+                timer_token = current_interaction_timer.set(timer)
+                try:
+                    await self._dispatch_command_interaction(interaction_data, timer)
+                finally:
+                    current_interaction_timer.reset(timer_token)
+                    timer.finish()
             else:
-                self.logger.error(f"Unknown cmd_id received:: {interaction_id} ({name})")
+                await self._dispatch_command_interaction(interaction_data)
 
         elif interaction_data["type"] == InteractionType.MESSAGE_COMPONENT:
             # Buttons, Selects, ContextMenu::Message
@@ -1968,11 +2017,8 @@ class Client(
             self.dispatch(events.Component(ctx=ctx))
             component_callback = self._component_callbacks.get(ctx.custom_id)
             if not component_callback:
-                # evaluate regex component callbacks
-                for regex, callback in self._regex_component_callbacks.items():
-                    if regex.match(ctx.custom_id):
-                        component_callback = callback
-                        break
+                # evaluate regex component callbacks, indexed by their literal prefix
+                component_callback = self._regex_component_callbacks.match(ctx.custom_id)
 
             if component_callback:
                 await self.__dispatch_interaction(
@@ -1994,11 +2040,8 @@ class Client(
 
             modal_callback = self._modal_callbacks.get(ctx.custom_id)
             if not modal_callback:
-                # evaluate regex component callbacks
-                for regex, callback in self._regex_modal_callbacks.items():
-                    if regex.match(ctx.custom_id):
-                        modal_callback = callback
-                        break
+                # evaluate regex modal callbacks, indexed by their literal prefix
+                modal_callback = self._regex_modal_callbacks.match(ctx.custom_id)
 
             if modal_callback:
                 await self.__dispatch_interaction(
@@ -2008,6 +2051,68 @@ class Client(
         else:
             raise NotImplementedError(f"Unknown Interaction Received: {interaction_data['type']}")
 
+    async def _dispatch_command_interaction(
+        self, interaction_data: dict, timer: Optional[InteractionTimer] = None
+    ) -> None:
+        """Dispatch an application command or autocomplete interaction, timing its phases if given a timer."""
+        interaction_id = interaction_data["data"]["id"]
+        name = interaction_data["data"]["name"]
+
+        ctx = await self.get_context(interaction_data)
+        if timer:
+            timer.mark("context")
+        if ctx.command:
+            self.logger.debug(f"{ctx.command_id}::{ctx.command.name} should be called")
+
+            if ctx.command.auto_defer:
+                auto_defer = ctx.command.auto_defer
+            elif ctx.command.extension and ctx.command.extension.auto_defer:
+                auto_defer = ctx.command.extension.auto_defer
+            else:
+                auto_defer = self.auto_defer
+
+            if auto_opt := getattr(ctx, "focussed_option", None):
+                if autocomplete := ctx.command.autocomplete_callbacks.get(str(auto_opt.name)):
+                    if ctx.command.has_binding:
+                        callback = functools.partial(ctx.command.call_with_binding, autocomplete)
+                    else:
+                        callback = autocomplete
+                elif autocomplete := self._global_autocompletes.get(str(auto_opt.name)):
+                    callback = autocomplete
+                else:
+                    raise ValueError(f"Autocomplete callback for {auto_opt.name!s} not found")
+
+                if timer:
+                    timer.kind, timer.name = "autocomplete", f"{ctx.command.resolved_name}:{auto_opt.name}"
+                if cache_ttl := getattr(ctx.command, "autocomplete_cache_ttls", {}).get(str(auto_opt.name)):
+                    response = self.autocomplete_cache.respond(ctx, callback, cache_ttl)
+                else:
+                    response = callback(ctx)
+                await self.__dispatch_interaction(
+                    ctx=ctx,
+                    callback=response,
+                    callback_kwargs=ctx.kwargs,
+                    error_callback=events.AutocompleteError,
+                    completion_callback=events.AutocompleteCompletion,
+                    timer=timer,
+                )
+            else:
+                if timer:
+                    timer.kind, timer.name = "command", str(ctx.command.resolved_name)
+                await auto_defer(ctx)
+                if timer:
+                    timer.mark("auto_defer")
+                await self.__dispatch_interaction(
+                    ctx=ctx,
+                    callback=self._run_slash_command(ctx.command, ctx),
+                    callback_kwargs=ctx.kwargs,
+                    error_callback=events.CommandError,
+                    completion_callback=events.CommandCompletion,
+                    timer=timer,
+                )
+        else:
+            self.logger.error(f"Unknown cmd_id received:: {interaction_id} ({name})")
+
     # todo add typing once context is re-implemented
     async def __dispatch_interaction(
         self,
@@ -2016,10 +2121,13 @@ class Client(
         error_callback: Type[BaseEvent],
         completion_callback: Type[BaseEvent] | None = None,
         callback_kwargs: dict | None = None,
+        timer: Optional[InteractionTimer] = None,
     ) -> None:
         if callback_kwargs is None:
             callback_kwargs = {}
 
+        if timer:
+            timer.count_http = True
         try:
             if self.pre_run_callback:
                 await self.pre_run_callback(ctx, **callback_kwargs)
@@ -2043,6 +2151,9 @@ class Client(
         except Exception as e:
             self.dispatch(error_callback(ctx=ctx, error=e))
         finally:
+            if timer:
+                timer.mark("callback")
+                timer.count_http = False
             if completion_callback:
                 self.dispatch(completion_callback(ctx=ctx))
 
@@ -0,0 +1,490 @@
+"""
+Run an AutoShardedClient across several processes.
+
+A `Cluster` starts `workers` processes that each run their own client for a slice of the shard IDs. The parent process
+is the coordinator: the workers connect to it over a Unix socket (newline delimited JSON) so that together they stay
+within the limits discord applies to the token, not to a process:
+
+- the global rate limit, workers lease calls from one shared window (`SharedGlobalLock`)
+- buckets used up by one worker are marked as used up in the others
+- identifies, paced per rate limit key and session start limit by one `IdentifyScheduler`
+
+Workers also report their shard latencies and guild counts, which the coordinator aggregates (`Cluster.stats`,
+`ClusterLink.cluster_stats`).
+
+```python
+from functools import partial
+
+if __name__ == "__main__":
+    Cluster(partial(AutoShardedClient, token="..."), total_shards=16, workers=4).start()
+```
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Any, Callable, Optional
+
+import interactions.client.const as constants
+from interactions.api.http.http_client import BucketLock, GlobalLock
+from interactions.client.auto_shard_client import IDENTIFY_INTERVAL, AutoShardedClient, IdentifyScheduler
+from interactions.client.utils.input_utils import FastJson
+
+__all__ = ("Cluster", "ClusterCoordinator", "ClusterLink", "SharedGlobalLock")
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict) -> None:
+    writer.write(FastJson.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+def _finite(latency: float) -> Optional[float]:
+    return latency if math.isfinite(latency) else None
+
+
+class ClusterCoordinator:
+    """The state the workers of a cluster share, served over a Unix socket."""
+
+    def __init__(self, socket_path: str, identify_interval: float = IDENTIFY_INTERVAL, global_limit: int = 45) -> None:
+        self.socket_path = socket_path
+        self.global_limit = global_limit
+
+        self.workers: dict[int, asyncio.StreamWriter] = {}
+        self.worker_stats: dict[int, dict] = {}
+        self.identifies: list[int] = []  # shard IDs in the order they were allowed to identify
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._global_lock = asyncio.Lock()
+        self._global_calls = 0
+        self._global_reset = 0.0
+        self.identify_scheduler = IdentifyScheduler(interval=identify_interval)
+        self._tasks: set[asyncio.Task] = set()
+
+        self.logger = constants.get_logger()
+
+    async def start(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._serve, path=self.socket_path)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in self.workers.values():
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def broadcast(self, message: dict, exclude: Optional[int] = None) -> None:
+        """
+        Send a message to every connected worker.
+
+        Args:
+            message: The message
+            exclude: A worker ID not to send it to, usually the one it came from
+
+        """
+        for worker_id, writer in list(self.workers.items()):
+            if worker_id != exclude:
+                try:
+                    await _send(writer, message)
+                except (ConnectionError, RuntimeError):
+                    self.workers.pop(worker_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Aggregate the latest stats reported by the workers.
+
+        Returns:
+            The number of workers reporting, the latency of each shard (None until it has been measured), their mean and the total guild count
+
+        """
+        shards = {}
+        for stats in self.worker_stats.values():
+            shards.update({int(shard_id): latency for shard_id, latency in stats["latencies"].items()})
+        measured = [latency for latency in shards.values() if latency is not None]
+        return {
+            "workers": len(self.worker_stats),
+            "shards": dict(sorted(shards.items())),
+            "latency": sum(measured) / len(measured) if measured else None,
+            "guilds": sum(stats["guilds"] for stats in self.worker_stats.values()),
+        }
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        worker_id = None
+        try:
+            while line := await reader.readline():
+                message = FastJson.loads(line)
+                if message["op"] == "hello":
+                    worker_id = message["worker"]
+                    self.workers[worker_id] = writer
+                    self.logger.debug(f"Cluster worker {worker_id} connected with shards {message['shards']}")
+                task = asyncio.create_task(self._handle(worker_id, message, writer))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            if worker_id is not None and self.workers.get(worker_id) is writer:
+                del self.workers[worker_id]
+                self.worker_stats.pop(worker_id, None)
+                self.logger.debug(f"Cluster worker {worker_id} disconnected")
+            writer.close()
+
+    async def _handle(self, worker_id: Optional[int], message: dict, writer: asyncio.StreamWriter) -> None:
+        reply = None
+        try:
+            match message["op"]:
+                case "hello":
+                    reply = {}
+                case "global":
+                    reply = await self._lease_global(message["count"])
+                case "global_429":
+                    self._global_calls = 0
+                    self._global_reset = time.perf_counter() + message["retry_after"]
+                    await self.broadcast(message, exclude=worker_id)
+                case "bucket":
+                    await self.broadcast(message, exclude=worker_id)
+                case "identify":
+                    await self._wait_identify(message["shard_id"], message["session_start_limit"])
+                    reply = {}
+                case "stats":
+                    self.worker_stats[worker_id] = {"latencies": message["latencies"], "guilds": message["guilds"]}
+                case "cluster_stats":
+                    reply = self.stats()
+                    reply["shards"] = {str(shard_id): latency for shard_id, latency in reply["shards"].items()}
+                case op:
+                    reply = {"error": f"Unknown op: {op}"}
+        except Exception as e:
+            self.logger.error(f"Cluster coordinator failed to handle {message['op']} from worker {worker_id}: {e!r}")
+            reply = {"error": repr(e)}
+
+        if reply is not None and "id" in message:
+            try:
+                await _send(writer, {"id": message["id"], **reply})
+            except (ConnectionError, RuntimeError):
+                pass
+
+    async def _lease_global(self, count: int) -> dict:
+        async with self._global_lock:
+            while True:
+                now = time.perf_counter()
+                if self._global_reset <= now:
+                    self._global_calls = self.global_limit
+                    self._global_reset = now + 1
+                if self._global_calls > 0:
+                    granted = min(count, self._global_calls)
+                    self._global_calls -= granted
+                    return {"granted": granted, "reset_after": self._global_reset - now}
+                await asyncio.sleep(self._global_reset - now)
+
+    async def _wait_identify(self, shard_id: int, session_start_limit: dict) -> None:
+        if self.identify_scheduler.remaining is None:
+            # every worker logged in with the same token, the first to identify tells us the limits
+            self.identify_scheduler.configure(session_start_limit)
+        await self.identify_scheduler.wait(shard_id)
+        self.identifies.append(shard_id)
+
+
+class SharedGlobalLock(GlobalLock):
+    """A GlobalLock that leases its calls from the cluster coordinator, so all workers share one global rate limit."""
+
+    def __init__(self, link: "ClusterLink", lease: int = 5) -> None:
+        super().__init__()
+        self.link = link
+        self.lease = lease
+        self._calls = 0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            if self._calls <= 0 or self._reset_time <= time.perf_counter():
+                reply = await self.link.request("global", count=self.lease)
+                self._calls = reply["granted"]
+                self._reset_time = time.perf_counter() + reply["reset_after"]
+        self._calls -= 1
+
+    def set_reset_time(self, delta: float) -> None:
+        super().set_reset_time(delta)
+        self.link.send("global_429", retry_after=delta)
+
+
+class ClusterLink:
+    """A worker's connection to the cluster coordinator."""
+
+    def __init__(self, socket_path: str, worker_id: int, stats_interval: float = 10) -> None:
+        self.socket_path = socket_path
+        self.worker_id = worker_id
+        self.stats_interval = stats_interval
+        self.client: Optional[AutoShardedClient] = None
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._tasks: list[asyncio.Task] = []
+
+        self.logger = constants.get_logger()
+
+    async def connect(self, shard_ids: list[int]) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+        self._tasks.append(asyncio.create_task(self._receive()))
+        await self.request("hello", worker=self.worker_id, shards=shard_ids)
+
+    def attach(self, client: AutoShardedClient) -> None:
+        """
+        Make a client share its rate limits and identifies with the rest of the cluster, and report its stats.
+
+        Args:
+            client: The worker's client
+
+        """
+        self.client = client
+        client.http.global_lock = SharedGlobalLock(self)
+        client.http.ratelimit_listener = self._on_bucket_exhausted
+        client.identify_gate = self.identify
+        self._tasks.append(asyncio.create_task(self._report_stats()))
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+
+    async def request(self, op: str, **data) -> dict:
+        """
+        Send a message to the coordinator and wait for its reply.
+
+        Args:
+            op: The operation
+            **data: The message's fields
+
+        Returns:
+            The reply
+
+        """
+        self._next_id += 1
+        request_id = self._next_id
+        future = self._pending[request_id] = asyncio.get_running_loop().create_future()
+        try:
+            await _send(self._writer, {"op": op, "id": request_id, **data})
+            reply = await future
+        finally:
+            self._pending.pop(request_id, None)
+        if "error" in reply:
+            raise RuntimeError(f"The cluster coordinator failed to handle {op}: {reply['error']}")
+        return reply
+
+    def send(self, op: str, **data) -> None:
+        """
+        Send a message to the coordinator without waiting for a reply.
+
+        Args:
+            op: The operation
+            **data: The message's fields
+
+        """
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(FastJson.dumps({"op": op, **data}).encode() + b"\n")
+
+    async def identify(self, shard_id: int) -> None:
+        """Waits until the coordinator lets a shard identify."""
+        await self.request("identify", shard_id=shard_id, session_start_limit=self.client.session_start_limit)
+
+    async def cluster_stats(self) -> dict[str, Any]:
+        """The stats of the whole cluster, see `ClusterCoordinator.stats`."""
+        reply = await self.request("cluster_stats")
+        reply.pop("id")
+        reply["shards"] = {int(shard_id): latency for shard_id, latency in reply["shards"].items()}
+        return reply
+
+    def report_stats(self) -> None:
+        self.send(
+            "stats",
+            # a shard has no gateway until it is let through to identify
+            latencies={
+                str(state.shard_id): _finite(state.gateway.latency) if state.gateway else None
+                for state in self.client.shards
+            },
+            guilds=self.client.guild_count if self.client.user else 0,
+        )
+
+    async def _report_stats(self) -> None:
+        while True:
+            try:
+                self.report_stats()
+            except Exception as e:
+                self.logger.error(f"Cluster worker {self.worker_id} failed to report its stats: {e!r}")
+            await asyncio.sleep(self.stats_interval)
+
+    def _on_bucket_exhausted(self, key: str, lock: BucketLock) -> None:
+        self.send("bucket", key=key, reset_after=lock.reset_at - time.perf_counter())
+
+    async def _receive(self) -> None:
+        while line := await self._reader.readline():
+            message = FastJson.loads(line)
+            if (future := self._pending.get(message.get("id"))) is not None:
+                if not future.done():
+                    future.set_result(message)
+                continue
+            match message.get("op"):
+                case "global_429":
+                    GlobalLock.set_reset_time(self.client.http.global_lock, message["retry_after"])
+                case "bucket":
+                    self.client.http.apply_shared_ratelimit(message["key"], message["reset_after"])
+                case "shutdown":
+                    self.logger.info(f"Cluster worker {self.worker_id} was asked to shut down")
+                    self._tasks.append(asyncio.create_task(self.client.stop()))
+
+        # the coordinator is gone, a worker on its own would break the shared limits
+        self.logger.error(f"Cluster worker {self.worker_id} lost its coordinator, shutting down")
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Lost the cluster coordinator"))
+        if self.client is not None:
+            await self.client.stop()
+
+
+def _run_worker(
+    client_factory: Callable[..., AutoShardedClient],
+    worker_id: int,
+    shard_ids: list[int],
+    total_shards: int,
+    socket_path: str,
+    token: Optional[str],
+    stats_interval: float,
+) -> None:
+    async def main() -> None:
+        link = ClusterLink(socket_path, worker_id, stats_interval)
+        await link.connect(shard_ids)
+        client = client_factory(shard_ids=shard_ids, total_shards=total_shards)
+        link.attach(client)
+        try:
+            await client.astart(token)
+        finally:
+            await link.close()
+
+    asyncio.run(main())
+
+
+class Cluster:
+    """
+    Runs an AutoShardedClient in several processes, each owning a slice of the shards.
+
+    Args:
+        client_factory: Creates a worker's client, called with `shard_ids` and `total_shards` keyword arguments. Must be picklable (e.g. a module level function or a `functools.partial` of AutoShardedClient), workers are spawned, not forked
+        total_shards: The number of shards across all workers
+        workers: The number of worker processes
+        token: The bot's token, if the client factory doesn't set it
+        socket_path: Where to create the coordinator's Unix socket, a temporary file by default
+        identify_interval: Seconds between the identifies of one rate limit key
+        stats_interval: Seconds between the stats reports of each worker
+        restart_workers: Whether to restart a worker that exits with an error
+
+    """
+
+    RESTART_DELAY = 5
+
+    def __init__(
+        self,
+        client_factory: Callable[..., AutoShardedClient],
+        *,
+        total_shards: int,
+        workers: int,
+        token: Optional[str] = None,
+        socket_path: Optional[str] = None,
+        identify_interval: float = IDENTIFY_INTERVAL,
+        stats_interval: float = 10,
+        restart_workers: bool = True,
+    ) -> None:
+        if not 0 < workers <= total_shards:
+            raise ValueError("A cluster needs between 1 and total_shards workers")
+        self.client_factory = client_factory
+        self.total_shards = total_shards
+        self.token = token
+        self.socket_path = socket_path or os.path.join(
+            tempfile.gettempdir(), f"interactions-cluster-{os.getpid()}.sock"
+        )
+        self.stats_interval = stats_interval
+        self.restart_workers = restart_workers
+        self.shard_slices: list[list[int]] = [
+            list(range(i * total_shards // workers, (i + 1) * total_shards // workers)) for i in range(workers)
+        ]
+
+        self.coordinator = ClusterCoordinator(self.socket_path, identify_interval)
+        self.processes: dict[int, multiprocessing.process.BaseProcess] = {}
+
+        self._context = multiprocessing.get_context("spawn")
+        self._stopping = False
+        self.logger = constants.get_logger()
+
+    def stats(self) -> dict[str, Any]:
+        """The aggregated stats of the workers, see `ClusterCoordinator.stats`."""
+        return self.coordinator.stats()
+
+    def start(self) -> None:
+        """Start the cluster, and block until it stops."""
+        asyncio.run(self.astart())
+
+    async def astart(self) -> None:
+        """Start the coordinator and the workers, and supervise them until they have all stopped."""
+        await self.coordinator.start()
+        try:
+            for worker_id in range(len(self.shard_slices)):
+                self._spawn(worker_id)
+            while self.processes:
+                await asyncio.sleep(0.5)
+                for worker_id, process in list(self.processes.items()):
+                    if process.is_alive():
+                        continue
+                    del self.processes[worker_id]
+                    if process.exitcode and self.restart_workers and not self._stopping:
+                        self.logger.warning(
+                            f"Cluster worker {worker_id} exited with {process.exitcode}, restarting it in {self.RESTART_DELAY}s"
+                        )
+                        await asyncio.sleep(self.RESTART_DELAY)
+                        if not self._stopping:
+                            self._spawn(worker_id)
+        finally:
+            await self.stop()
+
+    async def stop(self, timeout: float = 30) -> None:
+        """
+        Ask every worker to shut down, and stop the coordinator.
+
+        Args:
+            timeout: Seconds to wait for the workers before terminating them
+
+        """
+        self._stopping = True
+        await self.coordinator.broadcast({"op": "shutdown"})
+        deadline = time.perf_counter() + timeout
+        while any(process.is_alive() for process in self.processes.values()) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.1)
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        self.processes.clear()
+        await self.coordinator.close()
+
+    def _spawn(self, worker_id: int) -> None:
+        process = self._context.Process(
+            target=_run_worker,
+            args=(
+                self.client_factory,
+                worker_id,
+                self.shard_slices[worker_id],
+                self.total_shards,
+                self.socket_path,
+                self.token,
+                self.stats_interval,
+            ),
+            name=f"cluster-worker-{worker_id}",
+        )
+        process.start()
+        self.processes[worker_id] = process
@@ -37,7 +37,6 @@ Attributes:
 
 """
 
-import inspect
 import logging
 import os
 import sys
@@ -150,9 +149,8 @@ class Singleton(type):
 class Sentinel(metaclass=Singleton):
     @staticmethod
     def _get_caller_module() -> str:
-        stack = inspect.stack()
-
-        caller = stack[2][0]
+        # not inspect.stack(), which reads the source of every frame on the stack
+        caller = sys._getframe(2)
         return caller.f_globals.get("__name__")
 
     def __init__(self) -> None:
@@ -0,0 +1,239 @@
+"""Latency histograms of the interaction hot path, see `Client.interaction_metrics`."""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+__all__ = ("LatencyHistogram", "InteractionTimer", "InteractionMetrics", "current_interaction_timer", "PHASES")
+
+PHASES = ("context", "channel_fetch", "auto_defer", "callback", "http", "total")
+"""
+The phases of handling an interaction:
+    context: building the context (`get_context`, minus the channel fetch)
+    channel_fetch: fetching the channel when the interaction did not include it
+    auto_defer: the auto defer check
+    callback: the command or autocomplete callback, minus `http`
+    http: Discord API requests made by the callback, i.e. mostly sending the response
+    total: everything, from the raw event to the callback returning
+"""
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+current_interaction_timer: ContextVar[Optional["InteractionTimer"]] = ContextVar(
+    "current_interaction_timer", default=None
+)
+"""The timer of the interaction being handled, None if there is none or metrics are disabled"""
+
+
+class LatencyHistogram:
+    """
+    A HDR-style histogram of durations.
+
+    Values are recorded in microseconds into log-linear buckets: exact below 64µs, and above that 32
+    sub-buckets per power of two. Every value is therefore kept to within ~3%, from microseconds to hours,
+    in a few hundred counters at most.
+
+    """
+
+    __slots__ = ("counts", "count", "sum", "min", "max")
+
+    SUB_BUCKET_BITS = 5
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    @classmethod
+    def _index(cls, micros: int) -> int:
+        exact_below = 2 << cls.SUB_BUCKET_BITS
+        if micros < exact_below:
+            return micros
+        shift = micros.bit_length() - cls.SUB_BUCKET_BITS - 1
+        return exact_below + ((shift - 1) << cls.SUB_BUCKET_BITS) + (micros >> shift) - (1 << cls.SUB_BUCKET_BITS)
+
+    @classmethod
+    def _upper_bound(cls, index: int) -> int:
+        exact_below = 2 << cls.SUB_BUCKET_BITS
+        if index < exact_below:
+            return index
+        shift = ((index - exact_below) >> cls.SUB_BUCKET_BITS) + 1
+        top = (1 << cls.SUB_BUCKET_BITS) + ((index - exact_below) & ((1 << cls.SUB_BUCKET_BITS) - 1))
+        return ((top + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """
+        Record a duration.
+
+        Args:
+            seconds: The duration
+
+        """
+        seconds = max(seconds, 0.0)
+        index = self._index(int(seconds * 1_000_000))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """
+        Get a quantile of the recorded durations.
+
+        Args:
+            q: The quantile, between 0 and 1
+
+        Returns:
+            The duration in seconds (the upper end of its bucket), 0 if nothing was recorded
+
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, round(q * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index) / 1_000_000, self.max)
+        return self.max
+
+
+class InteractionTimer:
+    """Times the phases of handling one interaction. Created by `InteractionMetrics.start`."""
+
+    __slots__ = ("metrics", "kind", "name", "started", "phases", "count_http", "_last", "_unmarked_http")
+
+    def __init__(self, metrics: "InteractionMetrics") -> None:
+        self.metrics = metrics
+        self.kind: Optional[str] = None
+        self.name: Optional[str] = None
+        self.started = self._last = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.count_http = False
+        self._unmarked_http = 0.0
+
+    def mark(self, phase: str) -> None:
+        """Attribute the time since the previous mark to `phase`, minus the http time recorded meanwhile."""
+        now = time.perf_counter()
+        elapsed = now - self._last - self._unmarked_http
+        self.phases[phase] = self.phases.get(phase, 0.0) + max(elapsed, 0.0)
+        self._last = now
+        self._unmarked_http = 0.0
+
+    def add_http(self, seconds: float) -> None:
+        """Record a Discord API request made while `count_http` is set."""
+        self.phases["http"] = self.phases.get("http", 0.0) + seconds
+        self._unmarked_http += seconds
+
+    def finish(self) -> None:
+        """Record the phases, if the interaction was identified (`kind` and `name` set)."""
+        self.count_http = False
+        if self.kind and self.name:
+            self.phases["total"] = time.perf_counter() - self.started
+            self.metrics.record(self.kind, self.name, self.phases)
+
+
+class InteractionMetrics:
+    """
+    Per command latency histograms of interaction handling, split into `PHASES`.
+
+    Disabled by default. While disabled, handling an interaction costs a single attribute check.
+
+    Attributes:
+        enabled bool: Whether interactions are timed
+        histograms dict[tuple[str, str, str], LatencyHistogram]: The histograms by kind ("command" or "autocomplete"), name and phase
+        since float: When the histograms were last reset (unix time)
+
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.histograms: dict[tuple[str, str, str], LatencyHistogram] = {}
+        self.since = time.time()
+
+    def start(self) -> Optional[InteractionTimer]:
+        """
+        Start timing an interaction.
+
+        Returns:
+            The timer, None if metrics are disabled
+
+        """
+        return InteractionTimer(self) if self.enabled else None
+
+    def record(self, kind: str, name: str, phases: dict[str, float]) -> None:
+        """
+        Record the phase durations of a handled interaction.
+
+        Args:
+            kind: "command" or "autocomplete"
+            name: The command's name, for autocompletes including the option
+            phases: The durations in seconds by phase
+
+        """
+        for phase, seconds in phases.items():
+            key = (kind, name, phase)
+            if (histogram := self.histograms.get(key)) is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        self.histograms.clear()
+        self.since = time.time()
+
+    def summary(self, phase: str = "total") -> list[dict]:
+        """
+        Summarise one phase per command, slowest p99 first.
+
+        Args:
+            phase: The phase to summarise
+
+        Returns:
+            Dicts with kind, name, count, mean, p50, p90, p99 and max (seconds)
+
+        """
+        rows = [
+            {
+                "kind": kind,
+                "name": name,
+                "count": histogram.count,
+                "mean": histogram.sum / histogram.count,
+                "p50": histogram.quantile(0.5),
+                "p90": histogram.quantile(0.9),
+                "p99": histogram.quantile(0.99),
+                "max": histogram.max,
+            }
+            for (kind, name, hist_phase), histogram in self.histograms.items()
+            if hist_phase == phase and histogram.count
+        ]
+        return sorted(rows, key=lambda row: row["p99"], reverse=True)
+
+    def prometheus_text(self, metric: str = "interaction_latency_seconds") -> str:
+        """
+        Render the histograms in the Prometheus text exposition format, as a summary per kind, name and phase.
+
+        Args:
+            metric: The metric name
+
+        Returns:
+            The exposition text
+
+        """
+        lines = [
+            f"# HELP {metric} Time spent handling interactions, by phase.",
+            f"# TYPE {metric} summary",
+        ]
+        for (kind, name, phase), histogram in sorted(self.histograms.items()):
+            labels = f'kind="{_escape_label(kind)}",command="{_escape_label(name)}",phase="{phase}"'
+            lines.extend(f'{metric}{{{labels},quantile="{q}"}} {histogram.quantile(q):.6f}' for q in QUANTILES)
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.sum:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,3 +1,5 @@
+import gc
+import time
 from contextlib import suppress
 from logging import Logger
 from typing import TYPE_CHECKING, List, Dict, Any, Optional, Union
@@ -5,6 +7,7 @@ from typing import TYPE_CHECKING, List, Dict, Any, Optional, Union
 import attrs
 import discord_typings
 
+from interactions.client.cache_snapshot import read_snapshot, write_snapshot
 from interactions.client.const import Absent, MISSING, get_logger
 from interactions.client.errors import NotFound, Forbidden
 from interactions.client.utils.cache import TTLCache, NullCache
@@ -87,6 +90,10 @@ class GlobalCache:
     dm_channels: TTLCache = attrs.field(repr=False, factory=TTLCache)  # key: user_id
     user_guilds: TTLCache = attrs.field(repr=False, factory=dict)  # key: user_id; value: set[guild_id]
 
+    # Keys of the entries restored from a snapshot, until they are placed again. fetch_* refetches them instead of
+    # trusting them, get_* returns them as they are. key: cache name; value: set of keys
+    stale: dict = attrs.field(repr=False, init=False, factory=dict)
+
     logger: Logger = attrs.field(repr=False, init=False, factory=get_logger)
 
     def __attrs_post_init__(self) -> None:
@@ -116,7 +123,7 @@ class GlobalCache:
         user_id = to_snowflake(user_id)
 
         user = self.user_cache.get(user_id)
-        if (user is None or user._fetched is False) or force:
+        if (user is None or user._fetched is False) or force or self.is_stale("user_cache", user_id):
             data = await self._client.http.get_user(user_id)
             user = self.place_user_data(data)
             user._fetched = True  # the user object should set this to True, but we do it here just in case
@@ -155,6 +162,8 @@ class GlobalCache:
             self.user_cache[user_id] = user
         else:
             user.update_from_dict(data)
+            if self.stale:
+                self._revalidated("user_cache", user_id)
         return user
 
     def delete_user(self, user_id: "Snowflake_Type") -> None:
@@ -189,7 +198,7 @@ class GlobalCache:
         guild_id = to_snowflake(guild_id)
         user_id = to_snowflake(user_id)
         member = self.member_cache.get((guild_id, user_id))
-        if member is None or force:
+        if member is None or force or self.is_stale("member_cache", (guild_id, user_id)):
             data = await self._client.http.get_member(guild_id, user_id)
             member = self.place_member_data(guild_id, data)
         return member
@@ -234,6 +243,8 @@ class GlobalCache:
             self.member_cache[(guild_id, user_id)] = member
         else:
             member.update_from_dict(data)
+            if self.stale:
+                self._revalidated("member_cache", (guild_id, user_id))
 
         self.place_user_guild(user_id, guild_id)
         if guild := self.guild_cache.get(guild_id):
@@ -467,7 +478,7 @@ class GlobalCache:
         """
         channel_id = to_snowflake(channel_id)
         channel = self.channel_cache.get(channel_id)
-        if channel is None or force:
+        if channel is None or force or self.is_stale("channel_cache", channel_id):
             try:
                 data = await self._client.http.get_channel(channel_id)
                 channel = self.place_channel_data(data)
@@ -514,6 +525,8 @@ class GlobalCache:
         else:
             # Create entire new channel object if the type changes
             channel_type = data.get("type", None)
+            if self.stale:
+                self._revalidated("channel_cache", channel_id)
             if channel_type and channel_type != channel.type:
                 self.channel_cache.pop(channel_id)
                 channel = BaseChannel.from_dict_factory(data, self._client)
@@ -612,7 +625,7 @@ class GlobalCache:
         """
         guild_id = to_snowflake(guild_id)
         guild = self.guild_cache.get(guild_id)
-        if guild is None or force:
+        if guild is None or force or self.is_stale("guild_cache", guild_id):
             data = await self._client.http.get_guild(guild_id)
             guild = self.place_guild_data(data)
         return guild
@@ -648,6 +661,8 @@ class GlobalCache:
             self.guild_cache[guild_id] = guild
         else:
             guild.update_from_dict(data)
+            if self.stale:
+                self._revalidated("guild_cache", guild_id)
         return guild
 
     def delete_guild(self, guild_id: "Snowflake_Type") -> None:
@@ -694,7 +709,7 @@ class GlobalCache:
         guild_id = to_snowflake(guild_id)
         role_id = to_snowflake(role_id)
         role = self.role_cache.get(role_id)
-        if role is None or force:
+        if role is None or force or self.is_stale("role_cache", role_id):
             data = await self._client.http.get_roles(guild_id)
             role = self.place_role_data(guild_id, data).get(role_id)
         return role
@@ -741,6 +756,8 @@ class GlobalCache:
                 self.role_cache[role_id] = role
             else:
                 role.update_from_dict(role_data)
+                if self.stale:
+                    self._revalidated("role_cache", role_id)
 
             roles[role_id] = role
 
@@ -893,7 +910,7 @@ class GlobalCache:
         guild_id = to_snowflake(guild_id)
         emoji_id = to_snowflake(emoji_id)
         emoji = self.emoji_cache.get(emoji_id) if self.emoji_cache is not None else None
-        if emoji is None or force:
+        if emoji is None or force or self.is_stale("emoji_cache", emoji_id):
             data = await self._client.http.get_guild_emoji(guild_id, emoji_id)
             emoji = self.place_emoji_data(guild_id, data)
 
@@ -932,6 +949,8 @@ class GlobalCache:
         emoji = CustomEmoji.from_dict(data, self._client, to_optional_snowflake(guild_id))
         if self.emoji_cache is not None:
             self.emoji_cache[emoji.id] = emoji
+            if self.stale:
+                self._revalidated("emoji_cache", emoji.id)
 
         return emoji
 
@@ -1023,3 +1042,89 @@ class GlobalCache:
         self.scheduled_events_cache.pop(to_snowflake(scheduled_event_id), None)
 
     # endregion ScheduledEvents cache
+
+    # region Snapshots
+
+    def is_stale(self, cache_name: str, key: Any) -> bool:
+        """
+        Whether an entry was restored from a snapshot and hasn't been placed again since.
+
+        Args:
+            cache_name: The name of the cache, e.g. `member_cache`
+            key: The entry's key in that cache
+
+        Returns:
+            True if the entry may be outdated
+
+        """
+        return (keys := self.stale.get(cache_name)) is not None and key in keys
+
+    def _revalidated(self, cache_name: str, key: Any) -> None:
+        if (keys := self.stale.get(cache_name)) is not None:
+            keys.discard(key)
+            if not keys:
+                del self.stale[cache_name]
+
+    async def save_snapshot(self, path: str) -> int:
+        """
+        Save the guilds, roles, channels, users, members and emojis of the cache to a binary snapshot file.
+
+        The snapshot is written in batches, the client keeps running while it is saved.
+
+        Args:
+            path: The file to save the snapshot to
+
+        Returns:
+            The number of entries saved
+
+        """
+        started = time.perf_counter()
+        count = await write_snapshot(self, path)
+        self.logger.info(f"Saved {count} cache entries to {path} in {time.perf_counter() - started:.2f}s")
+        return count
+
+    def load_snapshot(self, path: str, *, max_age: Optional[float] = None) -> int:
+        """
+        Restore the cache from a snapshot saved with `save_snapshot`.
+
+        The restored entries are marked stale: `get_*` returns them right away, `fetch_*` refetches them the first
+        time, and the gateway events placing them again revalidate them. Entries already cached are kept.
+
+        Args:
+            path: The snapshot file
+            max_age: Seconds after which the snapshot is too old to restore, None to restore any age
+
+        Returns:
+            The number of entries restored
+
+        """
+        started = time.perf_counter()
+        restored = 0
+        # unpickling allocates a lot of containers at once, each of which would make the collector go over the ones
+        # restored so far, while none of them is garbage
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for cache_name, items in read_snapshot(self._client, path, max_age):
+                cache = getattr(self, cache_name)
+                if cache is None:  # e.g. the emoji cache was disabled since
+                    continue
+                items = [(key, value) for key, value in items if key not in cache]
+                if not items:
+                    continue
+                cache.update(items)
+                if cache_name != "user_guilds":  # only IDs
+                    self.stale.setdefault(cache_name, set()).update(key for key, _ in items)
+                restored += len(items)
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            self.logger.warning(f"Could not restore the cache snapshot {path}: {e!r}")
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if restored:
+            self.logger.info(f"Restored {restored} cache entries from {path} in {time.perf_counter() - started:.2f}s")
+        return restored
+
+    # endregion Snapshots
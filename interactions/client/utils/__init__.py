@@ -47,6 +47,8 @@ from .formatting import (
     underline,
 )
 from .text_utils import mentions
+from .routing import RegexRoutes, literal_prefix
+from .single_flight import SingleFlight
 
 __all__ = (
     "define",
@@ -103,4 +105,7 @@ __all__ = (
     "styles",
     "underline",
     "mentions",
+    "RegexRoutes",
+    "literal_prefix",
+    "SingleFlight",
 )
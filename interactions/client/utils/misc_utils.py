@@ -3,11 +3,11 @@ import inspect
 import re
 from typing import Callable, Iterable, List, Optional, Any, Union, TYPE_CHECKING
 
-import interactions.api.events as events
 from interactions.client.const import T
 from interactions.models.discord.enums import ComponentType
 
 if TYPE_CHECKING:
+    import interactions.api.events as events
     from interactions.models.discord.components import BaseComponent
 
 __all__ = (
@@ -200,9 +200,11 @@ def get_event_name(event: Union[str, "events.BaseEvent"]) -> str:
         The event name
 
     """
+    from interactions.api.events import BaseEvent  # the events import most of the library
+
     name = event
 
-    if inspect.isclass(name) and issubclass(name, events.BaseEvent):
+    if inspect.isclass(name) and issubclass(name, BaseEvent):
         name = name.__name__
 
     # convert CamelCase to snake_case
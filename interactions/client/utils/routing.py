@@ -0,0 +1,124 @@
+import bisect
+import re
+from typing import Any, Optional
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # python 3.10
+    import sre_parse
+
+__all__ = ("RegexRoutes", "literal_prefix")
+
+
+def literal_prefix(pattern: re.Pattern) -> str:
+    """
+    Get the literal text every `pattern.match` must start with.
+
+    Args:
+        pattern: A compiled pattern
+
+    Returns:
+        The prefix, empty if the pattern does not start with literal text (or is case-insensitive)
+
+    """
+    if pattern.flags & re.IGNORECASE or not isinstance(pattern.pattern, str):
+        return ""
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return ""
+    prefix = []
+    for index, (op, value) in enumerate(parsed):
+        if index == 0 and op == sre_parse.AT and value == sre_parse.AT_BEGINNING:
+            continue
+        if op != sre_parse.LITERAL:
+            break
+        prefix.append(chr(value))
+    return "".join(prefix)
+
+
+class RegexRoutes(dict):
+    r"""
+    The regex component/modal callbacks of a client: a dict of pattern to callback, indexed by literal prefix.
+
+    Patterns are grouped by the literal text they start with (e.g. `paginator|` for `^paginator\|.*`), so a lookup only
+    runs the patterns whose prefix the custom_id starts with, plus those without a literal prefix. That is one dict lookup
+    per distinct prefix length instead of a `match` per registered pattern. Like iterating the dict, the first registered
+    matching pattern wins.
+
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._index: Optional[
+            tuple[dict[str, list[tuple[int, re.Pattern]]], list[int], list[tuple[int, re.Pattern]]]
+        ] = None
+
+    def __setitem__(self, key: re.Pattern, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._index = None
+
+    def __delitem__(self, key: re.Pattern) -> None:
+        super().__delitem__(key)
+        self._index = None
+
+    def pop(self, *args) -> Any:
+        self._index = None
+        return super().pop(*args)
+
+    def popitem(self) -> tuple:
+        self._index = None
+        return super().popitem()
+
+    def clear(self) -> None:
+        self._index = None
+        super().clear()
+
+    def update(self, *args, **kwargs) -> None:
+        self._index = None
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key: re.Pattern, default: Any = None) -> Any:
+        self._index = None
+        return super().setdefault(key, default)
+
+    def _build_index(self) -> tuple:
+        by_prefix: dict[str, list[tuple[int, re.Pattern]]] = {}
+        unprefixed: list[tuple[int, re.Pattern]] = []
+        for order, pattern in enumerate(self):
+            if prefix := literal_prefix(pattern):
+                by_prefix.setdefault(prefix, []).append((order, pattern))
+            else:
+                unprefixed.append((order, pattern))
+        self._index = (by_prefix, sorted({len(prefix) for prefix in by_prefix}), unprefixed)
+        return self._index
+
+    def match(self, custom_id: str) -> Optional[Any]:
+        """
+        Get the callback of the first registered pattern matching a custom_id.
+
+        Args:
+            custom_id: The custom_id
+
+        Returns:
+            The callback, None if no pattern matches
+
+        """
+        by_prefix, lengths, candidates = self._index or self._build_index()
+        buckets = [
+            bucket
+            for length in lengths[: bisect.bisect_right(lengths, len(custom_id))]
+            if (bucket := by_prefix.get(custom_id[:length]))
+        ]
+        if len(buckets) == 1 and not candidates:
+            candidates = buckets[0]
+        elif buckets:
+            candidates = sorted(candidates + [entry for bucket in buckets for entry in bucket], key=_order)
+        for _, pattern in candidates:
+            if pattern.match(custom_id):
+                return self[pattern]
+        return None
+
+
+def _order(entry: tuple[int, re.Pattern]) -> int:
+    return entry[0]
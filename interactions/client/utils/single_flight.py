@@ -0,0 +1,61 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+__all__ = ("SingleFlight",)
+
+T = TypeVar("T")
+
+_TAKEN_OVER = object()
+"""Set as the result when the running caller was cancelled, a waiting caller runs the call instead."""
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time, concurrent callers with the same key share its result.
+
+    Errors are passed on to every waiting caller and not kept. If the caller running the call is cancelled, its
+    waiters are not: one of them runs the call itself and the others wait for that one.
+
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether a call for this key is running, i.e. a caller would wait for it."""
+        return key in self._in_flight
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Get the result of `call`, or of the running call for the same key.
+
+        Args:
+            key: Identifies calls with the same result
+            call: Produces the result, only called if no call for the key is running
+
+        Returns:
+            The result
+
+        """
+        while (future := self._in_flight.get(key)) is not None:
+            if (result := await asyncio.shield(future)) is not _TAKEN_OVER:
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await call()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.set_result(_TAKEN_OVER)  # the waiters weren't cancelled, they retry
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark as retrieved, the caller gets the exception raised below
+            raise
+        finally:
+            del self._in_flight[key]
@@ -1,7 +1,12 @@
 import asyncio
+import copy
+import re
 import textwrap
+import time
 import uuid
-from typing import Callable, Coroutine, List, Optional, Sequence, TYPE_CHECKING, Union
+import weakref
+from collections import OrderedDict
+from typing import Awaitable, Callable, Coroutine, List, Optional, Sequence, TYPE_CHECKING, Union
 
 import attrs
 
@@ -29,7 +34,14 @@ if TYPE_CHECKING:
     from interactions import Client
     from interactions.ext.prefixed_commands.context import PrefixedContext
 
-__all__ = ("Paginator",)
+__all__ = ("Paginator", "PaginatorRouter")
+
+STATELESS_PREFIX = "paginator"
+"""The custom_id prefix of stateless paginator components: `paginator|content key|page index|author id|action`"""
+CUSTOM_ID_MAX_LENGTH = 100
+"""Discord rejects components with longer custom_ids"""
+CONTENT_KEY_MAX_LENGTH = CUSTOM_ID_MAX_LENGTH - len(f"{STATELESS_PREFIX}||9999|{2**64 - 1}|callback")
+"""Longest content key that fits the custom_id of any action, up to 10000 pages and any author id"""
 
 
 @attrs.define(eq=False, order=False, hash=False, kw_only=False)
@@ -140,12 +152,32 @@ class Paginator:
     default_button_color: Union[ButtonStyle, int] = attrs.field(repr=False, default=ButtonStyle.BLURPLE)
     """The color of the buttons"""
 
+    stateless: bool = attrs.field(repr=False, default=False, kw_only=True)
+    """
+    Keep the page index and author in the components' custom_id and serve them with the client's shared `PaginatorRouter`,
+    instead of registering callbacks for this paginator. Stateless paginators don't time out, their pages expire from the router's store instead.
+    """
+    content_key: Optional[str] = attrs.field(repr=False, default=None, kw_only=True)
+    """
+    For stateless paginators, where the router gets the pages from: `source:argument` for a source registered with
+    `PaginatorRouter.register_source`, which recreates the paginator on every button press. Left unset, the paginator is kept in the router's store.
+    """
+
     _uuid: str = attrs.field(repr=False, factory=uuid.uuid4)
     _message: Message = attrs.field(repr=False, default=MISSING)
     _timeout_task: Timeout = attrs.field(repr=False, default=MISSING)
     _author_id: Snowflake_Type = attrs.field(repr=False, default=MISSING)
 
     def __attrs_post_init__(self) -> None:
+        if self.stateless:
+            if self.content_key is None:
+                self.content_key = PaginatorRouter.for_client(self.client).put(self)
+            elif "|" in self.content_key or len(self.content_key) > CONTENT_KEY_MAX_LENGTH:
+                raise ValueError(
+                    f"content_key must not contain `|` and be at most {CONTENT_KEY_MAX_LENGTH} characters long, "
+                    f"got {self.content_key!r}"
+                )
+            return
         self.client.add_component_callback(
             ComponentCommand(
                 name=f"Paginator:{self._uuid}",
@@ -172,7 +204,7 @@ class Paginator:
         return self._author_id
 
     @classmethod
-    def create_from_embeds(cls, client: "Client", *embeds: Embed, timeout: int = 0) -> "Paginator":
+    def create_from_embeds(cls, client: "Client", *embeds: Embed, timeout: int = 0, **kwargs) -> "Paginator":
         """
         Create a paginator system from a list of embeds.
 
@@ -180,12 +212,13 @@ class Paginator:
             client: A reference to the client
             *embeds: The embeds to use for each page
             timeout: A timeout to wait before closing the paginator
+            **kwargs: Further attributes of the paginator, e.g. `stateless=True`
 
         Returns:
             A paginator system
 
         """
-        return cls(client, pages=list(embeds), timeout_interval=timeout)
+        return cls(client, pages=list(embeds), timeout_interval=timeout, **kwargs)
 
     @classmethod
     def create_from_string(
@@ -196,6 +229,7 @@ class Paginator:
         suffix: str = "",
         page_size: int = 4000,
         timeout: int = 0,
+        **kwargs,
     ) -> "Paginator":
         """
         Create a paginator system from a string.
@@ -207,6 +241,7 @@ class Paginator:
             suffix: The suffix for each page to use
             page_size: The maximum characters for each page
             timeout: A timeout to wait before closing the paginator
+            **kwargs: Further attributes of the paginator, e.g. `stateless=True`
 
         Returns:
             A paginator system
@@ -220,7 +255,7 @@ class Paginator:
             replace_whitespace=False,
         )
         pages = [Page(c, prefix=prefix, suffix=suffix) for c in content_pages]
-        return cls(client, pages=pages, timeout_interval=timeout)
+        return cls(client, pages=pages, timeout_interval=timeout, **kwargs)
 
     @classmethod
     def create_from_list(
@@ -231,6 +266,7 @@ class Paginator:
         suffix: str = "",
         page_size: int = 4000,
         timeout: int = 0,
+        **kwargs,
     ) -> "Paginator":
         """
         Create a paginator from a list of strings. Useful to maintain formatting.
@@ -242,6 +278,7 @@ class Paginator:
             suffix: The suffix for each page to use
             page_size: The maximum characters for each page
             timeout: A timeout to wait before closing the paginator
+            **kwargs: Further attributes of the paginator, e.g. `stateless=True`
 
         Returns:
             A paginator system
@@ -259,7 +296,15 @@ class Paginator:
                 page = f"{entry}\n"
         if page != "":
             pages.append(Page(page, prefix=prefix, suffix=suffix))
-        return cls(client, pages=pages, timeout_interval=timeout)
+        return cls(client, pages=pages, timeout_interval=timeout, **kwargs)
+
+    def _custom_id(self, action: str) -> str:
+        if self.stateless:
+            custom_id = f"{STATELESS_PREFIX}|{self.content_key}|{self.page_index}|{self._author_id or 0}|{action}"
+            if len(custom_id) > CUSTOM_ID_MAX_LENGTH:
+                raise ValueError(f"The custom_id {custom_id!r} is longer than {CUSTOM_ID_MAX_LENGTH} characters")
+            return custom_id
+        return f"{self._uuid}|{action}"
 
     def create_components(self, disable: bool = False) -> List[ActionRow]:
         """
@@ -288,7 +333,7 @@ class Paginator:
                         )
                         for i, p in enumerate(self.pages[lower_index : lower_index + 25], start=lower_index)
                     ),
-                    custom_id=f"{self._uuid}|select",
+                    custom_id=self._custom_id("select"),
                     placeholder=f"{self.page_index+1} {current.get_summary if isinstance(current, Page) else current.title}",
                     max_values=1,
                     disabled=disable,
@@ -300,7 +345,7 @@ class Paginator:
                 Button(
                     style=self.default_button_color,
                     emoji=PartialEmoji.from_dict(process_emoji(self.first_button_emoji)),
-                    custom_id=f"{self._uuid}|first",
+                    custom_id=self._custom_id("first"),
                     disabled=disable or self.page_index == 0,
                 )
             )
@@ -309,7 +354,7 @@ class Paginator:
                 Button(
                     style=self.default_button_color,
                     emoji=PartialEmoji.from_dict(process_emoji(self.back_button_emoji)),
-                    custom_id=f"{self._uuid}|back",
+                    custom_id=self._custom_id("back"),
                     disabled=disable or self.page_index == 0,
                 )
             )
@@ -319,7 +364,7 @@ class Paginator:
                 Button(
                     style=self.default_button_color,
                     emoji=PartialEmoji.from_dict(process_emoji(self.callback_button_emoji)),
-                    custom_id=f"{self._uuid}|callback",
+                    custom_id=self._custom_id("callback"),
                     disabled=disable,
                 )
             )
@@ -329,7 +374,7 @@ class Paginator:
                 Button(
                     style=self.default_button_color,
                     emoji=PartialEmoji.from_dict(process_emoji(self.next_button_emoji)),
-                    custom_id=f"{self._uuid}|next",
+                    custom_id=self._custom_id("next"),
                     disabled=disable or self.page_index >= len(self.pages) - 1,
                 )
             )
@@ -338,7 +383,7 @@ class Paginator:
                 Button(
                     style=self.default_button_color,
                     emoji=PartialEmoji.from_dict(process_emoji(self.last_button_emoji)),
-                    custom_id=f"{self._uuid}|last",
+                    custom_id=self._custom_id("last"),
                     disabled=disable or self.page_index >= len(self.pages) - 1,
                 )
             )
@@ -375,10 +420,10 @@ class Paginator:
             The resulting message
 
         """
-        self._message = await ctx.send(**self.to_dict(), **kwargs)
         self._author_id = ctx.author.id
+        self._message = await ctx.send(**self.to_dict(), **kwargs)
 
-        if self.timeout_interval > 1:
+        if self.timeout_interval > 1 and not self.stateless:
             self._timeout_task = Timeout(self)
             _ = asyncio.create_task(self._timeout_task())  # noqa: RUF006
 
@@ -396,10 +441,10 @@ class Paginator:
             The resulting message
 
         """
-        self._message = await ctx.reply(**self.to_dict(), **kwargs)
         self._author_id = ctx.author.id
+        self._message = await ctx.reply(**self.to_dict(), **kwargs)
 
-        if self.timeout_interval > 1:
+        if self.timeout_interval > 1 and not self.stateless:
             self._timeout_task = Timeout(self)
             _ = asyncio.create_task(self._timeout_task())  # noqa: RUF006
 
@@ -407,6 +452,8 @@ class Paginator:
 
     async def stop(self) -> None:
         """Disable this paginator."""
+        if self.stateless:
+            PaginatorRouter.for_client(self.client).discard(self.content_key)
         if self._timeout_task:
             self._timeout_task.run = False
             self._timeout_task.ping.set()
@@ -430,7 +477,10 @@ class Paginator:
             )
         if self._timeout_task:
             self._timeout_task.ping.set()
-        match ctx.custom_id.split("|")[1]:
+        return await self._apply_action(ctx, ctx.custom_id.split("|")[-1])
+
+    async def _apply_action(self, ctx: ComponentContext, action: str) -> Optional[Message]:
+        match action:
             case "first":
                 self.page_index = 0
             case "last":
@@ -451,6 +501,130 @@ class Paginator:
         return None
 
 
+class PaginatorRouter:
+    """
+    Serves the components of all stateless paginators of a client with a single component callback.
+
+    The page index and author live in the custom_id, so the router only needs the pages: either from its store, a
+    LRU of recently sent paginators whose entries expire `ttl` seconds after their last use, or recreated by a registered
+    source. Memory therefore stays bounded no matter how many paginators are sent.
+
+    Attributes:
+        max_entries int: Paginators kept in the store, least recently used are dropped first
+        ttl float: Seconds a stored paginator is kept after it was last used
+
+    """
+
+    _routers: "weakref.WeakKeyDictionary[Client, PaginatorRouter]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, client: "Client", max_entries: int = 1024, ttl: float = 60 * 60) -> None:
+        self.client = client
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._store: OrderedDict[str, tuple[float, Paginator]] = OrderedDict()
+        self._sources: dict[str, Callable[[str], Awaitable[Paginator]]] = {}
+        client.add_component_callback(
+            ComponentCommand(
+                name="Paginator:router",
+                callback=self._on_component,
+                listeners=[re.compile(rf"^{STATELESS_PREFIX}\|")],
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    @classmethod
+    def for_client(cls, client: "Client") -> "PaginatorRouter":
+        """
+        Get the router of a client, creating it on first use.
+
+        Args:
+            client: The client
+
+        Returns:
+            The router
+
+        """
+        if (router := cls._routers.get(client)) is None:
+            router = cls._routers[client] = cls(client)
+        return router
+
+    def register_source(self, name: str, factory: Callable[[str], Awaitable[Paginator]]) -> None:
+        """
+        Register a coroutine that recreates paginators, for those sent with `content_key="name:argument"`.
+
+        Args:
+            name: The source name, without `:` or `|`. With the argument, the content key is at most `CONTENT_KEY_MAX_LENGTH` long
+            factory: Called with the argument, returns a stateless paginator with the same content key
+
+        """
+        self._sources[name] = factory
+
+    def put(self, paginator: Paginator) -> str:
+        """
+        Store a paginator.
+
+        Args:
+            paginator: The paginator
+
+        Returns:
+            Its content key
+
+        """
+        key = uuid.uuid4().hex[:16]
+        self._store[key] = (time.monotonic() + self.ttl, paginator)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+        return key
+
+    def discard(self, key: Optional[str]) -> None:
+        """Forget a stored paginator, its buttons answer as expired afterwards."""
+        self._store.pop(key, None)
+
+    async def get(self, key: str) -> Optional[Paginator]:
+        """
+        Get the paginator for a content key.
+
+        Args:
+            key: The content key
+
+        Returns:
+            The paginator, None if it expired or its source is unknown
+
+        """
+        if ":" in key:
+            name, _, argument = key.partition(":")
+            factory = self._sources.get(name)
+            return await factory(argument) if factory else None
+        if (entry := self._store.get(key)) is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._store[key]
+            return None
+        self._store[key] = (time.monotonic() + self.ttl, entry[1])
+        self._store.move_to_end(key)
+        return entry[1]
+
+    async def _on_component(self, ctx: ComponentContext) -> Optional[Message]:
+        # the content key may be anything, only the parts after it are split off
+        key, page_index, author_id, action = ctx.custom_id.removeprefix(f"{STATELESS_PREFIX}|").rsplit("|", 3)
+        if (template := await self.get(key)) is None:
+            return await ctx.edit_origin(components=[])
+
+        paginator = copy.copy(template)  # the page index of this message only
+        paginator.page_index = min(int(page_index), len(paginator.pages) - 1)
+        paginator._author_id = int(author_id)
+        paginator._message = ctx.message
+        if paginator._author_id and ctx.author.id != paginator._author_id:
+            return (
+                await ctx.send(paginator.wrong_user_message, ephemeral=True)
+                if paginator.wrong_user_message
+                else await ctx.defer(edit_origin=True)
+            )
+        return await paginator._apply_action(ctx, action)
+
+
 def setup(_) -> None:
     """A dummy setup function to trip the extension loader"""
     raise RuntimeError(
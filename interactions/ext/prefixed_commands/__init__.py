@@ -3,7 +3,7 @@ from .context import PrefixedContext
 
 from .help import PrefixedHelpCommand
 from .manager import PrefixedInjectedClient, PrefixedManager, setup
-from .utils import when_mentioned, when_mentioned_or
+from .utils import when_mentioned, when_mentioned_or, PrefixTrie
 
 __all__ = (
     "prefixed_command",
@@ -16,4 +16,5 @@ __all__ = (
     "setup",
     "when_mentioned",
     "when_mentioned_or",
+    "PrefixTrie",
 )
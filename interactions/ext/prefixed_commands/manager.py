@@ -18,7 +18,7 @@ from interactions.models.discord.message import Message
 from interactions.models.internal.listener import listen
 from .command import PrefixedCommand
 from .context import PrefixedContext
-from .utils import when_mentioned
+from .utils import when_mentioned, PrefixTrie
 
 __all__ = ("PrefixedInjectedClient", "PrefixedManager", "setup")
 
@@ -281,8 +281,9 @@ class PrefixedManager:
         if not message:
             try:
                 # i think 2 seconds is a very generous timeout limit
+                # keyed by the message id, so the waits for a busy channel's messages don't all check each other's
                 msg_event: MessageCreate = await self.client.wait_for(
-                    MessageCreate, checks=lambda e: int(e.message.id) == int(data["id"]), timeout=2
+                    MessageCreate, timeout=2, key=("message_id", data["id"])
                 )
                 message = msg_event.message
             except TimeoutError:
@@ -299,10 +300,8 @@ class PrefixedManager:
             # rather than building a special case for this
             prefixes = (prefixes,)  # type: ignore
 
-        prefix_used = next(
-            (prefix for prefix in prefixes if message.content.startswith(prefix)),
-            None,
-        )
+        # the trie for a set of prefixes is built once, and matching costs one walk over the prefix length
+        prefix_used = PrefixTrie.for_prefixes(tuple(prefixes)).match(message.content)
         if not prefix_used:
             return
 
@@ -1,9 +1,12 @@
-from typing import Callable, Any, Coroutine
+from functools import lru_cache
+from typing import Callable, Any, Coroutine, Iterable, Optional
 
 from interactions.client.client import Client
 from interactions.models.discord.message import Message
 
-__all__ = ("when_mentioned", "when_mentioned_or")
+__all__ = ("when_mentioned", "when_mentioned_or", "PrefixTrie")
+
+_END = object()
 
 
 async def when_mentioned(bot: Client, _) -> list[str]:
@@ -39,3 +42,64 @@ def when_mentioned_or(
         return (await when_mentioned(bot, _)) + list(prefixes)
 
     return _new_mention
+
+
+class PrefixTrie:
+    """
+    Matches text against many prefixes in one pass over the text, instead of one `startswith` per prefix.
+
+    Where several prefixes match, the one given first wins, exactly like trying them in order would.
+    Empty prefixes never match.
+
+    Args:
+        prefixes: The prefixes, in order of precedence.
+
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        self._root: dict = {}
+        for order, prefix in enumerate(prefixes):
+            if not prefix:
+                continue
+            node = self._root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node.setdefault(_END, (order, prefix))
+
+    def match(self, text: str) -> Optional[str]:
+        """
+        Get the prefix text starts with.
+
+        Args:
+            text: The text to match, e.g. a message's content.
+
+        Returns:
+            The matching prefix of highest precedence, or None.
+
+        """
+        node = self._root
+        best = None
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            if (found := node.get(_END)) and (best is None or found[0] < best[0]):
+                best = found
+        return best[1] if best else None
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def for_prefixes(prefixes: tuple[str, ...]) -> "PrefixTrie":
+        """
+        Get a trie for the given prefixes, built once per distinct tuple of prefixes.
+
+        Args:
+            prefixes: The prefixes, in order of precedence.
+
+        Returns:
+            The (possibly shared) trie.
+
+        """
+        return PrefixTrie(prefixes)
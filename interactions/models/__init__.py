@@ -1,326 +1,333 @@
-from .discord import (
-    ActionRow,
-    Activity,
-    ActivityAssets,
-    ActivityFlag,
-    ActivityParty,
-    ActivitySecrets,
-    ActivityTimestamps,
-    ActivityType,
-    AllowedMentions,
-    Application,
-    ApplicationCommandPermission,
-    ApplicationFlags,
-    Asset,
-    Attachment,
-    AuditLog,
-    AuditLogChange,
-    AuditLogEntry,
-    AuditLogEventType,
-    AuditLogHistory,
-    AutoArchiveDuration,
-    AutoModerationAction,
-    AutoModRule,
-    BaseChannel,
-    BaseComponent,
-    BaseGuild,
-    BaseMessage,
-    BaseSelectMenu,
-    BaseUser,
-    BrandColors,
-    BrandColours,
-    BulkBanResponse,
-    Button,
-    ButtonStyle,
-    ChannelFlags,
-    ChannelHistory,
-    ChannelMention,
-    ChannelSelectMenu,
-    ChannelType,
-    ClientUser,
-    Color,
-    COLOR_TYPES,
-    Colour,
-    CommandType,
-    ComponentType,
-    ContextType,
-    CustomEmoji,
-    DefaultNotificationLevel,
-    DefaultReaction,
-    DM,
-    DMChannel,
-    DMGroup,
-    Embed,
-    EmbedAttachment,
-    EmbedAuthor,
-    EmbedField,
-    EmbedFooter,
-    EmbedProvider,
-    Entitlement,
-    ExplicitContentFilterLevel,
-    File,
-    FlatUIColors,
-    FlatUIColours,
-    ForumLayoutType,
-    get_components_ids,
-    Guild,
-    GuildBan,
-    GuildCategory,
-    GuildChannel,
-    GuildForum,
-    GuildForumPost,
-    GuildIntegration,
-    GuildMedia,
-    GuildNews,
-    GuildNewsThread,
-    GuildPreview,
-    GuildPrivateThread,
-    GuildPublicThread,
-    GuildStageVoice,
-    GuildTemplate,
-    GuildText,
-    GuildVoice,
-    GuildWelcome,
-    GuildWelcomeChannel,
-    GuildWidget,
-    GuildWidgetSettings,
-    InputText,
-    IntegrationExpireBehaviour,
-    IntegrationType,
-    Intents,
-    InteractionPermissionTypes,
-    InteractionType,
-    InteractiveComponent,
-    InvitableMixin,
-    Invite,
-    InviteTargetType,
-    MaterialColors,
-    MaterialColours,
-    Member,
-    MemberFlags,
-    MentionableSelectMenu,
-    MentionType,
-    Message,
-    MessageableMixin,
-    MessageActivity,
-    MessageActivityType,
-    MessageFlags,
-    MessageInteraction,
-    MessageInteractionMetadata,
-    MessageReference,
-    MessageType,
-    MFALevel,
-    Modal,
-    NSFWLevel,
-    open_file,
-    OverwriteType,
-    Onboarding,
-    OnboardingMode,
-    OnboardingPrompt,
-    OnboardingPromptOption,
-    OnboardingPromptType,
-    ParagraphText,
-    PartialEmoji,
-    PermissionOverwrite,
-    Permissions,
-    Poll,
-    PollAnswer,
-    PollAnswerCount,
-    PollLayoutType,
-    PollMedia,
-    PollResults,
-    PremiumTier,
-    PremiumType,
-    process_allowed_mentions,
-    process_color,
-    process_colour,
-    process_components,
-    process_default_reaction,
-    process_embeds,
-    process_emoji,
-    process_emoji_req_format,
-    process_message_payload,
-    process_message_reference,
-    process_permission_overwrites,
-    process_thread_tag,
-    Reaction,
-    ReactionUsers,
-    Role,
-    RoleColors,
-    RoleColours,
-    RoleSelectMenu,
-    ScheduledEvent,
-    ScheduledEventPrivacyLevel,
-    ScheduledEventStatus,
-    ScheduledEventType,
-    ShortText,
-    Snowflake,
-    Snowflake_Type,
-    SnowflakeObject,
-    spread_to_rows,
-    StageInstance,
-    StagePrivacyLevel,
-    Status,
-    Sticker,
-    StickerFormatType,
-    StickerItem,
-    StickerPack,
-    StickerTypes,
-    StringSelectMenu,
-    StringSelectOption,
-    SystemChannelFlags,
-    Team,
-    TeamMember,
-    TeamMembershipState,
-    TextStyles,
-    ThreadableMixin,
-    ThreadChannel,
-    ThreadList,
-    ThreadMember,
-    ThreadTag,
-    Timestamp,
-    TimestampStyles,
-    to_optional_snowflake,
-    to_snowflake,
-    to_snowflake_list,
-    TYPE_ALL_ACTION,
-    TYPE_ALL_CHANNEL,
-    TYPE_ALL_TRIGGER,
-    TYPE_CHANNEL_MAPPING,
-    TYPE_COMPONENT_MAPPING,
-    TYPE_DM_CHANNEL,
-    TYPE_GUILD_CHANNEL,
-    TYPE_MESSAGEABLE_CHANNEL,
-    TYPE_THREAD_CHANNEL,
-    TYPE_VOICE_CHANNEL,
-    UPLOADABLE_TYPE,
-    User,
-    UserFlags,
-    UserSelectMenu,
-    VerificationLevel,
-    VideoQualityMode,
-    VoiceRegion,
-    VoiceState,
-    Webhook,
-    WebhookMixin,
-    WebhookTypes,
-    WebSocketOPCode,
-    ForumSortOrder,
-)
-from .internal import (
-    ActiveVoiceState,
-    application_commands_to_dict,
-    auto_defer,
-    AutocompleteContext,
-    AutoDefer,
-    BaseChannelConverter,
-    BaseCommand,
-    BaseContext,
-    BaseInteractionContext,
-    BaseTrigger,
-    Buckets,
-    CallbackObject,
-    CallbackType,
-    ChannelConverter,
-    check,
-    component_callback,
-    ComponentCommand,
-    ComponentContext,
-    contexts,
-    context_menu,
-    user_context_menu,
-    message_context_menu,
-    ConsumeRest,
-    ContextMenu,
-    ContextMenuContext,
-    Converter,
-    cooldown,
-    Cooldown,
-    CooldownSystem,
-    CronTrigger,
-    SlidingWindowSystem,
-    ExponentialBackoffSystem,
-    LeakyBucketSystem,
-    TokenBucketSystem,
-    CustomEmojiConverter,
-    DateTrigger,
-    dm_only,
-    DMChannelConverter,
-    DMConverter,
-    DMGroupConverter,
-    Extension,
-    global_autocomplete,
-    GlobalAutoComplete,
-    Greedy,
-    guild_only,
-    GuildCategoryConverter,
-    GuildChannelConverter,
-    GuildConverter,
-    GuildNewsConverter,
-    GuildNewsThreadConverter,
-    GuildPrivateThreadConverter,
-    GuildPublicThreadConverter,
-    GuildStageVoiceConverter,
-    GuildTextConverter,
-    GuildVoiceConverter,
-    has_any_role,
-    has_id,
-    has_role,
-    IDConverter,
-    integration_types,
-    InteractionCommand,
-    InteractionContext,
-    IntervalTrigger,
-    is_owner,
-    listen,
-    Listener,
-    LocalisedDesc,
-    LocalisedName,
-    LocalizedDesc,
-    LocalizedName,
-    max_concurrency,
-    MaxConcurrency,
-    MemberConverter,
-    MessageableChannelConverter,
-    MessageConverter,
-    modal_callback,
-    ModalCommand,
-    ModalContext,
-    MODEL_TO_CONVERTER,
-    NoArgumentConverter,
-    OptionType,
-    OrTrigger,
-    PartialEmojiConverter,
-    Resolved,
-    RoleConverter,
-    slash_attachment_option,
-    slash_bool_option,
-    slash_channel_option,
-    slash_command,
-    slash_default_member_permission,
-    slash_float_option,
-    slash_int_option,
-    slash_mentionable_option,
-    slash_option,
-    slash_role_option,
-    slash_str_option,
-    slash_user_option,
-    SlashCommand,
-    SlashCommandChoice,
-    SlashCommandOption,
-    SlashCommandParameter,
-    SlashContext,
-    SnowflakeConverter,
-    subcommand,
-    sync_needed,
-    Task,
-    ThreadChannelConverter,
-    TimeTrigger,
-    UserConverter,
-    VoiceChannelConverter,
-    Wait,
-)
-from .misc import AsyncIterator, Typing
+from typing import TYPE_CHECKING
+
+from interactions._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .discord import (
+        ActionRow,
+        Activity,
+        ActivityAssets,
+        ActivityFlag,
+        ActivityParty,
+        ActivitySecrets,
+        ActivityTimestamps,
+        ActivityType,
+        AllowedMentions,
+        Application,
+        ApplicationCommandPermission,
+        ApplicationFlags,
+        Asset,
+        Attachment,
+        AuditLog,
+        AuditLogChange,
+        AuditLogEntry,
+        AuditLogEventType,
+        AuditLogHistory,
+        AutoArchiveDuration,
+        AutoModerationAction,
+        AutoModRule,
+        BaseChannel,
+        BaseComponent,
+        BaseGuild,
+        BaseMessage,
+        BaseSelectMenu,
+        BaseUser,
+        BrandColors,
+        BrandColours,
+        BulkBanResponse,
+        Button,
+        ButtonStyle,
+        ChannelFlags,
+        ChannelHistory,
+        ChannelMention,
+        ChannelSelectMenu,
+        ChannelType,
+        ClientUser,
+        Color,
+        COLOR_TYPES,
+        Colour,
+        CommandType,
+        ComponentType,
+        ContextType,
+        CustomEmoji,
+        DefaultNotificationLevel,
+        DefaultReaction,
+        DM,
+        DMChannel,
+        DMGroup,
+        Embed,
+        EmbedAttachment,
+        EmbedAuthor,
+        EmbedField,
+        EmbedFooter,
+        EmbedProvider,
+        Entitlement,
+        ExplicitContentFilterLevel,
+        File,
+        FlatUIColors,
+        FlatUIColours,
+        ForumLayoutType,
+        get_components_ids,
+        Guild,
+        GuildBan,
+        GuildCategory,
+        GuildChannel,
+        GuildForum,
+        GuildForumPost,
+        GuildIntegration,
+        GuildMedia,
+        GuildNews,
+        GuildNewsThread,
+        GuildPreview,
+        GuildPrivateThread,
+        GuildPublicThread,
+        GuildStageVoice,
+        GuildTemplate,
+        GuildText,
+        GuildVoice,
+        GuildWelcome,
+        GuildWelcomeChannel,
+        GuildWidget,
+        GuildWidgetSettings,
+        InputText,
+        IntegrationExpireBehaviour,
+        IntegrationType,
+        Intents,
+        InteractionPermissionTypes,
+        InteractionType,
+        InteractiveComponent,
+        InvitableMixin,
+        Invite,
+        InviteTargetType,
+        MaterialColors,
+        MaterialColours,
+        Member,
+        MemberFlags,
+        MentionableSelectMenu,
+        MentionType,
+        Message,
+        MessageableMixin,
+        MessageActivity,
+        MessageActivityType,
+        MessageFlags,
+        MessageInteraction,
+        MessageInteractionMetadata,
+        MessageReference,
+        MessageType,
+        MFALevel,
+        Modal,
+        NSFWLevel,
+        open_file,
+        OverwriteType,
+        Onboarding,
+        OnboardingMode,
+        OnboardingPrompt,
+        OnboardingPromptOption,
+        OnboardingPromptType,
+        ParagraphText,
+        PartialEmoji,
+        PermissionOverwrite,
+        Permissions,
+        Poll,
+        PollAnswer,
+        PollAnswerCount,
+        PollLayoutType,
+        PollMedia,
+        PollResults,
+        PremiumTier,
+        PremiumType,
+        process_allowed_mentions,
+        process_color,
+        process_colour,
+        process_components,
+        process_default_reaction,
+        process_embeds,
+        process_emoji,
+        process_emoji_req_format,
+        process_message_payload,
+        process_message_reference,
+        process_permission_overwrites,
+        process_thread_tag,
+        Reaction,
+        ReactionUsers,
+        Role,
+        RoleColors,
+        RoleColours,
+        RoleSelectMenu,
+        ScheduledEvent,
+        ScheduledEventPrivacyLevel,
+        ScheduledEventStatus,
+        ScheduledEventType,
+        ShortText,
+        Snowflake,
+        Snowflake_Type,
+        SnowflakeObject,
+        spread_to_rows,
+        StageInstance,
+        StagePrivacyLevel,
+        Status,
+        Sticker,
+        StickerFormatType,
+        StickerItem,
+        StickerPack,
+        StickerTypes,
+        StringSelectMenu,
+        StringSelectOption,
+        SystemChannelFlags,
+        Team,
+        TeamMember,
+        TeamMembershipState,
+        TextStyles,
+        ThreadableMixin,
+        ThreadChannel,
+        ThreadList,
+        ThreadMember,
+        ThreadTag,
+        Timestamp,
+        TimestampStyles,
+        to_optional_snowflake,
+        to_snowflake,
+        to_snowflake_list,
+        TYPE_ALL_ACTION,
+        TYPE_ALL_CHANNEL,
+        TYPE_ALL_TRIGGER,
+        TYPE_CHANNEL_MAPPING,
+        TYPE_COMPONENT_MAPPING,
+        TYPE_DM_CHANNEL,
+        TYPE_GUILD_CHANNEL,
+        TYPE_MESSAGEABLE_CHANNEL,
+        TYPE_THREAD_CHANNEL,
+        TYPE_VOICE_CHANNEL,
+        UPLOADABLE_TYPE,
+        User,
+        UserFlags,
+        UserSelectMenu,
+        VerificationLevel,
+        VideoQualityMode,
+        VoiceRegion,
+        VoiceState,
+        Webhook,
+        WebhookMixin,
+        WebhookTypes,
+        WebSocketOPCode,
+        ForumSortOrder,
+    )
+    from .internal import (
+        ActiveVoiceState,
+        application_commands_to_dict,
+        auto_defer,
+        AutocompleteContext,
+        AutoDefer,
+        BaseChannelConverter,
+        BaseCommand,
+        BaseContext,
+        BaseInteractionContext,
+        BaseTrigger,
+        Buckets,
+        CallbackObject,
+        CallbackType,
+        ChannelConverter,
+        check,
+        component_callback,
+        ComponentCommand,
+        ComponentContext,
+        contexts,
+        context_menu,
+        user_context_menu,
+        message_context_menu,
+        ConsumeRest,
+        ContextMenu,
+        ContextMenuContext,
+        Converter,
+        cooldown,
+        Cooldown,
+        CooldownSystem,
+        CronTrigger,
+        SlidingWindowSystem,
+        ExponentialBackoffSystem,
+        LeakyBucketSystem,
+        TokenBucketSystem,
+        CustomEmojiConverter,
+        DateTrigger,
+        dm_only,
+        DMChannelConverter,
+        DMConverter,
+        DMGroupConverter,
+        Extension,
+        global_autocomplete,
+        GlobalAutoComplete,
+        Greedy,
+        guild_only,
+        GuildCategoryConverter,
+        GuildChannelConverter,
+        GuildConverter,
+        GuildNewsConverter,
+        GuildNewsThreadConverter,
+        GuildPrivateThreadConverter,
+        GuildPublicThreadConverter,
+        GuildStageVoiceConverter,
+        GuildTextConverter,
+        GuildVoiceConverter,
+        has_any_role,
+        has_id,
+        has_role,
+        IDConverter,
+        integration_types,
+        InteractionCommand,
+        InteractionContext,
+        IntervalTrigger,
+        is_owner,
+        listen,
+        Listener,
+        LocalisedDesc,
+        LocalisedName,
+        LocalizedDesc,
+        LocalizedName,
+        max_concurrency,
+        MaxConcurrency,
+        MemberConverter,
+        MessageableChannelConverter,
+        MessageConverter,
+        modal_callback,
+        ModalCommand,
+        ModalContext,
+        MODEL_TO_CONVERTER,
+        NoArgumentConverter,
+        OptionType,
+        OrTrigger,
+        PartialEmojiConverter,
+        Resolved,
+        RoleConverter,
+        slash_attachment_option,
+        slash_bool_option,
+        slash_channel_option,
+        slash_command,
+        slash_default_member_permission,
+        slash_float_option,
+        slash_int_option,
+        slash_mentionable_option,
+        slash_option,
+        slash_role_option,
+        slash_str_option,
+        slash_user_option,
+        SlashCommand,
+        SlashCommandChoice,
+        SlashCommandOption,
+        SlashCommandParameter,
+        SlashContext,
+        SnowflakeConverter,
+        subcommand,
+        sync_needed,
+        Task,
+        ThreadChannelConverter,
+        TimeTrigger,
+        UserConverter,
+        VoiceChannelConverter,
+        Wait,
+    )
+    from .misc import AsyncIterator, Typing
+
+__getattr__, __dir__ = lazy_exports(__name__)
 
 __all__ = (
     "ActionRow",
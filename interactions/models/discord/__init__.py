@@ -1,181 +1,196 @@
-from .activity import Activity, ActivityAssets, ActivityParty, ActivitySecrets, ActivityTimestamps
-from .app_perms import ApplicationCommandPermission
-from .application import Application
-from .asset import Asset
-from .auto_mod import AutoModerationAction, AutoModRule, TYPE_ALL_ACTION, TYPE_ALL_TRIGGER
-from .channel import (
-    BaseChannel,
-    ChannelHistory,
-    DM,
-    DMChannel,
-    DMGroup,
-    GuildCategory,
-    GuildChannel,
-    GuildForum,
-    GuildForumPost,
-    GuildMedia,
-    GuildNews,
-    GuildNewsThread,
-    GuildPrivateThread,
-    GuildPublicThread,
-    GuildStageVoice,
-    GuildText,
-    GuildVoice,
-    InvitableMixin,
-    MessageableMixin,
-    PermissionOverwrite,
-    process_permission_overwrites,
-    ThreadableMixin,
-    ThreadChannel,
-    TYPE_ALL_CHANNEL,
-    TYPE_CHANNEL_MAPPING,
-    TYPE_DM_CHANNEL,
-    TYPE_GUILD_CHANNEL,
-    TYPE_MESSAGEABLE_CHANNEL,
-    TYPE_THREAD_CHANNEL,
-    TYPE_VOICE_CHANNEL,
-    WebhookMixin,
-)
-from .color import (
-    BrandColors,
-    BrandColours,
-    Color,
-    COLOR_TYPES,
-    Colour,
-    FlatUIColors,
-    FlatUIColours,
-    MaterialColors,
-    MaterialColours,
-    process_color,
-    process_colour,
-    RoleColors,
-    RoleColours,
-)
-from .components import (
-    ActionRow,
-    BaseComponent,
-    BaseSelectMenu,
-    Button,
-    ChannelSelectMenu,
-    get_components_ids,
-    InteractiveComponent,
-    MentionableSelectMenu,
-    process_components,
-    RoleSelectMenu,
-    spread_to_rows,
-    StringSelectMenu,
-    StringSelectOption,
-    TYPE_COMPONENT_MAPPING,
-    UserSelectMenu,
-)
+from typing import TYPE_CHECKING
 
-from .embed import Embed, EmbedAttachment, EmbedAuthor, EmbedField, EmbedFooter, EmbedProvider, process_embeds
-from .emoji import CustomEmoji, PartialEmoji, process_emoji, process_emoji_req_format
-from .entitlement import Entitlement
-from .enums import (
-    ActivityFlag,
-    ActivityType,
-    ApplicationFlags,
-    AuditLogEventType,
-    AutoArchiveDuration,
-    ButtonStyle,
-    ChannelFlags,
-    ChannelType,
-    CommandType,
-    ComponentType,
-    ContextType,
-    DefaultNotificationLevel,
-    ExplicitContentFilterLevel,
-    ForumLayoutType,
-    IntegrationExpireBehaviour,
-    IntegrationType,
-    Intents,
-    InteractionPermissionTypes,
-    InteractionType,
-    InviteTargetType,
-    MemberFlags,
-    MentionType,
-    MessageActivityType,
-    MessageFlags,
-    MessageType,
-    MFALevel,
-    NSFWLevel,
-    OnboardingMode,
-    OnboardingPromptType,
-    OverwriteType,
-    Permissions,
-    PollLayoutType,
-    PremiumTier,
-    PremiumType,
-    ScheduledEventPrivacyLevel,
-    ScheduledEventStatus,
-    ScheduledEventType,
-    StagePrivacyLevel,
-    Status,
-    StickerFormatType,
-    StickerTypes,
-    SystemChannelFlags,
-    TeamMembershipState,
-    UserFlags,
-    VerificationLevel,
-    VideoQualityMode,
-    WebSocketOPCode,
-    ForumSortOrder,
-)
-from .file import File, open_file, UPLOADABLE_TYPE
-from .guild import (
-    AuditLog,
-    AuditLogChange,
-    AuditLogEntry,
-    AuditLogHistory,
-    BaseGuild,
-    BulkBanResponse,
-    Guild,
-    GuildBan,
-    GuildIntegration,
-    GuildPreview,
-    GuildTemplate,
-    GuildWelcome,
-    GuildWelcomeChannel,
-    GuildWidget,
-    GuildWidgetSettings,
-)
-from .invite import Invite
-from .message import (
-    AllowedMentions,
-    Attachment,
-    BaseMessage,
-    ChannelMention,
-    Message,
-    MessageActivity,
-    MessageInteraction,
-    MessageInteractionMetadata,
-    MessageReference,
-    process_allowed_mentions,
-    process_message_payload,
-    process_message_reference,
-)
-from .modal import InputText, Modal, ParagraphText, ShortText, TextStyles
-from .onboarding import Onboarding, OnboardingPrompt, OnboardingPromptOption
-from .poll import PollMedia, PollAnswer, PollAnswerCount, PollResults, Poll
-from .reaction import Reaction, ReactionUsers
-from .role import Role
-from .scheduled_event import ScheduledEvent
-from .snowflake import (
-    Snowflake,
-    Snowflake_Type,
-    SnowflakeObject,
-    to_optional_snowflake,
-    to_snowflake,
-    to_snowflake_list,
-)
-from .stage_instance import StageInstance
-from .sticker import Sticker, StickerItem, StickerPack
-from .team import Team, TeamMember
-from .thread import ThreadList, ThreadMember, ThreadTag, DefaultReaction, process_thread_tag, process_default_reaction
-from .timestamp import Timestamp, TimestampStyles
-from .user import BaseUser, Member, User, ClientUser
-from .voice_state import VoiceRegion, VoiceState
+from interactions._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .activity import Activity, ActivityAssets, ActivityParty, ActivitySecrets, ActivityTimestamps
+    from .app_perms import ApplicationCommandPermission
+    from .application import Application
+    from .asset import Asset
+    from .auto_mod import AutoModerationAction, AutoModRule, TYPE_ALL_ACTION, TYPE_ALL_TRIGGER
+    from .channel import (
+        BaseChannel,
+        ChannelHistory,
+        DM,
+        DMChannel,
+        DMGroup,
+        GuildCategory,
+        GuildChannel,
+        GuildForum,
+        GuildForumPost,
+        GuildMedia,
+        GuildNews,
+        GuildNewsThread,
+        GuildPrivateThread,
+        GuildPublicThread,
+        GuildStageVoice,
+        GuildText,
+        GuildVoice,
+        InvitableMixin,
+        MessageableMixin,
+        PermissionOverwrite,
+        process_permission_overwrites,
+        ThreadableMixin,
+        ThreadChannel,
+        TYPE_ALL_CHANNEL,
+        TYPE_CHANNEL_MAPPING,
+        TYPE_DM_CHANNEL,
+        TYPE_GUILD_CHANNEL,
+        TYPE_MESSAGEABLE_CHANNEL,
+        TYPE_THREAD_CHANNEL,
+        TYPE_VOICE_CHANNEL,
+        WebhookMixin,
+    )
+    from .color import (
+        BrandColors,
+        BrandColours,
+        Color,
+        COLOR_TYPES,
+        Colour,
+        FlatUIColors,
+        FlatUIColours,
+        MaterialColors,
+        MaterialColours,
+        process_color,
+        process_colour,
+        RoleColors,
+        RoleColours,
+    )
+    from .components import (
+        ActionRow,
+        BaseComponent,
+        BaseSelectMenu,
+        Button,
+        ChannelSelectMenu,
+        get_components_ids,
+        InteractiveComponent,
+        MentionableSelectMenu,
+        process_components,
+        RoleSelectMenu,
+        spread_to_rows,
+        StringSelectMenu,
+        StringSelectOption,
+        TYPE_COMPONENT_MAPPING,
+        UserSelectMenu,
+    )
+
+    from .embed import Embed, EmbedAttachment, EmbedAuthor, EmbedField, EmbedFooter, EmbedProvider, process_embeds
+    from .emoji import CustomEmoji, PartialEmoji, process_emoji, process_emoji_req_format
+    from .entitlement import Entitlement
+    from .enums import (
+        ActivityFlag,
+        ActivityType,
+        ApplicationFlags,
+        AuditLogEventType,
+        AutoArchiveDuration,
+        ButtonStyle,
+        ChannelFlags,
+        ChannelType,
+        CommandType,
+        ComponentType,
+        ContextType,
+        DefaultNotificationLevel,
+        ExplicitContentFilterLevel,
+        ForumLayoutType,
+        IntegrationExpireBehaviour,
+        IntegrationType,
+        Intents,
+        InteractionPermissionTypes,
+        InteractionType,
+        InviteTargetType,
+        MemberFlags,
+        MentionType,
+        MessageActivityType,
+        MessageFlags,
+        MessageType,
+        MFALevel,
+        NSFWLevel,
+        OnboardingMode,
+        OnboardingPromptType,
+        OverwriteType,
+        Permissions,
+        PollLayoutType,
+        PremiumTier,
+        PremiumType,
+        ScheduledEventPrivacyLevel,
+        ScheduledEventStatus,
+        ScheduledEventType,
+        StagePrivacyLevel,
+        Status,
+        StickerFormatType,
+        StickerTypes,
+        SystemChannelFlags,
+        TeamMembershipState,
+        UserFlags,
+        VerificationLevel,
+        VideoQualityMode,
+        WebSocketOPCode,
+        ForumSortOrder,
+    )
+    from .file import File, open_file, UPLOADABLE_TYPE
+    from .guild import (
+        AuditLog,
+        AuditLogChange,
+        AuditLogEntry,
+        AuditLogHistory,
+        BaseGuild,
+        BulkBanResponse,
+        Guild,
+        GuildBan,
+        GuildIntegration,
+        GuildPreview,
+        GuildTemplate,
+        GuildWelcome,
+        GuildWelcomeChannel,
+        GuildWidget,
+        GuildWidgetSettings,
+    )
+    from .invite import Invite
+    from .message import (
+        AllowedMentions,
+        Attachment,
+        BaseMessage,
+        ChannelMention,
+        Message,
+        MessageActivity,
+        MessageInteraction,
+        MessageInteractionMetadata,
+        MessageReference,
+        process_allowed_mentions,
+        process_message_payload,
+        process_message_reference,
+    )
+    from .modal import InputText, Modal, ParagraphText, ShortText, TextStyles
+    from .onboarding import Onboarding, OnboardingPrompt, OnboardingPromptOption
+    from .poll import PollMedia, PollAnswer, PollAnswerCount, PollResults, Poll
+    from .reaction import Reaction, ReactionUsers
+    from .role import Role
+    from .scheduled_event import ScheduledEvent
+    from .snowflake import (
+        Snowflake,
+        Snowflake_Type,
+        SnowflakeObject,
+        to_optional_snowflake,
+        to_snowflake,
+        to_snowflake_list,
+    )
+    from .stage_instance import StageInstance
+    from .sticker import Sticker, StickerItem, StickerPack
+    from .team import Team, TeamMember
+    from .thread import (
+        ThreadList,
+        ThreadMember,
+        ThreadTag,
+        DefaultReaction,
+        process_thread_tag,
+        process_default_reaction,
+    )
+    from .timestamp import Timestamp, TimestampStyles
+    from .user import BaseUser, Member, User, ClientUser
+    from .voice_state import VoiceRegion, VoiceState
+    from .webhooks import Webhook, WebhookTypes
+
+__getattr__, __dir__ = lazy_exports(__name__)
 
 __all__ = (
     "ActionRow",
@@ -386,4 +401,3 @@ __all__ = (
     "WebhookTypes",
     "WebSocketOPCode",
 )
-from .webhooks import Webhook, WebhookTypes
@@ -1,109 +1,116 @@
-from .annotations import (
-    slash_attachment_option,
-    slash_bool_option,
-    slash_channel_option,
-    slash_float_option,
-    slash_int_option,
-    slash_mentionable_option,
-    slash_role_option,
-    slash_str_option,
-    slash_user_option,
-)
-from .callback import CallbackObject
-from .active_voice_state import ActiveVoiceState
-from .auto_defer import AutoDefer  # purposely out of order to make sure auto_defer comes out as the deco
-from .application_commands import (
-    application_commands_to_dict,
-    auto_defer,
-    CallbackType,
-    component_callback,
-    ComponentCommand,
-    contexts,
-    context_menu,
-    user_context_menu,
-    message_context_menu,
-    ContextMenu,
-    global_autocomplete,
-    GlobalAutoComplete,
-    integration_types,
-    InteractionCommand,
-    LocalisedDesc,
-    LocalisedName,
-    LocalizedDesc,
-    LocalizedName,
-    modal_callback,
-    ModalCommand,
-    OptionType,
-    slash_command,
-    slash_default_member_permission,
-    slash_option,
-    SlashCommand,
-    SlashCommandChoice,
-    SlashCommandOption,
-    SlashCommandParameter,
-    subcommand,
-    sync_needed,
-)
-from .checks import dm_only, guild_only, has_any_role, has_id, has_role, is_owner
-from .command import BaseCommand, check, cooldown, max_concurrency
-from .context import (
-    AutocompleteContext,
-    BaseContext,
-    BaseInteractionContext,
-    ComponentContext,
-    ContextMenuContext,
-    InteractionContext,
-    ModalContext,
-    Resolved,
-    SlashContext,
-)
-from .converters import (
-    BaseChannelConverter,
-    ChannelConverter,
-    ConsumeRest,
-    CustomEmojiConverter,
-    DMChannelConverter,
-    DMConverter,
-    DMGroupConverter,
-    Greedy,
-    GuildCategoryConverter,
-    GuildChannelConverter,
-    GuildConverter,
-    GuildNewsConverter,
-    GuildNewsThreadConverter,
-    GuildPrivateThreadConverter,
-    GuildPublicThreadConverter,
-    GuildStageVoiceConverter,
-    GuildTextConverter,
-    GuildVoiceConverter,
-    IDConverter,
-    MemberConverter,
-    MessageableChannelConverter,
-    MessageConverter,
-    MODEL_TO_CONVERTER,
-    NoArgumentConverter,
-    PartialEmojiConverter,
-    RoleConverter,
-    SnowflakeConverter,
-    ThreadChannelConverter,
-    UserConverter,
-    VoiceChannelConverter,
-)
-from .cooldowns import (
-    Buckets,
-    Cooldown,
-    CooldownSystem,
-    MaxConcurrency,
-    SlidingWindowSystem,
-    ExponentialBackoffSystem,
-    LeakyBucketSystem,
-    TokenBucketSystem,
-)
-from .listener import listen, Listener
-from .protocols import Converter
-from .extension import Extension
-from .wait import Wait
-from .tasks import BaseTrigger, DateTrigger, IntervalTrigger, OrTrigger, Task, TimeTrigger, CronTrigger
+from typing import TYPE_CHECKING
+
+from interactions._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .annotations import (
+        slash_attachment_option,
+        slash_bool_option,
+        slash_channel_option,
+        slash_float_option,
+        slash_int_option,
+        slash_mentionable_option,
+        slash_role_option,
+        slash_str_option,
+        slash_user_option,
+    )
+    from .callback import CallbackObject
+    from .active_voice_state import ActiveVoiceState
+    from .auto_defer import AutoDefer  # purposely out of order to make sure auto_defer comes out as the deco
+    from .application_commands import (
+        application_commands_to_dict,
+        auto_defer,
+        CallbackType,
+        component_callback,
+        ComponentCommand,
+        contexts,
+        context_menu,
+        user_context_menu,
+        message_context_menu,
+        ContextMenu,
+        global_autocomplete,
+        GlobalAutoComplete,
+        integration_types,
+        InteractionCommand,
+        LocalisedDesc,
+        LocalisedName,
+        LocalizedDesc,
+        LocalizedName,
+        modal_callback,
+        ModalCommand,
+        OptionType,
+        slash_command,
+        slash_default_member_permission,
+        slash_option,
+        SlashCommand,
+        SlashCommandChoice,
+        SlashCommandOption,
+        SlashCommandParameter,
+        subcommand,
+        sync_needed,
+    )
+    from .checks import dm_only, guild_only, has_any_role, has_id, has_role, is_owner
+    from .command import BaseCommand, check, cooldown, max_concurrency
+    from .context import (
+        AutocompleteContext,
+        BaseContext,
+        BaseInteractionContext,
+        ComponentContext,
+        ContextMenuContext,
+        InteractionContext,
+        ModalContext,
+        Resolved,
+        SlashContext,
+    )
+    from .converters import (
+        BaseChannelConverter,
+        ChannelConverter,
+        ConsumeRest,
+        CustomEmojiConverter,
+        DMChannelConverter,
+        DMConverter,
+        DMGroupConverter,
+        Greedy,
+        GuildCategoryConverter,
+        GuildChannelConverter,
+        GuildConverter,
+        GuildNewsConverter,
+        GuildNewsThreadConverter,
+        GuildPrivateThreadConverter,
+        GuildPublicThreadConverter,
+        GuildStageVoiceConverter,
+        GuildTextConverter,
+        GuildVoiceConverter,
+        IDConverter,
+        MemberConverter,
+        MessageableChannelConverter,
+        MessageConverter,
+        MODEL_TO_CONVERTER,
+        NoArgumentConverter,
+        PartialEmojiConverter,
+        RoleConverter,
+        SnowflakeConverter,
+        ThreadChannelConverter,
+        UserConverter,
+        VoiceChannelConverter,
+    )
+    from .cooldowns import (
+        Buckets,
+        Cooldown,
+        CooldownSystem,
+        MaxConcurrency,
+        SlidingWindowSystem,
+        ExponentialBackoffSystem,
+        LeakyBucketSystem,
+        TokenBucketSystem,
+    )
+    from .listener import listen, Listener
+    from .protocols import Converter
+    from .extension import Extension
+    from .wait import Wait
+    from .tasks import BaseTrigger, DateTrigger, IntervalTrigger, OrTrigger, Task, TimeTrigger, CronTrigger
+
+__getattr__, __dir__ = lazy_exports(__name__)
 
 __all__ = (
     "ActiveVoiceState",
@@ -608,6 +608,7 @@ class SlashCommand(InteractionCommand):
 
     options: List[Union[SlashCommandOption, Dict]] = attrs.field(repr=False, factory=list)
     autocomplete_callbacks: dict = attrs.field(repr=False, factory=dict, metadata=no_export_meta)
+    autocomplete_cache_ttls: dict = attrs.field(repr=False, factory=dict, metadata=no_export_meta)
 
     parameters: dict[str, SlashCommandParameter] = attrs.field(
         repr=False,
@@ -759,13 +760,22 @@ class SlashCommand(InteractionCommand):
             ):
                 raise ValueError("Required options must go before optional options")
 
-    def autocomplete(self, option_name: str) -> Callable[..., Coroutine]:
-        """A decorator to declare a coroutine as an option autocomplete."""
+    def autocomplete(self, option_name: str, *, cache_ttl: float | None = None) -> Callable[..., Coroutine]:
+        """
+        A decorator to declare a coroutine as an option autocomplete.
+
+        Args:
+            option_name: The option to autocomplete
+            cache_ttl: Cache the responses for this many seconds, see `AutocompleteCache` for what that requires of the callback
+
+        """
 
         def wrapper(call: Callable[..., Coroutine]) -> Callable[..., Coroutine]:
             if not asyncio.iscoroutinefunction(call):
                 raise TypeError("autocomplete must be coroutine")
             self.autocomplete_callbacks[option_name] = call
+            if cache_ttl:
+                self.autocomplete_cache_ttls[option_name] = cache_ttl
 
             if self.options:
                 # automatically set the option's autocomplete attribute to True
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Optional
+
+if TYPE_CHECKING:
+    from interactions.models.internal.context import AutocompleteContext
+
+__all__ = ("AutocompleteCache",)
+
+MAX_CHOICES = 25
+"""Discord shows at most this many choices, unless told otherwise a response with fewer is the complete result"""
+
+
+class AutocompleteCache:
+    """
+    Caches autocomplete responses by command, option and normalised input.
+
+    Only used for autocompletes registered with a `cache_ttl`, see `SlashCommand.autocomplete`. Those must
+    answer with the choices whose name contains the input (as most name lookups do): a longer input is then
+    answered by filtering the cached, complete response of a shorter prefix, without running the callback at
+    all. A response is complete if it has fewer than 25 choices, callbacks that drop some of the matches they
+    looked up should tell with `AutocompleteContext.send(complete=...)`.
+
+    Per user, only the latest input for an option matters to Discord: identical inputs in flight share one
+    callback run, and with `debounce` set an input is dropped if the user typed on before it was handled.
+
+    Attributes:
+        max_entries int: Responses kept, least recently used are dropped first
+        debounce float: Seconds to wait for further keystrokes before running a callback, 0 to not wait
+        stats dict[str, int]: hits, derived (answered from a shorter prefix), misses, coalesced and superseded counts
+
+    """
+
+    def __init__(self, max_entries: int = 4096, debounce: float = 0) -> None:
+        self.max_entries = max_entries
+        self.debounce = debounce
+        self.stats: dict[str, int] = {"hits": 0, "derived": 0, "misses": 0, "coalesced": 0, "superseded": 0}
+        self._entries: OrderedDict[tuple, tuple[float, list, bool]] = OrderedDict()
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self._latest: OrderedDict[tuple, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of autocompletes answered without running their callback."""
+        answered = self.stats["hits"] + self.stats["derived"] + self.stats["coalesced"]
+        total = answered + self.stats["misses"]
+        return answered / total if total else 0.0
+
+    @staticmethod
+    def normalise(text: Any) -> str:
+        """Case and surrounding/repeated whitespace don't change the results."""
+        return " ".join(str(text or "").casefold().split())
+
+    def clear(self) -> None:
+        """Forget all responses, e.g. when the data behind them changed."""
+        self._entries.clear()
+
+    def get(self, command: str, option: str, text: str) -> Optional[list]:
+        """
+        Get the cached choices for an input.
+
+        Args:
+            command: The command's resolved name
+            option: The option's name
+            text: The normalised input
+
+        Returns:
+            The choices, None on a miss
+
+        """
+        now = time.monotonic()
+        if (entry := self._get_entry((command, option, text), now)) is not None:
+            self.stats["hits"] += 1
+            return entry[0]
+        for length in range(len(text) - 1, 0, -1):
+            shorter = self._get_entry((command, option, text[:length]), now)
+            if shorter is not None and shorter[1]:
+                self.stats["derived"] += 1
+                return [choice for choice in shorter[0] if text in self.normalise(choice["name"])]
+        return None
+
+    def put(self, key: tuple, choices: list, ttl: float, complete: Optional[bool] = None) -> None:
+        """
+        Cache the choices for an input.
+
+        Args:
+            key: The command, option and normalised input
+            choices: The choices
+            ttl: Seconds to keep them
+            complete: Whether these are all the matches, so longer inputs can be answered from them. Defaults to
+                fewer than 25 choices
+
+        """
+        if complete is None:
+            complete = len(choices) < MAX_CHOICES
+        self._entries[key] = (time.monotonic() + ttl, choices, complete)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_entry(self, key: tuple, now: float) -> Optional[tuple[list, bool]]:
+        if (entry := self._entries.get(key)) is None:
+            return None
+        if entry[0] < now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1], entry[2]
+
+    def _is_latest(self, user_key: tuple, interaction_id: int) -> bool:
+        return self._latest.get(user_key) == interaction_id
+
+    async def respond(
+        self, ctx: "AutocompleteContext", callback: Callable[["AutocompleteContext"], Coroutine], ttl: float
+    ) -> Any:
+        """
+        Answer an autocomplete from the cache, or run its callback and cache what it sends.
+
+        Args:
+            ctx: The autocomplete context
+            callback: The autocomplete callback
+            ttl: Seconds to keep the response
+
+        """
+        command, option = str(ctx.command.resolved_name), str(ctx.focussed_option.name)
+        text = self.normalise(ctx.input_text)
+        key = (command, option, text)
+        user_key = (ctx.author_id, command, option)
+        self._latest[user_key] = ctx.id
+        self._latest.move_to_end(user_key)
+        while len(self._latest) > self.max_entries:
+            self._latest.popitem(last=False)
+
+        if (choices := self.get(command, option, text)) is not None:
+            if key not in self._entries:  # derived from a shorter prefix, so complete as well
+                self.put(key, choices, ttl, complete=True)
+            return await ctx.send(choices)
+
+        if future := self._in_flight.get(key):
+            self.stats["coalesced"] += 1
+            if (choices := await asyncio.shield(future)) is not None:
+                return await ctx.send(choices)
+
+        if self.debounce:
+            await asyncio.sleep(self.debounce)
+            if not self._is_latest(user_key, ctx.id):
+                # the user typed on, Discord ignores the response to this keystroke anyway
+                self.stats["superseded"] += 1
+                return None
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        ctx._autocomplete_cache = (self, key, ttl, future)
+        try:
+            return await callback(ctx)
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            if not future.done():
+                future.set_result(None)  # the callback did not answer, waiters run their own
+
+    def _store_response(
+        self, key: tuple, ttl: float, future: asyncio.Future, choices: list, complete: Optional[bool] = None
+    ) -> None:
+        """Called by `AutocompleteContext.send` for responses to cached autocompletes."""
+        self.put(key, choices, ttl, complete)
+        if not future.done():
+            future.set_result(choices)
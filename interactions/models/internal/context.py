@@ -30,6 +30,7 @@ from interactions.models.discord.enums import (
     CommandType,
     ContextType,
     IntegrationType,
+    ChannelType,
 )
 from interactions.models.discord.message import (
     AllowedMentions,
@@ -201,11 +202,29 @@ class BaseContext(typing.Generic[ClientT], metaclass=abc.ABCMeta):
 
     @property
     def channel(self) -> "interactions.TYPE_MESSAGEABLE_CHANNEL":
-        """The channel this context was invoked in."""
+        """The channel this context was invoked in, None if it isn't cached. See `fetch_channel`."""
         if self.guild_id:
             return self.client.cache.get_channel(self.channel_id)
         return self.client.cache.get_dm_channel(self.author_id)
 
+    async def fetch_channel(self, *, force: bool = False) -> "interactions.TYPE_MESSAGEABLE_CHANNEL":
+        """
+        Fetch the channel this context was invoked in.
+
+        Interactions only include a partial channel, which `channel` returns. Use this when the full channel
+        (e.g. its permission overwrites) is needed.
+
+        Args:
+            force: Whether to fetch the channel from the API even if it is cached
+
+        Returns:
+            The channel
+
+        """
+        if self.channel_id:
+            return await self.client.cache.fetch_channel(self.channel_id, force=force)
+        return await self.client.cache.fetch_dm_channel(self.author_id, force=force)
+
     @property
     def message(self) -> typing.Optional["interactions.Message"]:
         """The message that invoked this context, if any."""
@@ -305,7 +324,9 @@ class BaseInteractionContext(BaseContext[ClientT]):
 
         instance.channel_id = Snowflake(payload["channel_id"])
         if channel := payload.get("channel"):
-            client.cache.place_channel_data(channel)
+            if payload.get("guild_id"):
+                channel.setdefault("guild_id", payload["guild_id"])
+            channel = client.cache.place_channel_data(channel)
 
         if member := payload.get("member"):
             instance.author_id = Snowflake(member["user"]["id"])
@@ -313,7 +334,12 @@ class BaseInteractionContext(BaseContext[ClientT]):
             client.cache.place_member_data(instance.guild_id, member)
         else:
             instance.author_id = Snowflake(payload["user"]["id"])
-            client.cache.place_user_data(payload["user"])
+            user = client.cache.place_user_data(payload["user"])
+            if channel and instance.context in (None, ContextType.BOT_DM) and channel.type == ChannelType.DM:
+                # the partial DM channel is enough to answer `ctx.channel` without fetching it
+                client.cache.place_dm_channel_id(instance.author_id, channel.id)
+                if not channel.recipients:
+                    channel.recipients = [user]
 
         if message_data := payload.get("message"):
             message = client.cache.place_message_data(message_data)
@@ -997,6 +1023,8 @@ class ModalContext(InteractionContext[ClientT]):
 class AutocompleteContext(BaseInteractionContext[ClientT]):
     focussed_option: SlashCommandOption  # todo: option parsing
     """The option the user is currently filling in."""
+    _autocomplete_cache: tuple | None = None
+    """Set by `AutocompleteCache.respond` when the response should be cached."""
 
     @classmethod
     def from_dict(cls, client: "ClientT", payload: dict) -> Self:
@@ -1013,7 +1041,9 @@ class AutocompleteContext(BaseInteractionContext[ClientT]):
         return
 
     async def send(
-        self, choices: typing.Iterable[str | int | float | dict[str, int | float | str] | SlashCommandChoice]
+        self,
+        choices: typing.Iterable[str | int | float | dict[str, int | float | str] | SlashCommandChoice],
+        complete: bool | None = None,
     ) -> None:
         """
         Send your autocomplete choices to discord. Choices must be either a list of strings, or a dictionary following the following format:
@@ -1029,6 +1059,8 @@ class AutocompleteContext(BaseInteractionContext[ClientT]):
 
         Args:
             choices: 25 choices the user can pick
+            complete: Whether these are all the matches for the input, for the autocomplete cache. Defaults to fewer
+                than 25 choices, pass it if the callback dropped some of the matches it looked up
 
         """
         if self.focussed_option.type == OptionType.STRING:
@@ -1054,5 +1086,8 @@ class AutocompleteContext(BaseInteractionContext[ClientT]):
 
             processed_choices.append({"name": name, "value": type_cast(value) if type_cast else value})
 
+        if self._autocomplete_cache:
+            cache, key, ttl, future = self._autocomplete_cache
+            cache._store_response(key, ttl, future, processed_choices, complete)
         payload = {"type": CallbackType.AUTOCOMPLETE_RESULT, "data": {"choices": processed_choices}}
         await self.client.http.post_initial_response(payload, self.id, self.token)
@@ -1,7 +1,22 @@
 from asyncio import Future, iscoroutinefunction
-from typing import Callable, Optional, Union, Awaitable
+from typing import Any, Callable, Optional, Union, Awaitable
 
-__all__ = ("Wait",)
+__all__ = ("Wait", "WAIT_KEYS")
+
+
+def _message_attr(attr: str) -> Callable[[Any], Any]:
+    def _get(event: Any) -> Any:
+        return getattr(getattr(event, "message", None), attr, None)
+
+    return _get
+
+
+WAIT_KEYS: dict[str, Callable[[Any], Any]] = {
+    "message_id": _message_attr("id"),
+    "channel_id": _message_attr("_channel_id"),
+    "author_id": _message_attr("_author_id"),
+}
+"""How to get the id a keyed wait (see `Client.wait_for`) is waiting for out of an event. None means the event has no such id."""
 
 
 class Wait:
@@ -15,6 +15,8 @@ except Exception as e:
 # --- End of new block ---
 
 import asyncio
+import contextlib
+import signal
 import time
 import random # Added import for random
 import subprocess # Added for git commands
@@ -31,8 +33,15 @@ from config import (
     DEV_MODE_UPDATE_INTERVAL,
     NORMAL_MODE_UPDATE_INTERVAL,
 )
-from bot_client import bot
+from bot_client import bot, METRICS_PORT, METRICS_HOST
 from common_utils import format_uptime
+from db_utils import watch_data_version, add_data_version_listener, get_data_version, notify_data_version_listeners, set_game_data_ready, is_game_data_ready
+from utils.image_utils import petpet_renderer
+from utils.offload import offload_pool
+from utils.metrics_server import start_metrics_server
+from utils.startup import StartupTimeline, import_extensions
+
+startup_timeline = StartupTimeline() # Created on import, so phases are relative to the process start
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
@@ -201,6 +210,19 @@ def discover_extensions(*root_dirs: str) -> list[str]:
             extensions.append(".".join(path.with_suffix("").parts))
     return extensions
 
+EXTENSIONS = discover_extensions("commands", "events") + ["recipes"] # Add recipes.py as an extension
+# Set by run_bot()
+_game_data_task: asyncio.Task | None = None
+_extension_imports: asyncio.Task | None = None
+_connect_started = startup_timeline.started
+# The event loop only keeps weak references to tasks, these are kept until they finish
+_background_tasks: set[asyncio.Task] = set()
+
+def _keep_task(task: asyncio.Task) -> asyncio.Task:
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 # --- Bot Events ---
 @bot.event()
 async def on_ready():
@@ -212,27 +234,32 @@ async def on_ready():
     if getattr(bot, "has_been_started", False):
         return
 
+    startup_timeline.record("gateway connect", _connect_started)
     logging.info("--------------------------------------------------")
     logging.info("Bot is performing first-time startup...")
     # To prevent rate limits from syncing on every extension load, we disable it temporarily
     bot.sync_ext = False
 
-    # Load all command and event extensions
-    extensions = discover_extensions("commands", "events") + ["recipes"] # Add recipes.py as an extension
+    # Load all command and event extensions. run_bot() imported them in the background while the gateway
+    # connected, so this only registers them. Commands that need game data are registered (and synced) even
+    # if the data isn't ready yet, game_data_check holds them until it is.
+    if _extension_imports is not None:
+        await _extension_imports
+    with startup_timeline.phase("load extensions"):
+        for extension in EXTENSIONS:
+            try:
+                bot.load_extension(extension)
+                logging.info(f"Successfully loaded extension: {extension}")
+            except Exception as e:
+                logging.error(f"Failed to load extension {extension}: {e}", exc_info=True)
 
-    for extension in extensions:
+    # Manually sync all commands once.
+    with startup_timeline.phase("command sync"):
         try:
-            bot.load_extension(extension)
-            logging.info(f"Successfully loaded extension: {extension}")
+            await bot.synchronise_interactions()
+            logging.info("Application commands successfully synchronised.")
         except Exception as e:
-            logging.error(f"Failed to load extension {extension}: {e}", exc_info=True)
-
-    # Manually sync all commands once.
-    try:
-        await bot.synchronise_interactions()
-        logging.info("Application commands successfully synchronised.")
-    except Exception as e:
-        logging.error(f"Failed to synchronise application commands: {e}", exc_info=True)
+            logging.error(f"Failed to synchronise application commands: {e}", exc_info=True)
     bot.sync_ext = True
 
     # Set a flag to indicate that the initial setup is complete
@@ -240,12 +267,25 @@ async def on_ready():
 
     # Start background tasks
     # rotate_funny_presence is a general bot task and can remain here or be moved to a general extension.
-    asyncio.create_task(rotate_funny_presence(bot, interval=300))
+    _keep_task(asyncio.create_task(rotate_funny_presence(bot, interval=300)))
     
-    asyncio.create_task(auto_update_task(bot)) # Start the auto-update task
+    _keep_task(asyncio.create_task(auto_update_task(bot))) # Start the auto-update task
+    add_data_version_listener(lambda _data_version: bot.autocomplete_cache.clear()) # Suggestions may name changed items
+    _keep_task(asyncio.create_task(watch_data_version())) # Reload caches when create_db.py refreshes the game data
+    if METRICS_PORT:
+        await start_metrics_server(bot, METRICS_PORT, METRICS_HOST)
     logging.info(f"Ina is ready! Logged in as {bot.user.username} ({bot.user.id})")
     logging.info(f"Version: {config_version}")
+    if not is_game_data_ready():
+        logging.info("Game data is still being prepared, data commands will be answered once it is ready.")
     logging.info("--------------------------------------------------")
+    _keep_task(asyncio.create_task(log_startup_timeline()))
+
+async def log_startup_timeline():
+    """Logs the startup timeline once the game data is ready too (it usually is already)."""
+    if _game_data_task is not None:
+        await asyncio.gather(_game_data_task, return_exceptions=True)
+    logging.info(startup_timeline.report())
 
 # --- Main Execution ---
 import sqlite3
@@ -277,12 +317,13 @@ def is_db_valid(db_path: str) -> bool:
         logging.warning(f"Database '{db_path}' is corrupted or not a valid SQLite file: {e}")
         return False
 
-def load_all_game_data():
+def load_all_game_data() -> bool:
     """
-    Ensures the SQLite database exists and is valid before the bot starts.
-    If the DB is missing or corrupted, it triggers a recreation.
+    Ensures the SQLite database exists and is valid. If the DB is missing or corrupted, it triggers a recreation.
+    Returns True if the database was (re)built. Runs in a worker thread, see prepare_game_data().
     """
     logging.info("Verifying game data source (SQLite Database)...")
+    rebuilt = False
 
     # If the DB exists but is invalid, remove it to force recreation.
     if os.path.exists(DB_NAME) and not is_db_valid(DB_NAME):
@@ -299,6 +340,7 @@ def load_all_game_data():
         try:
             from create_db import populate_db
             populate_db()
+            rebuilt = True
         except Exception as e:
             logging.critical(f"Failed to create and populate database: {e}", exc_info=True)
             sys.exit(1)
@@ -311,13 +353,56 @@ def load_all_game_data():
     logging.info(f"Database '{DB_NAME}' is available and valid. Bot will use it for data lookups.")
 
     logging.info("Game data verification/creation process complete.")
+    return rebuilt
+
+async def prepare_game_data() -> bool:
+    """
+    Runs load_all_game_data() in a worker thread, so a full database build doesn't hold up connecting to Discord.
+    Returns False if there is no usable database.
+    """
+    try:
+        with startup_timeline.phase("game data"):
+            rebuilt = await asyncio.to_thread(load_all_game_data)
+    except SystemExit:
+        return False # load_all_game_data logged why
+    set_game_data_ready()
+    if rebuilt:
+        # Caches filled while the database was being built (e.g. by imports) are stale
+        await notify_data_version_listeners(await get_data_version())
+    return True
+
+async def run_bot():
+    """Starts the bot while the game data is verified and the extensions are imported in the background."""
+    global _game_data_task, _extension_imports, _connect_started
+    _game_data_task = asyncio.create_task(prepare_game_data())
+    _extension_imports = asyncio.create_task(import_extensions(EXTENSIONS, startup_timeline))
+    _connect_started = time.perf_counter()
+    bot_task = asyncio.create_task(bot.astart())
+    # Stop the bot gracefully on Ctrl+C / SIGTERM, so its gateway session is saved and resumed on the next start
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError): # No signal handlers on Windows, Ctrl+C still works there
+            loop.add_signal_handler(sig, lambda: asyncio.create_task(bot.stop()))
+
+    await asyncio.wait((_game_data_task, bot_task), return_when=asyncio.FIRST_COMPLETED)
+    if _game_data_task.done() and not _game_data_task.result():
+        logging.critical("No usable game database, shutting down.")
+        bot_task.cancel()
+        await asyncio.gather(bot_task, return_exceptions=True)
+        sys.exit(1)
+    await bot_task
 
 if __name__ == "__main__":
-    # Ensure the database exists before starting the bot
-    # This is a synchronous call before the async loop starts
-    load_all_game_data()
+    # Start the petpet rendering and offload processes before the bot spins up its threads
+    petpet_renderer.start()
+    offload_pool.start()
 
     # The bot token is handled in bot_client.py, so we just start the bot here.
     # Set sync_interactions=False to prevent automatic command syncing on every startup
     # This relies on the /manage update command to sync commands.
-    bot.start()
+    try:
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(run_bot())
+    finally:
+        petpet_renderer.shutdown()
+        offload_pool.shutdown()
@@ -0,0 +1,204 @@
+"""
+Async scraping engine shared by scrape_items.py and scrape_perks.py.
+
+Pages are fetched over a bounded aiohttp connection pool with a polite per-host
+request spacing. Every URL's validators (ETag / Last-Modified), a checksum of the
+body and the parsed result are persisted in a small JSON cache so that the next
+run can skip unchanged pages entirely (304 or identical checksum).
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+PAGE_CACHE_FILE = 'nwdb_page_cache.json' # Default, the scrapers use one file each
+DEFAULT_MAX_CONCURRENCY = 6 # Open connections to nwdb.info at any time
+DEFAULT_REQUESTS_PER_SECOND = 4.0 # Per host, be respectful
+DEFAULT_RETRIES = 3
+DEFAULT_TIMEOUT = 20
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+logger = logging.getLogger(__name__)
+
+
+class FetchResult(NamedTuple):
+    url: str
+    status: int # HTTP status, 304 for "not modified", 0 if the request failed
+    data: Any # Decoded body (JSON or text), None when not modified or failed
+    changed: bool # False if the page is identical to the last run
+    payload: Any # Parsed result stored for this URL on a previous run, if any
+
+
+class HostRateLimiter:
+    """Spaces out request starts to the same host by at least 1/requests_per_second."""
+
+    def __init__(self, requests_per_second: float):
+        self.min_interval = 1 / requests_per_second if requests_per_second > 0 else 0
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, host: str):
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            next_slot = self._next_slot.get(host, now)
+            if next_slot > now:
+                await asyncio.sleep(next_slot - now)
+                now = next_slot
+            self._next_slot[host] = now + self.min_interval
+
+
+class PageCache:
+    """
+    Persisted per-URL state: ETag, Last-Modified, body checksum and the parsed payload.
+    Written atomically so an interrupted scrape never leaves a half-written cache behind.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable page cache {path}: {e}")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(url)
+
+    def save(self):
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Could not write page cache {self.path}: {e}")
+
+
+class ScrapeEngine:
+    """
+    Async HTTP fetcher with a bounded connection pool, per-host rate limiting and conditional requests.
+
+    Use as an async context manager:
+
+        async with ScrapeEngine() as engine:
+            result = await engine.fetch(url)
+            if result.changed:
+                engine.store_payload(url, parse(result.data))
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        retries: int = DEFAULT_RETRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_path: Optional[str] = PAGE_CACHE_FILE,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        if retries < 1:
+            raise ValueError(f"retries is the number of attempts per request and must be at least 1, not {retries}")
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.cache = PageCache(cache_path)
+        self.stats = {"requests": 0, "not_modified": 0, "unchanged": 0, "changed": 0, "failed": 0}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "ScrapeEngine":
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.max_concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=connector, headers=self.headers, timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._session:
+            await self._session.close()
+            self._session = None
+        self.cache.save()
+        logger.info(f"Scrape finished: {self.stats}")
+
+    def store_payload(self, url: str, payload: Any):
+        """Remember the parsed result for a URL so the next run can reuse it if the page is unchanged."""
+        entry = self.cache.entries.setdefault(url, {})
+        entry['payload'] = payload
+
+    async def fetch(self, url: str, as_json: bool = True) -> FetchResult:
+        """
+        Fetches a URL, honouring the cached validators for it.
+        Never raises for network/HTTP errors; those are logged and reported as status 0.
+        """
+        entry = self.cache.get(url) or {}
+        request_headers = {}
+        # Only ask for a 304 if we still have something to reuse in its place
+        if 'payload' in entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries):
+            retry_after = None
+            try:
+                await self.rate_limiter.wait(host)
+                async with self._semaphore:
+                    self.stats["requests"] += 1
+                    async with self._session.get(url, headers=request_headers) as response:
+                        if response.status == 304:
+                            self.stats["not_modified"] += 1
+                            return FetchResult(url, 304, None, False, entry.get('payload'))
+                        if response.status == 429 or response.status >= 500:
+                            retry_after = float(response.headers.get('Retry-After', 0) or 0)
+                            raise aiohttp.ClientResponseError(
+                                response.request_info, response.history, status=response.status, message=response.reason or ""
+                            )
+                        response.raise_for_status()
+                        body = await response.read()
+                        etag = response.headers.get('ETag')
+                        last_modified = response.headers.get('Last-Modified')
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Error fetching {url} (Attempt {attempt + 1}/{self.retries}): {e}")
+                if attempt < self.retries - 1 and (not isinstance(e, aiohttp.ClientResponseError) or e.status == 429 or e.status >= 500):
+                    delay = retry_after or (2 ** attempt) * 0.5 + random.random() * 0.5 # Backoff with jitter
+                    await asyncio.sleep(delay)
+                    continue
+                self.stats["failed"] += 1
+                return FetchResult(url, 0, None, True, entry.get('payload'))
+
+        try:
+            data = json.loads(body) if as_json else body.decode('utf-8', errors='replace')
+        except json.JSONDecodeError as e:
+            logger.error(f"Error decoding JSON from {url}: {e}. Content: {body[:200]!r}")
+            self.stats["failed"] += 1
+            return FetchResult(url, 0, None, True, entry.get('payload'))
+
+        checksum = hashlib.sha256(body).hexdigest()
+        changed = entry.get('checksum') != checksum or 'payload' not in entry
+        new_entry = {'etag': etag, 'last_modified': last_modified, 'checksum': checksum}
+        if not changed:
+            new_entry['payload'] = entry['payload']
+            self.stats["unchanged"] += 1
+        else:
+            self.stats["changed"] += 1
+        self.cache.entries[url] = new_entry
+        return FetchResult(url, response.status, data, changed, new_entry.get('payload'))
@@ -2,8 +2,6 @@
 Store crafting recipes for New World items
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
 import logging
 import sqlite3
@@ -15,7 +13,8 @@ from typing import Optional, Dict, Any, Set
 from commands.new_world.utils import resolve_item_name_for_lookup
 from typing import Optional, Dict, Any, Set
 from typing import Optional, Dict, Any, Set, List
-from config import DB_NAME, TRACKED_RECIPES_FILE
+from config import DB_NAME, TRACKED_RECIPES_FILE, AUTOCOMPLETE_CACHE_TTL
+from db_utils import add_data_version_listener, game_data_check, game_data_autocomplete
 
 def track_recipe(user_id: str, item_name: str, recipe: dict):
     try:
@@ -38,10 +37,23 @@ def get_tracked_recipes(user_id: str):
     except Exception:
         return []
 
+# Sorted recipe names, loaded once and dropped when create_db.py refreshes the data
+_recipe_names_cache: Optional[List[str]] = None
+
+def _clear_recipe_names_cache(_data_version: Optional[int] = None):
+    global _recipe_names_cache
+    _recipe_names_cache = None
+
+add_data_version_listener(_clear_recipe_names_cache)
+
 async def get_all_recipe_names() -> List[str]:
     """
     Fetches all unique recipe output names from both 'recipes' and 'parsed_recipes' tables.
+    The list is cached until the game data changes.
     """
+    global _recipe_names_cache
+    if _recipe_names_cache is not None:
+        return _recipe_names_cache
     recipe_names = set()
     try:
         async with aiosqlite.connect(DB_NAME) as conn:
@@ -61,10 +73,13 @@ async def get_all_recipe_names() -> List[str]:
         
     except aiosqlite.Error as e:
         logging.error(f"Database error in get_all_recipe_names: {e}")
+        return sorted(recipe_names) # Not cached, the next call tries again
     except Exception as e:
         logging.error(f"Unexpected error in get_all_recipe_names: {e}", exc_info=True)
-    
-    return sorted(list(recipe_names))
+        return sorted(recipe_names)
+
+    _recipe_names_cache = sorted(recipe_names)
+    return _recipe_names_cache
 
 
 async def get_recipe(item_name: str) -> Optional[Dict[str, Any]]:
@@ -245,6 +260,7 @@ from interactions import Extension, slash_command, slash_option, OptionType, Sla
 class NewWorldCrafting(Extension):
     def __init__(self, bot):
         self.bot = bot
+        self.add_ext_check(game_data_check)
 
     @slash_command(name="recipe", description="Shows the crafting recipe for an item.")
     @slash_option(
@@ -255,7 +271,7 @@ class NewWorldCrafting(Extension):
         autocomplete=True # Enable autocomplete for this option
     )
     async def recipe(self, ctx: SlashContext, item_name: str):
-        await ctx.defer() # Defer the response as lookup might take time
+        await ctx.defer(suppress_error=True) # Defer the response as lookup might take time
 
         recipe_data = await get_recipe(item_name)
 
@@ -318,7 +334,7 @@ class NewWorldCrafting(Extension):
         required=False
     )
     async def calculate_craft(self, ctx: SlashContext, item_name: str, amount: int = 1):
-        await ctx.defer()
+        await ctx.defer(suppress_error=True) # game_data_check may have deferred already
 
         materials = await calculate_crafting_materials(item_name, amount, include_intermediate=True)
 
@@ -342,13 +358,14 @@ class NewWorldCrafting(Extension):
 
         await ctx.send(embeds=embed)
 
-    @recipe.autocomplete("item_name")
+    @recipe.autocomplete("item_name", cache_ttl=AUTOCOMPLETE_CACHE_TTL)
+    @game_data_autocomplete
     async def recipe_autocomplete(self, ctx: AutocompleteContext):
         """
         Provides autocomplete suggestions for the item_name option in the /recipe command.
         """
-        search_term = ctx.input_text.lower()
-        
+        search_term = ctx.input_text.lower().strip() if ctx.input_text else ""
+
         # Fetch all unique recipe names from the database
         all_recipe_names = await get_all_recipe_names() 
 
@@ -362,7 +379,7 @@ class NewWorldCrafting(Extension):
         await ctx.send(choices=choices)
 
     # Reuse the same autocomplete logic for the new command
-    @calculate_craft.autocomplete("item_name")
+    @calculate_craft.autocomplete("item_name", cache_ttl=AUTOCOMPLETE_CACHE_TTL)
     async def calculate_craft_autocomplete(self, ctx: AutocompleteContext):
         return await self.recipe_autocomplete(ctx)
 
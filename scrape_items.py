@@ -1,15 +1,17 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import csv
-import time
 import re
 import json
 import logging
+from typing import Optional
+
+from nwdb_scraper import ScrapeEngine, DEFAULT_MAX_CONCURRENCY, DEFAULT_REQUESTS_PER_SECOND
 
 BASE_URL = "https://nwdb.info" # Keep this
 OUTPUT_CSV_FILE = 'items_scraped.csv' # Output for create_db.py
 OUTPUT_JSON_FILE = 'items_updated.json' # Output for commands/new_world/utils.py cache
 INITIAL_MAX_PAGES_TO_SCRAPE = 70 # Initial upper limit, will be replaced by actual page count
+PAGE_CACHE_FILE = 'nwdb_items_page_cache.json' # ETags/checksums of the last run, lets unchanged pages be skipped
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -28,139 +30,152 @@ def sanitize_html_description(description_text):
     description_text = re.sub(r'\s*\n\s*', '\n', description_text).strip()
     return description_text.strip()
 
-def scrape_nwdb_items():
+def parse_items_page(json_data: dict) -> list:
     """
-    Scrapes item data from nwdb.info JSON endpoint and saves it to a CSV file.
+    Turns one nwdb.info items page into CSV-ready rows.
+    """
+    page_rows = []
+    for item_entry in json_data.get('data') or []:
+        try:
+            item_id = item_entry.get('id')
+            item_name = item_entry.get('name')
+
+            if not item_id or not item_name:
+                logging.warning(f"Skipping entry with missing ID or Name: {item_entry}")
+                continue
+
+            perks_list = item_entry.get('perks', [])
+            # Ensure perks_list contains only strings (perk IDs)
+            processed_perks = []
+            for perk_item in perks_list:
+                if isinstance(perk_item, dict) and 'id' in perk_item:
+                    processed_perks.append(perk_item['id'])
+                elif isinstance(perk_item, str): # Handle cases where it might already be a string
+                    processed_perks.append(perk_item)
+                else:
+                    logging.warning(f"Unexpected perk format for item {item_name} ({item_id}): {perk_item}")
+            description = sanitize_html_description(item_entry.get('description', ''))
+            icon_path = item_entry.get('icon')
+            icon_url = f"{BASE_URL}/images/{icon_path}.png" if icon_path else ""
+
+            # Extracting various fields available in the item JSON
+            page_rows.append({
+                'Item ID': item_id,
+                'Name': item_name,
+                'Description': description,
+                'Icon Path': icon_path, # Storing path for potential local use or reconstruction
+                'Icon URL': icon_url,
+                'Rarity': item_entry.get('rarity'),
+                'Tier': item_entry.get('tier'),
+                'Item Type Name': item_entry.get('typeName'), # e.g., "1H Sword", "Light Headwear"
+                'Item Class': "|".join(item_entry.get('itemClass', [])), # e.g. ["EquippableHead", "Armor", "Light"] -> "EquippableHead|Armor|Light"
+                'Weight': item_entry.get('weight'),
+                'Max Stack Size': item_entry.get('maxStackSize'),
+                'Gear Score': item_entry.get('gearScore'), # This might be a single value or null
+                'MinGS': item_entry.get('minGs'),
+                'MaxGS': item_entry.get('maxGs'),
+                'Perks': "|".join(processed_perks), # Use the processed list
+                'PerkBuckets': "|".join(item_entry.get('perkBuckets', [])), # List of perk bucket IDs
+                'Ingredient Categories': item_entry.get('ingredientCategories'), # Often a string like "secondaryitemcategory_cloth|tier1"
+                'Crafting Recipe': item_entry.get('craftingRecipe'), # ID of the recipe if craftable
+                'Armor Rating Scale Factor': item_entry.get('armorRatingScaleFactor'),
+                'Weapon Dmg Scale Factor': item_entry.get('weaponDmgScaleFactor')
+            })
+        except Exception as e:
+            logging.error(f"Error processing an item entry: {e}. Entry: {item_entry}", exc_info=True)
+            continue
+    return page_rows
+
+async def _scrape_items_page(engine: ScrapeEngine, base_url: str, page_num: int) -> Optional[dict]:
+    """
+    Fetches one items page. Returns the cached {'pageCount', 'rows'} payload for unchanged pages
+    and a freshly parsed one otherwise, or None if the page could not be fetched at all.
+    """
+    current_url = f"{base_url}/db/items/page/{page_num}.json"
+    result = await engine.fetch(current_url)
+    if not result.changed:
+        logging.debug(f"Page {page_num} unchanged since last scrape, reusing {len(result.payload['rows'])} items.")
+        return result.payload
+    if result.data is None or not result.data.get('success') or not result.data.get('data'):
+        if result.payload:
+            logging.warning(f"Page {page_num} could not be fetched, falling back to the previous scrape of it.")
+            return result.payload
+        logging.warning(f"Skipping page {page_num} due to fetch/parse failure or no data.")
+        return None
+
+    logging.info(f"Scraped page: {current_url}")
+    payload = {'pageCount': result.data.get('pageCount'), 'rows': parse_items_page(result.data)}
+    engine.store_payload(current_url, payload)
+    return payload
+
+async def scrape_nwdb_items_async(
+    base_url: str = BASE_URL,
+    output_csv: str = OUTPUT_CSV_FILE,
+    output_json: str = OUTPUT_JSON_FILE,
+    cache_path: Optional[str] = PAGE_CACHE_FILE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+) -> int:
     """
+    Scrapes item data from the nwdb.info JSON endpoint concurrently and saves it to CSV and JSON.
+    Pages that did not change since the last run are served from the page cache.
+    Returns the number of items written.
+    """
+    logging.info(f"Starting item scraping from {base_url}...")
+    async with ScrapeEngine(max_concurrency=max_concurrency, requests_per_second=requests_per_second, cache_path=cache_path) as engine:
+        first_page = await _scrape_items_page(engine, base_url, 1)
+        if first_page is None:
+            logging.warning("No item data was scraped.")
+            return 0
+        actual_page_count = first_page.get('pageCount') or INITIAL_MAX_PAGES_TO_SCRAPE
+        logging.info(f"Total item pages to scrape: {actual_page_count}")
+
+        other_pages = await asyncio.gather(
+            *(_scrape_items_page(engine, base_url, page_num) for page_num in range(2, actual_page_count + 1))
+        )
+
     all_items_data = []
     processed_item_ids = set()
-    actual_page_count = INITIAL_MAX_PAGES_TO_SCRAPE
-
-    logging.info(f"Starting item scraping from {BASE_URL}...")
-
-    for page_num in range(1, actual_page_count + 1):
-        current_url = f"{BASE_URL}/db/items/page/{page_num}.json"
-        logging.info(f"Scraping page: {current_url}")
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-        retries = 3
-        for attempt in range(retries):
-            try:
-                response = requests.get(current_url, headers=headers, timeout=20)
-                response.raise_for_status()
-                json_data = response.json()
-                break # Success, break from retry loop
-            except requests.exceptions.RequestException as e:
-                logging.error(f"Error fetching page {current_url} (Attempt {attempt + 1}/{retries}): {e}")
-                if attempt < retries - 1:
-                    time.sleep(2) # Wait before retrying
-                else:
-                    logging.error(f"Failed to fetch page {current_url} after {retries} attempts. Skipping.")
-                    json_data = None # Indicate failure
-                    break
-            except requests.exceptions.JSONDecodeError:
-                logging.error(f"Error decoding JSON from {current_url} (Attempt {attempt + 1}/{retries}). Content: {response.text[:200]}")
-                json_data = None # Indicate failure
-                break
-
-        if json_data is None or not json_data.get('success') or not json_data.get('data'):
-            logging.warning(f"Skipping page {page_num} due to fetch/parse failure or no data.")
-            break # Stop if a page fails completely
-
-        if page_num == 1 and json_data.get('pageCount'):
-            actual_page_count = json_data['pageCount']
-            logging.info(f"Total item pages to scrape: {actual_page_count}")
-
-        page_had_new_items = False
-        for item_entry in json_data['data']:
-            try:
-                item_id = item_entry.get('id')
-                item_name = item_entry.get('name')
-
-                if not item_id or not item_name:
-                    logging.warning(f"Skipping entry with missing ID or Name: {item_entry}")
-                    continue
-
-                if item_id in processed_item_ids:
-                    continue
-                processed_item_ids.add(item_id)
-                page_had_new_items = True
-
-                perks_list = item_entry.get('perks', [])
-                # Ensure perks_list contains only strings (perk IDs)
-                processed_perks = []
-                for perk_item in perks_list:
-                    if isinstance(perk_item, dict) and 'id' in perk_item:
-                        processed_perks.append(perk_item['id'])
-                    elif isinstance(perk_item, str): # Handle cases where it might already be a string
-                        processed_perks.append(perk_item)
-                    else:
-                        logging.warning(f"Unexpected perk format for item {item_name} ({item_id}): {perk_item}")
-                description = sanitize_html_description(item_entry.get('description', ''))
-                icon_path = item_entry.get('icon')
-                icon_url = f"{BASE_URL}/images/{icon_path}.png" if icon_path else ""
-                
-                # Extracting various fields available in the item JSON
-                item_data = {
-                    'Item ID': item_id,
-                    'Name': item_name,
-                    'Description': description,
-                    'Icon Path': icon_path, # Storing path for potential local use or reconstruction
-                    'Icon URL': icon_url,
-                    'Rarity': item_entry.get('rarity'),
-                    'Tier': item_entry.get('tier'),
-                    'Item Type Name': item_entry.get('typeName'), # e.g., "1H Sword", "Light Headwear"
-                    'Item Class': "|".join(item_entry.get('itemClass', [])), # e.g. ["EquippableHead", "Armor", "Light"] -> "EquippableHead|Armor|Light"
-                    'Weight': item_entry.get('weight'),
-                    'Max Stack Size': item_entry.get('maxStackSize'),
-                    'Gear Score': item_entry.get('gearScore'), # This might be a single value or null
-                    'MinGS': item_entry.get('minGs'),
-                    'MaxGS': item_entry.get('maxGs'),
-                    'Perks': "|".join(processed_perks), # Use the processed list
-                    'PerkBuckets': "|".join(item_entry.get('perkBuckets', [])), # List of perk bucket IDs
-                    'Ingredient Categories': item_entry.get('ingredientCategories'), # Often a string like "secondaryitemcategory_cloth|tier1"
-                    'Crafting Recipe': item_entry.get('craftingRecipe'), # ID of the recipe if craftable
-                    'Armor Rating Scale Factor': item_entry.get('armorRatingScaleFactor'),
-                    'Weapon Dmg Scale Factor': item_entry.get('weaponDmgScaleFactor')
-                }
-                all_items_data.append(item_data)
-
-            except Exception as e:
-                logging.error(f"Error processing an item entry on page {page_num}: {e}. Entry: {item_entry}", exc_info=True)
+    for page in [first_page, *other_pages]:
+        if page is None:
+            continue
+        for item_data in page['rows']:
+            if item_data['Item ID'] in processed_item_ids:
                 continue
-        
-        if not page_had_new_items and page_num > 1: # Check if any new items were added from this page
-            logging.info(f"No new items found on page {page_num}. Stopping.")
-            break
-        time.sleep(0.5) # Be respectful
+            processed_item_ids.add(item_data['Item ID'])
+            all_items_data.append(item_data)
 
     if not all_items_data:
         logging.warning("No item data was scraped.")
-        return
+        return 0
+
+    logging.info(f"Scraped {len(all_items_data)} items ({engine.stats['changed']} changed pages). Writing to {output_csv}...")
 
-    logging.info(f"Scraped {len(all_items_data)} items. Writing to {OUTPUT_CSV_FILE}...")
-    
     # Write to CSV for create_db.py
     try:
-        with open(OUTPUT_CSV_FILE, 'w', newline='', encoding='utf-8') as csvfile:
+        with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = list(all_items_data[0].keys()) # Get fieldnames from the first item
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             writer.writeheader()
             writer.writerows(all_items_data)
-        logging.info(f"Successfully wrote items to CSV: {OUTPUT_CSV_FILE}")
+        logging.info(f"Successfully wrote items to CSV: {output_csv}")
     except Exception as e:
-        logging.error(f"Error writing CSV file {OUTPUT_CSV_FILE}: {e}")
+        logging.error(f"Error writing CSV file {output_csv}: {e}")
 
     # Write to JSON for commands/new_world/utils.py cache
     try:
-        with open(OUTPUT_JSON_FILE, 'w', encoding='utf-8') as f:
+        with open(output_json, 'w', encoding='utf-8') as f:
             json.dump(all_items_data, f, indent=2)
-        logging.info(f"Successfully wrote items to JSON: {OUTPUT_JSON_FILE}")
+        logging.info(f"Successfully wrote items to JSON: {output_json}")
     except Exception as e:
-        logging.error(f"Error writing JSON file {OUTPUT_JSON_FILE}: {e}")
+        logging.error(f"Error writing JSON file {output_json}: {e}")
+    return len(all_items_data)
+
+def scrape_nwdb_items():
+    """
+    Scrapes item data from nwdb.info JSON endpoint and saves it to a CSV file.
+    """
+    return asyncio.run(scrape_nwdb_items_async())
 
 if __name__ == '__main__':
     scrape_nwdb_items()
\ No newline at end of file
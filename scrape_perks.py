@@ -1,13 +1,17 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import csv
-import time
 import re
 import logging # Added for better logging
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+from nwdb_scraper import ScrapeEngine, DEFAULT_MAX_CONCURRENCY, DEFAULT_REQUESTS_PER_SECOND
 
 BASE_URL = "https://nwdb.info"
 OUTPUT_CSV_FILE = 'perks_scraped.csv'
 INITIAL_MAX_PAGES_TO_SCRAPE = 25 # Initial upper limit, will be replaced by actual page count
+PAGE_CACHE_FILE = 'nwdb_perks_page_cache.json' # ETags/checksums of the last run, lets unchanged pages be skipped
 
 def sanitize_json_description(description_text):
     """
@@ -35,21 +39,14 @@ def sanitize_json_description(description_text):
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def scrape_individual_perk_html(perk_id: str, perk_name_for_log: str) -> dict:
+def parse_individual_perk_html(html: str, perk_name_for_log: str) -> dict:
     """
-    Fetches and parses the individual HTML page for a perk to get additional details.
+    Parses the individual HTML page for a perk to get additional details.
     Returns a dictionary with any found details.
     """
     html_details = {}
-    perk_url = f"{BASE_URL}/db/perk/{perk_id}"
-    logging.debug(f"HTML SCRAPE: Fetching HTML for {perk_name_for_log} ({perk_id}) from {perk_url}")
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(perk_url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(html, 'html.parser')
 
         # --- Try to get PerkType from HTML header ---
         # Structure from your provided HTML for "Enchanted":
@@ -94,193 +91,199 @@ def scrape_individual_perk_html(perk_id: str, perk_name_for_log: str) -> dict:
         logging.debug(f"HTML SCRAPE: Finished parsing HTML for {perk_name_for_log}. Found {found_details_count} potential details.")
 
     except Exception as e:
-        logging.warning(f"HTML SCRAPE: Error fetching/parsing HTML for {perk_name_for_log} ({perk_id}): {e}")
+        logging.warning(f"HTML SCRAPE: Error parsing HTML for {perk_name_for_log}: {e}")
     return html_details
 
-def scrape_nwdb_perks():
+async def scrape_individual_perk_html(engine: ScrapeEngine, perk_id: str, perk_name_for_log: str, base_url: str = BASE_URL) -> dict:
     """
-    Scrapes perk data from nwdb.info and saves it to a CSV file.
+    Fetches the individual HTML page for a perk through the shared engine and parses it.
+    Unchanged pages reuse the details parsed on the previous run.
     """
-    all_perks_data = []
-    processed_perk_ids = set() # To avoid duplicates if a perk appears on multiple pages (unlikely but good practice)
-    actual_page_count = INITIAL_MAX_PAGES_TO_SCRAPE
+    perk_url = f"{base_url}/db/perk/{perk_id}"
+    logging.debug(f"HTML SCRAPE: Fetching HTML for {perk_name_for_log} ({perk_id}) from {perk_url}")
+    result = await engine.fetch(perk_url, as_json=False)
+    if not result.changed:
+        return result.payload or {}
+    if result.data is None:
+        logging.warning(f"HTML SCRAPE: Error fetching HTML for {perk_name_for_log} ({perk_id})")
+        return result.payload or {}
+    html_details = parse_individual_perk_html(result.data, perk_name_for_log)
+    engine.store_payload(perk_url, html_details)
+    return html_details
 
-    logging.info(f"Starting perk scraping from {BASE_URL}...")
+PERK_CSV_FIELDNAMES = [
+    'id', 'name', 'description', 'PerkType', 'icon_url',
+    'ConditionText', 'CompatibleEquipment', 'ExclusiveLabels',
+    'ExclusiveLabel', 'CraftModItem', 'GeneratedLabel'
+]
 
-    for page_num in range(1, actual_page_count + 1):
-        current_url = f"{BASE_URL}/db/perks/page/{page_num}.json" # Fetch JSON endpoint
-        print(f"Scraping page: {current_url}")
+def _build_perk_row(perk_entry: dict) -> Optional[dict]:
+    """
+    Builds a CSV row from one perk JSON entry. Returns None for unusable entries.
+    """
+    perk_id = perk_entry.get('id')
+    perk_name = perk_entry.get('name')
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        retries = 3
-        for attempt in range(retries):
-            try:
-                response = requests.get(current_url, headers=headers, timeout=15)
-                response.raise_for_status() 
-                json_data = response.json()
-                break # Success, break from retry loop
-            except requests.exceptions.HTTPError as http_err:
-                logging.error(f"HTTP error fetching page {current_url} (Attempt {attempt + 1}/{retries}): {http_err}")
-                if attempt < retries - 1:
-                    time.sleep(2) # Wait before retrying
-                else:
-                    logging.error(f"Failed to fetch page {current_url} after {retries} attempts. Skipping.")
-                    json_data = None # Indicate failure
-                    break
-            except requests.exceptions.RequestException as req_err:
-                logging.error(f"Network error fetching page {current_url} (Attempt {attempt + 1}/{retries}): {req_err}")
-                if attempt < retries - 1:
-                    time.sleep(2) # Wait before retrying
-                else:
-                    logging.error(f"Failed to fetch page {current_url} after {retries} attempts. Skipping.")
-                    json_data = None # Indicate failure
-                    break
-            except requests.exceptions.JSONDecodeError as json_err:
-                logging.error(f"Error decoding JSON from {current_url} (Attempt {attempt + 1}/{retries}). Content was: {response.text[:200]}... Error: {json_err}")
-                # Save problematic content for debugging
-                debug_html_filename = f"debug_page_{page_num}_non_json_content.html"
-                try:
-                    with open(debug_html_filename, 'w', encoding='utf-8') as f:
-                        f.write(response.text)
-                    print(f"Content of page {page_num} saved to {debug_html_filename} for inspection.")
-                except Exception as e_write:
-                    logging.error(f"Could not write debug HTML file: {e_write}")
-                json_data = None # Indicate failure
-                break
-
-        if json_data is None or not json_data.get('success') or not json_data.get('data'):
-            logging.warning(f"Skipping page {page_num} due to fetch/parse failure or no data.")
-            break # Stop if a page fails completely
-
-        if page_num == 1 and json_data.get('pageCount'):
-            actual_page_count = json_data['pageCount']
-            logging.info(f"Total pages to scrape: {actual_page_count}")
-
-        page_had_new_perks = False
-        for perk_entry in json_data['data']:
-            try:
-                perk_id = perk_entry.get('id')
-                perk_name = perk_entry.get('name')
-
-                if not perk_id or not perk_name:
-                    logging.warning(f"Skipping entry with missing ID or Name: {perk_entry}")
-                    continue
-
-                if perk_id in processed_perk_ids:
-                    continue # Skip if already processed
-                processed_perk_ids.add(perk_id)
-                page_had_new_perks = True
-
-                # Use 'searchGSFormulaReadable' if available and contains placeholders, otherwise 'description'
-                # The 'searchGSFormulaReadable' often has the GS 700 scaled values, but we want the formula for our bot to scale
-                # The raw 'description' field usually has the ${...perkMultiplier} placeholders.
-                raw_description = perk_entry.get('description', "No description available.")
-                perk_description = sanitize_json_description(raw_description)
-                
-                icon_path = perk_entry.get('icon')
-                # Construct full icon URL: https://nwdb.info/images/ + icon_path + .png
-                icon_url = f"{BASE_URL}/images/{icon_path}.png" if icon_path else ""
-
-                # Extract new fields
-                actual_perk_type = perk_entry.get('perkType') # More reliable type
-                condition_text = perk_entry.get('condition')
-                
-                compatible_equipment_list = perk_entry.get('itemClass', [])
-                compatible_equipment = ", ".join(compatible_equipment_list) if compatible_equipment_list else None
-                
-                exclusive_labels_list_json = perk_entry.get('exclusiveLabels', [])
-                exclusive_labels = ", ".join(exclusive_labels_list_json) if exclusive_labels_list_json else None
-                
-                exclusive_label_single = perk_entry.get('exclusiveLabel')
-                
-                craft_mod_data = perk_entry.get('craftMod')
-                craft_mod_item_name = craft_mod_data.get('name') if craft_mod_data else None
-
-                # --- Fallback to HTML scraping if JSON data is missing ---
-                # Check if essential fields are missing from JSON
-                if not actual_perk_type or not condition_text or not compatible_equipment or not (exclusive_labels or exclusive_label_single):
-                    logging.info(f"JSON data incomplete for '{perk_name}'. Attempting HTML scrape for additional details.")
-                    html_scraped_details = scrape_individual_perk_html(perk_id, perk_name)
-                    if html_scraped_details:
-                        # Override with HTML data if JSON was None/empty and HTML provided something
-                        if not actual_perk_type and html_scraped_details.get('PerkType_html'):
-                            actual_perk_type = html_scraped_details.get('PerkType_html')
-                        # Be careful with 'PerkType' as HTML might be generic "Perk"
-                        condition_text = condition_text or html_scraped_details.get('ConditionText_html')
-                        compatible_equipment = compatible_equipment or html_scraped_details.get('CompatibleEquipment_html')
-                        # For exclusive labels, you might need to combine or prioritize
-                        if not exclusive_labels and not exclusive_label_single: # Only if both JSON sources are empty
-                            exclusive_labels = html_scraped_details.get('ExclusiveLabels_html') # HTML might provide a comma-separated string or just one
-                
-                generated_item_label = perk_entry.get('generatedLabel')
-
-                all_perks_data.append({
-                    'id': perk_id,
-                    'name': perk_name,
-                    'description': perk_description,
-                    'PerkType': actual_perk_type, # Use the new column name
-                    'icon_url': icon_url,
-                    'ConditionText': condition_text,
-                    'CompatibleEquipment': compatible_equipment,
-                    'ExclusiveLabels': exclusive_labels,
-                    'ExclusiveLabel': exclusive_label_single,
-                    'CraftModItem': craft_mod_item_name,
-                    'GeneratedLabel': generated_item_label
-                })
-
-                # --- Add Debugging for Specific Perks ---
-                if perk_name.lower() == 'enchanted':
-                    logging.debug(f"DEBUG: Enchanted Perk Data Extracted:")
-                    logging.debug(f"  id: {perk_id}")
-                    logging.debug(f"  name: {perk_name}")
-                    logging.debug(f"  description: {perk_description}")
-                    logging.debug(f"  PerkType: {actual_perk_type}")
-                    logging.debug(f"  icon_url: {icon_url}")
-                    logging.debug(f"  ConditionText: {condition_text}")
-                    logging.debug(f"  CompatibleEquipment: {compatible_equipment}")
-                    logging.debug(f"  ExclusiveLabels: {exclusive_labels}")
-                    logging.debug(f"  ExclusiveLabel: {exclusive_label_single}")
-                    logging.debug("-" * 20)
-
-            except Exception as e:
-                logging.error(f"Error processing a perk entry on page {page_num}: {e}. Entry: {perk_entry}", exc_info=True)
-                continue
-        
-        if not page_had_new_perks and page_num > 1:
-            logging.info(f"No new perks found on page {page_num}. Stopping.")
-            break
+    if not perk_id or not perk_name:
+        logging.warning(f"Skipping entry with missing ID or Name: {perk_entry}")
+        return None
+
+    # Use 'searchGSFormulaReadable' if available and contains placeholders, otherwise 'description'
+    # The 'searchGSFormulaReadable' often has the GS 700 scaled values, but we want the formula for our bot to scale
+    # The raw 'description' field usually has the ${...perkMultiplier} placeholders.
+    raw_description = perk_entry.get('description', "No description available.")
+    perk_description = sanitize_json_description(raw_description)
+
+    icon_path = perk_entry.get('icon')
+    # Construct full icon URL: https://nwdb.info/images/ + icon_path + .png
+    icon_url = f"{BASE_URL}/images/{icon_path}.png" if icon_path else ""
 
-        # Be respectful to the server
-        time.sleep(1) # Wait 1 second between page requests
+    compatible_equipment_list = perk_entry.get('itemClass', [])
+    exclusive_labels_list_json = perk_entry.get('exclusiveLabels', [])
+    craft_mod_data = perk_entry.get('craftMod')
+
+    return {
+        'id': perk_id,
+        'name': perk_name,
+        'description': perk_description,
+        'PerkType': perk_entry.get('perkType'), # More reliable type
+        'icon_url': icon_url,
+        'ConditionText': perk_entry.get('condition'),
+        'CompatibleEquipment': ", ".join(compatible_equipment_list) if compatible_equipment_list else None,
+        'ExclusiveLabels': ", ".join(exclusive_labels_list_json) if exclusive_labels_list_json else None,
+        'ExclusiveLabel': perk_entry.get('exclusiveLabel'),
+        'CraftModItem': craft_mod_data.get('name') if craft_mod_data else None,
+        'GeneratedLabel': perk_entry.get('generatedLabel')
+    }
+
+def _row_needs_html_details(row: dict) -> bool:
+    return not row['PerkType'] or not row['ConditionText'] or not row['CompatibleEquipment'] or not (row['ExclusiveLabels'] or row['ExclusiveLabel'])
+
+def _merge_html_details(row: dict, html_scraped_details: dict):
+    """Fills in fields the JSON left empty with what the perk's HTML page provided."""
+    if not html_scraped_details:
+        return
+    # Be careful with 'PerkType' as HTML might be generic "Perk"
+    if not row['PerkType'] and html_scraped_details.get('PerkType_html'):
+        row['PerkType'] = html_scraped_details.get('PerkType_html')
+    row['ConditionText'] = row['ConditionText'] or html_scraped_details.get('ConditionText_html')
+    row['CompatibleEquipment'] = row['CompatibleEquipment'] or html_scraped_details.get('CompatibleEquipment_html')
+    # For exclusive labels, you might need to combine or prioritize
+    if not row['ExclusiveLabels'] and not row['ExclusiveLabel']: # Only if both JSON sources are empty
+        row['ExclusiveLabels'] = html_scraped_details.get('ExclusiveLabels_html') # HTML might provide a comma-separated string or just one
+
+async def parse_perks_page(engine: ScrapeEngine, json_data: dict, base_url: str = BASE_URL) -> list:
+    """
+    Turns one nwdb.info perks page into CSV-ready rows, fetching the HTML page
+    of every perk whose JSON is incomplete concurrently.
+    """
+    page_rows = []
+    for perk_entry in json_data.get('data') or []:
+        try:
+            row = _build_perk_row(perk_entry)
+        except Exception as e:
+            logging.error(f"Error processing a perk entry: {e}. Entry: {perk_entry}", exc_info=True)
+            continue
+        if row:
+            page_rows.append(row)
+
+    # --- Fallback to HTML scraping if JSON data is missing ---
+    incomplete_rows = [row for row in page_rows if _row_needs_html_details(row)]
+    if incomplete_rows:
+        logging.info(f"JSON data incomplete for {len(incomplete_rows)} perks. Attempting HTML scrape for additional details.")
+        html_results = await asyncio.gather(
+            *(scrape_individual_perk_html(engine, row['id'], row['name'], base_url) for row in incomplete_rows)
+        )
+        for row, html_scraped_details in zip(incomplete_rows, html_results):
+            _merge_html_details(row, html_scraped_details)
+
+    for row in page_rows:
+        # --- Add Debugging for Specific Perks ---
+        if row['name'].lower() == 'enchanted':
+            logging.debug(f"DEBUG: Enchanted Perk Data Extracted: {row}")
+    return page_rows
+
+async def _scrape_perks_page(engine: ScrapeEngine, base_url: str, page_num: int) -> Optional[dict]:
+    """
+    Fetches one perks page. Returns the cached {'pageCount', 'rows'} payload for unchanged pages
+    and a freshly parsed one otherwise, or None if the page could not be fetched at all.
+    """
+    current_url = f"{base_url}/db/perks/page/{page_num}.json" # Fetch JSON endpoint
+    result = await engine.fetch(current_url)
+    if not result.changed:
+        logging.debug(f"Page {page_num} unchanged since last scrape, reusing {len(result.payload['rows'])} perks.")
+        return result.payload
+    if result.data is None or not result.data.get('success') or not result.data.get('data'):
+        if result.payload:
+            logging.warning(f"Page {page_num} could not be fetched, falling back to the previous scrape of it.")
+            return result.payload
+        logging.warning(f"Skipping page {page_num} due to fetch/parse failure or no data.")
+        return None
+
+    logging.info(f"Scraped page: {current_url}")
+    payload = {'pageCount': result.data.get('pageCount'), 'rows': await parse_perks_page(engine, result.data, base_url)}
+    engine.store_payload(current_url, payload)
+    return payload
+
+async def scrape_nwdb_perks_async(
+    base_url: str = BASE_URL,
+    output_csv: str = OUTPUT_CSV_FILE,
+    cache_path: Optional[str] = PAGE_CACHE_FILE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+) -> int:
+    """
+    Scrapes perk data from nwdb.info concurrently and saves it to a CSV file.
+    Pages that did not change since the last run are served from the page cache.
+    Returns the number of perks written.
+    """
+    logging.info(f"Starting perk scraping from {base_url}...")
+    async with ScrapeEngine(max_concurrency=max_concurrency, requests_per_second=requests_per_second, cache_path=cache_path) as engine:
+        first_page = await _scrape_perks_page(engine, base_url, 1)
+        if first_page is None:
+            logging.warning("No perk data was scraped.")
+            return 0
+        actual_page_count = first_page.get('pageCount') or INITIAL_MAX_PAGES_TO_SCRAPE
+        logging.info(f"Total pages to scrape: {actual_page_count}")
+
+        other_pages = await asyncio.gather(
+            *(_scrape_perks_page(engine, base_url, page_num) for page_num in range(2, actual_page_count + 1))
+        )
+
+    all_perks_data = []
+    processed_perk_ids = set() # To avoid duplicates if a perk appears on multiple pages (unlikely but good practice)
+    for page in [first_page, *other_pages]:
+        if page is None:
+            continue
+        for perk_data in page['rows']:
+            if perk_data['id'] in processed_perk_ids:
+                continue # Skip if already processed
+            processed_perk_ids.add(perk_data['id'])
+            all_perks_data.append(perk_data)
 
     if not all_perks_data:
-        print("No perk data was scraped.")
         logging.warning("No perk data was scraped.")
-        return
+        return 0
 
     # Write to CSV
-    logging.info(f"\nScraped {len(all_perks_data)} perks. Writing to {OUTPUT_CSV_FILE}...")
+    logging.info(f"Scraped {len(all_perks_data)} perks ({engine.stats['changed']} changed pages). Writing to {output_csv}...")
     try:
-        with open(OUTPUT_CSV_FILE, 'w', newline='', encoding='utf-8') as csvfile:
-            # Define fieldnames based on the keys in the dictionaries being written
-            # Ensure all keys used in all_perks_data.append are listed here
-            fieldnames = [
-                'id', 'name', 'description', 'PerkType', 'icon_url', 
-                'ConditionText', 'CompatibleEquipment', 'ExclusiveLabels', 
-                'ExclusiveLabel', 'CraftModItem', 'GeneratedLabel'
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=PERK_CSV_FIELDNAMES)
             writer.writeheader()
-            for perk_data in all_perks_data:
-                writer.writerow(perk_data)
-        logging.info(f"Successfully wrote perks to {OUTPUT_CSV_FILE}")
+            writer.writerows(all_perks_data)
+        logging.info(f"Successfully wrote perks to {output_csv}")
     except IOError as e:
         logging.error(f"Error writing CSV file: {e}")
     except Exception as e:
         logging.error(f"An unexpected error occurred during CSV writing: {e}", exc_info=True)
+    return len(all_perks_data)
+
+def scrape_nwdb_perks():
+    """
+    Scrapes perk data from nwdb.info and saves it to a CSV file.
+    """
+    return asyncio.run(scrape_nwdb_perks_async())
 
 if __name__ == '__main__':
     scrape_nwdb_perks()
@@ -1,7 +1,7 @@
 import json
 import os
 from typing import Optional, List, Dict, Any
-from config import MASTER_SETTINGS_FILE, OWNER_ID # Import constants
+from config import LOG_WEBHOOKS_FILE, MASTER_SETTINGS_FILE, OWNER_ID # Import constants
 
 def load_master_settings() -> Dict[str, Any]:
     """Loads all settings from the master JSON file. Creates it with defaults if not found."""
@@ -61,6 +61,30 @@ def get_logging_setting(guild_id: str) -> Optional[Dict[str, Any]]:
     settings = load_master_settings()
     return settings.get("guild_settings", {}).get(str(guild_id), {}).get("logging")
 
+def load_logging_webhooks() -> Dict[str, Dict[str, str]]:
+    """Guild ID -> the webhook ({"channel_id", "id", "token"}) its log is delivered through."""
+    try:
+        with open(LOG_WEBHOOKS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def get_logging_webhook(guild_id: str) -> Optional[Dict[str, str]]:
+    return load_logging_webhooks().get(str(guild_id))
+
+def save_logging_webhook(guild_id: str, webhook: Optional[Dict[str, str]]):
+    """
+    Keeps the webhook the log is delivered through, None forgets it. Its token lets anyone post into the log
+    channel, so it goes to LOG_WEBHOOKS_FILE, which is not tracked in git, rather than the master settings.
+    """
+    webhooks = load_logging_webhooks()
+    if webhook:
+        webhooks[str(guild_id)] = webhook
+    else:
+        webhooks.pop(str(guild_id), None)
+    with open(LOG_WEBHOOKS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(webhooks, f, indent=4)
+
 def is_bot_manager(user_id: int) -> bool: # owner_id_param removed
     if user_id == OWNER_ID: # Use imported OWNER_ID
         return True
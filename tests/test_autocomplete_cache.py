@@ -0,0 +1,129 @@
+import asyncio
+
+from interactions import AutocompleteContext, OptionType, SlashCommand, SlashCommandOption
+from interactions.client.client import Client
+from interactions.models.discord.snowflake import Snowflake
+
+__all__ = ()
+
+NAMES = [f"Iron {kind}" for kind in ("Ingot", "Ore", "Sword", "Hatchet")] + [f"Item {i}" for i in range(40)]
+
+
+async def test_autocomplete_is_answered_from_cache_and_shorter_prefixes(monkeypatch) -> None:
+    bot = Client()
+    sent = []
+
+    async def post_initial_response(payload, interaction_id, token) -> None:
+        sent.append([choice["name"] for choice in payload["data"]["choices"]])
+
+    monkeypatch.setattr(bot.http, "post_initial_response", post_initial_response)
+
+    lookups = []
+    command = SlashCommand(name="nwdb", description="Look up an item")
+
+    @command.autocomplete("item_name", cache_ttl=60)
+    async def item_autocomplete(ctx: AutocompleteContext) -> None:
+        lookups.append(ctx.input_text)
+        await asyncio.sleep(0.01)
+        search = ctx.input_text.lower().strip()
+        await ctx.send([name for name in NAMES if search in name.lower()][:25])
+
+    bot._interaction_lookup[command.resolved_name] = command
+    assert command.autocomplete_cache_ttls == {"item_name": 60}
+
+    def keystroke(text: str, user_id: int = 1) -> AutocompleteContext:
+        ctx = AutocompleteContext(bot)
+        ctx.id = Snowflake(len(sent) + 1000 + len(lookups))
+        ctx.author_id = Snowflake(user_id)
+        ctx.token = "token"
+        ctx.locale = "en-US"
+        ctx._command_name = command.resolved_name
+        ctx.focussed_option = SlashCommandOption(name="item_name", type=OptionType.STRING, description="Item")
+        ctx.kwargs = {"item_name": text}
+        return ctx
+
+    async def type_(text: str, user_id: int = 1) -> list:
+        await bot.autocomplete_cache.respond(keystroke(text, user_id), item_autocomplete, 60)
+        return sent[-1]
+
+    # "i" has more than 25 results, so it is truncated and can't answer longer inputs
+    assert len(await type_("i")) == 25
+    assert await type_("ir") == ["Iron Ingot", "Iron Ore", "Iron Sword", "Iron Hatchet"]
+    assert await type_("IRON  s") == ["Iron Sword"]  # filtered from "ir"
+    assert await type_("iro") == NAMES[:4]
+    assert lookups == ["i", "ir"]
+
+    # concurrent identical keystrokes from different users share one lookup
+    await asyncio.gather(type_("item 3", user_id=2), type_("Item 3", user_id=3))
+    assert lookups == ["i", "ir", "item 3"]
+    assert (
+        sent[-1]
+        == sent[-2]
+        == ["Item 3", "Item 30", "Item 31", "Item 32", "Item 33", "Item 34"] + [f"Item 3{i}" for i in range(5, 10)]
+    )
+
+    stats = bot.autocomplete_cache.stats
+    assert (stats["misses"], stats["derived"], stats["coalesced"]) == (3, 2, 1)
+    assert bot.autocomplete_cache.hit_rate == 0.5
+
+    bot.autocomplete_cache.clear()
+    await type_("ir")
+    assert lookups[-1] == "ir"
+
+
+async def test_debounce_drops_keystrokes_the_user_typed_past(monkeypatch) -> None:
+    bot = Client()
+    bot.autocomplete_cache.debounce = 0.02
+    answered = []
+
+    async def post_initial_response(payload, interaction_id, token) -> None:
+        answered.append(interaction_id)
+
+    monkeypatch.setattr(bot.http, "post_initial_response", post_initial_response)
+    command = SlashCommand(name="perk", description="Look up a perk")
+
+    @command.autocomplete("perk_name", cache_ttl=60)
+    async def perk_autocomplete(ctx: AutocompleteContext) -> None:
+        await ctx.send([ctx.input_text])
+
+    bot._interaction_lookup[command.resolved_name] = command
+    contexts = []
+    for i, text in enumerate(("k", "ke", "kee")):
+        ctx = AutocompleteContext(bot)
+        ctx.id, ctx.author_id, ctx.token, ctx.locale = Snowflake(i + 1), Snowflake(1), "token", "en-US"
+        ctx._command_name = command.resolved_name
+        ctx.focussed_option = SlashCommandOption(name="perk_name", type=OptionType.STRING, description="Perk")
+        ctx.kwargs = {"perk_name": text}
+        contexts.append(ctx)
+
+    await asyncio.gather(*(bot.autocomplete_cache.respond(ctx, perk_autocomplete, 60) for ctx in contexts))
+    assert answered == [3]
+    assert bot.autocomplete_cache.stats["superseded"] == 2
+
+
+async def test_callbacks_can_mark_short_responses_truncated(monkeypatch) -> None:
+    bot = Client()
+    monkeypatch.setattr(bot.http, "post_initial_response", lambda payload, interaction_id, token: asyncio.sleep(0))
+    command = SlashCommand(name="perk", description="Look up a perk")
+    rows = [None] + [f"Keen {i}" for i in range(30)]
+    lookups = []
+
+    @command.autocomplete("perk_name", cache_ttl=60)
+    async def perk_autocomplete(ctx: AutocompleteContext) -> None:
+        lookups.append(ctx.input_text)
+        matches = [row for row in rows if row is None or ctx.input_text in row.lower()][:25]  # LIMIT 25
+        names = [name for name in matches if name]
+        await ctx.send(names, complete=len(matches) < 25)
+
+    bot._interaction_lookup[command.resolved_name] = command
+    for i, text in enumerate(("keen", "keen 2")):
+        ctx = AutocompleteContext(bot)
+        ctx.id, ctx.author_id, ctx.token, ctx.locale = Snowflake(i + 1), Snowflake(1), "token", "en-US"
+        ctx._command_name = command.resolved_name
+        ctx.focussed_option = SlashCommandOption(name="perk_name", type=OptionType.STRING, description="Perk")
+        ctx.kwargs = {"perk_name": text}
+        await bot.autocomplete_cache.respond(ctx, perk_autocomplete, 60)
+
+    # 24 names, but from a truncated query: "keen 2" isn't answered from them, it has matches they don't
+    assert lookups == ["keen", "keen 2"]
+    assert bot.autocomplete_cache.stats["derived"] == 0
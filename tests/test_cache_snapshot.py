@@ -0,0 +1,160 @@
+import asyncio
+import struct
+import time
+
+import pytest
+
+from interactions.api.gateway.session_store import GatewaySessionStore
+from interactions.api.http.route import Route
+from interactions.client import cache_snapshot
+from interactions.client.client import Client
+from interactions.models.discord.channel import GuildText
+from tests.consts import SAMPLE_GUILD_DATA, SAMPLE_USER_DATA
+from tests.utils import FakeDiscord
+
+__all__ = ()
+
+GUILD_ID = SAMPLE_GUILD_DATA()["id"]
+USER_ID = SAMPLE_USER_DATA()["id"]
+
+
+def _fill(client: Client) -> None:
+    data = SAMPLE_GUILD_DATA()
+    data["roles"] = [{"id": "20", "name": "mods", "color": 0, "hoist": False, "position": 1, "permissions": "8"}]
+    data["channels"] = [{"id": "30", "type": 0, "name": "general", "position": 0, "permission_overwrites": []}]
+    data["members"] = [
+        {
+            "user": SAMPLE_USER_DATA(),
+            "roles": ["20"],
+            "joined_at": "2024-01-01T00:00:00+00:00",
+            "deaf": False,
+            "mute": False,
+        }
+    ]
+    client.cache.place_guild_data(data)
+
+
+async def test_restored_entries_belong_to_the_new_client_and_are_stale(tmp_path) -> None:
+    path = str(tmp_path / "cache.bin")
+    client = Client()
+    _fill(client)
+    assert await client.cache.save_snapshot(path) == 6  # guild, role, channel, user, member, user guilds
+
+    restored = Client()
+    assert restored.cache.load_snapshot(path) == 6
+    guild = restored.cache.get_guild(GUILD_ID)
+    assert guild._client is restored
+    assert guild.name == "test_guild"
+    assert [role.name for role in guild.roles if not role.default] == ["mods"]
+    channel = guild.channels[0]
+    assert isinstance(channel, GuildText)
+    assert channel.name == "general"
+    member = restored.cache.get_member(GUILD_ID, USER_ID)
+    assert member.display_name == SAMPLE_USER_DATA()["username"]
+    assert [role.name for role in member.roles] == ["mods"]
+    assert restored.cache.get_user_guild_ids(USER_ID) == [guild.id]
+
+    assert restored.cache.is_stale("guild_cache", guild.id)
+    assert restored.cache.is_stale("member_cache", (guild.id, member.id))
+    assert not restored.cache.is_stale("user_guilds", member.id)
+
+
+async def test_stale_entries_are_refetched_once(tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / "cache.bin")
+    client = Client()
+    _fill(client)
+    await client.cache.save_snapshot(path)
+
+    restored = Client()
+    restored.cache.load_snapshot(path)
+    fetched = []
+
+    async def get_guild(guild_id) -> dict:
+        fetched.append(guild_id)
+        return SAMPLE_GUILD_DATA() | {"name": "renamed"}
+
+    monkeypatch.setattr(restored.http, "get_guild", get_guild)
+    guild = restored.cache.get_guild(GUILD_ID)
+    assert await restored.cache.fetch_guild(GUILD_ID) is guild
+    assert guild.name == "renamed"
+    await restored.cache.fetch_guild(GUILD_ID)
+    assert len(fetched) == 1
+    assert "guild_cache" not in restored.cache.stale
+
+
+async def test_unusable_snapshots_restore_nothing(tmp_path) -> None:
+    client = Client()
+    _fill(client)
+    path = str(tmp_path / "cache.bin")
+    await client.cache.save_snapshot(path)
+
+    assert Client().cache.load_snapshot(str(tmp_path / "missing.bin")) == 0
+    assert Client().cache.load_snapshot(path, max_age=60) == 6
+
+    with open(path, "r+b") as f:
+        header = cache_snapshot.HEADER.unpack(f.read(cache_snapshot.HEADER.size))
+        f.seek(0)
+        f.write(cache_snapshot.HEADER.pack(*header[:2], time.time() - 120, *header[3:]))
+    assert Client().cache.load_snapshot(path, max_age=60) == 0
+
+    with open(path, "r+b") as f:
+        f.write(cache_snapshot.HEADER.pack(*header[:3], b"0.0.1", header[4]))
+    assert Client().cache.load_snapshot(path) == 0
+
+    with open(path, "wb") as f:
+        f.write(b"not a snapshot" + bytes(cache_snapshot.HEADER.size))
+    assert Client().cache.load_snapshot(path) == 0
+
+    with open(path, "wb") as f:
+        f.write(
+            cache_snapshot.HEADER.pack(cache_snapshot.MAGIC, cache_snapshot.FORMAT_VERSION, time.time(), *header[3:])
+        )
+        f.write(struct.pack("<I", 5) + b"trunc")
+    assert Client().cache.load_snapshot(path) == 0
+
+
+async def test_snapshots_of_changed_classes_are_ignored(tmp_path, monkeypatch) -> None:
+    client = Client()
+    _fill(client)
+    path = str(tmp_path / "cache.bin")
+    await client.cache.save_snapshot(path)
+    assert len(cache_snapshot.class_fingerprint()) == 16
+
+    # e.g. a field was added to a cached class by an update that kept the library's version
+    monkeypatch.setattr(cache_snapshot, "class_fingerprint", lambda: bytes(16))
+    assert Client().cache.load_snapshot(path) == 0
+
+
+@pytest.mark.parametrize("resumable", [True, False])
+async def test_restarted_client_starts_with_the_snapshot(monkeypatch, tmp_path, resumable) -> None:
+    fake = FakeDiscord(guilds_per_shard=2)
+    monkeypatch.setattr(Route, "BASE", await fake.start())
+    path = str(tmp_path / "cache.bin")
+
+    def make_client() -> Client:
+        client = Client()
+        client.cache_snapshot = path
+        if resumable:
+            client.session_store = GatewaySessionStore(str(tmp_path / "session.json"))
+        return client
+
+    try:
+        names = []
+        for _ in range(2):
+            client = make_client()
+            running = asyncio.create_task(client.astart("token"))
+            deadline = time.monotonic() + 20
+            while not client.is_ready and time.monotonic() < deadline:
+                assert not running.done()
+                await asyncio.sleep(0.05)
+            names.append(sorted(guild.name for guild in client.guilds))
+            await client.stop()
+            await asyncio.wait_for(running, 10)
+
+        assert len(names[0]) == 2
+        assert names[1] == names[0]
+        # resumed: the guilds only came from the snapshot, identified: GUILD_CREATE revalidated them
+        assert len(fake.identifies) == (1 if resumable else 2)
+        assert bool(client.cache.stale) == resumable
+    finally:
+        await fake.close()
@@ -0,0 +1,107 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from interactions.api.http.cdn_cache import CDNCache
+
+__all__ = ()
+
+
+class FakeCDN:
+    def __init__(self) -> None:
+        self.downloads = []
+
+    def fetcher(self, key: str, size: int = 100, fail: bool = False) -> Callable[[], Awaitable[bytes]]:
+        async def fetch() -> bytes:
+            self.downloads.append(key)
+            await asyncio.sleep(0.01)
+            if fail:
+                raise ConnectionError("CDN unavailable")
+            return key.encode().ljust(size, b".")
+
+        return fetch
+
+
+def test_key_ignores_everything_but_path_and_size() -> None:
+    url = "https://cdn.discordapp.com/avatars/1/abc.png"
+    assert CDNCache.key_for_url(f"{url}?size=256") == CDNCache.key_for_url(f"{url}?format=x&size=256")
+    assert CDNCache.key_for_url(f"{url}?size=256") != CDNCache.key_for_url(f"{url}?size=512")
+    assert CDNCache.key_for_url(url) != CDNCache.key_for_url(url.replace("abc", "a_abc"))
+
+
+async def test_concurrent_requests_share_one_download() -> None:
+    cache, cdn = CDNCache(), FakeCDN()
+    results = await asyncio.gather(*(cache.get("avatar", cdn.fetcher("avatar")) for _ in range(10)))
+    assert len(set(results)) == 1
+    assert cdn.downloads == ["avatar"]
+    assert cache.stats["misses"] == 1 and cache.stats["coalesced"] == 9
+
+    assert await cache.get("avatar", cdn.fetcher("avatar")) == results[0]
+    assert cache.stats["memory_hits"] == 1
+
+
+async def test_errors_reach_every_waiter_and_are_not_cached() -> None:
+    cache, cdn = CDNCache(), FakeCDN()
+    results = await asyncio.gather(
+        *(cache.get("icon", cdn.fetcher("icon", fail=True)) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert await cache.get("icon", cdn.fetcher("icon"))
+    assert cdn.downloads == ["icon", "icon"]
+
+
+async def test_a_cancelled_download_is_taken_over_by_a_waiter() -> None:
+    cache, cdn = CDNCache(), FakeCDN()
+    first = asyncio.create_task(cache.get("avatar", cdn.fetcher("avatar")))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(cache.get("avatar", cdn.fetcher("avatar"))) for _ in range(3)]
+    await asyncio.sleep(0)
+    first.cancel()
+    results = await asyncio.gather(*waiters)
+    assert first.cancelled()
+    assert results == [b"avatar".ljust(100, b".")] * 3
+    assert cdn.downloads == ["avatar", "avatar"]
+
+
+async def test_memory_budget_evicts_least_recently_used() -> None:
+    cache, cdn = CDNCache(max_bytes=1000), FakeCDN()
+    for key in ("a", "b", "c", "d"):
+        await cache.get(key, cdn.fetcher(key, size=250))
+    await cache.get("a", cdn.fetcher("a", size=250))  # a is now the most recently used
+    await cache.get("e", cdn.fetcher("e", size=250))
+    assert cache.memory_bytes <= 1000
+    assert cache.stats["evictions"] == 1
+    await cache.get("a", cdn.fetcher("a", size=250))
+    await cache.get("b", cdn.fetcher("b", size=250))
+    assert cdn.downloads == ["a", "b", "c", "d", "e", "b"]
+
+    await cache.get("big", cdn.fetcher("big", size=300))  # over a quarter of the budget: disk/nothing only
+    assert "big" not in cache._memory
+
+
+async def test_disk_tier_survives_a_restart(tmp_path) -> None:
+    cdn = FakeCDN()
+    await CDNCache(disk_path=str(tmp_path)).get("emoji", cdn.fetcher("emoji"))
+
+    cache = CDNCache(disk_path=str(tmp_path))
+    assert await cache.get("emoji", cdn.fetcher("emoji")) == b"emoji".ljust(100, b".")
+    assert cdn.downloads == ["emoji"]
+    assert cache.stats["disk_hits"] == 1
+
+
+async def test_disk_budget_removes_oldest_files(tmp_path) -> None:
+    cache, cdn = CDNCache(disk_path=str(tmp_path), disk_max_bytes=1000), FakeCDN()
+    for i in range(12):
+        await cache.get(f"asset{i}", cdn.fetcher(f"asset{i}"))
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 1000
+    assert await cache._read_disk("asset11") is not None
+
+
+async def test_concurrent_disk_writes_keep_the_budget_exact(tmp_path, caplog) -> None:
+    (tmp_path / "interrupted.tmp").write_bytes(bytes(5000))  # a crashed write, neither counted nor pruned
+    cache, cdn = CDNCache(max_bytes=0, disk_path=str(tmp_path), disk_max_bytes=1000), FakeCDN()
+    await asyncio.gather(*(cache.get(f"asset{i}", cdn.fetcher(f"asset{i}")) for i in range(30)))
+
+    assert "Could not write" not in caplog.text
+    files = [path for path in tmp_path.iterdir() if path.suffix != ".tmp"]
+    assert cache._disk_bytes == sum(path.stat().st_size for path in files) <= 1000
+    assert (tmp_path / "interrupted.tmp").exists()
@@ -0,0 +1,104 @@
+import asyncio
+import itertools
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from interactions.api.http.http_client import BucketLock, HTTPClient
+from interactions.api.http.route import Route
+from interactions.client.auto_shard_client import AutoShardedClient
+from interactions.client.cluster import Cluster, ClusterCoordinator, ClusterLink, SharedGlobalLock
+from tests.utils import FakeDiscord
+
+__all__ = ()
+
+TOTAL_SHARDS = 4
+GUILDS_PER_SHARD = 2
+IDENTIFY_INTERVAL = 0.3
+
+
+def _make_client(shard_ids: list, total_shards: int) -> AutoShardedClient:
+    # runs in the (spawned) worker processes, which inherit the fake's address through the environment
+    Route.BASE = os.environ["FAKE_DISCORD_URL"]
+    return AutoShardedClient(shard_ids=shard_ids, total_shards=total_shards)
+
+
+@pytest.fixture()
+async def fake_discord(monkeypatch):
+    fake = FakeDiscord(shards=TOTAL_SHARDS, guilds_per_shard=GUILDS_PER_SHARD)
+    monkeypatch.setenv("FAKE_DISCORD_URL", await fake.start())
+    yield fake
+    await fake.close()
+
+
+async def test_workers_split_the_shards_and_share_identifies(fake_discord) -> None:
+    cluster = Cluster(
+        _make_client,
+        total_shards=TOTAL_SHARDS,
+        workers=2,
+        token="token",
+        identify_interval=IDENTIFY_INTERVAL,
+        stats_interval=0.2,
+    )
+    assert cluster.shard_slices == [[0, 1], [2, 3]]
+    running = asyncio.create_task(cluster.astart())
+    try:
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            stats = cluster.stats()
+            if stats["guilds"] == TOTAL_SHARDS * GUILDS_PER_SHARD and None not in stats["shards"].values():
+                break
+            assert not running.done()
+            await asyncio.sleep(0.2)
+
+        assert stats["workers"] == 2
+        assert sorted(stats["shards"]) == list(range(TOTAL_SHARDS))
+        assert stats["latency"] is not None
+
+        # every shard identified once, and with max_concurrency 1 never two within the identify interval
+        assert sorted(shard_id for shard_id, _ in fake_discord.identifies) == list(range(TOTAL_SHARDS))
+        times = [at for _, at in fake_discord.identifies]
+        assert min(b - a for a, b in itertools.pairwise(times)) >= IDENTIFY_INTERVAL * 0.9
+    finally:
+        await cluster.stop()
+        await asyncio.wait_for(running, 30)
+    assert not cluster.processes
+    assert not os.path.exists(cluster.socket_path)
+
+
+async def test_global_limit_and_exhausted_buckets_are_shared(tmp_path) -> None:
+    coordinator = ClusterCoordinator(str(tmp_path / "cluster.sock"), global_limit=10)
+    await coordinator.start()
+    links, clients = [], []
+    for worker_id in range(2):
+        link = ClusterLink(coordinator.socket_path, worker_id, stats_interval=60)
+        await link.connect([worker_id])
+        shard = SimpleNamespace(shard_id=worker_id, gateway=SimpleNamespace(latency=0.05))
+        client = SimpleNamespace(http=HTTPClient(), identify_gate=None, shards=[shard], guild_count=3, user=True)
+        link.attach(client)
+        links.append(link)
+        clients.append(client)
+    try:
+        assert isinstance(clients[0].http.global_lock, SharedGlobalLock)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client.http.global_lock.wait() for client in clients for _ in range(15)))
+        assert time.perf_counter() - started >= 0.9  # 30 calls at 10/s need a third window
+
+        key = "hash:None:1:None"
+        lock = BucketLock()
+        lock.reset_at = time.perf_counter() + 5
+        clients[1].http.ratelimit_locks[key] = BucketLock()
+        clients[0].http.ratelimit_listener(key, lock)
+        await asyncio.sleep(0.1)
+        assert clients[1].http.ratelimit_locks[key].remaining == 0
+        assert clients[1].http.ratelimit_locks[key].locked
+
+        stats = await links[0].cluster_stats()
+        assert stats == {"workers": 2, "shards": {0: 0.05, 1: 0.05}, "latency": 0.05, "guilds": 6}
+    finally:
+        for link in links:
+            await link.close()
+        await coordinator.close()
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from interactions import ChannelType, InteractionType
+from interactions.client.client import Client
+from interactions.models.discord.snowflake import Snowflake
+
+__all__ = ()
+
+USER = {"id": "200", "username": "ina", "discriminator": "0", "avatar": None}
+
+
+def _interaction(**extra) -> dict:
+    return {
+        "id": "300",
+        "application_id": "1",
+        "type": InteractionType.APPLICATION_COMMAND,
+        "token": "token",
+        "locale": "en-US",
+        "data": {"id": "400", "name": "perk", "type": 1},
+        "channel_id": "100",
+        **extra,
+    }
+
+
+def _client(monkeypatch) -> Client:
+    bot = Client()
+    bot._app = SimpleNamespace(id=Snowflake(1))
+
+    async def no_rest(*args, **kwargs) -> None:
+        raise AssertionError("the channel should not be fetched")
+
+    monkeypatch.setattr(bot.http, "request", no_rest)
+    return bot
+
+
+async def test_dm_interaction_uses_the_partial_channel(monkeypatch) -> None:
+    bot = _client(monkeypatch)
+    data = _interaction(user=USER, context=1, channel={"id": "100", "type": ChannelType.DM, "flags": 0})
+
+    ctx = await bot.get_context(data)
+    assert ctx.channel.id == 100
+    assert ctx.channel.recipient.id == 200
+    ctx = await bot.get_context(data)
+    assert ctx.channel.id == 100
+    assert bot.context_channel_stats == {"payload": 2, "cached": 0, "fetched": 0, "failed": 0}
+
+
+async def test_guild_interaction_channel_knows_its_guild(monkeypatch) -> None:
+    bot = _client(monkeypatch)
+    member = {"user": USER, "roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "permissions": "0"}
+    channel = {"id": "100", "type": ChannelType.GUILD_TEXT, "name": "general", "flags": 0}
+    ctx = await bot.get_context(_interaction(guild_id="500", member=member, context=0, channel=channel))
+
+    assert ctx.channel.name == "general"
+    assert ctx.channel._guild_id == 500
+    assert bot.context_channel_stats["payload"] == 1
+
+
+async def test_missing_channel_is_still_fetched(monkeypatch) -> None:
+    bot = _client(monkeypatch)
+    fetched = []
+
+    async def fetch_dm_channel(cache, user_id, *, force=False) -> SimpleNamespace:
+        fetched.append(user_id)
+        return SimpleNamespace(id=Snowflake(100))
+
+    monkeypatch.setattr(type(bot.cache), "fetch_dm_channel", fetch_dm_channel)
+    await bot.get_context(_interaction(user=USER))
+    assert fetched == [200]
+    assert bot.context_channel_stats["fetched"] == 1
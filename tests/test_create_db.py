@@ -0,0 +1,205 @@
+import json
+import sqlite3
+
+import db_utils
+from commands.new_world import utils as new_world_utils
+from create_db import _remove_wal_files, build_database, read_data_version, refresh_database
+from utils.perk_scaler import SCALING_BREAKPOINTS
+
+__all__ = ()
+
+
+def _write(path, text: str) -> str:
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_build_database_streams_all_tables(tmp_path) -> None:
+    items_csv = _write(
+        tmp_path / "items.csv",
+        "Item ID,Name,Description,Gear Score,Weight (kg)\n"
+        'ironingott1,Iron Ingot,"Smelted\nfrom ore",,0.1\n'
+        "steelingott2,Steel Ingot,Stronger,,0.1\n",
+    )
+    scraped_perks_csv = _write(
+        tmp_path / "perks_scraped.csv",
+        "id,name,description,PerkType,icon_url,ConditionText\n"
+        "perkid_keen,Keen,Scraped keen,Generated,https://nwdb.info/keen.png,Always\n"
+        "perkid_only_scraped,Scraped Only,Only here,Generated,,\n",
+    )
+    buddy_csv = _write(
+        tmp_path / "perks_buddy.csv",
+        '"Perk ID","Name","Description","Type","Icon Path"\n'
+        '"perkid_keen","Keen","Buddy keen","","lyshineui/keen.webp"\n'
+        '"perkid_only_buddy","Buddy Only","Only in buddy","Inherent",""\n',
+    )
+    recipes_csv = _write(
+        tmp_path / "recipes.csv",
+        "Name,CraftingStation,Tradeskill,Level,Tier,Ingredient1,Qty1,Ingredient2,Qty2\n"
+        "Steel Ingot,Smelter,Smelting,50,3,Iron Ingot,3,Charcoal,x\n",
+    )
+
+    report = build_database(
+        str(tmp_path / "test.db"),
+        items_csv=items_csv,
+        scraped_perks_csv=scraped_perks_csv,
+        perks_buddy_csv=buddy_csv,
+        recipes_csv=recipes_csv,
+        legacy_recipes_csv=recipes_csv,
+    )
+    assert [phase[:2] for phase in report.phases] == [("items", 2), ("perks", 3), ("recipes", 1), ("parsed_recipes", 1)]
+
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    conn.row_factory = sqlite3.Row
+    item = dict(conn.execute("SELECT * FROM items WHERE lower(Name) = 'iron ingot'").fetchone())
+    assert item["Item_ID"] == "ironingott1"
+    assert item["Description"] == "Smelted\nfrom ore"
+    assert item["Gear_Score"] is None
+    assert item["Weight_kg"] == "0.1"
+
+    perks = {row["id"]: dict(row) for row in conn.execute("SELECT * FROM perks")}
+    # nw-buddy values win, scraped values fill the gaps
+    assert perks["perkid_keen"]["description"] == "Buddy keen"
+    assert perks["perkid_keen"]["PerkType"] == "Generated"
+    assert perks["perkid_keen"]["ConditionText"] == "Always"
+    assert perks["perkid_keen"]["icon_url"] == "https://cdn.nw-buddy.de/nw-data/live/lyshineui/keen.webp"
+    assert perks["perkid_only_buddy"]["PerkType"] == "Inherent"
+    assert perks["perkid_only_scraped"]["name"] == "Scraped Only"
+
+    recipe = conn.execute("SELECT * FROM recipes").fetchone()
+    assert json.loads(recipe["ingredients"]) == [{"item": "Iron Ingot", "quantity": 3}]
+    assert json.loads(recipe["raw_recipe_data"])["CraftingStation"] == "Smelter"
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_items_name_lower", "idx_perks_name_lower", "idx_recipes_output_item_name_lower"} <= indexes
+    conn.close()
+
+
+def test_refresh_database_applies_only_changes(tmp_path) -> None:
+    db_path = str(tmp_path / "test.db")
+    items_csv = _write(
+        tmp_path / "items.csv",
+        "Item ID,Name,Tier\n" "ironingott1,Iron Ingot,2\n" "steelingott2,Steel Ingot,3\n" "oldthing,Old Thing,1\n",
+    )
+    build_database(db_path, items_csv=items_csv, data_version=5)
+    assert read_data_version(db_path) == 5
+    conn = sqlite3.connect(db_path)
+    iron_rowid = conn.execute("SELECT rowid FROM items WHERE Name = 'Iron Ingot'").fetchone()[0]
+    conn.close()
+
+    # Steel changes, Old Thing is gone, Orichalcum is new and a column appears
+    _write(
+        tmp_path / "items.csv",
+        "Item ID,Name,Tier,Weight\n"
+        "ironingott1,Iron Ingot,2,\n"
+        "steelingott2,Steel Ingot,4,\n"
+        "orichalcumingott,Orichalcum Ingot,5,0.1\n",
+    )
+    # The refreshed row of iron gets a NULL Weight, so it counts as updated
+    results = refresh_database(db_path, items_csv=items_csv)
+    assert results == {"items": {"inserted": 1, "updated": 2, "deleted": 1, "unchanged": 0}}
+    assert read_data_version(db_path) == 6
+
+    conn = sqlite3.connect(db_path)
+    rows = {row[0]: row[1:] for row in conn.execute("SELECT Name, Tier, Weight, rowid FROM items")}
+    conn.close()
+    assert set(rows) == {"Iron Ingot", "Steel Ingot", "Orichalcum Ingot"}
+    assert rows["Steel Ingot"][0] == "4"
+    assert rows["Orichalcum Ingot"][1] == "0.1"
+    assert rows["Iron Ingot"][2] == iron_rowid
+
+    # Nothing changed: no writes and the version stays
+    results = refresh_database(db_path, items_csv=items_csv)
+    assert results["items"]["unchanged"] == 3
+    assert read_data_version(db_path) == 6
+
+
+def test_item_cache_is_rebuilt_from_the_refreshed_database(tmp_path, monkeypatch) -> None:
+    db_path = str(tmp_path / "test.db")
+    items_csv = _write(tmp_path / "items.csv", "Item ID,Name,Tier\n" "ironingott1,Iron Ingot,2\n")
+    build_database(db_path, items_csv=items_csv)
+    monkeypatch.setattr(new_world_utils, "DB_NAME", db_path)
+    assert new_world_utils.get_any(new_world_utils._build_items_data_cache()["iron ingot"], ["Tier"], None) == "2"
+
+    # items_updated.json is not rewritten by a refresh, the cache follows the database
+    _write(tmp_path / "items.csv", "Item ID,Name,Tier\n" "ironingott1,Iron Ingot,3\n" "testingott9,Test Ingot,9\n")
+    refresh_database(db_path, items_csv=items_csv)
+    cache = new_world_utils._build_items_data_cache()
+    assert new_world_utils.get_any(cache["iron ingot"], ["Tier"], None) == "3"
+    assert cache["testingott9"] is cache["test ingot"]
+
+
+def test_leftover_wal_files_are_removed(tmp_path) -> None:
+    db_path = str(tmp_path / "test.db")
+    for suffix in ("", "-wal", "-shm"):
+        _write(tmp_path / f"test.db{suffix}", "")
+    _remove_wal_files(db_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["test.db"]
+
+
+async def test_full_text_search_ranks_name_hits_first(tmp_path, monkeypatch) -> None:
+    db_path = str(tmp_path / "test.db")
+    items_csv = _write(
+        tmp_path / "items.csv",
+        "Item ID,Name,Description\n"
+        "ring1,Empowered Ring,A plain ring\n"
+        "amulet1,Amulet,Grants empower on kill\n"
+        "rock1,Rock,Just a rock\n",
+    )
+    scraped_perks_csv = _write(
+        tmp_path / "perks_scraped.csv",
+        "id,name,description,ConditionText\n"
+        "perkid_empower,Empower,Deal more damage,On Hit\n"
+        "perkid_keen,Keen,Crit chance. Café bonus,Always\n"
+        "perkid_sharp,Sharp,Gain ${10 * perkMultiplier}% damage,Always\n",
+    )
+    build_database(db_path, items_csv=items_csv, scraped_perks_csv=scraped_perks_csv)
+    monkeypatch.setattr(db_utils, "DB_NAME", db_path)
+
+    results = await db_utils.search_game_data("empower")
+    assert [(r["result_type"], r["result_name"]) for r in results][:2] == [
+        ("perk", "Empower"),
+        ("item", "Empowered Ring"),
+    ]
+    assert ("item", "Amulet") in [(r["result_type"], r["result_name"]) for r in results]
+    assert "**empower**" in next(r["snippet"] for r in results if r["result_name"] == "Amulet")
+
+    # Prefix matching, category filter, diacritics and FTS syntax in user input
+    assert [r["result_name"] for r in await db_utils.search_game_data("kee", category="perk")] == ["Keen"]
+    assert [r["result_name"] for r in await db_utils.search_game_data("cafe")] == ["Keen"]
+    assert await db_utils.search_game_data("item", category="item") == []
+    assert [r["result_name"] for r in await db_utils.search_game_data('"rock:*(')] == ["Rock"]
+
+    # Snippets show perk values scaled to the default gear score, never the formula with markers inside it
+    assert [r["snippet"] for r in await db_utils.search_game_data("14")] == ["Gain **14**.5% damage"]
+    assert await db_utils.search_game_data("perkmultiplier") == []
+
+    # A refresh that changes a description keeps the index in step
+    _write(tmp_path / "items.csv", "Item ID,Name,Description\nrock1,Rock,Now with empower\n")
+    refresh_database(db_path, items_csv=items_csv)
+    assert {r["result_name"] for r in await db_utils.search_game_data("empower", category="item")} == {"Rock"}
+
+
+async def test_perk_scaling_is_precomputed_at_breakpoints(tmp_path, monkeypatch) -> None:
+    db_path = str(tmp_path / "test.db")
+    scraped_perks_csv = _write(
+        tmp_path / "perks_scraped.csv",
+        "id,name,description\n"
+        'perkid_empower,Empower,"+{[0.05 * 100 * {perkMultiplier}]}% damage, ${2 * 3} stacks"\n'
+        "perkid_keen,Keen,Crit chance\n",
+    )
+    build_database(db_path, scraped_perks_csv=scraped_perks_csv)
+    monkeypatch.setattr(db_utils, "DB_NAME", db_path)
+
+    scaling = await db_utils.get_perk_scaling("perkid_empower")
+    assert sorted(scaling) == list(SCALING_BREAKPOINTS)
+    assert scaling[500] == [5.0, 6]
+    assert scaling[725] == [7.25, 6]
+    assert await db_utils.get_perk_scaling("perkid_keen") == {}
+
+    # A changed formula is re-evaluated on refresh
+    _write(
+        tmp_path / "perks_scraped.csv",
+        'id,name,description\nperkid_empower,Empower,"+{[0.1 * 100 * {perkMultiplier}]}%"\n',
+    )
+    refresh_database(db_path, scraped_perks_csv=scraped_perks_csv)
+    assert (await db_utils.get_perk_scaling("perkid_empower"))[500] == [10.0]
@@ -0,0 +1,77 @@
+import asyncio
+import sqlite3
+import sys
+import time
+
+import pytest
+
+import db_utils
+
+__all__ = ()
+
+
+@pytest.fixture()
+def perk_db(tmp_path, monkeypatch) -> str:
+    db_path = str(tmp_path / "test.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE perks (id TEXT, name TEXT, description TEXT)")
+    conn.execute("INSERT INTO perks VALUES ('perkid_keen', 'Keen', 'Crit chance')")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(db_utils, "DB_NAME", db_path)
+    monkeypatch.setattr(db_utils, "_recent_perk_misses", {})
+    monkeypatch.setattr(
+        db_utils, "_perk_refresh_status", dict(db_utils._perk_refresh_status, running=False, finished_at=None, runs=0)
+    )
+    # Stands in for update_perks.sh: slow enough for the misses below to overlap with it
+    monkeypatch.setattr(
+        db_utils, "_perk_update_command", lambda: [sys.executable, "-c", "import time; time.sleep(0.5)"]
+    )
+    return db_path
+
+
+async def test_perk_miss_refreshes_in_background_once(perk_db) -> None:
+    assert [perk["name"] for perk in await db_utils.find_perk_in_db("keen", exact_match=True)] == ["Keen"]
+    assert db_utils.get_perk_refresh_status()["runs"] == 0
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(db_utils.find_perk_in_db(f"Unknown {i}") for i in range(5)))
+    assert results == [[]] * 5
+    assert time.perf_counter() - started < 0.4  # Nobody waited for the update script
+    status = db_utils.get_perk_refresh_status()
+    assert status["running"] and status["runs"] == 1 and status["trigger"].startswith("Unknown ")
+    assert status["cached_misses"] == 5
+
+    await db_utils._perk_refresh_task
+    status = db_utils.get_perk_refresh_status()
+    assert not status["running"] and status["returncode"] == 0
+    assert status["cached_misses"] == 0  # A successful refresh forgets the old misses
+
+    # Cooldown: another miss right after the refresh does not start a new one
+    assert await db_utils.find_perk_in_db("Still unknown") == []
+    assert db_utils.get_perk_refresh_status()["runs"] == 1
+    assert db_utils.request_perk_refresh("manual", force=True)
+    assert not db_utils.request_perk_refresh("manual again", force=True)  # Single flight, even when forced
+    await db_utils._perk_refresh_task
+
+
+async def test_negative_cache_skips_the_database(perk_db, monkeypatch) -> None:
+    assert await db_utils.find_perk_in_db("Unknown", refresh_on_miss=False) == []
+    assert db_utils.get_perk_refresh_status()["runs"] == 0
+
+    monkeypatch.setattr(db_utils.aiosqlite, "connect", None)  # Any further query would fail loudly
+    assert await db_utils.find_perk_in_db("unknown", refresh_on_miss=False) == []
+
+    monkeypatch.setattr(db_utils, "PERK_MISS_CACHE_MAX", 3)
+    for i in range(5):
+        db_utils._remember_perk_miss((f"miss {i}", False))
+    assert list(db_utils._recent_perk_misses) == [("miss 2", False), ("miss 3", False), ("miss 4", False)]
+
+
+async def test_autocomplete_miss_still_refreshes_on_submit(perk_db) -> None:
+    # perk_autocomplete caches the miss without refreshing, /perk then falls back to the same lookup
+    assert await db_utils.find_perk_in_db("unknown", exact_match=False, refresh_on_miss=False) == []
+    assert db_utils.get_perk_refresh_status()["runs"] == 0
+    assert await db_utils.find_perk_in_db("Unknown", exact_match=False) == []
+    assert db_utils.get_perk_refresh_status()["runs"] == 1
+    await db_utils._perk_refresh_task
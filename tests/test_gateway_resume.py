@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+
+from interactions.api.gateway.session_store import GatewaySessionStore
+from interactions.api.http.route import Route
+from interactions.client.client import Client
+from tests.utils import FakeDiscord
+
+__all__ = ()
+
+
+async def _run_until_ready(client: Client) -> asyncio.Task:
+    running = asyncio.create_task(client.astart("token"))
+    deadline = time.monotonic() + 20
+    while not client.is_ready and time.monotonic() < deadline:
+        assert not running.done()
+        await asyncio.sleep(0.05)
+    assert client.is_ready
+    return running
+
+
+async def _stop(client: Client, running: asyncio.Task) -> None:
+    await client.stop()
+    await asyncio.wait_for(running, 10)
+
+
+async def test_session_saved_on_stop_is_resumed_on_restart(monkeypatch, tmp_path) -> None:
+    fake = FakeDiscord(guilds_per_shard=2)
+    monkeypatch.setattr(Route, "BASE", await fake.start())
+    path = str(tmp_path / "gateway_session.json")
+    try:
+        client = Client()
+        client.session_store = GatewaySessionStore(path)
+        await _stop(client, await _run_until_ready(client))
+
+        with open(path) as f:
+            saved = json.load(f)["0/1"]
+        assert saved["session_id"] in fake.sessions
+        assert saved["sequence"] == 3  # READY and two GUILD_CREATEs
+        assert len(saved["guild_ids"]) == 2
+        assert fake.close_codes[-1] != 1000
+
+        client = Client()
+        client.session_store = GatewaySessionStore(path)
+        running = await _run_until_ready(client)
+        try:
+            assert len(fake.identifies) == 1
+            assert fake.resumes == [(saved["session_id"], 3)]
+            assert client.guild_count == 2
+            with open(path) as f:
+                assert json.load(f) == {}
+        finally:
+            await _stop(client, running)
+    finally:
+        await fake.close()
+
+
+async def test_unknown_or_stale_sessions_identify(monkeypatch, tmp_path) -> None:
+    fake = FakeDiscord(guilds_per_shard=2)
+    monkeypatch.setattr(Route, "BASE", await fake.start())
+    path = str(tmp_path / "gateway_session.json")
+    session = {"session_id": "gone", "sequence": 10, "resume_gateway_url": None, "guild_ids": []}
+    try:
+        store = GatewaySessionStore(path, max_age=60)
+        store._write({"0/1": session | {"saved_at": time.time() - 120}})
+        assert store.take(0, 1) is None
+
+        store._write({"0/1": session | {"saved_at": time.time()}, "0/2": session | {"saved_at": time.time()}})
+        client = Client()
+        client.session_store = store
+        running = await _run_until_ready(client)
+        try:
+            assert fake.resumes == [("gone", 10)]
+            assert len(fake.identifies) == 1
+            assert client.guild_count == 2
+            assert list(store._read()) == ["0/2"]
+        finally:
+            await _stop(client, running)
+    finally:
+        await fake.close()
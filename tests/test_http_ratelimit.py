@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from interactions.api.http.http_client import HTTPClient
+from interactions.api.http.route import Route
+
+__all__ = ()
+
+LIMIT = 5
+WINDOW = 0.3
+
+
+class FakeDiscordRest:
+    """Enforces discord-style per-bucket limits (bucket hash + channel) and reports what it saw."""
+
+    def __init__(self) -> None:
+        self.windows = {}
+        self.served = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.first_request_alone = None
+
+    async def users_me(self, request: web.Request) -> web.Response:
+        return web.json_response({"id": "1", "username": "ina"})
+
+    async def channel_route(self, request: web.Request) -> web.Response:
+        bucket_hash = "edit" if request.method in {"PATCH", "DELETE"} else "send"
+        key = (bucket_hash, request.match_info["channel_id"])
+        if self.first_request_alone is None:
+            self.first_request_alone = self.in_flight == 0
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            reset, count = self.windows.get(key, (0.0, 0))
+            if now >= reset:
+                reset, count = now + WINDOW, 0
+            headers = {"X-RateLimit-Bucket": bucket_hash, "X-RateLimit-Limit": str(LIMIT)}
+            if count >= LIMIT:
+                self.rejected += 1
+                headers.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": f"{reset - now:.3f}"})
+                return web.json_response(
+                    {"message": "You are being rate limited.", "retry_after": reset - now, "global": False},
+                    status=429,
+                    headers=headers,
+                )
+            self.windows[key] = (reset, count + 1)
+            self.served += 1
+            headers.update(
+                {"X-RateLimit-Remaining": str(LIMIT - count - 1), "X-RateLimit-Reset-After": f"{reset - now:.3f}"}
+            )
+            return web.json_response({"id": str(self.served)}, headers=headers)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture()
+async def http_client(monkeypatch):
+    fake = FakeDiscordRest()
+    app = web.Application()
+    app.router.add_get("/users/@me", fake.users_me)
+    app.router.add_route("*", "/channels/{channel_id}/messages", fake.channel_route)
+    app.router.add_route("*", "/channels/{channel_id}/messages/{message_id}", fake.channel_route)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    monkeypatch.setattr(Route, "BASE", f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+
+    client = HTTPClient()
+    await client.login("token")
+    fake.first_request_alone = None
+    yield client, fake
+    await client.close()
+    await runner.cleanup()
+
+
+def _send(channel_id: int) -> Route:
+    return Route("POST", "/channels/{channel_id}/messages", channel_id=channel_id)
+
+
+async def test_burst_to_unknown_bucket_is_paced_without_429s(http_client) -> None:
+    client, fake = http_client
+    started = time.perf_counter()
+    results = await asyncio.gather(*(client.request(_send(1), payload={"content": str(i)}) for i in range(3 * LIMIT)))
+    # three windows' worth of requests need two resets, and not much more
+    assert 2 * WINDOW <= time.perf_counter() - started < 4 * WINDOW
+
+    assert len(results) == 3 * LIMIT
+    assert fake.served == 3 * LIMIT
+    assert fake.rejected == 0
+    assert client.ratelimit_stats["429"] == 0
+    assert client.ratelimit_stats["paced"] > 0  # the 429s we avoided by waiting for the reset
+    assert fake.first_request_alone  # the provisional lock let one request discover the bucket first
+    assert 1 < fake.max_in_flight <= LIMIT
+    assert not client._provisional_locks.get(_send(1).rl_bucket)
+
+
+async def test_buckets_are_per_channel_and_shared_between_routes(http_client) -> None:
+    client, fake = http_client
+    started = time.perf_counter()
+    await asyncio.gather(*(client.request(_send(channel_id)) for channel_id in (1, 2) for _ in range(LIMIT)))
+    # each channel has its own bucket, so neither had to wait for a reset
+    assert time.perf_counter() - started < WINDOW
+    assert client.get_ratelimit(_send(1)) is not client.get_ratelimit(_send(2))
+
+    edit = Route("PATCH", "/channels/{channel_id}/messages/{message_id}", channel_id=1, message_id=2)
+    delete = Route("DELETE", "/channels/{channel_id}/messages/{message_id}", channel_id=1, message_id=2)
+    await client.request(edit)
+    await client.request(delete)
+    assert client.get_ratelimit(edit) is client.get_ratelimit(delete)
+    assert client.get_ratelimit(edit) is not client.get_ratelimit(_send(1))
+    assert fake.rejected == 0
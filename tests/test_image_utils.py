@@ -0,0 +1,69 @@
+import asyncio
+import io
+
+import pytest
+from PIL import Image
+
+from utils import image_utils
+from utils.image_utils import ANIMATION_HAND_INDICES, CANVAS_SIZE, PetPetRenderer, generate_petpet_gif
+
+__all__ = ()
+
+
+def _avatar(color: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _assert_petpet_gif(gif: bytes) -> None:
+    image = Image.open(io.BytesIO(gif))
+    assert image.format == "GIF"
+    assert image.size == CANVAS_SIZE
+    assert image.n_frames == len(ANIMATION_HAND_INDICES)
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+async def test_renderer_caches_and_coalesces(workers: int) -> None:
+    renderer = PetPetRenderer(workers=workers, cache_size=2)
+    renderer.start()
+    try:
+        red, blue, green = _avatar("red"), _avatar("blue"), _avatar("green")
+        first, second = await asyncio.gather(renderer.render(red), renderer.render(red))
+        assert first == second
+        _assert_petpet_gif(first)
+        assert renderer.stats["renders"] == 1 and renderer.stats["coalesced"] == 1
+
+        assert await renderer.render(red) == first
+        assert renderer.stats["cache_hits"] == 1
+
+        # LRU: red was used last, so blue is evicted when green comes in
+        await renderer.render(blue)
+        await renderer.render(red)
+        await renderer.render(green)
+        assert renderer.stats["cache_hits"] == 2 and len(renderer._cache) == 2
+        await renderer.render(blue)
+        assert renderer.stats["renders"] == 4
+    finally:
+        renderer.shutdown()
+
+
+async def test_a_cancelled_render_is_taken_over_by_a_waiter() -> None:
+    renderer = PetPetRenderer(workers=0)
+    renderer.start()
+    first = asyncio.create_task(renderer.render(_avatar("red"), cache_key="red"))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(renderer.render(_avatar("red"), cache_key="red")) for _ in range(2)]
+    await asyncio.sleep(0)
+    first.cancel()
+    first_gif, second_gif = await asyncio.gather(*waiters)
+    assert first.cancelled()
+    assert first_gif == second_gif
+    _assert_petpet_gif(first_gif)
+
+
+async def test_generate_petpet_gif_handles_bad_images(monkeypatch) -> None:
+    monkeypatch.setattr(image_utils, "petpet_renderer", PetPetRenderer(workers=0))
+    gif = await generate_petpet_gif(_avatar("purple"), cache_key="avatar-hash:256")
+    _assert_petpet_gif(gif.getvalue())
+    assert await generate_petpet_gif(b"not an image") is None
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+
+import pytest
+
+__all__ = ()
+
+
+def _imported(statement: str) -> set[str]:
+    """Run `statement` in a fresh interpreter, returns the modules it imported."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"{statement}\nimport sys\nprint(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def _import_seconds(module: str) -> float:
+    """The cumulative time `python -X importtime` reports for importing `module` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1e6
+    raise AssertionError(f"{module} is not in the importtime output")
+
+
+def test_importing_the_library_imports_nothing_heavy() -> None:
+    assert not {"aiohttp", "interactions.client.client", "interactions.models.discord"} & _imported(
+        "import interactions"
+    )
+    assert _import_seconds("interactions") < 0.2  # eagerly, it was ~0.5s
+
+
+def test_public_names_import_on_first_use() -> None:
+    modules = _imported("from interactions import Embed")
+    assert "interactions.models.discord.embed" in modules
+    assert "interactions.client.client" not in modules
+
+    import interactions
+    from interactions.client.client import Client
+    from interactions.models.internal.application_commands import auto_defer
+
+    assert interactions.Client is Client
+    assert interactions.models.internal.auto_defer is auto_defer
+    assert "Client" in dir(interactions)
+    with pytest.raises(AttributeError):
+        getattr(interactions, "NotAnExport")  # noqa: B009
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["interactions.client.errors", "interactions.models.discord.channel", "interactions.ext.prefixed_commands"],
+)
+def test_modules_import_on_their_own(module: str) -> None:
+    # without the library importing everything first, in an order that happens to resolve the circular imports
+    _imported(f"import {module}")
+
+
+def test_bot_extensions_leave_scraping_dependencies_unimported() -> None:
+    assert not {"requests", "bs4"} & _imported("import recipes")
@@ -0,0 +1,80 @@
+import asyncio
+import random
+
+import pytest
+from aiohttp import web
+
+from interactions.api.http.http_client import HTTPClient
+from interactions.api.http.route import Route
+from interactions.client.metrics import InteractionMetrics, LatencyHistogram, current_interaction_timer
+
+__all__ = ()
+
+
+def test_histogram_quantiles_are_within_a_few_percent() -> None:
+    histogram = LatencyHistogram()
+    values = [random.uniform(0.0001, 5.0) for _ in range(10_000)]
+    for value in values:
+        histogram.record(value)
+    values.sort()
+    for q in (0.5, 0.9, 0.99):
+        exact = values[round(q * len(values)) - 1]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.04)
+    assert histogram.quantile(1.0) == max(values)
+    assert histogram.count == len(values)
+    assert len(histogram.counts) < 600
+    assert LatencyHistogram().quantile(0.5) == 0.0
+
+
+def test_disabled_metrics_record_nothing() -> None:
+    metrics = InteractionMetrics()
+    assert metrics.start() is None
+    metrics.enabled = True
+    timer = metrics.start()
+    timer.finish()  # never identified as a command, e.g. an unknown command id
+    assert metrics.histograms == {}
+
+
+async def test_http_time_of_the_callback_is_split_out(monkeypatch) -> None:
+    async def slow_response(request: web.Request) -> web.Response:
+        await asyncio.sleep(0.05)
+        return web.json_response({"id": "1", "username": "ina"})
+
+    app = web.Application()
+    app.router.add_get("/users/@me", slow_response)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    monkeypatch.setattr(Route, "BASE", f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+    http = HTTPClient()
+    await http.login("token")
+
+    metrics = InteractionMetrics(enabled=True)
+    timer = metrics.start()
+    timer.kind, timer.name = "command", "perk"
+    token = current_interaction_timer.set(timer)
+    try:
+        await http.request(Route("GET", "/users/@me"))  # not counted: the callback hasn't started
+        timer.mark("context")
+        timer.count_http = True
+        await asyncio.sleep(0.02)
+        await http.request(Route("GET", "/users/@me"))
+        timer.mark("callback")
+    finally:
+        current_interaction_timer.reset(token)
+        timer.finish()
+        await http.close()
+        await runner.cleanup()
+
+    phases = {phase: histogram.sum for (_, _, phase), histogram in metrics.histograms.items()}
+    assert phases["http"] == pytest.approx(0.05, abs=0.03)
+    assert phases["callback"] == pytest.approx(0.02, abs=0.015)
+    assert phases["context"] >= 0.05
+    assert phases["total"] >= phases["context"] + phases["callback"] + phases["http"]
+
+    [row] = metrics.summary("http")
+    assert (row["kind"], row["name"], row["count"]) == ("command", "perk", 1)
+    text = metrics.prometheus_text()
+    assert 'interaction_latency_seconds_count{kind="command",command="perk",phase="callback"} 1' in text
+    assert 'interaction_latency_seconds{kind="command",command="perk",phase="total",quantile="0.99"}' in text
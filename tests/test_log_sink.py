@@ -0,0 +1,124 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from interactions import Client, Embed
+from interactions.client.errors import NotFound
+import settings_manager
+from tests.consts import SAMPLE_CHANNEL_DATA, SAMPLE_GUILD_DATA, SAMPLE_MESSAGE_DATA
+from utils import log_sink
+from utils.log_sink import ServerLogSink
+
+__all__ = ()
+
+GUILD_ID = SAMPLE_GUILD_DATA()["id"]
+CHANNEL_ID = SAMPLE_CHANNEL_DATA()["id"]
+
+
+@pytest.fixture
+def bot(monkeypatch) -> Client:
+    bot = Client()
+    bot.cache.place_guild_data(SAMPLE_GUILD_DATA())
+    bot.cache.place_channel_data(SAMPLE_CHANNEL_DATA(guild_id=GUILD_ID))
+    bot.sent = []
+
+    async def create_message(payload, channel_id, files=None) -> dict:
+        bot.sent.append(payload["embeds"])
+        await asyncio.sleep(0.05)  # a rate limited channel
+        return SAMPLE_MESSAGE_DATA(channel_id=str(channel_id), guild_id=GUILD_ID)
+
+    monkeypatch.setattr(bot.http, "create_message", create_message)
+    bot.settings = {GUILD_ID: {"enabled": True, "channel_id": CHANNEL_ID}}
+    monkeypatch.setattr(log_sink, "get_logging_setting", bot.settings.get)
+    return bot
+
+
+@pytest.fixture
+def webhooks(bot: Client, monkeypatch, tmp_path) -> dict:
+    webhooks = {"created": 0, "executed": [], "fail": False}
+
+    async def get_channel_webhooks(channel_id) -> list:
+        return []
+
+    async def create_webhook(channel_id, name: str, avatar=None) -> dict:
+        webhooks["created"] += 1
+        return {"id": "40", "token": "secret", "channel_id": channel_id, "name": name}
+
+    async def execute_webhook(webhook_id, webhook_token: str, payload: dict, **kwargs) -> None:
+        if webhooks["fail"]:
+            raise NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Webhook", 10015)
+        webhooks["executed"].append((webhook_id, webhook_token, payload["embeds"]))
+
+    monkeypatch.setattr(bot.http, "get_channel_webhooks", get_channel_webhooks)
+    monkeypatch.setattr(bot.http, "create_webhook", create_webhook)
+    monkeypatch.setattr(bot.http, "execute_webhook", execute_webhook)
+    monkeypatch.setattr(settings_manager, "LOG_WEBHOOKS_FILE", str(tmp_path / "log_webhooks.json"))
+    return webhooks
+
+
+async def _drained(sink: ServerLogSink) -> None:
+    while sink._guilds:
+        await asyncio.sleep(0.01)
+
+
+async def test_bursts_are_coalesced_into_few_messages(bot: Client) -> None:
+    sink = ServerLogSink(flush_interval=0.1)
+    for i in range(25):
+        sink.log(bot, GUILD_ID, Embed(title=f"event {i}"))
+    sink.log(bot, "1", Embed(title="logging disabled"))
+    await _drained(sink)
+
+    assert [len(embeds) for embeds in bot.sent] == [10, 10, 5]
+    assert [embed["title"] for embeds in bot.sent for embed in embeds] == [f"event {i}" for i in range(25)]
+    assert all(embed["timestamp"] for embeds in bot.sent for embed in embeds)
+    assert sink.stats == {"logged": 25, "messages": 3, "webhook_messages": 0, "dropped": 0, "failed": 0}
+
+
+async def test_batches_fit_discords_message_limits(bot: Client) -> None:
+    sink = ServerLogSink(flush_interval=0.05, max_pending=5)
+    for i in range(8):
+        sink.log(bot, GUILD_ID, Embed(title=f"event {i}", description="x" * 2500))
+    await _drained(sink)
+
+    # the oldest were dropped past max_pending, and two 2500 character embeds fill a message
+    assert [[embed["title"] for embed in embeds] for embeds in bot.sent] == [
+        ["event 3", "event 4"],
+        ["event 5", "event 6"],
+        ["event 7"],
+    ]
+    assert sink.stats["dropped"] == 3
+
+
+async def test_webhook_delivery_is_kept_across_restarts(bot: Client, webhooks: dict) -> None:
+    sink = ServerLogSink(flush_interval=0.05, use_webhooks=True)
+    for i in range(12):
+        sink.log(bot, GUILD_ID, Embed(title=f"event {i}"))
+    await _drained(sink)
+
+    assert [(webhook_id, len(embeds)) for webhook_id, _, embeds in webhooks["executed"]] == [("40", 10), ("40", 2)]
+    assert bot.sent == []
+    assert settings_manager.get_logging_webhook(GUILD_ID) == {"channel_id": CHANNEL_ID, "id": "40", "token": "secret"}
+    assert "webhook" not in bot.settings[GUILD_ID]  # tokens stay out of the git tracked settings
+
+    restarted = ServerLogSink(flush_interval=0.05, use_webhooks=True)
+    restarted.log(bot, GUILD_ID, Embed(title="after the restart"))
+    await _drained(restarted)
+    assert webhooks["created"] == 1
+    assert restarted.stats["webhook_messages"] == 1
+
+
+async def test_failed_webhooks_fall_back_to_the_bot(bot: Client, webhooks: dict) -> None:
+    sink = ServerLogSink(flush_interval=0.05, use_webhooks=True)
+    webhooks["fail"] = True
+    sink.log(bot, GUILD_ID, Embed(title="deleted webhook"))
+    await _drained(sink)
+
+    assert [[embed["title"] for embed in embeds] for embeds in bot.sent] == [["deleted webhook"]]
+    assert settings_manager.get_logging_webhook(GUILD_ID) is None
+
+    webhooks["fail"] = False
+    sink.log(bot, GUILD_ID, Embed(title="new webhook"))
+    await _drained(sink)
+    assert webhooks["created"] == 2
+    assert sink.stats["messages"] == 1 and sink.stats["webhook_messages"] == 1
@@ -0,0 +1,92 @@
+import asyncio
+import math
+import time
+
+import pytest
+
+from common_utils import CalculationError, evaluate_expression
+from utils import offload
+from utils.offload import OffloadLimitExceeded, OffloadPool, OffloadQueueFull
+
+__all__ = ()
+
+needs_limits = pytest.mark.skipif(
+    offload.resource is None or not offload._FORK_TASKS, reason="needs os.fork and resource"
+)
+
+
+@pytest.fixture
+async def pool():
+    pool = OffloadPool(workers=1, max_queue=1)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+async def test_results_and_exceptions_come_back(pool: OffloadPool) -> None:
+    assert await pool.run(evaluate_expression, "sqrt(16) + factorial(5)") == "124.0"
+    with pytest.raises(ValueError, match="math domain error"):
+        await pool.run(math.sqrt, -1)
+    with pytest.raises(CalculationError):
+        await pool.run(evaluate_expression, "__import__('os')")
+    assert pool.stats["completed"] == 1 and pool.stats["failed"] == 2
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "[c for c in ().__class__.__base__.__subclasses__() if c.__name__=='_wrap_close'][0]"
+        ".__init__.__globals__['system']('id')",
+        "sqrt.__self__",
+        "(1).__class__",
+        "'spell' * 3",
+        "factorial(n=3)",
+        "9**9**9",
+    ],
+)
+def test_calculate_only_evaluates_arithmetic(expression: str) -> None:
+    with pytest.raises(CalculationError):
+        evaluate_expression(expression)
+    assert evaluate_expression("-2**10 + pi // 1 * comb(5, 2)") == "-994.0"
+
+
+@needs_limits
+@pytest.mark.parametrize(
+    ("func", "args", "limit"),
+    [(evaluate_expression, ("factorial(10**8)",), "CPU time"), (bytearray, (10**9,), "memory")],
+)
+async def test_abusive_tasks_are_killed(pool: OffloadPool, func, args: tuple, limit: str) -> None:
+    started = time.perf_counter()
+    with pytest.raises(OffloadLimitExceeded) as e:
+        await pool.run(func, *args, cpu_seconds=1)
+    assert e.value.limit == limit
+    assert time.perf_counter() - started < 5
+    # Only the task's process died, the worker takes the next task
+    assert await pool.run(evaluate_expression, "2**10") == "1024"
+    assert pool.stats["killed"] == 1
+
+
+async def test_timeouts_and_cancelled_callers_free_the_worker(pool: OffloadPool) -> None:
+    with pytest.raises(OffloadLimitExceeded) as e:
+        await pool.run(time.sleep, 10, timeout=0.2)
+    assert e.value.limit == "time"
+
+    task = asyncio.create_task(pool.run(time.sleep, 10))
+    await asyncio.sleep(0.2)
+    assert pool.busy == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert await asyncio.wait_for(pool.run(abs, -1), 5) == 1
+    assert pool.stats["cancelled"] == 1
+
+
+async def test_full_queue_turns_tasks_away(pool: OffloadPool) -> None:
+    running = asyncio.create_task(pool.run(time.sleep, 0.3))
+    queued = asyncio.create_task(pool.run(abs, -2))
+    await asyncio.sleep(0.1)
+    assert (pool.busy, pool.queued) == (1, 1)
+    with pytest.raises(OffloadQueueFull):
+        await pool.run(abs, -3)
+    assert await asyncio.gather(running, queued) == [None, 2]
+    assert pool.stats["rejected"] == 1
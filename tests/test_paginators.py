@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import pytest
+
+from interactions import Embed
+from interactions.client.client import Client
+from interactions.ext.paginators import Paginator, PaginatorRouter
+
+__all__ = ()
+
+
+def _custom_ids(message: dict) -> dict:
+    ids = [component["custom_id"] for row in message["components"] for component in row["components"]]
+    return {custom_id.rsplit("|", 1)[1]: custom_id for custom_id in ids}
+
+
+def _press(custom_id: str, author_id: int = 42) -> SimpleNamespace:
+    async def edit_origin(**kwargs) -> None:
+        ctx.edited = kwargs
+
+    async def send(content, ephemeral=False) -> None:
+        ctx.sent = content
+
+    ctx = SimpleNamespace(
+        custom_id=custom_id, author=SimpleNamespace(id=author_id), message=None, values=[], edited=None, sent=None
+    )
+    ctx.edit_origin, ctx.send = edit_origin, send
+    return ctx
+
+
+async def test_stateless_paginators_share_one_callback_and_a_bounded_store() -> None:
+    bot = Client()
+    callbacks = len(bot._component_callbacks) + len(bot._regex_component_callbacks)
+    router = PaginatorRouter.for_client(bot)
+    router.max_entries = 100
+    for i in range(500):
+        Paginator.create_from_list(bot, [f"line {i}.{n}" for n in range(50)], page_size=100, stateless=True)
+
+    assert len(bot._component_callbacks) + len(bot._regex_component_callbacks) == callbacks + 1
+    assert len(router) == 100
+    assert PaginatorRouter.for_client(bot) is router
+
+    Paginator(bot, pages=[Embed(title="a"), Embed(title="b")])  # the stateful mode still registers its own
+    assert len(bot._component_callbacks) == 6
+
+
+async def test_router_pages_from_the_custom_id() -> None:
+    bot = Client()
+    paginator = Paginator.create_from_embeds(bot, *(Embed(title=str(i)) for i in range(5)), stateless=True)
+    paginator._author_id = 42
+    ids = _custom_ids(paginator.to_dict())
+    router = PaginatorRouter.for_client(bot)
+
+    ctx = _press(ids["next"])
+    await router._on_component(ctx)
+    assert ctx.edited["embeds"][0]["title"] == "1"
+    ctx = _press(_custom_ids(ctx.edited)["last"])
+    await router._on_component(ctx)
+    assert ctx.edited["embeds"][0]["title"] == "4"
+    assert paginator.page_index == 0  # the stored paginator keeps no per-message state
+
+    ctx = _press(ids["next"], author_id=7)
+    await router._on_component(ctx)
+    assert (ctx.edited, ctx.sent) == (None, "This paginator is not for you")
+
+    router.discard(paginator.content_key)
+    ctx = _press(ids["next"])
+    await router._on_component(ctx)
+    assert ctx.edited == {"components": []}
+
+
+async def test_sources_recreate_pages_on_demand() -> None:
+    bot = Client()
+    titles = ["a", "b"]
+
+    async def source(argument: str) -> Paginator:
+        return Paginator.create_from_embeds(
+            bot, *(Embed(title=f"{argument}{t}") for t in titles), stateless=True, content_key=f"letters:{argument}"
+        )
+
+    router = PaginatorRouter.for_client(bot)
+    router.register_source("letters", source)
+    paginator = await source("x")
+    assert len(router) == 0
+
+    titles.append("c")
+    ctx = _press(_custom_ids(paginator.to_dict())["last"], author_id=0)
+    await router._on_component(ctx)
+    assert ctx.edited["embeds"][0]["title"] == "xc"
+    assert ctx.edited["embeds"][0]["footer"]["text"] == "Page 3/3"
+
+
+async def test_content_keys_must_fit_the_custom_id() -> None:
+    bot = Client()
+    router = PaginatorRouter.for_client(bot)
+
+    async def source(argument: str) -> Paginator:
+        return Paginator.create_from_embeds(
+            bot, Embed(title=argument), Embed(title="b"), stateless=True, content_key=f"tag:{argument}"
+        )
+
+    router.register_source("tag", source)
+    paginator = await source("x:y")  # the router splits off page index, author and action from the end
+    ctx = _press(_custom_ids(paginator.to_dict())["last"], author_id=0)
+    await router._on_component(ctx)
+    assert ctx.edited["embeds"][0]["footer"]["text"] == "Page 2/2"
+
+    for content_key in ("tag:a|b", "tag:" + "x" * 100):
+        with pytest.raises(ValueError, match="content_key"):
+            Paginator.create_from_embeds(bot, Embed(title="a"), stateless=True, content_key=content_key)
@@ -0,0 +1,43 @@
+import pytest
+
+from utils.perk_scaler import PerkExpressionError, compile_perk_expression, compile_perk_template, scale_value_with_gs
+
+__all__ = ()
+
+
+def test_both_placeholder_styles_scale_with_gear_score() -> None:
+    assert scale_value_with_gs("+{[0.05 * 100 * {perkMultiplier}]}% damage") == "+7.25% damage"
+    assert scale_value_with_gs("+${5 * perkMultiplier}% damage", gear_score=600) == "+6% damage"
+    assert scale_value_with_gs("Heals {[2.0]} health") == "Heals 2.9 health"  # a bare base value scales too
+    assert scale_value_with_gs("Lasts ${3} seconds") == "Lasts 3 seconds"
+    assert scale_value_with_gs("No placeholders") == "No placeholders"
+    assert scale_value_with_gs(None) is None
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["__import__('os').system('true')", "perkMultiplier.real", "(1).__class__", "x * 2", "[1][0]", "2 ** 8"],
+)
+def test_anything_outside_the_whitelist_is_rejected(expression) -> None:
+    with pytest.raises(PerkExpressionError):
+        compile_perk_expression(expression)
+    assert scale_value_with_gs(f"{{[{expression}]}}") == f"[EVAL_ERROR: {expression}]"
+
+
+def test_expressions_are_compiled_once_and_rendered_many_times() -> None:
+    text = "Deal {[0.024 * {perkMultiplier}]} more and ${max(1, 0.5 * perkMultiplier)} extra, ${1 / 0} never"
+    template = compile_perk_template(text)
+    assert compile_perk_template(text) is template
+    assert template.has_scaling
+    assert template.render(500) == "Deal 0.024 more and 1 extra, [EVAL_ERROR: 1 / 0] never"
+    assert template.scaling_table([500, 725]) == [["500", "0.024", "1"], ["725", "0.035", "1"]]
+    assert compile_perk_expression("abs(-2) + round(1.26, 1) % 1")(1.0) == pytest.approx(2.3)
+    assert not compile_perk_template("Lasts ${3} seconds").has_scaling
+
+
+def test_precomputed_values_are_used_when_they_match_the_template() -> None:
+    template = compile_perk_template("+{[0.05 * 100 * {perkMultiplier}]}% for ${2 * 3}s")
+    precomputed = {500: [5.0, 6], 725: [7.25, 6], 600: [1.0]}  # 600 was stored for an older description
+    assert template.render(725, precomputed=precomputed) == "+7.25% for 6s"
+    assert template.render(600, precomputed=precomputed) == "+6% for 6s"
+    assert template.scaling_table([500, 700], precomputed) == [["500", "5"], ["700", "7"]]
@@ -0,0 +1,32 @@
+import re
+
+from interactions.client.utils import RegexRoutes, literal_prefix
+
+__all__ = ()
+
+
+def test_literal_prefix() -> None:
+    assert literal_prefix(re.compile(r"^paginator\|(\w+)")) == "paginator|"
+    assert literal_prefix(re.compile(r"poll:\d+")) == "poll:"
+    assert literal_prefix(re.compile(r"ab*c")) == "a"
+    assert literal_prefix(re.compile(r"poll|vote")) == ""
+    assert literal_prefix(re.compile(r"(\d+)-vote")) == ""
+    assert literal_prefix(re.compile(r"poll:", re.IGNORECASE)) == ""
+
+
+def test_first_registered_match_wins() -> None:
+    routes = RegexRoutes()
+    routes[re.compile(r"poll:\d+:yes")] = "yes"
+    routes[re.compile(r"(\w+):\d+")] = "any"
+    routes[re.compile(r"poll:\d+")] = "poll"
+    routes[re.compile(r"po")] = "po"
+
+    assert routes.match("poll:1:yes") == "yes"
+    assert routes.match("poll:1:no") == "any"
+    assert routes.match("pony") == "po"
+    assert routes.match("p") is None
+
+    routes.pop(re.compile(r"(\w+):\d+"))
+    assert routes.match("poll:1:no") == "poll"
+    routes.clear()
+    assert routes.match("poll:1:no") is None
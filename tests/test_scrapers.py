@@ -0,0 +1,165 @@
+import asyncio
+import csv
+import hashlib
+import json
+
+import pytest
+from aiohttp import web
+
+from nwdb_scraper import ScrapeEngine
+from scrape_items import scrape_nwdb_items_async
+from scrape_perks import scrape_nwdb_perks_async
+
+__all__ = ()
+
+PAGE_COUNT = 4
+
+
+def _item_page(page_num: int) -> dict:
+    return {
+        "success": True,
+        "pageCount": PAGE_COUNT,
+        "data": [
+            {"id": f"item_{page_num}_{i}", "name": f"Item {page_num}-{i}", "description": "A <br>thing", "perks": []}
+            for i in range(3)
+        ],
+    }
+
+
+def _perk_page(page_num: int) -> dict:
+    return {
+        "success": True,
+        "pageCount": 2,
+        "data": [
+            # Complete entry, no HTML fallback needed
+            {
+                "id": f"perk_{page_num}_full",
+                "name": f"Keen {page_num}",
+                "description": "Gain ${0.02 * perkMultiplier} crit chance.",
+                "perkType": "Generated",
+                "condition": "Always",
+                "itemClass": ["Melee"],
+                "exclusiveLabel": "Keen",
+            },
+            # Incomplete entry, details come from /db/perk/<id>
+            {"id": f"perk_{page_num}_html", "name": f"Empower {page_num}", "description": "Empowered."},
+        ],
+    }
+
+
+PERK_HTML = """
+<div class="item-name"><h1>Empower</h1><div><span>Perk</span><span>Weapon Perk</span></div></div>
+<div class="panel-item-details-content">
+  <span class="stat-name">Condition:</span><span class="stat-value">On Hit</span>
+  <span class="stat-name">Compatible With:</span><span class="stat-value">Weapons</span>
+  <span class="stat-name">Exclusive Labels:</span><span class="stat-value">Empower</span>
+</div>
+"""
+
+
+class FakeNwdb:
+    """Serves canned nwdb.info pages with ETag support and records what was asked of it."""
+
+    def __init__(self) -> None:
+        self.pages = {}
+        self.hits = []
+        self.not_modified = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.hits.append(request.path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            body, content_type = self.pages[request.path]
+        except KeyError:
+            raise web.HTTPNotFound() from None
+        finally:
+            self.in_flight -= 1
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type=content_type, headers={"ETag": etag})
+
+
+@pytest.fixture()
+async def fake_nwdb():
+    fake = FakeNwdb()
+    for page_num in range(1, PAGE_COUNT + 1):
+        fake.pages[f"/db/items/page/{page_num}.json"] = (json.dumps(_item_page(page_num)).encode(), "application/json")
+    for page_num in range(1, 3):
+        fake.pages[f"/db/perks/page/{page_num}.json"] = (json.dumps(_perk_page(page_num)).encode(), "application/json")
+        fake.pages[f"/db/perk/perk_{page_num}_html"] = (PERK_HTML.encode(), "text/html")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", fake.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    fake.base_url = f"http://127.0.0.1:{port}"
+    yield fake
+    await runner.cleanup()
+
+
+async def test_items_scrape_and_incremental_refresh(fake_nwdb: FakeNwdb, tmp_path) -> None:
+    kwargs = {
+        "base_url": fake_nwdb.base_url,
+        "output_csv": str(tmp_path / "items.csv"),
+        "output_json": str(tmp_path / "items.json"),
+        "cache_path": str(tmp_path / "cache.json"),
+        "max_concurrency": 2,
+        "requests_per_second": 1000,
+    }
+    assert await scrape_nwdb_items_async(**kwargs) == PAGE_COUNT * 3
+    assert fake_nwdb.max_in_flight == 2
+    with open(kwargs["output_csv"], encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["Item ID"] for row in rows[:3]] == ["item_1_0", "item_1_1", "item_1_2"]
+    assert rows[0]["Description"] == "A\nthing"
+
+    # Second run: every page is answered with a 304 and the output is rebuilt from the cache
+    fake_nwdb.hits.clear()
+    assert await scrape_nwdb_items_async(**kwargs) == PAGE_COUNT * 3
+    assert fake_nwdb.not_modified == PAGE_COUNT
+    with open(kwargs["output_json"], encoding="utf-8") as f:
+        assert len(json.load(f)) == PAGE_COUNT * 3
+
+    # Only the changed page is re-parsed
+    changed = _item_page(3)
+    changed["data"][0]["name"] = "Renamed"
+    fake_nwdb.pages["/db/items/page/3.json"] = (json.dumps(changed).encode(), "application/json")
+    await scrape_nwdb_items_async(**kwargs)
+    assert fake_nwdb.not_modified == PAGE_COUNT * 2 - 1
+    with open(kwargs["output_json"], encoding="utf-8") as f:
+        assert "Renamed" in {item["Name"] for item in json.load(f)}
+
+
+async def test_perks_scrape_with_html_fallback(fake_nwdb: FakeNwdb, tmp_path) -> None:
+    kwargs = {
+        "base_url": fake_nwdb.base_url,
+        "output_csv": str(tmp_path / "perks.csv"),
+        "cache_path": str(tmp_path / "cache.json"),
+        "requests_per_second": 1000,
+    }
+    assert await scrape_nwdb_perks_async(**kwargs) == 4
+    with open(kwargs["output_csv"], encoding="utf-8") as f:
+        rows = {row["id"]: row for row in csv.DictReader(f)}
+    assert rows["perk_1_html"]["PerkType"] == "Weapon Perk"
+    assert rows["perk_1_html"]["ConditionText"] == "On Hit"
+    assert rows["perk_2_full"]["ConditionText"] == "Always"
+    assert fake_nwdb.hits.count("/db/perk/perk_1_html") == 1
+
+    # Unchanged pages skip the per-perk HTML requests entirely
+    fake_nwdb.hits.clear()
+    assert await scrape_nwdb_perks_async(**kwargs) == 4
+    assert not [hit for hit in fake_nwdb.hits if hit.startswith("/db/perk/")]
+
+
+def test_engine_needs_at_least_one_attempt(tmp_path) -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        ScrapeEngine(retries=0, cache_path=str(tmp_path / "cache.json"))
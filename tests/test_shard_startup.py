@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from interactions.api.http.route import Route
+from interactions.client.auto_shard_client import AutoShardedClient, IdentifyScheduler
+from tests.utils import FakeDiscord
+
+__all__ = ()
+
+
+async def _identify_times(scheduler: IdentifyScheduler, shard_ids: list) -> dict:
+    started = time.perf_counter()
+    times = {}
+
+    async def identify(shard_id: int) -> None:
+        await scheduler.wait(shard_id)
+        times[shard_id] = time.perf_counter() - started
+
+    await asyncio.gather(*(identify(shard_id) for shard_id in shard_ids))
+    return times
+
+
+async def test_one_identify_per_rate_limit_key_and_interval() -> None:
+    scheduler = IdentifyScheduler(max_concurrency=2, interval=0.2)
+    times = await _identify_times(scheduler, [0, 1, 2, 3, 4, 5])
+
+    assert max(times[0], times[1]) < 0.1  # both keys identify right away
+    for a, b in [(0, 2), (2, 4), (1, 3), (3, 5)]:
+        assert times[b] - times[a] >= 0.19
+    assert times[5] < 0.55
+
+
+async def test_used_up_session_start_limit_is_waited_out() -> None:
+    scheduler = IdentifyScheduler(interval=0)
+    scheduler.configure({"total": 1000, "remaining": 1, "reset_after": 300, "max_concurrency": 4})
+    times = await _identify_times(scheduler, [0, 1])
+
+    assert sorted(times.values())[1] >= 0.29
+    assert scheduler.remaining == 999
+
+
+async def test_shards_start_in_parallel_and_report_cold_start_times(monkeypatch) -> None:
+    fake = FakeDiscord(shards=4, max_concurrency=2)
+    monkeypatch.setattr(Route, "BASE", await fake.start())
+    client = AutoShardedClient(total_shards=4)
+    client.identify_scheduler.interval = 0.3
+    running = asyncio.create_task(client.astart("token"))
+    try:
+        deadline = time.monotonic() + 20
+        while len(client.cold_start_times) < 4 and time.monotonic() < deadline:
+            assert not running.done()
+            await asyncio.sleep(0.05)
+
+        assert sorted(client.cold_start_times) == [0, 1, 2, 3]
+        assert client.max_start_concurrency == 2
+        identified = dict(fake.identifies)
+        assert abs(identified[0] - identified[1]) < 0.2
+        assert identified[2] - identified[0] >= 0.29
+        assert identified[3] - identified[1] >= 0.29
+        # the sequential start waited for READY plus 5.1s between shards
+        assert max(client.cold_start_times.values()) < 2
+    finally:
+        await client.stop()
+        await asyncio.wait_for(running, 10)
+        await fake.close()
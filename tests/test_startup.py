@@ -0,0 +1,72 @@
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+import db_utils
+from utils.startup import StartupTimeline, import_extensions
+
+__all__ = ()
+
+
+def test_timeline_report_lists_phases_in_start_order() -> None:
+    timeline = StartupTimeline()
+    now = time.perf_counter()
+    timeline.record("command sync", now + 1.5, now + 2.0)
+    timeline.record("game data", now, now + 2.0)
+    with timeline.phase("load extensions"):
+        pass
+
+    lines = timeline.report().splitlines()
+    assert lines[0].startswith("Startup timeline (2.0")
+    assert [line.split()[0] for line in lines[1:]] == ["game", "load", "command"]
+    assert "|" + "#" * 30 + "|" in lines[1]
+
+
+async def test_import_extensions_reports_failures(tmp_path, monkeypatch) -> None:
+    (tmp_path / "ext_ok.py").write_text("VALUE = 1\n")
+    (tmp_path / "ext_broken.py").write_text("raise RuntimeError('broken')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    timeline = StartupTimeline()
+
+    failed = await import_extensions(["ext_ok", "ext_broken"], timeline)
+    assert list(failed) == ["ext_broken"]
+    assert sys.modules["ext_ok"].VALUE == 1
+    assert timeline.phases[0][0] == "import extensions"
+    sys.modules.pop("ext_ok")
+
+
+async def test_data_commands_are_held_until_the_game_data_is_ready(monkeypatch) -> None:
+    monkeypatch.setattr(db_utils, "_game_data_ready", asyncio.Event())
+    deferred = []
+
+    async def defer(**kwargs) -> None:
+        deferred.append(kwargs)
+        ctx.deferred = True
+
+    ctx = SimpleNamespace(deferred=False, responded=False, invoke_target="perk", defer=defer)
+    check = asyncio.create_task(db_utils.game_data_check(ctx))
+    await asyncio.sleep(0.01)
+    assert deferred == [{}]
+    assert not check.done()
+
+    db_utils.set_game_data_ready()
+    assert await check is True
+    assert db_utils.is_game_data_ready()
+    assert await db_utils.game_data_check(ctx) is True
+    assert len(deferred) == 1
+
+
+async def test_autocompletes_do_not_answer_before_the_game_data_is_ready(monkeypatch) -> None:
+    monkeypatch.setattr(db_utils, "_game_data_ready", asyncio.Event())
+    answered = []
+
+    @db_utils.game_data_autocomplete
+    async def autocomplete(extension: object, ctx: object) -> None:
+        answered.append(ctx)
+
+    assert await autocomplete(None, "early") is None
+    db_utils.set_game_data_ready()
+    await autocomplete(None, "ready")
+    assert answered == ["ready"]
+    assert autocomplete.__name__ == "autocomplete"
@@ -0,0 +1,54 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from interactions.api.events import MessageCreate
+from interactions.client.client import Client
+from interactions.ext.prefixed_commands import PrefixTrie
+
+__all__ = ()
+
+
+def _message_create(message_id: int, channel_id: int = 1) -> MessageCreate:
+    return MessageCreate(message=SimpleNamespace(id=message_id, _channel_id=channel_id, _author_id=None))
+
+
+async def test_keyed_waits_only_see_their_own_events() -> None:
+    bot = Client()
+    checked = []
+
+    def check(event) -> bool:
+        checked.append(event.message.id)
+        return True
+
+    waits = [bot.wait_for(MessageCreate, checks=check, timeout=1, key=("message_id", str(i))) for i in range(100)]
+    channel_wait = bot.wait_for(MessageCreate, timeout=1, key=("channel_id", 7))
+    await bot._process_waits(_message_create(42))
+    await bot._process_waits(_message_create(1000, channel_id=7))
+
+    assert (await waits[42]).message.id == 42
+    assert (await channel_wait).message.id == 1000
+    assert checked == [42]  # none of the other 99 checks ran
+    assert len(bot.keyed_waits["message_create"]["message_id"]) == 99
+    assert "channel_id" not in bot.keyed_waits["message_create"]
+
+    # timed out waits clean up after themselves
+    with pytest.raises(asyncio.TimeoutError):
+        await bot.wait_for(MessageCreate, timeout=0.01, key=("message_id", 12345))
+    await asyncio.sleep(0)
+    assert 12345 not in bot.keyed_waits["message_create"]["message_id"]
+    for wait in waits:
+        wait.close()
+    with pytest.raises(ValueError):
+        bot.wait_for(MessageCreate, key=("guild_id", 1))
+
+
+def test_prefix_trie_keeps_the_order_of_precedence() -> None:
+    trie = PrefixTrie(["!", "", "!!", "ina ", "<@1> "])
+    assert trie.match("!!help") == "!"
+    assert trie.match("ina help") == "ina "
+    assert trie.match("in") is None
+    assert trie.match("<@1> help") == "<@1> "
+    assert PrefixTrie(["!!", "!"]).match("!!help") == "!!"
+    assert PrefixTrie.for_prefixes(("?",)) is PrefixTrie.for_prefixes(("?",))
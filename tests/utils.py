@@ -1,9 +1,16 @@
+import time
+import zlib
+from typing import ClassVar
+
+from aiohttp import WSMsgType, web
+
 from interactions import Snowflake_Type, Client, Message
+from interactions.client.utils.input_utils import FastJson
 from interactions.models.internal.context import InteractionContext
 from tests.consts import SAMPLE_MESSAGE_DATA
 from interactions.ext.prefixed_commands import PrefixedContext
 
-__all__ = ("generate_dummy_context",)
+__all__ = ("FakeDiscord", "generate_dummy_context")
 
 
 def generate_dummy_context(
@@ -26,3 +33,143 @@ def generate_dummy_context(
     message = SAMPLE_MESSAGE_DATA(user_id=user_id, channel_id=channel_id, message_id=message_id, guild_id=guild_id)
 
     return PrefixedContext.from_message(client, Message.from_dict(message, client))
+
+
+def _json(data) -> web.Response:
+    # exactly the content type discord sends, aiohttp's json_response appends a charset
+    return web.Response(body=FastJson.dumps(data).encode(), headers={"Content-Type": "application/json"})
+
+
+class FakeDiscord:
+    """Just enough REST and gateway (zlib-stream, HELLO, IDENTIFY -> READY + GUILD_CREATE, RESUME, heartbeats) to run shards."""
+
+    USER: ClassVar[dict] = {
+        "id": "100",
+        "username": "bot",
+        "discriminator": "0",
+        "avatar": None,
+        "bot": True,
+        "verified": True,
+    }
+
+    def __init__(self, shards: int = 1, guilds_per_shard: int = 2, max_concurrency: int = 1) -> None:
+        self.shards = shards
+        self.guilds_per_shard = guilds_per_shard
+        self.max_concurrency = max_concurrency
+        self.url = None
+        self.identifies: list[tuple[int, float]] = []
+        self.resumes: list[tuple[str, int]] = []  # (session_id, sequence)
+        self.sessions: dict[str, int] = {}  # resumable session ID -> last sequence sent
+        self.close_codes: list[int] = []
+        self._runner = None
+
+    async def start(self) -> str:
+        """Serve on a free local port, returns the base url to use as `Route.BASE`."""
+        app = web.Application()
+        app.router.add_get("/users/@me", self.users_me)
+        app.router.add_get("/oauth2/applications/@me", self.application)
+        app.router.add_get("/gateway/bot", self.gateway_bot)
+        app.router.add_get("/gateway", self.gateway)
+        app.router.add_get("/ws", self.websocket)
+        app.router.add_route("*", "/{tail:.*}", self.anything)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/ws"
+        return f"http://127.0.0.1:{port}"
+
+    async def close(self) -> None:
+        await self._runner.cleanup()
+
+    async def users_me(self, request: web.Request) -> web.Response:
+        return _json(self.USER)
+
+    async def application(self, request: web.Request) -> web.Response:
+        owner = {"id": "1", "username": "owner", "discriminator": "0", "avatar": None}
+        return _json(
+            {
+                "id": "100",
+                "name": "bot",
+                "description": "",
+                "summary": "",
+                "bot_public": True,
+                "bot_require_code_grant": False,
+                "flags": 0,
+                "owner": owner,
+            }
+        )
+
+    async def gateway_bot(self, request: web.Request) -> web.Response:
+        limit = {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": self.max_concurrency}
+        return _json({"url": self.url, "shards": self.shards, "session_start_limit": limit})
+
+    async def gateway(self, request: web.Request) -> web.Response:
+        return _json({"url": self.url})
+
+    async def anything(self, request: web.Request) -> web.Response:
+        return _json([] if request.method == "GET" else {})
+
+    async def websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        compressor = zlib.compressobj()
+
+        async def send(payload: dict) -> None:
+            data = compressor.compress(FastJson.dumps(payload).encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            await ws.send_bytes(data)
+
+        session_id = None
+        await send({"op": 10, "d": {"heartbeat_interval": 200}})
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            payload = FastJson.loads(msg.data)
+            if payload["op"] == 1:
+                await send({"op": 11})
+            elif payload["op"] == 6:
+                self.resumes.append((payload["d"]["session_id"], payload["d"]["seq"]))
+                if payload["d"]["session_id"] in self.sessions:
+                    session_id = payload["d"]["session_id"]
+                    self.sessions[session_id] += 1
+                    await send({"op": 0, "t": "RESUMED", "s": self.sessions[session_id], "d": {}})
+                else:
+                    await send({"op": 9, "d": False})
+            elif payload["op"] == 2:
+                shard_id, total = payload["d"]["shard"]
+                self.identifies.append((shard_id, time.monotonic()))
+                guild_ids = [str((shard_id + total * k) << 22) for k in range(1, self.guilds_per_shard + 1)]
+                ready = {
+                    "v": 10,
+                    "user": self.USER,
+                    "guilds": [{"id": guild_id, "unavailable": True} for guild_id in guild_ids],
+                    "session_id": f"session-{shard_id}-{len(self.identifies)}",
+                    "resume_gateway_url": self.url,
+                    "shard": [shard_id, total],
+                    "application": {"id": "100", "flags": 0},
+                }
+                await send({"op": 0, "t": "READY", "s": 1, "d": ready})
+                for seq, guild_id in enumerate(guild_ids, start=2):
+                    guild = {
+                        "id": guild_id,
+                        "name": f"guild {guild_id}",
+                        "owner_id": "1",
+                        "roles": [],
+                        "emojis": [],
+                        "features": [],
+                        "channels": [],
+                        "threads": [],
+                        "members": [],
+                        "member_count": 1,
+                        "joined_at": "2024-01-01T00:00:00+00:00",
+                        "preferred_locale": "en-US",
+                    }
+                    await send({"op": 0, "t": "GUILD_CREATE", "s": seq, "d": guild})
+                session_id = ready["session_id"]
+                self.sessions[session_id] = len(guild_ids) + 1
+        # like discord, closing with 1000 ends the session
+        self.close_codes.append(ws.close_code)
+        if ws.close_code == 1000 and session_id:
+            self.sessions.pop(session_id, None)
+        return ws
@@ -27,8 +27,8 @@ if (Test-Path "requirements.txt") {
 }
 
 # --- Run create_db.py ---
-Write-Host "Running create_db.py to update database..."
-& $PythonExecutable create_db.py 
+Write-Host "Running create_db.py --refresh to update database..."
+& $PythonExecutable create_db.py --refresh
 if ($LASTEXITCODE -ne 0) {
     Write-Error "create_db.py failed. Aborting."
     exit 1
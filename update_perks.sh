@@ -24,9 +24,9 @@ else
     exit 1
 fi
 
-# Run create_db.py to populate the database from perks_buddy.csv
-echo "Attempting to update database from perks_buddy.csv using 'python3 create_db.py'..."
-python3 create_db.py
+# Run create_db.py to refresh the database in place from perks_buddy.csv (only changed rows are written)
+echo "Attempting to update database from perks_buddy.csv using 'python3 create_db.py --refresh'..."
+python3 create_db.py --refresh
 echo "Database population script (create_db.py) completed successfully."
 
 # Ensure VERSION file exists and read version
@@ -1,7 +1,17 @@
+import asyncio
+import hashlib
 import io
 import logging
-import requests
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+import aiohttp
 from PIL import Image, ImageDraw
+from interactions.api.http.cdn_cache import CDNCache
+from interactions.client.utils import SingleFlight
 
 # Animation parameters (based on common PetPet implementations)
 AVATAR_BASE_SIZE = (112, 112)  # The size the input avatar will be resized to initially
@@ -22,80 +32,194 @@ AVATAR_DEFORM_PARAMS = {
 }
 # Adjusted y & h values slightly for better visual based on common generators
 
-HAND_IMAGE_PATHS = [f"assets/hand{i}.png" for i in range(5)]
-HAND_IMAGE_PATHS = [f"assets/pet{i}.gif" for i in range(5)] # Updated to use petX.gif
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+HAND_IMAGE_PATHS = [os.path.join(ASSETS_DIR, f"pet{i}.gif") for i in range(5)] # petX.gif overlays, one per hand state
 
-async def generate_petpet_gif(avatar_url: str) -> io.BytesIO | None:
+PETPET_WORKERS = 2 # Rendering processes, the GIFs are CPU bound
+PETPET_CACHE_SIZE = 128 # Finished GIFs kept in memory, a few dozen KB each
+
+AVATAR_DOWNLOAD_TIMEOUT = 10
+# Avatars passed by URL (Discord assets normally come through bot.http.cdn_cache via Asset.fetch instead)
+avatar_cache = CDNCache(max_bytes=8 * 1024 * 1024)
+
+async def _download_image(url: str) -> bytes:
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=AVATAR_DOWNLOAD_TIMEOUT)) as session:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.read()
+
+async def fetch_avatar_bytes(avatar_url: str) -> bytes:
+    """Downloads an image without blocking the event loop, cached by URL path and size."""
+    return await avatar_cache.get(CDNCache.key_for_url(avatar_url), lambda: _download_image(avatar_url))
+
+def load_hand_frames() -> List[bytes]:
+    """
+    Loads the hand overlays once, converted to RGBA and resized to the canvas.
+    Returned as PNG bytes so they can be handed to the worker processes.
+    """
+    frames = []
+    for path in HAND_IMAGE_PATHS:
+        hand_img = Image.open(path).convert("RGBA")
+        if hand_img.size != CANVAS_SIZE: # Ensure hands are also 112x112
+            hand_img = hand_img.resize(CANVAS_SIZE, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        hand_img.save(buffer, format="PNG")
+        frames.append(buffer.getvalue())
+    return frames
+
+def decode_hand_frames(frames: List[bytes]) -> List[Image.Image]:
+    images = []
+    for frame in frames:
+        image = Image.open(io.BytesIO(frame))
+        image.load()
+        images.append(image)
+    return images
+
+# Set in each worker process by _init_worker
+_worker_hand_images: Optional[List[Image.Image]] = None
+
+def _init_worker(hand_frames: List[bytes]):
+    global _worker_hand_images
+    _worker_hand_images = decode_hand_frames(hand_frames)
+
+def _warm_up():
+    return None
+
+def render_petpet(avatar_bytes: bytes, hand_images: Optional[List[Image.Image]] = None) -> bytes:
+    """
+    Renders the petpet GIF for an avatar image. CPU bound: runs in a worker process, where the
+    hand images come from _init_worker.
+    """
+    hand_images = hand_images or _worker_hand_images
+    base_avatar_img = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA")
+    base_avatar_img = base_avatar_img.resize(AVATAR_BASE_SIZE, Image.Resampling.LANCZOS)
+
+    # Every hand state but the first and last appears twice in a cycle, deform the avatar once per state
+    squished_avatars = {
+        hand_idx: base_avatar_img.resize((params["w"], params["h"]), Image.Resampling.LANCZOS)
+        for hand_idx, params in AVATAR_DEFORM_PARAMS.items()
+    }
+
+    output_frames = []
+    for hand_idx_for_cycle in ANIMATION_HAND_INDICES:
+        deform_params = AVATAR_DEFORM_PARAMS[hand_idx_for_cycle]
+        frame_canvas = Image.new("RGBA", CANVAS_SIZE, (0, 0, 0, 0))
+        squished_avatar = squished_avatars[hand_idx_for_cycle]
+        frame_canvas.paste(squished_avatar, (deform_params["x"], deform_params["y"]), squished_avatar)
+        # Hand images are 112x112 and pre-positioned, so paste at (0,0)
+        current_hand_image = hand_images[hand_idx_for_cycle]
+        frame_canvas.paste(current_hand_image, (0, 0), current_hand_image)
+        output_frames.append(frame_canvas)
+
+    gif_bytesio = io.BytesIO()
+    output_frames[0].save(
+        gif_bytesio, format="GIF", save_all=True, append_images=output_frames[1:],
+        duration=FRAME_DURATION_MS, loop=0, transparency=0, disposal=2 # disposal=2 means restore background
+    )
+    return gif_bytesio.getvalue()
+
+class PetPetRenderer:
+    """
+    Renders petpet GIFs in a process pool, so the event loop never stalls on PIL work,
+    and keeps the most recently rendered GIFs by avatar hash.
+    With workers=0 (or if the pool breaks) rendering falls back to a thread.
+    """
+
+    def __init__(self, workers: int = PETPET_WORKERS, cache_size: int = PETPET_CACHE_SIZE):
+        self.workers = workers
+        self.cache_size = cache_size
+        self.stats = {"renders": 0, "cache_hits": 0, "coalesced": 0, "render_seconds": 0.0}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._hand_frames: Optional[List[bytes]] = None
+        self._hand_images: Optional[List[Image.Image]] = None # For the thread fallback
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._in_flight = SingleFlight()
+
+    def start(self):
+        """
+        Loads the hand frames and starts the worker processes. Call it early at startup: on Linux the
+        workers are forked, which is cheapest and safest before the bot's threads exist.
+        """
+        if self._hand_frames is not None:
+            return
+        self._hand_frames = load_hand_frames()
+        if self.workers > 0:
+            self._start_pool()
+        logging.info(f"PetPet renderer started with {self.workers} worker process(es).")
+
+    def _start_pool(self):
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self._hand_frames,))
+        for _ in range(self.workers):
+            self._pool.submit(_warm_up) # Spawn the workers now rather than on the first /petpet
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _remember(self, key: str, gif: bytes):
+        self._cache[key] = gif
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _render_uncached(self, avatar_bytes: bytes) -> bytes:
+        if self._pool is not None:
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._pool, render_petpet, avatar_bytes)
+            except BrokenProcessPool:
+                logging.error("PetPet worker pool broke, rendering in a thread from now on.")
+                self._pool = None
+        if self._hand_images is None:
+            self._hand_images = decode_hand_frames(self._hand_frames)
+        return await asyncio.to_thread(render_petpet, avatar_bytes, self._hand_images)
+
+    async def render(self, avatar_bytes: bytes, cache_key: Optional[str] = None) -> bytes:
+        """
+        Returns the petpet GIF for an avatar image.
+        cache_key defaults to a hash of the image, pass the avatar's asset hash to skip hashing.
+        """
+        key = cache_key or hashlib.blake2b(avatar_bytes, digest_size=16).hexdigest()
+        if (gif := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return gif
+        if key in self._in_flight: # The same avatar is already being rendered
+            self.stats["coalesced"] += 1
+
+        async def render_and_remember() -> bytes:
+            self.start()
+            started = time.perf_counter()
+            gif = await self._render_uncached(avatar_bytes)
+            self.stats["renders"] += 1
+            self.stats["render_seconds"] += time.perf_counter() - started
+            self._remember(key, gif)
+            return gif
+
+        return await self._in_flight.run(key, render_and_remember)
+
+petpet_renderer = PetPetRenderer()
+
+async def generate_petpet_gif(avatar: bytes | str, cache_key: Optional[str] = None) -> io.BytesIO | None:
     """
-    Generates an animated PetPet GIF for the given avatar URL.
+    Generates an animated PetPet GIF for the given avatar.
 
     Args:
-        avatar_url: URL of the user's avatar.
+        avatar: The avatar image, or the URL to download it from.
+        cache_key: Identifies the avatar in the GIF cache, e.g. its asset hash.
 
     Returns:
         An io.BytesIO object containing the GIF data, or None if an error occurred.
     """
     try:
-        # Fetch and prepare avatar
-        response = requests.get(avatar_url, stream=True, timeout=10)
-        response.raise_for_status()
-        avatar_bytes = response.content
-        
-        base_avatar_img = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA")
-        base_avatar_img = base_avatar_img.resize(AVATAR_BASE_SIZE, Image.Resampling.LANCZOS)
-
-        # Load hand images
-        hand_images = []
-        for i in range(5):
-            try:
-                hand_img = Image.open(HAND_IMAGE_PATHS[i]).convert("RGBA")
-                if hand_img.size != CANVAS_SIZE: # Ensure hands are also 112x112
-                    hand_img = hand_img.resize(CANVAS_SIZE, Image.Resampling.LANCZOS)
-                hand_images.append(hand_img)
-            except FileNotFoundError:
-                logging.error(f"Hand image not found: {HAND_IMAGE_PATHS[i]}")
-                return None
-        
-        output_frames = []
-
-        for hand_idx_for_cycle in ANIMATION_HAND_INDICES:
-            # Get deformation parameters for the current hand state
-            deform_params = AVATAR_DEFORM_PARAMS[hand_idx_for_cycle]
-
-            # Create a new transparent canvas for this frame
-            frame_canvas = Image.new("RGBA", CANVAS_SIZE, (0, 0, 0, 0))
-
-            # Deform (resize) the base avatar
-            squished_avatar = base_avatar_img.resize(
-                (deform_params["w"], deform_params["h"]), 
-                Image.Resampling.LANCZOS
-            )
-
-            # Paste the deformed avatar onto the canvas at its specified position
-            frame_canvas.paste(squished_avatar, (deform_params["x"], deform_params["y"]), squished_avatar)
-
-            # Get the current hand image
-            current_hand_image = hand_images[hand_idx_for_cycle]
-            
-            # Paste the hand image over the avatar
-            # Hand images are 112x112 and pre-positioned, so paste at (0,0)
-            frame_canvas.paste(current_hand_image, (0, 0), current_hand_image)
-            
-            output_frames.append(frame_canvas)
-
-        # Save frames as an animated GIF into a BytesIO object
-        gif_bytesio = io.BytesIO()
-        output_frames[0].save(
-            gif_bytesio, format="GIF", save_all=True, append_images=output_frames[1:],
-            duration=FRAME_DURATION_MS, loop=0, transparency=0, disposal=2 # disposal=2 means restore background
-        )
-        gif_bytesio.seek(0)
-        return gif_bytesio
-
-    except requests.exceptions.RequestException as e:
+        avatar_bytes = avatar if isinstance(avatar, bytes) else await fetch_avatar_bytes(avatar)
+        return io.BytesIO(await petpet_renderer.render(avatar_bytes, cache_key=cache_key))
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         logging.error(f"Failed to download avatar: {e}")
+    except FileNotFoundError as e:
+        logging.error(f"Hand image not found: {e}")
     except IOError as e: # Catches PIL image opening/processing errors
         logging.error(f"Image processing error for PetPet: {e}")
     except Exception as e:
         logging.error(f"Unexpected error generating PetPet GIF: {e}", exc_info=True)
-    return None
\ No newline at end of file
+    return None
@@ -0,0 +1,153 @@
+import asyncio
+import contextlib
+import datetime
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from interactions import Client, Embed
+from interactions.client.const import EMBED_TOTAL_MAX
+from interactions.client.errors import NotFound
+from interactions.models.discord.channel import GuildText
+from interactions.models.discord.embed import process_embeds
+from settings_manager import get_logging_setting, get_logging_webhook, save_logging_webhook
+
+EMBEDS_PER_MESSAGE = 10 # Discord's limit
+LOG_FLUSH_INTERVAL = 2.0 # Seconds an embed may wait for others to share its message
+LOG_MAX_PENDING = 500 # Embeds buffered per guild, the oldest are dropped past it (e.g. a raid into a slow channel)
+LOG_WEBHOOK_NAME = "Ina's Server Log"
+WEBHOOK_RETRY_INTERVAL = 600 # Seconds before trying again to get a webhook for a channel that had none to offer
+
+class _GuildLog:
+    def __init__(self, channel_id: str):
+        self.channel_id = channel_id
+        self.embeds: deque = deque()
+        self.full = asyncio.Event() # A message's worth of embeds is waiting
+        self.task: Optional[asyncio.Task] = None
+
+class ServerLogSink:
+    """
+    Delivers the server activity log of every guild with logging enabled, for all the event listeners that log.
+    Embeds are buffered per guild and sent up to EMBEDS_PER_MESSAGE per message, as soon as a message is full or
+    after flush_interval. Each guild's log is sent by one task, one message at a time: while the channel's rate limit
+    holds a send back, the next batch fills up instead of queueing more sends.
+    With use_webhooks, the log goes through a webhook in each log channel (created once, its token kept in a file outside git). Webhooks
+    have their own rate limits, so the log doesn't hold up the bot's other messages in the channel. Without the Manage
+    Webhooks permission, or if the webhook fails, the log is sent as the bot.
+    """
+
+    def __init__(self, flush_interval: float = LOG_FLUSH_INTERVAL, max_pending: int = LOG_MAX_PENDING, use_webhooks: bool = False):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.use_webhooks = use_webhooks
+        self.stats = {"logged": 0, "messages": 0, "webhook_messages": 0, "dropped": 0, "failed": 0}
+        self._guilds: Dict[str, _GuildLog] = {}
+        # channel ID -> (webhook ID, token), or the time to try again for channels without one
+        self._webhooks: Dict[str, Tuple[str, str] | float] = {}
+
+    def log(self, bot: Client, guild_id: str, embed: Embed):
+        """Queues an embed for the guild's log channel, if logging is enabled there. Never blocks."""
+        if not guild_id:
+            return
+        log_settings = get_logging_setting(str(guild_id))
+        if not (log_settings and log_settings.get("enabled") and log_settings.get("channel_id")):
+            return
+        if not embed.timestamp: # When it happened, not when its batch was sent
+            embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+
+        guild_log = self._guilds.get(guild_id)
+        if guild_log is None:
+            guild_log = self._guilds[guild_id] = _GuildLog(log_settings["channel_id"])
+        guild_log.channel_id = log_settings["channel_id"]
+        if len(guild_log.embeds) >= self.max_pending:
+            guild_log.embeds.popleft()
+            self.stats["dropped"] += 1
+        guild_log.embeds.append(embed)
+        self.stats["logged"] += 1
+        if len(guild_log.embeds) >= EMBEDS_PER_MESSAGE:
+            guild_log.full.set()
+        if guild_log.task is None:
+            guild_log.task = asyncio.create_task(self._deliver(bot, guild_id, guild_log))
+
+    @staticmethod
+    def _take_batch(embeds: deque) -> List[Embed]:
+        batch = [embeds.popleft()]
+        size = len(batch[0])
+        while embeds and len(batch) < EMBEDS_PER_MESSAGE and size + len(embeds[0]) <= EMBED_TOTAL_MAX:
+            size += len(embeds[0])
+            batch.append(embeds.popleft())
+        return batch
+
+    async def _deliver(self, bot: Client, guild_id: str, guild_log: _GuildLog):
+        try:
+            while guild_log.embeds:
+                if len(guild_log.embeds) < EMBEDS_PER_MESSAGE:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(guild_log.full.wait(), self.flush_interval)
+                batch = self._take_batch(guild_log.embeds)
+                if len(guild_log.embeds) < EMBEDS_PER_MESSAGE:
+                    guild_log.full.clear()
+                await self._send(bot, guild_id, guild_log.channel_id, batch)
+        finally:
+            guild_log.task = None
+            if not guild_log.embeds:
+                self._guilds.pop(guild_id, None)
+
+    async def _get_webhook(self, bot: Client, guild_id: str, channel_id: str) -> Optional[Tuple[str, str]]:
+        webhook = self._webhooks.get(channel_id)
+        if isinstance(webhook, tuple):
+            return webhook
+        if webhook is not None and time.monotonic() < webhook:
+            return None
+
+        stored = get_logging_webhook(guild_id)
+        if stored and stored.get("channel_id") == channel_id:
+            webhook = (stored["id"], stored["token"])
+        else:
+            try:
+                # Reuse the webhook of a previous setup of this channel, a channel can only have 15
+                ours = [
+                    data for data in await bot.http.get_channel_webhooks(channel_id)
+                    if data.get("token") and data.get("user", {}).get("id") == str(bot.user.id) and data.get("name") == LOG_WEBHOOK_NAME
+                ]
+                data = ours[0] if ours else await bot.http.create_webhook(channel_id, LOG_WEBHOOK_NAME)
+            except Exception as e: # Usually no Manage Webhooks permission
+                logging.warning(f"No webhook for log channel {channel_id} in guild {guild_id}, sending the log as the bot: {e}")
+                self._webhooks[channel_id] = time.monotonic() + WEBHOOK_RETRY_INTERVAL
+                return None
+            webhook = (data["id"], data["token"])
+            save_logging_webhook(guild_id, {"channel_id": channel_id, "id": webhook[0], "token": webhook[1]})
+        self._webhooks[channel_id] = webhook
+        return webhook
+
+    async def _send_webhook(self, bot: Client, guild_id: str, channel_id: str, embeds: List[Embed]) -> bool:
+        if (webhook := await self._get_webhook(bot, guild_id, channel_id)) is None:
+            return False
+        try:
+            await bot.http.execute_webhook(webhook[0], webhook[1], {"embeds": process_embeds(embeds)})
+            self.stats["webhook_messages"] += 1
+            return True
+        except NotFound: # Deleted from the channel, the next batch gets a new one
+            logging.warning(f"The log webhook of channel {channel_id} in guild {guild_id} was deleted.")
+            self._webhooks.pop(channel_id, None)
+            save_logging_webhook(guild_id, None)
+        except Exception as e:
+            logging.warning(f"Failed to send {len(embeds)} log embed(s) through the webhook of channel {channel_id} in guild {guild_id}, sending them as the bot: {e}")
+        return False
+
+    async def _send(self, bot: Client, guild_id: str, channel_id: str, embeds: List[Embed]):
+        if self.use_webhooks and await self._send_webhook(bot, guild_id, channel_id, embeds):
+            return
+        try:
+            log_channel = await bot.fetch_channel(int(channel_id))
+            if log_channel and isinstance(log_channel, GuildText):
+                await log_channel.send(embeds=embeds)
+                self.stats["messages"] += 1
+                return
+            logging.warning(f"Log channel {channel_id} in guild {guild_id} is not a valid text channel or not found.")
+        except Exception as e:
+            logging.error(f"Failed to send {len(embeds)} log embed(s) to channel {channel_id} in guild {guild_id}: {e}", exc_info=True)
+        self.stats["failed"] += len(embeds)
+
+server_log = ServerLogSink()
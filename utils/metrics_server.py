@@ -0,0 +1,67 @@
+import logging
+from typing import Optional
+from aiohttp import web
+from interactions import Client
+from utils.log_sink import server_log
+from utils.offload import offload_pool
+
+METRICS_PATH = "/metrics"
+
+_runner: Optional[web.AppRunner] = None
+
+def render_metrics(bot: Client) -> str:
+    """Interaction latency summaries plus rate limit, autocomplete cache, channel, offload pool and server log counters, in Prometheus text format."""
+    lines = [bot.interaction_metrics.prometheus_text().rstrip("\n")]
+    lines.append("# HELP discord_http_ratelimit_total Discord API requests and rate limit events.")
+    lines.append("# TYPE discord_http_ratelimit_total counter")
+    for name, value in bot.http.ratelimit_stats.items():
+        lines.append(f'discord_http_ratelimit_total{{event="{name}"}} {value}')
+    lines.append("# HELP autocomplete_cache_total Autocomplete interactions by how the cache answered them.")
+    lines.append("# TYPE autocomplete_cache_total counter")
+    for name, value in bot.autocomplete_cache.stats.items():
+        lines.append(f'autocomplete_cache_total{{result="{name}"}} {value}')
+    lines.append("# HELP interaction_channel_total Interaction contexts by where their channel came from.")
+    lines.append("# TYPE interaction_channel_total counter")
+    for name, value in bot.context_channel_stats.items():
+        lines.append(f'interaction_channel_total{{source="{name}"}} {value}')
+    lines.append("# HELP offload_tasks_total Tasks run in the offload worker processes, by outcome.")
+    lines.append("# TYPE offload_tasks_total counter")
+    for name, value in offload_pool.stats.items():
+        lines.append(f'offload_tasks_total{{result="{name}"}} {value}')
+    lines.append("# HELP offload_queue_depth Tasks waiting for an offload worker.")
+    lines.append("# TYPE offload_queue_depth gauge")
+    lines.append(f"offload_queue_depth {offload_pool.queued}")
+    lines.append("# HELP offload_workers_busy Offload workers running a task.")
+    lines.append("# TYPE offload_workers_busy gauge")
+    lines.append(f"offload_workers_busy {offload_pool.busy}")
+    lines.append("# HELP server_log_total Server activity log embeds, and the messages that delivered them.")
+    lines.append("# TYPE server_log_total counter")
+    for name, value in server_log.stats.items():
+        lines.append(f'server_log_total{{event="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+async def start_metrics_server(bot: Client, port: int, host: str = "127.0.0.1") -> bool:
+    """
+    Serves render_metrics on http://host:port/metrics for Prometheus to scrape. Only starts once.
+    Binds to localhost by default, the numbers include command names and should not be public.
+    """
+    global _runner
+    if _runner is not None:
+        return False
+
+    async def metrics(_request: web.Request) -> web.Response:
+        return web.Response(text=render_metrics(bot), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get(METRICS_PATH, metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError as e:
+        logging.error(f"Could not start the metrics endpoint on {host}:{port}: {e}")
+        await runner.cleanup()
+        return False
+    _runner = runner
+    logging.info(f"Serving Prometheus metrics on http://{host}:{port}{METRICS_PATH}")
+    return True
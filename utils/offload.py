@@ -0,0 +1,279 @@
+import asyncio
+import contextlib
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import pickle
+import select
+import signal
+import time
+from multiprocessing.connection import Connection
+from typing import Any, Callable, List, Optional
+
+try:
+    import resource # Not available on Windows, tasks there are only stopped by their timeout
+except ImportError:
+    resource = None
+
+OFFLOAD_WORKERS = 2 # Worker processes, each runs one task at a time
+OFFLOAD_MAX_QUEUE = 32 # Tasks allowed to wait for a worker before new ones are turned away
+OFFLOAD_CPU_SECONDS = 2 # CPU time a task may use before it is killed
+OFFLOAD_MEMORY_MB = 256 # Memory a task may allocate on top of what its process starts with
+OFFLOAD_TIMEOUT = 10 # Wall clock seconds a task may take, covers tasks that wait rather than compute
+KILL_GRACE = 2 # Extra seconds before the pool gives up on a worker that doesn't answer at all
+
+# Tasks run in a fork of their worker, so the kernel can enforce the limits and kill only the task
+_FORK_TASKS = hasattr(os, "fork")
+
+class OffloadError(Exception):
+    """A task could not be run or finished in the offload pool."""
+
+class OffloadQueueFull(OffloadError):
+    """Too many tasks are already waiting for a worker."""
+
+class OffloadLimitExceeded(OffloadError):
+    """A task went over a limit and was killed. limit is "CPU time", "memory" or "time"."""
+
+    def __init__(self, limit: str):
+        super().__init__(f"The task went over its {limit} limit")
+        self.limit = limit
+
+def _call(func: Callable, args: tuple) -> bytes:
+    """Runs a task, returns the pickled reply for the pool."""
+    try:
+        reply = ("ok", func(*args))
+    except MemoryError:
+        reply = ("limit", "memory")
+    except Exception as e:
+        reply = ("error", e)
+    try:
+        return pickle.dumps(reply)
+    except Exception as e: # An unpicklable result or exception
+        return pickle.dumps(("error", OffloadError(f"Could not send back the task's {reply[0]} reply: {e!r}")))
+
+def _address_space() -> Optional[int]:
+    """Bytes of address space the process uses, None where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+def _limit_resources(cpu_seconds: float, memory_bytes: int):
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0)) # Going over the CPU limit would dump core otherwise
+    if cpu_seconds:
+        # The kernel sends SIGXCPU, which kills the process even in the middle of C code like 9**9**9
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        limit = max(1, math.ceil(cpu_seconds))
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    if memory_bytes and (used := _address_space()) is not None:
+        # Allocations past the limit raise MemoryError, the process was forked with the worker's address space
+        resource.setrlimit(resource.RLIMIT_AS, (used + memory_bytes, resource.RLIM_INFINITY))
+
+def _run_task_process(conn: Connection, task_id: int, func: Callable, args: tuple, cpu_seconds: float, memory_bytes: int, timeout: float) -> bytes:
+    """Runs a task in a fork of the worker and waits for its reply, killing it on timeout or when the pool cancels it."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0: # The task's process, which must never return into the worker's loop
+        code = 1
+        try:
+            os.close(read_fd)
+            if resource is not None:
+                _limit_resources(cpu_seconds, memory_bytes)
+            data = _call(func, args)
+            with open(write_fd, "wb") as f:
+                f.write(data)
+            code = 0
+        finally:
+            os._exit(code)
+
+    os.close(write_fd)
+    chunks = []
+    stopped = None
+    deadline = time.monotonic() + timeout
+    with open(read_fd, "rb", buffering=0) as f:
+        while stopped is None:
+            ready, _, _ = select.select([f, conn], [], [], max(deadline - time.monotonic(), 0))
+            if f in ready:
+                if not (chunk := f.read(65536)):
+                    break
+                chunks.append(chunk)
+            elif conn in ready:
+                try:
+                    if conn.recv() == task_id: # Anything else is a cancel that came after its task was done
+                        stopped = ("cancelled", None)
+                except EOFError: # The pool shut down
+                    stopped = ("cancelled", None)
+            else:
+                stopped = ("limit", "time")
+    if stopped is not None:
+        os.kill(pid, signal.SIGKILL)
+    _, status = os.waitpid(pid, 0)
+
+    if stopped is not None:
+        return pickle.dumps(stopped)
+    if os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0:
+        return b"".join(chunks)
+    if os.WIFSIGNALED(status) and os.WTERMSIG(status) == signal.SIGXCPU:
+        return pickle.dumps(("limit", "CPU time"))
+    return pickle.dumps(("error", OffloadError(f"The task's process died (wait status {status})")))
+
+def _worker_main(conn: Connection):
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # Ctrl+C is for the bot, which shuts the pool down
+    while True:
+        try:
+            message = pickle.loads(conn.recv_bytes())
+        except EOFError: # The pool shut down
+            return
+        except Exception as e: # The task's function couldn't be imported
+            conn.send_bytes(pickle.dumps(("error", OffloadError(f"Could not load the task: {e!r}"))))
+            continue
+        if not isinstance(message, tuple): # A cancel that came after its task was done
+            continue
+        task_id, func, args, cpu_seconds, memory_bytes, timeout = message
+        if _FORK_TASKS:
+            reply = _run_task_process(conn, task_id, func, args, cpu_seconds, memory_bytes, timeout)
+        else:
+            reply = _call(func, args)
+        conn.send_bytes(reply)
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), name="offload-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task_id: Optional[int] = None
+
+    def exchange(self, task: tuple) -> tuple:
+        """Sends a task and waits for its reply. Blocks, runs in a thread."""
+        self.conn.send(task)
+        return pickle.loads(self.conn.recv_bytes())
+
+    def cancel(self):
+        if not _FORK_TASKS:
+            self.process.kill() # The task runs in the worker itself, the pool replaces it
+            return
+        with contextlib.suppress(OSError): # Already gone, the pool replaces it
+            self.conn.send(self.task_id) # The worker kills the task's process and replies
+
+    def close(self):
+        self.conn.close() # The worker kills a running task's process and exits
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+
+class OffloadPool:
+    """
+    Runs CPU heavy work from commands in worker processes, so it never blocks the event loop, with limits that
+    keep abusive inputs from hurting the bot.
+    Each task runs in a fresh fork of its worker, where the kernel kills it once it uses cpu_seconds of CPU time,
+    and allocations past memory_mb raise MemoryError. The worker also kills it after timeout seconds, or when the
+    awaiting coroutine is cancelled. At most max_queue tasks wait for a worker, more are turned away.
+    Without os.fork (Windows) tasks run in the worker itself and only the timeout applies, by replacing the worker.
+    """
+
+    def __init__(self, workers: int = OFFLOAD_WORKERS, max_queue: int = OFFLOAD_MAX_QUEUE, cpu_seconds: float = OFFLOAD_CPU_SECONDS,
+                 memory_mb: int = OFFLOAD_MEMORY_MB, timeout: float = OFFLOAD_TIMEOUT):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_mb * 1024 * 1024
+        self.timeout = timeout
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "killed": 0, "cancelled": 0, "rejected": 0}
+        self.queued = 0 # Tasks waiting for a worker
+        self._workers: List[_Worker] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._task_ids = itertools.count(1)
+        self._context = multiprocessing.get_context()
+
+    @property
+    def busy(self) -> int:
+        """Workers running a task."""
+        return len(self._workers) - self._idle.qsize() if self._idle is not None else 0
+
+    def start(self):
+        """
+        Starts the worker processes. Call it early at startup: on Linux the workers are forked, which is cheapest
+        and safest before the bot's threads and connections exist.
+        """
+        if self._idle is not None:
+            return
+        self._idle = asyncio.Queue()
+        for _ in range(self.workers):
+            self._add_worker()
+        logging.info(f"Offload pool started with {self.workers} worker process(es).")
+
+    def _add_worker(self):
+        worker = _Worker(self._context)
+        self._workers.append(worker)
+        self._idle.put_nowait(worker)
+
+    def shutdown(self):
+        workers, self._workers = self._workers, []
+        self._idle = None
+        for worker in workers:
+            worker.close()
+
+    def _release(self, worker: _Worker, exchange: asyncio.Future):
+        if worker not in self._workers: # Shut down in the meantime
+            return
+        if not isinstance(exchange.exception(), (EOFError, OSError)) and worker.process.is_alive():
+            self._idle.put_nowait(worker)
+            return
+        logging.warning(f"Offload worker {worker.process.pid} stopped, starting a new one.")
+        self._workers.remove(worker)
+        worker.close()
+        self._add_worker()
+
+    async def run(self, func: Callable, *args: Any, cpu_seconds: Optional[float] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Returns func(*args), computed in a worker process. func must be a module level function, and its arguments and
+        result picklable. Raises what func raised, OffloadLimitExceeded if the task was killed for going over a limit,
+        and OffloadQueueFull if too many tasks are already waiting.
+        """
+        if self.queued >= self.max_queue:
+            self.stats["rejected"] += 1
+            raise OffloadQueueFull(f"{self.queued} tasks are already waiting for a worker")
+        self.start()
+        self.stats["submitted"] += 1
+        self.queued += 1
+        try:
+            worker = await self._idle.get()
+        finally:
+            self.queued -= 1
+
+        timeout = timeout or self.timeout
+        worker.task_id = next(self._task_ids)
+        task = (worker.task_id, func, args, cpu_seconds or self.cpu_seconds, self.memory_bytes, timeout)
+        exchange = asyncio.get_running_loop().run_in_executor(None, worker.exchange, task)
+        # The worker is free again once it has answered, also when the caller stopped waiting for it
+        exchange.add_done_callback(lambda _: self._release(worker, exchange))
+        try:
+            status, value = await asyncio.wait_for(asyncio.shield(exchange), timeout + KILL_GRACE)
+        except asyncio.TimeoutError: # Without os.fork, or if the worker hangs: the pool replaces it
+            worker.process.kill()
+            self.stats["killed"] += 1
+            raise OffloadLimitExceeded("time") from None
+        except asyncio.CancelledError:
+            worker.cancel()
+            self.stats["cancelled"] += 1
+            raise
+        except (EOFError, OSError) as e:
+            self.stats["failed"] += 1
+            raise OffloadError("The worker process stopped") from e
+
+        if status == "ok":
+            self.stats["completed"] += 1
+            return value
+        if status == "limit":
+            self.stats["killed"] += 1
+            raise OffloadLimitExceeded(value)
+        self.stats["failed"] += 1
+        raise value
+
+offload_pool = OffloadPool()
@@ -1,36 +1,214 @@
-import re
+import ast
 import logging
+import operator
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+BASE_GEAR_SCORE = 500
+DEFAULT_GEAR_SCORE = 725
+# Gear scores create_db.py evaluates every scaling perk at ahead of time
+SCALING_BREAKPOINTS = tuple(range(BASE_GEAR_SCORE, DEFAULT_GEAR_SCORE + 1, 25))
+
+# nw-buddy writes placeholders as {[0.05 * 100 * {perkMultiplier}]}, nwdb as ${5 * perkMultiplier}
+PLACEHOLDER_PATTERN = re.compile(r'\{\[(.*?)\]\}|\$\{(.*?)\}')
+MULTIPLIER_NAME = "perkMultiplier"
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+_UNARY_OPERATORS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+_FUNCTIONS = {"abs": abs, "min": min, "max": max, "round": round}
+
+class PerkExpressionError(ValueError):
+    """The expression uses something other than numbers, perkMultiplier, + - * / // %, abs, min, max and round."""
+
+class ArithmeticWhitelist:
+    """
+    What an expression may use besides numbers and unary + -: one variable, named constants, calls of named
+    functions with positional arguments, and binary operators. Anything else raises error.
+    """
+    __slots__ = ("variable", "constants", "functions", "binary_operators", "error")
+
+    def __init__(self, variable: Optional[str] = None, constants: Optional[Dict[str, float]] = None,
+                 functions: Optional[Dict[str, Callable]] = None, binary_operators: Optional[Dict[type, Callable]] = None,
+                 error: type = ValueError) -> None:
+        self.variable = variable
+        self.constants = constants or {}
+        self.functions = functions or {}
+        self.binary_operators = binary_operators or BINARY_OPERATORS
+        self.error = error
+
+PERK_WHITELIST = ArithmeticWhitelist(MULTIPLIER_NAME, functions=_FUNCTIONS, error=PerkExpressionError)
+
+def _compile_node(node: ast.AST, whitelist: ArithmeticWhitelist) -> Callable[[float], float]:
+    """Turns a whitelisted AST node into a closure of the variable. Constant subtrees are folded."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda variable: value
+    if isinstance(node, ast.Name) and node.id == whitelist.variable:
+        return lambda variable: variable
+    if isinstance(node, ast.Name) and node.id in whitelist.constants:
+        value = whitelist.constants[node.id]
+        return lambda variable: value
+    if isinstance(node, ast.BinOp) and type(node.op) in whitelist.binary_operators:
+        op = whitelist.binary_operators[type(node.op)]
+        left, right = _compile_node(node.left, whitelist), _compile_node(node.right, whitelist)
+
+        def compiled(variable: float) -> float:
+            return op(left(variable), right(variable))
+    elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        op = _UNARY_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand, whitelist)
+
+        def compiled(variable: float) -> float:
+            return op(operand(variable))
+    elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in whitelist.functions
+          and not node.keywords):
+        function = whitelist.functions[node.func.id]
+        args = [_compile_node(arg, whitelist) for arg in node.args]
+
+        def compiled(variable: float) -> float:
+            return function(*(arg(variable) for arg in args))
+    else:
+        raise whitelist.error(f"Unsupported syntax: {ast.unparse(node)[:100]}")
+
+    if not any(isinstance(child, ast.Name) and child.id == whitelist.variable for child in ast.walk(node)):
+        try:
+            value = compiled(1.0) # Does not depend on the variable
+        except (ArithmeticError, TypeError, ValueError):
+            return compiled # Let evaluation report it
+        return lambda variable: value
+    return compiled
+
+def compile_arithmetic(expression: str, whitelist: ArithmeticWhitelist) -> Callable[[float], float]:
+    """
+    Compiles an arithmetic expression into a function of the whitelist's variable.
+    Raises whitelist.error for invalid syntax or anything outside the whitelist.
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise whitelist.error(f"Invalid expression '{expression}': {e.msg}") from None
+    return _compile_node(tree.body, whitelist)
 
-def _eval_perk_expression(expr_str: str, gs_multiplier_val: float) -> str:
+def compile_perk_expression(expression: str) -> Callable[[float], float]:
     """
-    Safely evaluates a perk expression string after substituting perkMultiplier.
-    Example: expr_str = "2.4 * perkMultiplier", gs_multiplier_val = 1.45
+    Compiles a perk expression like "0.024 * perkMultiplier" into a function of the gear score multiplier.
+    Raises PerkExpressionError for anything outside the arithmetic whitelist.
     """
+    return compile_arithmetic(expression.replace("{" + MULTIPLIER_NAME + "}", MULTIPLIER_NAME), PERK_WHITELIST)
+
+def format_perk_value(result: Union[int, float]) -> str:
+    if isinstance(result, float):
+        # Format floats nicely, remove trailing zeros for whole numbers
+        if result.is_integer():
+            return str(int(result))
+        num_decimals = 3 if abs(result) < 1 and abs(result) > 0 else 2
+        formatted_result = f"{result:.{num_decimals}f}".rstrip('0').rstrip('.')
+        return formatted_result if formatted_result != "0" else "0"
+    return str(result)
+
+class _Placeholder:
+    __slots__ = ("source", "function", "scales")
+
+    def __init__(self, source: str, function: Optional[Callable[[float], float]], scales: bool):
+        self.source = source # The expression as written, for error output
+        self.function = function # None if the expression failed to compile
+        self.scales = scales
+
+    def evaluate(self, multiplier: float) -> Optional[Union[int, float]]:
+        if self.function is None:
+            return None
+        try:
+            return self.function(multiplier)
+        except (ArithmeticError, TypeError, ValueError) as e:
+            logging.warning(f"Could not evaluate perk expression '{self.source}' with multiplier {multiplier}: {e}")
+            return None
+
+    def format(self, value: Optional[Union[int, float]]) -> str:
+        return f"[EVAL_ERROR: {self.source}]" if value is None else format_perk_value(value)
+
+    def render(self, multiplier: float) -> str:
+        return self.format(self.evaluate(multiplier))
+
+def _compile_placeholder(expression: str, bare_number_scales: bool) -> _Placeholder:
+    stripped = expression.strip()
+    if bare_number_scales and MULTIPLIER_NAME not in stripped:
+        # A bare {[value]} is a base value that scales with gear score
+        try:
+            value = float(stripped)
+            return _Placeholder(expression, lambda multiplier: value * multiplier, True)
+        except ValueError:
+            pass
     try:
-        eval_str = expr_str.replace("perkMultiplier", str(gs_multiplier_val))
-        allowed_globals = {"__builtins__": {}}
-        allowed_locals = {}
+        function = compile_perk_expression(expression)
+    except PerkExpressionError as e:
+        logging.warning(f"Could not compile perk expression '{expression}': {e}")
+        return _Placeholder(expression, None, False)
+    return _Placeholder(expression, function, MULTIPLIER_NAME in stripped)
+
+class PerkTemplate:
+    """A perk description split into literal text and compiled placeholders, renderable at any gear score."""
+
+    def __init__(self, text: str):
+        self.parts: List[Union[str, _Placeholder]] = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            self.parts.append(text[position:match.start()])
+            if match.group(1) is not None:
+                self.parts.append(_compile_placeholder(match.group(1), bare_number_scales=True))
+            else:
+                self.parts.append(_compile_placeholder(match.group(2), bare_number_scales=False))
+            position = match.end()
+        self.parts.append(text[position:])
+        self.placeholders = [part for part in self.parts if isinstance(part, _Placeholder)]
+
+    @property
+    def has_scaling(self) -> bool:
+        return any(placeholder.scales for placeholder in self.placeholders)
 
-        result = eval(eval_str, allowed_globals, allowed_locals)
+    def evaluate(self, gear_score: int) -> List[Optional[Union[int, float]]]:
+        """The value of every placeholder at a gear score, None where it can't be evaluated."""
+        multiplier = gear_score / BASE_GEAR_SCORE
+        return [placeholder.evaluate(multiplier) for placeholder in self.placeholders]
 
-        if isinstance(result, float):
-            if result.is_integer():
-                return str(int(result))
-            formatted_result = f"{result:.3f}".rstrip('0').rstrip('.')
-            return formatted_result
-        return str(result)
-    except Exception as e:
-        logging.warning(f"Could not evaluate perk expression '{expr_str}' with multiplier {gs_multiplier_val}: {e}")
-        return f"[EVAL_ERROR: {expr_str}]"
+    def _values_at(self, gear_score: int, precomputed: Optional[Dict[int, Sequence]]) -> Sequence:
+        values = precomputed.get(gear_score) if precomputed else None
+        # Values stored by an older build may not match this template, evaluate those instead
+        return values if values is not None and len(values) == len(self.placeholders) else self.evaluate(gear_score)
 
-def scale_value_with_gs(base_value: str, gear_score: int = 725) -> str:
+    def render(self, gear_score: int = DEFAULT_GEAR_SCORE, precomputed: Optional[Dict[int, Sequence]] = None) -> str:
+        """precomputed maps gear scores to the output of evaluate(), e.g. as stored in the database."""
+        values = iter(self._values_at(gear_score, precomputed))
+        return "".join(part if isinstance(part, str) else part.format(next(values)) for part in self.parts)
+
+    def scaling_table(self, gear_scores: Iterable[int], precomputed: Optional[Dict[int, Sequence]] = None) -> List[List[str]]:
+        """One row per gear score: the gear score, then each value that scales with it."""
+        table = []
+        for gear_score in gear_scores:
+            values = self._values_at(gear_score, precomputed)
+            table.append([str(gear_score)] + [
+                placeholder.format(value) for placeholder, value in zip(self.placeholders, values) if placeholder.scales
+            ])
+        return table
+
+@lru_cache(maxsize=4096)
+def compile_perk_template(text: str) -> PerkTemplate:
+    """Compiled once per distinct description, then cheap to render at any gear score."""
+    return PerkTemplate(text)
+
+def scale_value_with_gs(base_value: Optional[str], gear_score: int = DEFAULT_GEAR_SCORE) -> Optional[str]:
     """
     Scales numeric values within a perk description string based on Gear Score.
-    Replaces placeholders like ${expression * perkMultiplier} or ${value} with their calculated/literal values.
+    Replaces placeholders like {[expression * perkMultiplier]}, {[value]} or ${expression * perkMultiplier}
+    with their calculated values.
     """
-    if not base_value or '${' not in base_value:
+    if not base_value or ('{[' not in base_value and '${' not in base_value):
         return base_value
-
-    base_gs = 500
-    gs_multiplier = gear_score / base_gs
-    return re.sub(r'\$\{(.*?)\}', lambda match: _eval_perk_expression(match.group(1), gs_multiplier), base_value)
\ No newline at end of file
+    return compile_perk_template(base_value).render(gear_score)
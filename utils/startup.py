@@ -0,0 +1,60 @@
+import asyncio
+import importlib
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+class StartupTimeline:
+    """
+    Records how long each startup phase took, relative to when the timeline was created (process start).
+    Phases may overlap, e.g. the game data check runs while the gateway connects.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float, float]] = [] # (name, start, end) in seconds since self.started
+
+    def record(self, name: str, start: float, end: Optional[float] = None):
+        """Records a phase from perf_counter() timestamps, end defaults to now."""
+        end = time.perf_counter() if end is None else end
+        self.phases.append((name, start - self.started, end - self.started))
+
+    @contextmanager
+    def phase(self, name: str):
+        """with timeline.phase("command sync"): ... records the block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def report(self) -> str:
+        """One line per phase in start order: offset, duration and a bar on a shared time axis."""
+        if not self.phases:
+            return "No startup phases recorded."
+        total = max(end for _, _, end in self.phases) or 1e-9
+        width = 30
+        lines = [f"Startup timeline ({total:.2f}s):"]
+        for name, start, end in sorted(self.phases, key=lambda phase: phase[1]):
+            bar_start = int(start / total * width)
+            bar = " " * bar_start + "#" * max(1, int(end / total * width) - bar_start)
+            lines.append(f"  {name:<20} {start:>7.2f}s +{end - start:>6.2f}s |{bar:<{width}}|")
+        return "\n".join(lines)
+
+async def import_extensions(names: List[str], timeline: Optional[StartupTimeline] = None) -> Dict[str, Exception]:
+    """
+    Imports extension modules in worker threads, concurrently with each other and with whatever the event loop
+    does meanwhile (connecting to the gateway). Extensions don't depend on each other, and their imports are
+    mostly file reads (item caches, CSVs), so this takes them off the startup critical path.
+    bot.load_extension() then only has to register the already imported modules.
+
+    Returns the modules that failed to import, load_extension() retries and reports those.
+    """
+    start = time.perf_counter()
+    results = await asyncio.gather(*(asyncio.to_thread(importlib.import_module, name) for name in names), return_exceptions=True)
+    if timeline:
+        timeline.record("import extensions", start)
+    failed = {name: result for name, result in zip(names, results) if isinstance(result, Exception)}
+    for name, error in failed.items():
+        logging.debug(f"Background import of {name} failed ({error!r}), load_extension will retry it.")
+    return failed